@@ -0,0 +1,68 @@
+"""
+Rating burst detection benchmark.
+
+Generates synthetic ratings directly as arrays (skewed consumer activity
+spread over a year) plus a few injected bursts, and times the sliding
+window scan: one lexsort by (consumer, created_at), one searchsorted and
+a maximum reduceat. Checks that every injected burst is flagged.
+
+Usage: python -m benchmarks.bench_burst_detection [--ratings 10000000] [--consumers 2000000] [--bursts 50]
+"""
+import argparse
+import time
+from typing import Set, Tuple
+import numpy as np
+from src.application.analytics.burst_detection import ConsumerColumns, detect_bursts
+
+def generate(count: int, consumers: int, professionals: int, bursts: int, threshold: int, seed: int) -> Tuple[ConsumerColumns, Set[str]]:
+    rng = np.random.default_rng(seed)
+    # Atividade aproximadamente Zipf: poucos consumidores avaliam muito, espalhado no ano
+    weights = 1 / np.arange(1, consumers + 1) ** 0.6
+    codes = rng.choice(consumers, size=count, p=weights / weights.sum()).astype(np.int32)
+    start = np.datetime64("2025-01-01T00:00:00", "ms").astype(np.int64)
+    times = start + rng.integers(0, 365 * 86400 * 1000, size=count)
+    # Rajadas injetadas: consumidores do fim da cauda com threshold avaliações em dez minutos
+    injected = np.arange(consumers - bursts, consumers, dtype=np.int32)
+    burst_codes = np.repeat(injected, threshold)
+    burst_times = np.repeat(start + rng.integers(0, 300 * 86400 * 1000, size=bursts), threshold)
+    burst_times += rng.integers(0, 600 * 1000, size=len(burst_times))
+    codes = np.concatenate([codes, burst_codes])
+    times = np.concatenate([times, burst_times])
+    return ConsumerColumns(
+        consumer_ids=[f"consumer-{i}" for i in range(consumers)],
+        professional_ids=[f"professional-{i}" for i in range(professionals)],
+        consumers=codes,
+        professionals=rng.integers(0, professionals, size=len(codes)).astype(np.int32),
+        rates=rng.integers(0, 6, size=len(codes)).astype(np.int8),
+        created_at=times.astype("datetime64[ms]")
+    ), {f"consumer-{i}" for i in injected}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ratings", type=int, default=10_000_000)
+    parser.add_argument("--consumers", type=int, default=2_000_000)
+    parser.add_argument("--professionals", type=int, default=200_000)
+    parser.add_argument("--bursts", type=int, default=50)
+    parser.add_argument("--window", type=int, default=3600)
+    parser.add_argument("--threshold", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    columns, injected = generate(args.ratings, args.consumers, args.professionals, args.bursts, args.threshold, args.seed)
+    print(f"generated {len(columns)} ratings in {time.perf_counter() - start:.1f}s")
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        flags = detect_bursts(columns, args.window, args.threshold)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"burst scan: {best:.2f}s for {len(columns)} ratings ({len(columns) / best / 1e6:.1f}M ratings/s)")
+
+    flagged = {flag["consumer_id"] for flag in flags}
+    print(f"flagged {len(flagged)} consumers, {len(injected & flagged)}/{len(injected)} injected bursts found")
+
+if __name__ == "__main__":
+    main()
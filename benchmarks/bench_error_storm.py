@@ -0,0 +1,127 @@
+"""
+Handler throughput during an injected failure storm.
+
+The rating repository is given a collection whose every command fails with
+ServerSelectionTimeoutError (what a MongoDB outage looks like to the
+driver), and the app serves a mix of GET /ratings/{id} and POST /ratings/
+through the ASGI transport with some requests in flight. Three runs:
+
+- healthy: the same mix against mongomock, as the baseline;
+- storm, trace per error: ERROR_LOG_INTERVAL_SECONDS=0, so every failure is
+  logged with its stack trace (what the service did before);
+- storm, rate-limited: one stack trace per error signature per interval,
+  the rest only counted.
+
+Log records go to os.devnull, so the run measures formatting the records
+and stack traces, not the terminal. Reported: requests/s, p50/p99 latency
+and how many records were written.
+
+Usage: python -m benchmarks.bench_error_storm [--requests 3000] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from typing import Dict, List, Tuple
+from uuid import uuid4
+import httpx
+from pymongo.errors import ServerSelectionTimeoutError
+
+class FailingCollection:
+    """Collection stand-in for a MongoDB outage: every command times out."""
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ServerSelectionTimeoutError("No servers found yet, Timeout: 30s, Topology Description: <TopologyDescription id: bench, topology_type: Unknown>")
+        return fail
+
+class CountingHandler(logging.FileHandler):
+    def __init__(self):
+        super().__init__(os.devnull)
+        self.records = 0
+
+    def emit(self, record):
+        self.records += 1
+        super().emit(record)
+
+def provider(service):
+    # Sem parâmetros: o FastAPI trataria um argumento com default como query param
+    def provide():
+        return service
+    return provide
+
+async def run_mix(app, requests: int, concurrency: int, expected: Tuple[int, ...]) -> Dict[str, float]:
+    """Requests/s and p50/p99 latency (ms) of an even GET/POST mix."""
+    latencies: List[float] = []
+    body = {"professional_id": str(uuid4()), "consumer_id": str(uuid4()), "rate": 4, "description": "Benchmark"}
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one(i: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                if i % 2:
+                    response = await client.post("/ratings/", json=body)
+                else:
+                    response = await client.get(f"/ratings/{uuid4()}")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code in expected
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--interval", type=float, default=60.0, help="Rate-limited run: seconds between traces of a signature")
+    args = parser.parse_args()
+
+    from src.infrastructure.database import mongo_client
+    if not os.getenv("MONGODB_URI"):
+        import mongomock
+        mongo_client.set_mongo_client(mongomock.MongoClient())
+    from src.main import create_app
+    from src.api.dependencies import provide_rating_service
+    from src.application.services.rating_service import RatingService
+    from src.infrastructure.observability.error_log import ErrorLog, set_error_log
+    from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl, get_rating_repository
+
+    handler = CountingHandler()
+    root = logging.getLogger()
+    app = create_app()
+    # create_app configura o logging: só então os registros vão para o os.devnull
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    # Sem os INFO por requisição, que pesariam igualmente nas três rodadas
+    root.setLevel(logging.WARNING)
+
+    healthy = RatingService(get_rating_repository())
+    failing_repository = RatingRepositoryImpl.__new__(RatingRepositoryImpl)
+    failing_repository.collection = FailingCollection()
+    failing = RatingService(failing_repository)
+
+    runs = (
+        # Saudável: 201 no POST e 404 no GET (ID inexistente)
+        ("healthy", healthy, ErrorLog(args.interval), (201, 404)),
+        ("storm, trace per error", failing, ErrorLog(0), (500,)),
+        ("storm, rate-limited", failing, ErrorLog(args.interval), (500,))
+    )
+    print(f"{'run':<26}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'records':>10}{'suppressed':>12}")
+    for name, service, error_log, expected in runs:
+        app.dependency_overrides[provide_rating_service] = provider(service)
+        set_error_log(error_log)
+        handler.records = 0
+        result = asyncio.run(run_mix(app, args.requests, args.concurrency, expected))
+        print(f"{name:<26}{result['rps']:>10.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{handler.records:>10}{error_log.suppressed:>12}")
+    set_error_log(None)
+
+if __name__ == "__main__":
+    main()
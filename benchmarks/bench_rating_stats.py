@@ -0,0 +1,70 @@
+"""
+Vectorized rating statistics benchmark.
+
+Generates synthetic ratings directly as arrays (skewed professional
+popularity, skewed rates) and times the per-professional group-by:
+count, mean, variance, percentiles, Wilson interval and first/last rating.
+A plain Python loop over the same data is timed on a sample for reference.
+
+Usage: python -m benchmarks.bench_rating_stats [--ratings 10000000] [--professionals 200000] [--loop-sample 1000000]
+"""
+import argparse
+import time
+import numpy as np
+from src.application.analytics.rating_stats import RatingColumns, professional_stats
+
+def generate(count: int, professionals: int, seed: int) -> RatingColumns:
+    rng = np.random.default_rng(seed)
+    # Popularidade aproximadamente Zipf: poucos profissionais concentram as avaliações
+    weights = 1 / np.arange(1, professionals + 1) ** 0.8
+    codes = rng.choice(professionals, size=count, p=weights / weights.sum()).astype(np.int32)
+    rates = rng.choice(6, size=count, p=[0.03, 0.04, 0.06, 0.12, 0.30, 0.45]).astype(np.int8)
+    now = np.datetime64("2026-01-01T00:00:00", "ms").astype(np.int64)
+    created_at = (now - rng.integers(0, 3 * 365 * 86400 * 1000, size=count)).astype("datetime64[ms]")
+    return RatingColumns([f"professional-{i}" for i in range(professionals)], codes, rates, created_at)
+
+def python_loop(columns: RatingColumns, limit: int) -> dict:
+    """Same count/sum/sum of squares a dict-based implementation would do."""
+    totals = {}
+    for code, rate in zip(columns.codes[:limit].tolist(), columns.rates[:limit].tolist()):
+        entry = totals.setdefault(code, [0, 0, 0])
+        entry[0] += 1
+        entry[1] += rate
+        entry[2] += rate * rate
+    return totals
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ratings", type=int, default=10_000_000)
+    parser.add_argument("--professionals", type=int, default=200_000)
+    parser.add_argument("--loop-sample", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    columns = generate(args.ratings, args.professionals, args.seed)
+    print(f"generated {len(columns)} ratings in {time.perf_counter() - start:.1f}s "
+          f"({(columns.codes.nbytes + columns.rates.nbytes + columns.created_at.nbytes) / 2**20:.0f} MiB of columns)")
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        stats = professional_stats(columns)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"vectorized: {best:.2f}s for {len(columns)} ratings ({len(columns) / best / 1e6:.1f}M ratings/s)")
+
+    sample = min(args.loop_sample, len(columns))
+    start = time.perf_counter()
+    python_loop(columns, sample)
+    elapsed = time.perf_counter() - start
+    print(f"python loop: {elapsed:.2f}s for {sample} ratings ({sample / elapsed / 1e6:.1f}M ratings/s, "
+          f"~{elapsed * len(columns) / sample:.0f}s extrapolated)")
+
+    top = stats.top_by_wilson(1, min_count=100)[0]
+    print(f"top professional: {top['professional_id']} n={top['count']} mean={top['mean']:.2f} "
+          f"wilson_lower={top['wilson_lower']:.3f}")
+
+if __name__ == "__main__":
+    main()
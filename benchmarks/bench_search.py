@@ -0,0 +1,71 @@
+"""
+Full-text search benchmark for the in-process inverted index.
+
+Indexes synthetic ratings (Portuguese vocabulary, skewed term frequencies)
+and reports build time and p50/p99 latency for single-term, multi-term and
+per-professional queries.
+
+Usage: python -m benchmarks.bench_search [--ratings 1000000] [--professionals 10000] [--queries 500]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+from src.infrastructure.search.inverted_index_search import InvertedIndexSearch
+
+WORDS = ("pontual educado atencioso rapido caprichoso recomendo otimo servico chegou horario "
+         "limpou tudo depois preco justo voltaria contratar atraso demorou sujeira caro "
+         "profissional excelente trabalho bem feito ruim pessimo nunca mais competente").split()
+
+def generate(count: int, professionals: int, seed: int):
+    rng = random.Random(seed)
+    professional_ids = [UUID(int=rng.getrandbits(128)) for _ in range(professionals)]
+    now = datetime.now(timezone.utc)
+    # Frequência de termos aproximadamente Zipf, como em texto real
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    for _ in range(count):
+        yield {
+            "_id": UUID(int=rng.getrandbits(128)),
+            "professional_id": rng.choice(professional_ids),
+            "description": " ".join(rng.choices(WORDS, weights, k=rng.randint(3, 20))),
+            "created_at": now - timedelta(seconds=rng.randint(0, 365 * 86400))
+        }
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ratings", type=int, default=1_000_000)
+    parser.add_argument("--professionals", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    index = InvertedIndexSearch()
+    start = time.perf_counter()
+    index.index_ratings(generate(args.ratings, args.professionals, args.seed))
+    print(f"indexed {len(index)} ratings in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(args.seed + 1)
+    sample = list(generate(200, args.professionals, args.seed))
+    scenarios = {
+        "single term": lambda: (rng.choice(WORDS), None),
+        "rare term": lambda: (rng.choice(WORDS[-5:]), None),
+        "three terms": lambda: (" ".join(rng.sample(WORDS, 3)), None),
+        "professional": lambda: (rng.choice(WORDS), rng.choice(sample)["professional_id"]),
+    }
+    print(f"{'query':<14}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for name, make in scenarios.items():
+        latencies = []
+        for _ in range(args.queries):
+            query, professional_id = make()
+            began = time.perf_counter()
+            index.search(query, professional_id, 1, 10)
+            latencies.append((time.perf_counter() - began) * 1000)
+        print(f"{name:<14}{percentile(latencies, 0.50):>10.2f}{percentile(latencies, 0.99):>10.2f}")
+
+if __name__ == "__main__":
+    main()
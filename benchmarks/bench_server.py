@@ -0,0 +1,92 @@
+"""
+Throughput comparison between the development setup (one uvicorn process,
+as started by run.py without reload) and the production launcher (serve.py).
+
+Each configuration is started as a subprocess and hammered with concurrent
+keep-alive requests for a fixed duration.
+
+Usage: python -m benchmarks.bench_server [--path /health/] [--duration 10] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+import httpx
+
+SINGLE = [sys.executable, "-c", "import uvicorn; uvicorn.run('src.main:app', host='127.0.0.1', port={port}, log_level='warning')"]
+PRODUCTION = [sys.executable, "serve.py"]
+
+def start(command: List[str], port: int) -> subprocess.Popen:
+    env = dict(os.environ, SERVER_HOST="127.0.0.1", SERVER_PORT=str(port))
+    command = [part.format(port=port) for part in command]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start")
+
+async def hammer(url: str, duration: float, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def user() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.monotonic()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "errors": errors,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/health/")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'setup':<12}{'requests':>10}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'errors':>8}")
+    for name, command in (("single", SINGLE), ("production", PRODUCTION)):
+        process = start(command, args.port)
+        try:
+            url = f"http://127.0.0.1:{args.port}{args.path}"
+            asyncio.run(wait_ready(url))
+            result = asyncio.run(hammer(url, args.duration, args.concurrency))
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"{name:<12}{result['requests']:>10}{result['rps']:>10.0f}{result['p50_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}{result['errors']:>8}")
+
+if __name__ == "__main__":
+    main()
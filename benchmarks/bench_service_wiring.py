@@ -0,0 +1,115 @@
+"""
+Per-request cost of building RatingService/RatingRepositoryImpl versus the
+lifespan-managed instances shared through app.state.
+
+Two measurements, each with per-request construction (what the rating
+endpoints did before: a new repository opening its collections and ensuring
+its indexes, and a new service) and with the shared ServiceContainer:
+
+- the dependency alone, called in a loop: time per call, and the peak
+  memory allocated by one call (tracemalloc, in a separate pass);
+- GET /ratings/{id} through the ASGI app: p50/p99 latency and the peak
+  memory allocated by one request.
+
+Uses mongomock unless MONGODB_URI is set; against a real server every
+per-request construction also pays the network round trips of
+list_collection_names and create_index.
+
+Usage: python -m benchmarks.bench_service_wiring [--calls 2000] [--requests 2000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from uuid import uuid4
+import httpx
+
+def peak_allocation(call: Callable[[], object]) -> int:
+    """Bytes allocated at the peak of one call, above what was live before it (tracemalloc must be on)."""
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    call()
+    return tracemalloc.get_traced_memory()[1] - current
+
+def measure_calls(call: Callable[[], object], calls: int) -> Dict[str, float]:
+    """Mean time (us) and median peak allocation (bytes) per call; timed without tracing."""
+    call()
+    started = time.perf_counter()
+    for _ in range(calls):
+        call()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    peaks = [peak_allocation(call) for _ in range(min(calls, 200))]
+    tracemalloc.stop()
+    return {"us_per_call": elapsed / calls * 1e6, "bytes_per_call": statistics.median(peaks)}
+
+async def measure_requests(app, rating_id: str, requests: int) -> Dict[str, float]:
+    """p50/p99 latency (ms) and median peak allocation (KiB) of GET /ratings/{id}."""
+    latencies: List[float] = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get(f"/ratings/{rating_id}")
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get(f"/ratings/{rating_id}")
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+        # Memória medida numa segunda passada, para o tracemalloc não pesar na latência
+        tracemalloc.start()
+        peaks = []
+        for _ in range(min(requests, 200)):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await client.get(f"/ratings/{rating_id}")
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "peak_kb": statistics.median(peaks) / 1024
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    from src.infrastructure.database import mongo_client
+    if not os.getenv("MONGODB_URI"):
+        import mongomock
+        mongo_client.set_mongo_client(mongomock.MongoClient())
+    from src.main import create_app
+    from src.api.dependencies import ServiceContainer
+    from src.application.services.rating_service import get_rating_service
+    from src.infrastructure.repositories.rating_repository import get_rating_repository
+
+    container = ServiceContainer()
+    per_request = measure_calls(lambda: get_rating_service(get_rating_repository()), args.calls)
+    shared = measure_calls(container.rating_service, args.calls)
+    print(f"{'dependency':<14}{'us/call':>10}{'bytes/call':>12}")
+    print(f"{'per request':<14}{per_request['us_per_call']:>10.1f}{per_request['bytes_per_call']:>12.0f}")
+    print(f"{'shared':<14}{shared['us_per_call']:>10.1f}{shared['bytes_per_call']:>12.0f}")
+
+    app = create_app()
+    rating = container.rating_service().repository.create_rating({
+        "professional_id": str(uuid4()),
+        "consumer_id": str(uuid4()),
+        "rate": 5,
+        "description": "Benchmark"
+    })
+    # Sem app.state.services a dependência monta o serviço a cada requisição, como antes
+    app.state.services = None
+    before = asyncio.run(measure_requests(app, rating["_id"], args.requests))
+    app.state.services = ServiceContainer()
+    after = asyncio.run(measure_requests(app, rating["_id"], args.requests))
+    print()
+    print(f"{'GET /ratings/{id}':<18}{'p50 (ms)':>10}{'p99 (ms)':>10}{'peak (KiB)':>12}")
+    for name, result in (("per request", before), ("shared", after)):
+        print(f"{name:<18}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['peak_kb']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
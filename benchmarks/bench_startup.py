@@ -0,0 +1,141 @@
+"""
+Cold-start cost of the service: import time breakdown and time to first response.
+
+Every measurement runs in a fresh interpreter:
+
+- `python -X importtime` while importing src.main and calling create_app(),
+  aggregated by top-level package and listed by module (cumulative time);
+- in-process phases: import src.main, create_app(), and the first request
+  (GET /health/) through the ASGI transport;
+- end to end: from spawning uvicorn to the first successful HTTP response.
+
+Runs are repeated and the median is reported; the report is also written as
+JSON so it can be tracked between versions.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--top 15] [--output startup-report.json]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+import httpx
+
+IMPORT_APP = "import src.main; src.main.create_app()"
+
+PHASES = """
+import asyncio, json, time
+started = time.perf_counter()
+import src.main
+imported = time.perf_counter()
+app = src.main.create_app()
+created = time.perf_counter()
+import httpx
+async def first():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        before = time.perf_counter()
+        response = await client.get("/health/")
+        return before, response.status_code
+before, status = asyncio.run(first())
+answered = time.perf_counter()
+print(json.dumps({"import_s": imported - started, "create_app_s": created - imported, "first_response_s": answered - before, "status": status}))
+"""
+
+SERVER = "import uvicorn; uvicorn.run('src.main:create_app', factory=True, host='127.0.0.1', port={port}, log_level='warning')"
+
+def import_times() -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every module imported by the app."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_APP],
+        capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, float]:
+    """Self time in ms summed by top-level package (src, fastapi, pymongo...)."""
+    totals: Dict[str, float] = defaultdict(float)
+    for name, self_us, _ in rows:
+        totals[name.split(".")[0]] += self_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+def phases() -> Dict[str, Any]:
+    result = subprocess.run([sys.executable, "-c", PHASES], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_first_response(timeout: float = 30.0) -> float:
+    """Seconds from spawning uvicorn to the first successful GET /health/."""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", SERVER.format(port=port)],
+        env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health/").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    time.sleep(0.005)
+        raise RuntimeError("server did not answer in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Modules listed by cumulative import time")
+    parser.add_argument("--output", default="startup-report.json")
+    args = parser.parse_args()
+
+    rows = import_times()
+    packages = by_package(rows)
+    print(f"{'package':<30}{'self (ms)':>12}")
+    for package, total in list(packages.items())[:args.top]:
+        print(f"{package:<30}{total:>12.1f}")
+    print()
+    print(f"{'module':<60}{'cumulative (ms)':>16}")
+    slowest = sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]
+    for name, _, cumulative in slowest:
+        print(f"{name:<60}{cumulative / 1000:>16.1f}")
+
+    runs = [phases() for _ in range(args.runs)]
+    servers = [server_first_response() for _ in range(args.runs)]
+    report = {
+        "python": sys.version.split()[0],
+        "import_by_package_ms": packages,
+        "slowest_modules_ms": {name: cumulative / 1000 for name, _, cumulative in slowest},
+        "median_s": {
+            "import": statistics.median(run["import_s"] for run in runs),
+            "create_app": statistics.median(run["create_app_s"] for run in runs),
+            "first_response_in_process": statistics.median(run["first_response_s"] for run in runs),
+            "server_first_response": statistics.median(servers)
+        }
+    }
+    print()
+    for phase, seconds in report["median_s"].items():
+        print(f"{phase:<30}{seconds * 1000:>10.1f} ms")
+    with open(args.output, "w", encoding="utf-8") as stream:
+        json.dump(report, stream, indent=2)
+    print(f"report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Rating storage backends compared on the same traffic mix.
+
+Each backend is preloaded with the same synthetic ratings (through
+insert_ratings, so SQLite takes the executemany path) and then driven
+from several threads with the load generator's route mix: creates, gets
+by ID and first listing pages by professional and by consumer, with
+Zipf-distributed professional popularity. Reports operations per second
+and p50/p99 latency per operation.
+
+The MongoDB path runs only when MONGODB_URI is set (it uses a scratch
+database that is dropped at the end); sqlite and memory always run.
+
+Usage: python -m benchmarks.bench_storage [--preload 200000] [--operations 50000] [--threads 8] [--backends sqlite,memory,mongo]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+from benchmarks.load_generator import DEFAULT_MIX, ZipfSampler
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.infrastructure.repositories.memory_rating_repository import InMemoryRatingRepository
+from src.infrastructure.repositories.sqlite_rating_repository import SQLiteRatingRepository
+
+def preload_docs(count: int, professionals: List[str], consumers: List[str], seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    popularity = ZipfSampler(len(professionals), 1.1, rng)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "professional_id": professionals[popularity.sample()],
+            "consumer_id": rng.choice(consumers),
+            "rate": rng.randint(0, 5),
+            "description": "Serviço bem feito",
+            "created_at": start + timedelta(seconds=rng.randrange(365 * 86400))
+        }
+        for _ in range(count)
+    ]
+
+def drive(repository: RatingRepository, docs: List[dict], professionals: List[str], consumers: List[str], operations: int, threads: int, seed: int) -> Dict[str, List[float]]:
+    """Run the route mix from several threads; returns latencies per operation."""
+    routes = list(DEFAULT_MIX)
+    weights = [DEFAULT_MIX[route] for route in routes]
+    known_ids = [doc["_id"] for doc in docs]
+    latencies: Dict[str, List[float]] = {route: [] for route in routes}
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        popularity = ZipfSampler(len(professionals), 1.1, rng)
+        local: Dict[str, List[float]] = {route: [] for route in routes}
+        calls: Dict[str, Callable[[], object]] = {
+            "create": lambda: repository.create_rating({
+                "professional_id": professionals[popularity.sample()],
+                "consumer_id": rng.choice(consumers),
+                "rate": rng.randint(0, 5),
+                "description": "Chegou no horário"
+            }),
+            "get": lambda: repository.get_rating_by_id(rng.choice(known_ids)),
+            "list_professional": lambda: repository.list_ratings_by_professional(professionals[popularity.sample()], 1, 10),
+            "list_consumer": lambda: repository.list_ratings_by_consumer(rng.choice(consumers), 1, 10)
+        }
+        for _ in range(operations // threads):
+            route = rng.choices(routes, weights)[0]
+            start = time.perf_counter()
+            calls[route]()
+            local[route].append(time.perf_counter() - start)
+        with lock:
+            for route, values in local.items():
+                latencies[route].extend(values)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return latencies
+
+def open_backend(name: str, directory: str) -> Tuple[RatingRepository, Callable[[], None]]:
+    if name == "memory":
+        return InMemoryRatingRepository(), lambda: None
+    if name == "sqlite":
+        repository = SQLiteRatingRepository(os.path.join(directory, "ratings.db"))
+        return repository, repository.close
+    from src.infrastructure.database import mongo_client
+    from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+    database = f"bench_storage_{uuid.uuid4().hex[:8]}"
+    client = mongo_client.get_mongo_client()
+    repository = RatingRepositoryImpl()
+    # Coleções de rascunho, com os mesmos índices da coleção de produção
+    repository.collection = client[database]["ratings"]
+    for keys in mongo_client.RATINGS_INDEXES:
+        repository.collection.create_index(keys)
+    repository.versions = client[database]["rating_versions"]
+    repository.trends = client[database]["rating_trends"]
+    return repository, lambda: client.drop_database(database)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preload", type=int, default=200_000)
+    parser.add_argument("--operations", type=int, default=50_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--professionals", type=int, default=5_000)
+    parser.add_argument("--consumers", type=int, default=50_000)
+    parser.add_argument("--backends", default="sqlite,memory,mongo")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    professionals = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(args.professionals)]
+    consumers = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(args.consumers)]
+    docs = preload_docs(args.preload, professionals, consumers, args.seed)
+
+    print(f"{'backend':<10}{'operation':<20}{'count':>8}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for name in args.backends.split(","):
+        if name == "mongo" and not os.getenv("MONGODB_URI"):
+            print(f"{name:<10}skipped (MONGODB_URI is not set)")
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            repository, cleanup = open_backend(name, directory)
+            try:
+                start = time.perf_counter()
+                for offset in range(0, len(docs), 10_000):
+                    repository.insert_ratings([dict(doc) for doc in docs[offset:offset + 10_000]])
+                loaded = time.perf_counter() - start
+
+                start = time.perf_counter()
+                latencies = drive(repository, docs, professionals, consumers, args.operations, args.threads, args.seed)
+                elapsed = time.perf_counter() - start
+            finally:
+                cleanup()
+        for route, values in latencies.items():
+            values.sort()
+            if values:
+                print(f"{name:<10}{route:<20}{len(values):>8}{statistics.median(values) * 1000:>10.3f}"
+                      f"{values[int(len(values) * 0.99)] * 1000:>10.3f}")
+        total = sum(len(values) for values in latencies.values())
+        print(f"{name:<10}preload {len(docs) / loaded:,.0f} docs/s, mix {total / elapsed:,.0f} ops/s with {args.threads} threads")
+
+if __name__ == "__main__":
+    main()
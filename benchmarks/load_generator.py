@@ -0,0 +1,241 @@
+"""
+Open-loop load generator replaying a realistic traffic mix against a
+running instance.
+
+Requests arrive on a Poisson schedule at --rate per second regardless of
+how fast the server answers (open loop): a slow response does not delay
+the next arrival, and every latency is measured from the request's
+scheduled time, so queueing on the client side is not hidden
+(coordinated omission). The mix of creates, gets by ID and listings by
+professional/consumer is configurable; professionals and consumers are
+picked with Zipf-distributed popularity. Gets use the IDs of ratings
+created during the priming phase and the run.
+
+The report (throughput, latency percentiles, status codes and error rate
+per route) is printed and written as JSON.
+
+Usage: python -m benchmarks.load_generator --url http://127.0.0.1:8000 [--rate 200] [--duration 30]
+       [--mix create=0.1,get=0.5,list_professional=0.3,list_consumer=0.1] [--output load-report.json]
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import random
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+import httpx
+
+DEFAULT_MIX = {"create": 0.1, "get": 0.5, "list_professional": 0.3, "list_consumer": 0.1}
+PERCENTILES = (0.5, 0.9, 0.99, 0.999)
+
+class ZipfSampler:
+    """Draws indexes 0..n-1 with probability proportional to 1 / (rank + 1) ** s."""
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.rng = rng
+        self.cumulative = list(itertools.accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+    def sample(self) -> int:
+        return bisect.bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])
+
+class Workload:
+    """Produces the next request of the mix: (route, method, path, json body)."""
+    def __init__(
+        self,
+        mix: Dict[str, float],
+        professionals: int = 10000,
+        consumers: int = 100000,
+        zipf_s: float = 1.1,
+        page_size: int = 10,
+        seed: int = 42
+    ):
+        unknown = set(mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"Unknown routes in the mix: {', '.join(sorted(unknown))}")
+        self.rng = random.Random(seed)
+        self.routes = list(mix)
+        self.route_weights = list(itertools.accumulate(mix[route] for route in self.routes))
+        self.professional_ids = [str(uuid4()) for _ in range(professionals)]
+        self.consumer_ids = [str(uuid4()) for _ in range(consumers)]
+        self.professionals = ZipfSampler(professionals, zipf_s, self.rng)
+        # Consumidores avaliam de forma mais uniforme que profissionais são avaliados
+        self.consumers = ZipfSampler(consumers, zipf_s / 2, self.rng)
+        self.page_size = page_size
+        self.rating_ids: deque = deque(maxlen=100000)
+
+    def create(self) -> Tuple[str, str, str, Optional[Dict[str, Any]]]:
+        body = {
+            "professional_id": self.professional_ids[self.professionals.sample()],
+            "consumer_id": self.consumer_ids[self.consumers.sample()],
+            "rate": self.rng.choices(range(6), weights=(3, 4, 6, 12, 30, 45))[0],
+            "description": self.rng.choice((None, "Bom atendimento", "Chegou no horário e resolveu o problema"))
+        }
+        return "create", "POST", "/ratings/", body
+
+    def next_request(self) -> Tuple[str, str, str, Optional[Dict[str, Any]]]:
+        route = self.routes[bisect.bisect_left(self.route_weights, self.rng.random() * self.route_weights[-1])]
+        if route == "get" and self.rating_ids:
+            return route, "GET", f"/ratings/{self.rng.choice(self.rating_ids)}", None
+        if route == "list_professional":
+            professional_id = self.professional_ids[self.professionals.sample()]
+            return route, "GET", f"/ratings/professional/{professional_id}?page=1&size={self.page_size}", None
+        if route == "list_consumer":
+            consumer_id = self.consumer_ids[self.consumers.sample()]
+            return route, "GET", f"/ratings/consumer/{consumer_id}?page=1&size={self.page_size}", None
+        # Sem IDs conhecidos ainda, um get vira criação
+        return self.create()
+
+    def record(self, route: str, response: httpx.Response) -> None:
+        if route == "create" and response.status_code == 201:
+            self.rating_ids.append(response.json()["_id"])
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.transport_errors = 0
+        self.dropped = 0
+
+async def prime(client: httpx.AsyncClient, workload: Workload, count: int, concurrency: int = 32) -> None:
+    """Create ratings before measuring, so gets and listings hit existing data."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            route, method, path, body = workload.create()
+            workload.record(route, await client.request(method, path, json=body))
+
+    await asyncio.gather(*(one() for _ in range(count)))
+
+async def run_load(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    rate: float,
+    duration: float,
+    max_in_flight: int = 1000
+) -> Tuple[Dict[str, RouteStats], float]:
+    """Send requests on a Poisson schedule for duration seconds; returns per-route stats and elapsed time."""
+    loop = asyncio.get_running_loop()
+    stats: Dict[str, RouteStats] = {}
+    in_flight = set()
+
+    async def send(route: str, method: str, path: str, body: Optional[Dict[str, Any]], scheduled: float) -> None:
+        entry = stats.setdefault(route, RouteStats())
+        try:
+            response = await client.request(method, path, json=body)
+            entry.statuses[response.status_code] += 1
+            workload.record(route, response)
+        except httpx.HTTPError:
+            entry.transport_errors += 1
+        # Latência desde o instante agendado, não desde o envio
+        entry.latencies.append(loop.time() - scheduled)
+
+    started = loop.time()
+    scheduled = started
+    deadline = started + duration
+    while True:
+        scheduled += workload.rng.expovariate(rate)
+        if scheduled >= deadline:
+            break
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        route, method, path, body = workload.next_request()
+        if len(in_flight) >= max_in_flight:
+            # Limite do próprio gerador: a requisição é contada como descartada, sem esperar vaga
+            stats.setdefault(route, RouteStats()).dropped += 1
+            continue
+        task = asyncio.create_task(send(route, method, path, body, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.wait(in_flight)
+    return stats, loop.time() - started
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(int(q * len(ordered) + 0.5) - 1, 0))]
+
+def summarize(stats: Dict[str, RouteStats], elapsed: float, target_rate: float) -> Dict[str, Any]:
+    """Report with throughput, latency percentiles (ms), status codes and error rate per route."""
+    routes = {}
+    for route, entry in sorted(stats.items()):
+        ordered = sorted(entry.latencies)
+        attempted = len(ordered) + entry.dropped
+        errors = entry.transport_errors + entry.dropped + sum(n for status, n in entry.statuses.items() if status >= 400)
+        routes[route] = {
+            "requests": attempted,
+            "throughput": len(ordered) / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                **{f"p{q * 100:g}": percentile(ordered, q) * 1000 for q in PERCENTILES},
+                "mean": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+                "max": ordered[-1] * 1000 if ordered else 0.0
+            },
+            "statuses": {str(status): n for status, n in sorted(entry.statuses.items())},
+            "transport_errors": entry.transport_errors,
+            "dropped": entry.dropped,
+            "error_rate": errors / attempted if attempted else 0.0
+        }
+    completed = sum(len(entry.latencies) for entry in stats.values())
+    return {
+        "target_rate": target_rate,
+        "duration_s": elapsed,
+        "requests": sum(route["requests"] for route in routes.values()),
+        "throughput": completed / elapsed if elapsed else 0.0,
+        "routes": routes
+    }
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse "create=0.1,get=0.5,..." into route weights."""
+    mix = {}
+    for part in value.split(","):
+        route, _, weight = part.partition("=")
+        mix[route.strip()] = float(weight)
+    return mix
+
+async def generate(args: argparse.Namespace) -> Dict[str, Any]:
+    workload = Workload(parse_mix(args.mix), args.professionals, args.consumers, args.zipf, args.page_size, args.seed)
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        if args.prime:
+            started = time.perf_counter()
+            await prime(client, workload, args.prime)
+            print(f"primed {len(workload.rating_ids)} ratings in {time.perf_counter() - started:.1f}s")
+        stats, elapsed = await run_load(client, workload, args.rate, args.duration, args.max_in_flight)
+    return summarize(stats, elapsed, args.rate)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rate", type=float, default=200.0, help="Arrivals per second (Poisson)")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--mix", default=",".join(f"{route}={weight}" for route, weight in DEFAULT_MIX.items()))
+    parser.add_argument("--professionals", type=int, default=10000)
+    parser.add_argument("--consumers", type=int, default=100000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of professional popularity")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--prime", type=int, default=1000, help="Ratings created before measuring")
+    parser.add_argument("--connections", type=int, default=256)
+    parser.add_argument("--max-in-flight", type=int, default=5000, help="Outstanding requests before arrivals are dropped")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="load-report.json")
+    args = parser.parse_args()
+
+    report = asyncio.run(generate(args))
+    print(f"{'route':<20}{'requests':>10}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'p99.9 (ms)':>12}{'errors':>8}")
+    for route, entry in report["routes"].items():
+        latency = entry["latency_ms"]
+        print(f"{route:<20}{entry['requests']:>10}{entry['throughput']:>10.0f}{latency['p50']:>10.2f}"
+              f"{latency['p99']:>10.2f}{latency['p99.9']:>12.2f}{entry['error_rate']:>8.1%}")
+    with open(args.output, "w", encoding="utf-8") as stream:
+        json.dump(report, stream, indent=2)
+    print(f"report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
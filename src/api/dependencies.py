@@ -0,0 +1,43 @@
+import threading
+from typing import Optional
+from fastapi import Request
+from src.application.services.rating_service import RatingService, get_rating_service
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.repositories.rating_repository import get_rating_repository
+
+class ServiceContainer:
+    """Rating repository and service shared by every request of an application.
+
+    The lifespan handler puts one in app.state. The objects are built on
+    first use, once (opening the collections and ensuring their indexes), so
+    startup still does not wait for MongoDB; every later request gets the
+    same instances. They are wired from the application's settings (by
+    default, from the environment).
+    """
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._rating_service: Optional[RatingService] = None
+
+    def rating_service(self) -> RatingService:
+        service = self._rating_service
+        if service is None:
+            with self._lock:
+                if self._rating_service is None:
+                    self._rating_service = get_rating_service(get_rating_repository(self.settings), self.settings)
+                service = self._rating_service
+        return service
+
+def provide_rating_service(request: Request) -> RatingService:
+    """Dependency of the rating endpoints: the application's shared RatingService.
+
+    Without the lifespan (e.g. an ASGI transport that skips it) the service
+    is built for the request, as before. Tests replace it with
+    app.dependency_overrides[provide_rating_service] or by setting
+    app.state.services.
+    """
+    services: Optional[ServiceContainer] = getattr(request.app.state, "services", None)
+    if services is None:
+        settings: Optional[Settings] = getattr(request.app.state, "settings", None)
+        return get_rating_service(get_rating_repository(settings), settings)
+    return services.rating_service()
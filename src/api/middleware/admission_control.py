@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.api.utils.error_bodies import error_response
+from src.infrastructure.config.settings import Settings, get_settings
+from src.infrastructure.database.slow_query_log import current_route
+
+logger = logging.getLogger(__name__)
+
+WRITES = "writes"
+READS_BY_ID = "reads_by_id"
+LISTINGS = "listings"
+EXPORTS = "exports"
+ROUTE_GROUPS = (WRITES, READS_BY_ID, LISTINGS, EXPORTS)
+
+OVERLOADED = "Service overloaded, retry later"
+
+# Rotas de leitura por ID, inclusive em lote (o resto dos GETs de avaliações são listagens)
+BY_ID_ROUTES = {"GET /ratings/{id}", "GET /ratings", "POST /ratings:batchGet", "GET /erasure-jobs/{job_id}"}
+
+def route_group(route: str) -> Optional[str]:
+    """Admission group of a route template ("GET /ratings/{id}"); None for routes never shed (health, admin, docs)."""
+    method, _, path = route.partition(" ")
+    if not path.startswith(("/ratings", "/erasure-jobs")):
+        return None
+    if "export" in path:
+        return EXPORTS
+    if route in BY_ID_ROUTES:
+        return READS_BY_ID
+    if method in ("POST", "PUT", "PATCH", "DELETE"):
+        return WRITES
+    return LISTINGS
+
+def parse_limits(value: str) -> Dict[str, Tuple[int, int, float]]:
+    """Parse "group=concurrency:queue:target_ms,..." into (concurrency, queue, target ms) by group."""
+    limits = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            group, spec = item.split("=")
+            concurrency, queue, target_ms = spec.split(":")
+            parsed = (int(concurrency), int(queue), float(target_ms))
+        except ValueError:
+            raise ValueError(f"Invalid admission limit {item.strip()!r}, expected group=concurrency:queue:target_ms")
+        group = group.strip()
+        if group not in ROUTE_GROUPS:
+            raise ValueError(f"Unknown admission group {group!r}, expected one of {', '.join(ROUTE_GROUPS)}")
+        if parsed[0] < 1 or parsed[1] < 0 or parsed[2] <= 0:
+            raise ValueError(f"Admission limits of {group} must be a positive concurrency, a queue of 0 or more and a positive target")
+        limits[group] = parsed
+    return limits
+
+def _grant(limiter: "AdaptiveLimiter", future: "asyncio.Future[bool]") -> None:
+    if future.cancelled():
+        # O waiter desistiu depois de receber a vaga: ela passa para o próximo
+        limiter.release()
+    else:
+        future.set_result(True)
+
+class AdaptiveLimiter:
+    """Concurrency limit and bounded wait queue of one route group, adapted to latency.
+
+    Requests over the limit wait in FIFO order while the queue has room and
+    for at most queue_timeout seconds; otherwise they are rejected right
+    away. A finishing request hands its slot to the oldest waiter.
+
+    The limit follows the observed latency (AIMD): after every `window`
+    requests, if their p90 is over the target the limit is cut by 10%, down
+    to 1; if it is under the target and the limit was reached, it grows by
+    one, up to max_limit. When MongoDB slows down, fewer requests run at
+    once and the rest are shed quickly instead of all timing out.
+    """
+    def __init__(self, name: str, max_limit: int, queue_size: int, target_ms: float, queue_timeout: float = 1.0, window: int = 50):
+        self.name = name
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.queue_size = queue_size
+        self.target_ms = target_ms
+        self.queue_timeout = queue_timeout
+        self.window = window
+        self.in_flight = 0
+        self._queue: Deque[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[bool]"]] = deque()
+        self._lock = threading.Lock()
+        self._samples: List[float] = []
+        self._saturated = False
+        self._last_p90_ms: Optional[float] = None
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False if the request must be shed."""
+        with self._lock:
+            if self.in_flight < self.limit and not self._queue:
+                self._admit()
+                return True
+            if len(self._queue) >= self.queue_size:
+                self.rejected += 1
+                return False
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            entry = (loop, future)
+            self._queue.append(entry)
+        try:
+            return await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                self.timed_out += 1
+            # Se a vaga chegou junto com o timeout, _grant a devolve
+            return False
+        except asyncio.CancelledError:
+            with self._lock:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+            raise
+
+    def release(self, elapsed_ms: Optional[float] = None) -> None:
+        """Free a slot (handing it to the oldest waiter) and record the request latency."""
+        with self._lock:
+            self.in_flight -= 1
+            if elapsed_ms is not None:
+                self._observe(elapsed_ms)
+            self._drain()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "max_limit": self.max_limit,
+                "in_flight": self.in_flight,
+                "queued": len(self._queue),
+                "queue_size": self.queue_size,
+                "target_ms": self.target_ms,
+                "last_p90_ms": self._last_p90_ms,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out
+            }
+
+    def _drain(self) -> None:
+        # Vagas livres vão para os waiters mais antigos; com o limite reduzido, podem não sobrar vagas
+        while self._queue and self.in_flight < self.limit:
+            loop, future = self._queue.popleft()
+            self._admit()
+            loop.call_soon_threadsafe(_grant, self, future)
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self.admitted += 1
+        if self.in_flight >= self.limit:
+            self._saturated = True
+
+    def _observe(self, elapsed_ms: float) -> None:
+        self._samples.append(elapsed_ms)
+        if len(self._samples) < self.window:
+            return
+        samples = sorted(self._samples)
+        p90 = samples[int(len(samples) * 0.9)]
+        self._samples = []
+        self._last_p90_ms = p90
+        previous = self.limit
+        if p90 > self.target_ms:
+            self.limit = max(1, int(self.limit * 0.9))
+        elif self._saturated:
+            self.limit = min(self.max_limit, self.limit + 1)
+        self._saturated = False
+        if self.limit != previous:
+            logger.info(f"Admission limit of {self.name} changed from {previous} to {self.limit} (p90 {p90:.1f} ms, target {self.target_ms:g} ms)")
+
+class AdmissionControl:
+    """One AdaptiveLimiter per route group; groups without limits are never shed."""
+    def __init__(self, limiters: Dict[str, AdaptiveLimiter], retry_after: int = 1):
+        self.limiters = limiters
+        self.retry_after = retry_after
+
+    def limiter(self, route: str) -> Optional[AdaptiveLimiter]:
+        group = route_group(route)
+        return self.limiters.get(group) if group is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {group: limiter.stats() for group, limiter in self.limiters.items()}
+
+_admission_control = None
+_admission_control_lock = threading.Lock()
+
+def get_admission_control(settings: Optional[Settings] = None) -> Optional[AdmissionControl]:
+    """Process-wide admission control, or None when disabled by settings (by default, from the environment)."""
+    global _admission_control
+    settings = settings or get_settings()
+    if not settings.admission_control_enabled:
+        return None
+    if _admission_control is None:
+        with _admission_control_lock:
+            if _admission_control is None:
+                _admission_control = AdmissionControl(
+                    {
+                        group: AdaptiveLimiter(group, concurrency, queue, target_ms, settings.admission_queue_timeout_ms / 1000)
+                        for group, (concurrency, queue, target_ms) in parse_limits(settings.admission_limits).items()
+                    },
+                    retry_after=settings.admission_retry_after_seconds
+                )
+    return _admission_control
+
+def set_admission_control(admission_control: Optional[AdmissionControl]) -> None:
+    global _admission_control
+    _admission_control = admission_control
+
+class AdmissionControlMiddleware:
+    """Shed requests of a route group over its limits with a fast 503 and Retry-After.
+
+    Must run inside RouteContextMiddleware, which resolves the route.
+    """
+    def __init__(self, app: ASGIApp, settings: Optional[Settings] = None):
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        admission = get_admission_control(self.settings) if scope["type"] == "http" else None
+        limiter = admission.limiter(current_route.get()) if admission is not None else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        if not await limiter.acquire():
+            response = error_response(503, OVERLOADED)
+            response.headers["Retry-After"] = str(admission.retry_after)
+            await response(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release((time.perf_counter() - started) * 1000)
@@ -1,12 +1,17 @@
-from fastapi import Request, status
+import logging
+from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from pymongo.errors import PyMongoError
 from typing import Union
 
+from src.api.utils.error_bodies import error_response, DATABASE_ERROR, UNEXPECTED_ERROR
 from src.domain.exceptions.base_exceptions import BaseAPIException
+from src.infrastructure.observability.error_log import report_error
 
-async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+logger = logging.getLogger(__name__)
+
+async def global_exception_handler(request: Request, exc: Exception) -> Response:
     """
     Global exception handler for the application
     """
@@ -29,19 +34,13 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
         )
     
     if isinstance(exc, PyMongoError):
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "message": "An error occurred while accessing the database",
-                "details": {"error": str(exc)}
-            }
-        )
+        report_error(logger, exc, f"MongoDB error on {request.method} {request.url.path}: {str(exc)}")
+        return error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, DATABASE_ERROR, str(exc))
 
     # Handle unexpected errors
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "message": "An unexpected error occurred",
-            "details": {"error": str(exc)} if request.app.debug else None
-        }
-    ) 
\ No newline at end of file
+    report_error(logger, exc, f"Unexpected error on {request.method} {request.url.path}: {str(exc)}")
+    return error_response(
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        UNEXPECTED_ERROR,
+        str(exc) if request.app.debug else None
+    )
@@ -0,0 +1,30 @@
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.infrastructure.database.slow_query_log import current_route
+
+def route_template(scope: Scope) -> str:
+    """Method and path template of the route matching the request (e.g. "GET /ratings/{rating_id}")."""
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{scope['method']} {route.path}"
+    return f"{scope['method']} (unmatched)"
+
+class RouteContextMiddleware:
+    """Expose the route of the current request to code below the API (slow-query log).
+
+    A plain ASGI middleware: the context variable is set in the request's
+    task and inherited by the threadpool that runs synchronous endpoints.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_route.set(route_template(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_route.reset(token)
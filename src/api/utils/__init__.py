@@ -0,0 +1,3 @@
+"""
+API utils package
+"""
\ No newline at end of file
@@ -0,0 +1,96 @@
+import gzip
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import BaseModel
+from src.infrastructure.config.settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+def _gzip(body: bytes) -> bytes:
+    # mtime fixo: o mesmo corpo gera sempre os mesmos bytes
+    return gzip.compress(body, compresslevel=get_settings().compression_gzip_level, mtime=0)
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=get_settings().compression_brotli_quality)
+
+def _zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=get_settings().compression_zstd_level).compress(body)
+
+def available_codecs() -> Dict[str, Callable[[bytes], bytes]]:
+    """Codecs usable in this process; brotli and zstd are optional dependencies."""
+    codecs = {"gzip": _gzip}
+    if brotli is not None:
+        codecs["br"] = _brotli
+    if zstandard is not None:
+        codecs["zstd"] = _zstd
+    return codecs
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+    return accepted
+
+def negotiate_encoding(accept_encoding: Optional[str], supported: List[str]) -> Optional[str]:
+    """Pick the encoding for a response, or None for identity.
+
+    The client's q-values decide first; ties are broken by the server
+    preference order given in `supported`.
+    """
+    if not accept_encoding:
+        return None
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress_body(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress a body according to configuration and the Accept-Encoding header."""
+    settings = get_settings()
+    if not settings.compression_enabled or len(body) < settings.compression_min_size:
+        return body, None
+    codecs = available_codecs()
+    supported = [e.strip() for e in settings.compression_encodings.split(",") if e.strip() in codecs]
+    encoding = negotiate_encoding(accept_encoding, supported)
+    if encoding is None:
+        return body, None
+    return codecs[encoding](body), encoding
+
+def compressed_json_response(request: Request, payload: BaseModel, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize a response model and compress it when it pays off.
+
+    Serialization and compression are CPU-bound: call this from sync (`def`)
+    endpoints, which FastAPI runs in its threadpool, so large bodies never
+    block the event loop.
+    """
+    body = payload.json(by_alias=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body, encoding = compress_body(body, request.headers.get("accept-encoding"))
+    response_headers = dict(headers or {})
+    response_headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        response_headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=response_headers)
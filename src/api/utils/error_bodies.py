@@ -0,0 +1,39 @@
+import json
+from functools import lru_cache
+from typing import Optional, Tuple
+from fastapi import Response
+
+DATABASE_ERROR = "An error occurred while accessing the database"
+UNEXPECTED_ERROR = "An unexpected error occurred"
+
+
+@lru_cache(maxsize=64)
+def _body_parts(message: str, wrap_detail: bool) -> Tuple[bytes, bytes]:
+    """Bytes before and after the error text of a body, encoded once per message."""
+    prefix = b'{"message":' + json.dumps(message, ensure_ascii=False).encode("utf-8") + b',"details":'
+    if wrap_detail:
+        return b'{"detail":' + prefix, b"}"
+    return prefix, b""
+
+
+@lru_cache(maxsize=64)
+def _constant_body(message: str, wrap_detail: bool) -> bytes:
+    prefix, suffix = _body_parts(message, wrap_detail)
+    return prefix + b"null}" + suffix
+
+
+def error_response(status_code: int, message: str, error: Optional[str] = None, wrap_detail: bool = False) -> Response:
+    """JSON error response built from prebuilt bytes.
+
+    The body is {"message": message, "details": {"error": error}} (details is
+    null without an error), wrapped in {"detail": ...} like an HTTPException
+    when wrap_detail is set; the same bytes JSONResponse would render. Only
+    the error text is encoded per response, so a failure storm does not pay
+    for building and serializing the whole dictionary every time.
+    """
+    if error is None:
+        body = _constant_body(message, wrap_detail)
+    else:
+        prefix, suffix = _body_parts(message, wrap_detail)
+        body = prefix + b'{"error":' + json.dumps(error, ensure_ascii=False).encode("utf-8") + b"}}" + suffix
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,76 @@
+import hashlib
+from typing import Optional
+from uuid import UUID
+from fastapi import Response, status
+from src.domain.value_objects.rating_filters import RatingFilters
+
+# Incrementar quando a representação JSON de uma avaliação mudar
+REPRESENTATION_VERSION = 1
+
+
+def rating_etag(rating_id: UUID) -> str:
+    """Strong ETag for a single rating.
+
+    Ratings are immutable once created, so the ID (plus the representation
+    version) identifies the exact bytes of the response.
+    """
+    return f'"r{REPRESENTATION_VERSION}-{UUID(str(rating_id)).hex}"'
+
+
+def listing_etag(
+    scope: str,
+    entity_id: UUID,
+    version: int,
+    page: int,
+    size: int,
+    filters: Optional[RatingFilters] = None
+) -> str:
+    """Weak ETag for a listing, derived from the entity write counter.
+
+    Filtered listings carry a digest of the normalized filters, so a
+    filtered page never matches the ETag of the unfiltered one (or of
+    another filter) with the same version.
+    """
+    etag = f'{scope[0]}{REPRESENTATION_VERSION}-{UUID(str(entity_id)).hex}-{version}-{page}-{size}'
+    if filters is not None and not filters.is_empty():
+        etag = f"{etag}-{_filters_digest(filters)}"
+    return f'W/"{etag}"'
+
+
+def _filters_digest(filters: RatingFilters) -> str:
+    # Filtros equivalentes (ex.: min_rate=4 e rate_in=4,5) geram o mesmo resumo
+    rates = filters.allowed_rates()
+    canonical = "|".join((
+        filters.created_after.isoformat() if filters.created_after else "",
+        filters.created_before.isoformat() if filters.created_before else "",
+        "*" if rates is None else ",".join(str(rate) for rate in rates)
+    ))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(etag: str, vary: Optional[str] = None) -> Response:
+    """Build an empty 304 response carrying the current ETag.
+
+    vary must repeat the Vary header of the matching 200, so caches keep
+    keying the revalidated entry the same way.
+    """
+    headers = {"ETag": etag}
+    if vary is not None:
+        headers["Vary"] = vary
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
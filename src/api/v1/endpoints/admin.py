@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Query, Request
+from typing import Any, Dict
+from src.api.middleware.admission_control import get_admission_control
+from src.application.cache.list_page_cache import get_list_page_cache
+from src.application.cache.single_flight import get_single_flight
+from src.application.cache.stale_while_revalidate import get_stale_while_revalidate
+from src.infrastructure.database.slow_query_log import get_slow_query_log
+from src.infrastructure.observability.error_log import get_error_log
+
+router = APIRouter()
+
+@router.get("/cache", response_model=Dict[str, Any])
+def cache_stats(request: Request) -> Dict[str, Any]:
+    """Listing cache hit-rate and memory metrics, reads coalesced by single-flight and stale-while-revalidate serves."""
+    settings = request.app.state.settings
+    cache = get_list_page_cache(settings)
+    single_flight = get_single_flight(settings)
+    stale = get_stale_while_revalidate(settings)
+    return {
+        "list_pages": cache.stats() if cache is not None else None,
+        "single_flight": single_flight.stats() if single_flight is not None else None,
+        "stale_while_revalidate": stale.stats() if stale is not None else None
+    }
+
+@router.get("/slow-queries", response_model=Dict[str, Any])
+def slow_queries(
+    limit: int = Query(100, ge=1, le=1000, description="Latest slow commands to return"),
+    top: int = Query(10, ge=1, le=100, description="Query shapes to rank by total slow time")
+) -> Dict[str, Any]:
+    """MongoDB commands over the slow-query threshold, latest first, and the shapes that cost the most."""
+    log = get_slow_query_log()
+    if log is None:
+        return {"stats": None, "top": [], "recent": []}
+    return {"stats": log.stats(), "top": log.top(top), "recent": log.recent(limit)}
+
+@router.get("/errors", response_model=Dict[str, Any])
+def errors(
+    limit: int = Query(20, ge=1, le=1000, description="Error signatures to return, most frequent first")
+) -> Dict[str, Any]:
+    """Error counters by signature (exception type and reporting site), including suppressed stack traces."""
+    return get_error_log().stats(limit)
+
+@router.get("/admission", response_model=Dict[str, Any])
+def admission(request: Request) -> Dict[str, Any]:
+    """Current limit, in-flight and queued requests, and admitted/shed counters per route group."""
+    admission_control = get_admission_control(request.app.state.settings)
+    return {"groups": admission_control.stats() if admission_control is not None else None}
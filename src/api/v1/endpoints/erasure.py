@@ -0,0 +1,46 @@
+import logging
+from fastapi import APIRouter, Depends, status
+from uuid import UUID
+from src.api.v1.schemas.erasure import ErasureJobCreate, ErasureJobResponse
+from src.application.services.erasure_service import ErasureService, get_erasure_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.post(
+    "/",
+    response_model=ErasureJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Erase all ratings of a professional or consumer",
+    description="""
+    Starts a background job that deletes every rating of a professional or
+    consumer in bounded chunks, keeping listings, trends, caches and search
+    consistent. If a job for the same subject is already active, it is
+    returned instead of starting another one.
+    
+    Poll `GET /erasure-jobs/{job_id}` for progress.
+    """
+)
+def create_erasure_job(
+    request: ErasureJobCreate,
+    service: ErasureService = Depends(get_erasure_service)
+):
+    """Start the erasure of a subject's ratings."""
+    logger.info(f"Received request to erase ratings of {request.scope.value} {request.subject_id}")
+    return service.start_erasure(request.scope, request.subject_id)
+
+@router.get(
+    "/{job_id}",
+    response_model=ErasureJobResponse,
+    summary="Get erasure job progress",
+    responses={
+        404: {"description": "Job not found"}
+    }
+)
+def get_erasure_job(
+    job_id: UUID,
+    service: ErasureService = Depends(get_erasure_service)
+):
+    """Get the progress of an erasure job."""
+    return service.get_job(job_id)
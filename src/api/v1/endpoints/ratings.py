@@ -1,11 +1,22 @@
 import logging
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Query, status, Header, Request, Response
 from uuid import UUID
-from typing import List
-from src.api.v1.schemas.rating import RatingCreate, RatingResponse, PaginatedResponse
-from src.application.services.rating_service import RatingService, get_rating_service
+from typing import List, Optional
+from datetime import datetime
+from src.api.v1.schemas.rating import RatingCreate, RatingResponse, PaginatedResponse, SearchResponse, BatchGetRequest, BatchGetResponse
+from src.api.v1.schemas.trend import TrendResponse
+from src.domain.value_objects.trend_period import TrendGranularity
+from src.domain.value_objects.rating_filters import RatingFilters
+from src.api.utils.etag import rating_etag, listing_etag, etag_matches, not_modified
+from src.api.utils.compression import compressed_json_response
+from src.api.utils.error_bodies import error_response, DATABASE_ERROR, UNEXPECTED_ERROR
+from src.application.services.rating_service import RatingService, MAX_BATCH_GET_IDS
+from src.application.cache.stale_while_revalidate import PROFESSIONAL_LISTING, CONSUMER_LISTING
+from src.api.dependencies import provide_rating_service
 from src.domain.exceptions.base_exceptions import ValidationException, NotFoundException, DatabaseException
+from src.infrastructure.observability.error_log import report_error
 from pymongo.errors import PyMongoError
+from pydantic import conint
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
@@ -51,29 +62,135 @@ router = APIRouter(
         }
     }
 )
-def create_rating(rating: RatingCreate, service: RatingService = Depends(get_rating_service)):
+# Sem a barra final: o GET "" (busca por IDs) faria o POST /ratings responder 405 em vez do redirect
+@router.post("", response_model=RatingResponse, status_code=status.HTTP_201_CREATED, include_in_schema=False)
+def create_rating(rating: RatingCreate, service: RatingService = Depends(provide_rating_service)):
     """Create a new rating."""
     try:
         logger.info(f"Received request to create rating for professional {rating.professional_id}")
         return service.create_rating(rating)
     except PyMongoError as e:
-        logger.error(f"MongoDB error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "message": "An error occurred while accessing the database",
-                "details": {"error": str(e)}
-            }
-        )
+        report_error(logger, e, f"MongoDB error: {str(e)}")
+        return error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, DATABASE_ERROR, str(e), wrap_detail=True)
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "message": "An unexpected error occurred",
-                "details": {"error": str(e)}
+        report_error(logger, e, f"Unexpected error: {str(e)}")
+        return error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, UNEXPECTED_ERROR, str(e), wrap_detail=True)
+
+@router.get(
+    "/search",
+    response_model=SearchResponse,
+    summary="Search ratings",
+    description="""
+    Full-text search over rating descriptions.
+    
+    - **q**: Search terms (accent and case insensitive)
+    - **professional_id**: Restrict the search to one professional (optional)
+    - **page**: Page number (default: 1)
+    - **size**: Page size (default: 10, max: 100)
+    
+    Returns a paginated list of matching ratings ordered by relevance.
+    """,
+    responses={
+        200: {
+            "description": "Search results returned successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "items": [
+                            {
+                                "_id": "123e4567-e89b-12d3-a456-426614174000",
+                                "professional_id": "123e4567-e89b-12d3-a456-426614174001",
+                                "consumer_id": "123e4567-e89b-12d3-a456-426614174002",
+                                "rate": 2,
+                                "description": "Arrived late",
+                                "created_at": "2024-03-20T10:00:00Z",
+                                "score": 1.37
+                            }
+                        ],
+                        "total": 1,
+                        "page": 1,
+                        "size": 10,
+                        "pages": 1
+                    }
+                }
             }
-        )
+        }
+    }
+)
+def search_ratings(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    professional_id: Optional[UUID] = Query(None, description="Restrict to one professional"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(10, ge=1, le=100, description="Page size"),
+    service: RatingService = Depends(provide_rating_service)
+):
+    """Search ratings by description."""
+    logger.info(f"Received request to search ratings for '{q}' (page {page}, size {size})")
+    ratings, total = service.search_ratings(q, professional_id, page, size)
+    pages = (total + size - 1) // size  # Round up
+    return SearchResponse(
+        items=ratings,
+        total=total,
+        page=page,
+        size=size,
+        pages=pages
+    )
+
+@router.get(
+    "",
+    response_model=BatchGetResponse,
+    summary="Get ratings by IDs",
+    description=f"""
+    Get several ratings at once, with a single database query.
+    
+    - **ids**: Rating IDs, comma separated and/or repeated (`?ids=a,b&ids=c`), at most {MAX_BATCH_GET_IDS}
+    
+    Returns the ratings found in the order of the requested IDs (a repeated
+    ID appears once) and the IDs without a rating in `missing`.
+    """
+)
+def get_ratings_by_ids(
+    ids: List[str] = Query(..., description="Rating IDs, comma separated or repeated"),
+    service: RatingService = Depends(provide_rating_service)
+):
+    """Get ratings by their IDs."""
+    rating_ids = _parse_ids(ids)
+    logger.info(f"Received request to get {len(rating_ids)} ratings by ID")
+    items, missing = service.get_ratings_by_ids(rating_ids)
+    return BatchGetResponse(items=items, missing=missing)
+
+@router.post(
+    ":batchGet",
+    response_model=BatchGetResponse,
+    summary="Get ratings by IDs (request body)",
+    description=f"""
+    Same as `GET /ratings?ids=...`, with the IDs in the body, for lists that
+    do not fit comfortably in a URL.
+    
+    - **ids**: Rating IDs, at most {MAX_BATCH_GET_IDS}
+    """
+)
+def batch_get_ratings(request: BatchGetRequest, service: RatingService = Depends(provide_rating_service)):
+    """Get ratings by their IDs."""
+    logger.info(f"Received request to batch get {len(request.ids)} ratings")
+    items, missing = service.get_ratings_by_ids(request.ids)
+    return BatchGetResponse(items=items, missing=missing)
+
+def _parse_ids(values: List[str]) -> List[UUID]:
+    """UUIDs from repeated and/or comma separated query values."""
+    rating_ids = []
+    for value in values:
+        for item in value.split(","):
+            if not item.strip():
+                continue
+            try:
+                rating_ids.append(UUID(item.strip()))
+            except ValueError:
+                raise ValidationException(
+                    message="Invalid rating ID",
+                    details={"id": item.strip()}
+                )
+    return rating_ids
 
 @router.get(
     "/{id}",
@@ -84,7 +201,9 @@ def create_rating(rating: RatingCreate, service: RatingService = Depends(get_rat
     
     - **id**: UUID of the rating to retrieve
     
-    Returns the complete rating data if found.
+    Returns the complete rating data if found. The response carries a strong
+    `ETag`; sending it back in `If-None-Match` returns `304 Not Modified`
+    without loading the rating.
     """,
     responses={
         200: {
@@ -102,6 +221,7 @@ def create_rating(rating: RatingCreate, service: RatingService = Depends(get_rat
                 }
             }
         },
+        304: {"description": "Rating not modified since the given ETag"},
         404: {
             "description": "Rating not found",
             "content": {
@@ -115,10 +235,21 @@ def create_rating(rating: RatingCreate, service: RatingService = Depends(get_rat
         }
     }
 )
-def get_rating(id: UUID, service: RatingService = Depends(get_rating_service)):
+def get_rating(
+    id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: RatingService = Depends(provide_rating_service)
+):
     """Get a rating by its ID."""
     logger.info(f"Received request to get rating {id}")
-    return service.get_rating_by_id(id)
+    etag = rating_etag(id)
+    # Avaliações são imutáveis: basta confirmar que ainda existe
+    if etag_matches(if_none_match, etag) and service.rating_exists(id):
+        return not_modified(etag)
+    rating = service.get_rating_by_id(id)
+    response.headers["ETag"] = etag
+    return rating
 
 @router.get(
     "/professional/{professional_id}",
@@ -130,8 +261,15 @@ def get_rating(id: UUID, service: RatingService = Depends(get_rating_service)):
     - **professional_id**: ID of the professional
     - **page**: Page number (default: 1)
     - **size**: Page size (default: 10, max: 100)
+    - **created_after**: Only ratings created at or after this instant (optional)
+    - **created_before**: Only ratings created before this instant (optional)
+    - **min_rate** / **max_rate**: Rating value bounds (optional)
+    - **rate_in**: Only these rating values, e.g. `rate_in=1&rate_in=2` (optional)
     
     Returns a paginated list of ratings ordered by creation date (newest first).
+    The response carries a weak `ETag` that changes on every write affecting the
+    listing; sending it back in `If-None-Match` returns `304 Not Modified`.
+    Large bodies are compressed (zstd, br or gzip) according to `Accept-Encoding`.
     """,
     responses={
         200: {
@@ -156,27 +294,110 @@ def get_rating(id: UUID, service: RatingService = Depends(get_rating_service)):
                     }
                 }
             }
-        }
+        },
+        304: {"description": "Listing not modified since the given ETag"}
     }
 )
 def list_ratings_by_professional(
     professional_id: UUID,
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
-    service: RatingService = Depends(get_rating_service)
+    created_after: Optional[datetime] = Query(None, description="Only ratings created at or after this instant"),
+    created_before: Optional[datetime] = Query(None, description="Only ratings created before this instant"),
+    min_rate: Optional[int] = Query(None, ge=0, le=5, description="Minimum rating value"),
+    max_rate: Optional[int] = Query(None, ge=0, le=5, description="Maximum rating value"),
+    rate_in: Optional[List[conint(ge=0, le=5)]] = Query(None, description="Only these rating values (repeatable)"),
+    if_none_match: Optional[str] = Header(None),
+    service: RatingService = Depends(provide_rating_service)
 ):
     """List ratings for a professional."""
     logger.info(f"Received request to list ratings for professional {professional_id} (page {page}, size {size})")
-    ratings, total = service.list_ratings_by_professional(professional_id, page, size)
+    filters = RatingFilters(
+        created_after=created_after,
+        created_before=created_before,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        rate_in=tuple(sorted(set(rate_in))) if rate_in else None
+    )
+    if service.serves_stale(PROFESSIONAL_LISTING):
+        # Página possivelmente velha: o ETag vem da versão em que ela foi lida
+        ratings, total, version = service.list_ratings_stale("professional", professional_id, page, size, filters)
+        etag = listing_etag("professional", professional_id, version, page, size, filters)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, vary="Accept-Encoding")
+    else:
+        # A versão é lida antes da consulta: uma escrita concorrente só gera um ETag mais antigo
+        version = service.get_professional_version(professional_id)
+        etag = listing_etag("professional", professional_id, version, page, size, filters)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, vary="Accept-Encoding")
+        ratings, total = service.list_ratings_by_professional(professional_id, page, size, version=version, filters=filters)
     pages = (total + size - 1) // size  # Round up
-    return PaginatedResponse(
-        items=ratings,
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
+    return compressed_json_response(
+        request,
+        PaginatedResponse(
+            items=ratings,
+            total=total,
+            page=page,
+            size=size,
+            pages=pages
+        ),
+        headers={"ETag": etag}
     )
 
+@router.get(
+    "/professional/{professional_id}/trend",
+    response_model=TrendResponse,
+    summary="Rating trend of a professional",
+    description="""
+    Rating trend of a professional over time, served from pre-aggregated
+    daily/monthly buckets maintained on every write. The cost is bounded by
+    the number of buckets, not by the number of ratings.
+    
+    - **professional_id**: ID of the professional
+    - **from**: Start of the range (default: 12 months or 30 days before `to`)
+    - **to**: End of the range (default: now)
+    - **granularity**: `month` (default, up to 120 buckets) or `day` (up to 366 buckets)
+    
+    Returns one point per bucket, including empty ones, in chronological order.
+    """,
+    responses={
+        200: {
+            "description": "Trend returned successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "professional_id": "123e4567-e89b-12d3-a456-426614174001",
+                        "granularity": "month",
+                        "start": "2024-03-01T00:00:00+00:00",
+                        "end": "2024-03-20T10:00:00+00:00",
+                        "points": [
+                            {
+                                "period_start": "2024-03-01T00:00:00+00:00",
+                                "count": 4,
+                                "sum": 17,
+                                "average": 4.25,
+                                "histogram": {"0": 0, "1": 0, "2": 0, "3": 1, "4": 1, "5": 2}
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_rating_trend(
+    professional_id: UUID,
+    from_: Optional[datetime] = Query(None, alias="from", description="Start of the range"),
+    to: Optional[datetime] = Query(None, description="End of the range"),
+    granularity: TrendGranularity = Query(TrendGranularity.MONTH, description="Bucket size"),
+    service: RatingService = Depends(provide_rating_service)
+):
+    """Rating trend of a professional."""
+    logger.info(f"Received request for {granularity.value} trend of professional {professional_id}")
+    return service.get_rating_trend(professional_id, granularity, from_, to)
+
 @router.get(
     "/consumer/{consumer_id}",
     response_model=PaginatedResponse,
@@ -187,8 +408,15 @@ def list_ratings_by_professional(
     - **consumer_id**: ID of the consumer
     - **page**: Page number (default: 1)
     - **size**: Page size (default: 10, max: 100)
+    - **created_after**: Only ratings created at or after this instant (optional)
+    - **created_before**: Only ratings created before this instant (optional)
+    - **min_rate** / **max_rate**: Rating value bounds (optional)
+    - **rate_in**: Only these rating values, e.g. `rate_in=1&rate_in=2` (optional)
     
     Returns a paginated list of ratings ordered by creation date (newest first).
+    The response carries a weak `ETag` that changes on every write affecting the
+    listing; sending it back in `If-None-Match` returns `304 Not Modified`.
+    Large bodies are compressed (zstd, br or gzip) according to `Accept-Encoding`.
     """,
     responses={
         200: {
@@ -213,25 +441,56 @@ def list_ratings_by_professional(
                     }
                 }
             }
-        }
+        },
+        304: {"description": "Listing not modified since the given ETag"}
     }
 )
 def list_ratings_by_consumer(
     consumer_id: UUID,
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
-    service: RatingService = Depends(get_rating_service)
+    created_after: Optional[datetime] = Query(None, description="Only ratings created at or after this instant"),
+    created_before: Optional[datetime] = Query(None, description="Only ratings created before this instant"),
+    min_rate: Optional[int] = Query(None, ge=0, le=5, description="Minimum rating value"),
+    max_rate: Optional[int] = Query(None, ge=0, le=5, description="Maximum rating value"),
+    rate_in: Optional[List[conint(ge=0, le=5)]] = Query(None, description="Only these rating values (repeatable)"),
+    if_none_match: Optional[str] = Header(None),
+    service: RatingService = Depends(provide_rating_service)
 ):
     """List ratings made by a consumer."""
     logger.info(f"Received request to list ratings made by consumer {consumer_id} (page {page}, size {size})")
-    ratings, total = service.list_ratings_by_consumer(consumer_id, page, size)
+    filters = RatingFilters(
+        created_after=created_after,
+        created_before=created_before,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        rate_in=tuple(sorted(set(rate_in))) if rate_in else None
+    )
+    if service.serves_stale(CONSUMER_LISTING):
+        # Página possivelmente velha: o ETag vem da versão em que ela foi lida
+        ratings, total, version = service.list_ratings_stale("consumer", consumer_id, page, size, filters)
+        etag = listing_etag("consumer", consumer_id, version, page, size, filters)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, vary="Accept-Encoding")
+    else:
+        # A versão é lida antes da consulta: uma escrita concorrente só gera um ETag mais antigo
+        version = service.get_consumer_version(consumer_id)
+        etag = listing_etag("consumer", consumer_id, version, page, size, filters)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, vary="Accept-Encoding")
+        ratings, total = service.list_ratings_by_consumer(consumer_id, page, size, version=version, filters=filters)
     pages = (total + size - 1) // size  # Round up
-    return PaginatedResponse(
-        items=ratings,
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
+    return compressed_json_response(
+        request,
+        PaginatedResponse(
+            items=ratings,
+            total=total,
+            page=page,
+            size=size,
+            pages=pages
+        ),
+        headers={"ETag": etag}
     )
 
 @router.delete(
@@ -260,7 +519,7 @@ def list_ratings_by_consumer(
         }
     }
 )
-def delete_rating(id: UUID, service: RatingService = Depends(get_rating_service)):
+def delete_rating(id: UUID, service: RatingService = Depends(provide_rating_service)):
     """Delete a rating by its ID."""
     logger.info(f"Received request to delete rating {id}")
     service.delete_rating(id) 
\ No newline at end of file
@@ -0,0 +1,68 @@
+from pydantic import BaseModel, Field, UUID4
+from typing import Optional
+from datetime import datetime
+from src.domain.value_objects.erasure_job import ErasureScope, ErasureStatus
+
+class ErasureJobCreate(BaseModel):
+    """Schema for requesting the erasure of all ratings of a subject."""
+    scope: ErasureScope = Field(
+        ...,
+        description="Whether subject_id is a professional or a consumer",
+        example="consumer"
+    )
+    subject_id: UUID4 = Field(
+        ...,
+        description="ID of the professional or consumer whose ratings are erased",
+        example="123e4567-e89b-12d3-a456-426614174002"
+    )
+
+class ErasureJobResponse(BaseModel):
+    """Schema for the progress of an erasure job."""
+    id: UUID4 = Field(
+        ...,
+        alias="_id",
+        description="Unique job ID",
+        example="123e4567-e89b-12d3-a456-426614174009"
+    )
+    scope: ErasureScope = Field(
+        ...,
+        description="Whether subject_id is a professional or a consumer",
+        example="consumer"
+    )
+    subject_id: UUID4 = Field(
+        ...,
+        description="ID of the professional or consumer being erased",
+        example="123e4567-e89b-12d3-a456-426614174002"
+    )
+    status: ErasureStatus = Field(
+        ...,
+        description="pending, running, completed or failed",
+        example="running"
+    )
+    deleted: int = Field(
+        ...,
+        description="Ratings deleted so far",
+        example=1500
+    )
+    error: Optional[str] = Field(
+        None,
+        description="Failure reason, when status is failed"
+    )
+    created_at: datetime = Field(
+        ...,
+        description="Job creation date and time",
+        example="2024-03-20T10:00:00Z"
+    )
+    updated_at: datetime = Field(
+        ...,
+        description="Last progress update",
+        example="2024-03-20T10:00:05Z"
+    )
+    finished_at: Optional[datetime] = Field(
+        None,
+        description="Completion date and time",
+        example="2024-03-20T10:01:00Z"
+    )
+
+    class Config:
+        allow_population_by_field_name = True
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, UUID4, conint
 from typing import Optional, List
+from uuid import UUID
 from datetime import datetime
 
 class RatingCreate(BaseModel):
@@ -128,4 +129,59 @@ class PaginatedResponse(BaseModel):
                 "size": 10,
                 "pages": 1
             }
-        } 
\ No newline at end of file
+        } 
+
+class RatingSearchHit(RatingResponse):
+    """Schema for a rating matched by a full-text search."""
+    score: float = Field(
+        ...,
+        description="Relevance score (higher is more relevant)",
+        example=1.37
+    )
+
+class SearchResponse(BaseModel):
+    """Schema for paginated full-text search results."""
+    items: List[RatingSearchHit] = Field(
+        ...,
+        description="Matching ratings, most relevant first"
+    )
+    total: int = Field(
+        ...,
+        description="Total number of matching ratings",
+        example=1
+    )
+    page: int = Field(
+        ...,
+        description="Current page number",
+        example=1
+    )
+    size: int = Field(
+        ...,
+        description="Page size",
+        example=10
+    )
+    pages: int = Field(
+        ...,
+        description="Total number of pages",
+        example=1
+    )
+
+class BatchGetRequest(BaseModel):
+    """Schema for fetching several ratings by ID."""
+    ids: List[UUID] = Field(
+        ...,
+        description="Rating IDs; the response follows this order",
+        example=["123e4567-e89b-12d3-a456-426614174000", "123e4567-e89b-12d3-a456-426614174003"]
+    )
+
+class BatchGetResponse(BaseModel):
+    """Schema for ratings fetched by ID."""
+    items: List[RatingResponse] = Field(
+        ...,
+        description="Ratings found, in the order of the requested IDs"
+    )
+    missing: List[UUID] = Field(
+        ...,
+        description="Requested IDs without a rating",
+        example=["123e4567-e89b-12d3-a456-426614174003"]
+    )
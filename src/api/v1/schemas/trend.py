@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field, UUID4
+from typing import Dict, List, Optional
+from datetime import datetime
+from src.domain.value_objects.trend_period import TrendGranularity
+
+class TrendPoint(BaseModel):
+    """Aggregated ratings of one time bucket."""
+    period_start: datetime = Field(
+        ...,
+        description="Start of the bucket (UTC)",
+        example="2024-03-01T00:00:00Z"
+    )
+    count: int = Field(
+        ...,
+        description="Number of ratings in the bucket",
+        example=4
+    )
+    sum: int = Field(
+        ...,
+        description="Sum of the rating values in the bucket",
+        example=17
+    )
+    average: Optional[float] = Field(
+        None,
+        description="Average rating in the bucket (null when empty)",
+        example=4.25
+    )
+    histogram: Dict[str, int] = Field(
+        ...,
+        description="Number of ratings per value (0 to 5)",
+        example={"0": 0, "1": 0, "2": 0, "3": 1, "4": 1, "5": 2}
+    )
+
+class TrendResponse(BaseModel):
+    """Schema for a professional's rating trend."""
+    professional_id: UUID4 = Field(
+        ...,
+        description="ID of the rated professional",
+        example="123e4567-e89b-12d3-a456-426614174001"
+    )
+    granularity: TrendGranularity = Field(
+        ...,
+        description="Bucket size",
+        example="month"
+    )
+    start: datetime = Field(
+        ...,
+        description="Start of the first bucket (UTC)",
+        example="2024-03-01T00:00:00Z"
+    )
+    end: datetime = Field(
+        ...,
+        description="End of the requested range (UTC)",
+        example="2024-03-31T23:59:59Z"
+    )
+    points: List[TrendPoint] = Field(
+        ...,
+        description="One point per bucket, in chronological order, including empty buckets"
+    )
@@ -0,0 +1,3 @@
+"""
+Analytics package
+"""
\ No newline at end of file
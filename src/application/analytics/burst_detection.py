@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.application.analytics.rating_stats import _isoformat, _naive_utc
+
+@dataclass
+class ConsumerColumns:
+    """Ratings as parallel arrays; consumers and professionals are dictionary-encoded."""
+    consumer_ids: List[str]
+    professional_ids: List[str]
+    consumers: np.ndarray
+    professionals: np.ndarray
+    rates: np.ndarray
+    created_at: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+def consumer_columns_from_batches(batches: Iterable[List[Dict[str, Any]]]) -> ConsumerColumns:
+    """Build columns from batches of {consumer_id, professional_id, rate, created_at} documents."""
+    consumer_codes: Dict[str, int] = {}
+    professional_codes: Dict[str, int] = {}
+    consumers, professionals, rates, created_at = [], [], [], []
+    for batch in batches:
+        if not batch:
+            continue
+        consumers.append(np.fromiter(
+            (consumer_codes.setdefault(doc["consumer_id"], len(consumer_codes)) for doc in batch),
+            dtype=np.int32,
+            count=len(batch)
+        ))
+        professionals.append(np.fromiter(
+            (professional_codes.setdefault(doc["professional_id"], len(professional_codes)) for doc in batch),
+            dtype=np.int32,
+            count=len(batch)
+        ))
+        rates.append(np.fromiter((doc["rate"] for doc in batch), dtype=np.int8, count=len(batch)))
+        created_at.append(np.array([_naive_utc(doc["created_at"]) for doc in batch], dtype="datetime64[ms]"))
+    return ConsumerColumns(
+        consumer_ids=list(consumer_codes),
+        professional_ids=list(professional_codes),
+        consumers=np.concatenate(consumers) if consumers else np.empty(0, dtype=np.int32),
+        professionals=np.concatenate(professionals) if professionals else np.empty(0, dtype=np.int32),
+        rates=np.concatenate(rates) if rates else np.empty(0, dtype=np.int8),
+        created_at=np.concatenate(created_at) if created_at else np.empty(0, dtype="datetime64[ms]")
+    )
+
+def load_consumer_columns(repository: RatingRepository, batch_size: int = 50000, since: Optional[datetime] = None) -> ConsumerColumns:
+    """Load the columns of every rating, or of those created at or after since."""
+    query = {"created_at": {"$gte": since}} if since is not None else None
+    return consumer_columns_from_batches(
+        repository.iter_field_batches(["consumer_id", "professional_id", "rate", "created_at"], batch_size, query)
+    )
+
+def detect_bursts(columns: ConsumerColumns, window_seconds: int = 3600, threshold: int = 20) -> List[Dict[str, Any]]:
+    """Consumers with at least threshold ratings inside some window of window_seconds.
+
+    One lexsort orders the ratings by (consumer, created_at). Each consumer's
+    times are shifted into a disjoint range of a single monotonic key, so one
+    searchsorted gives, for every rating, how many ratings of the same
+    consumer fall in [created_at, created_at + window). The peak per consumer
+    is a maximum reduceat over the consumer boundaries; only the flagged
+    consumers (few) are then described one by one.
+    """
+    if not len(columns):
+        return []
+    window = int(window_seconds) * 1000
+    times = columns.created_at.astype(np.int64)
+    order = np.lexsort((times, columns.consumers))
+    consumers = columns.consumers[order].astype(np.int64)
+    offsets = times[order] - times.min()
+    span = int(offsets.max()) + window + 1
+    if span * (int(consumers.max()) + 1) >= np.iinfo(np.int64).max:
+        raise ValueError("Time range too wide for the burst window key; narrow it with since")
+    key = consumers * span + offsets
+
+    positions = np.arange(len(key))
+    in_window = np.searchsorted(key, key + window, side="left") - positions
+    starts = np.flatnonzero(np.r_[True, consumers[1:] != consumers[:-1]])
+    peaks = np.maximum.reduceat(in_window, starts)
+    ends = np.r_[starts[1:], len(key)]
+
+    flags = []
+    for group in np.flatnonzero(peaks >= threshold):
+        start, end = starts[group], ends[group]
+        first = start + int(np.argmax(in_window[start:end]))
+        burst = order[first:first + int(peaks[group])]
+        flags.append({
+            "consumer_id": columns.consumer_ids[int(consumers[start])],
+            "ratings_in_window": int(peaks[group]),
+            "window_seconds": int(window_seconds),
+            "window_start": _isoformat(columns.created_at[burst[0]]),
+            "window_end": _isoformat(columns.created_at[burst[-1]]),
+            "professionals_in_window": int(len(np.unique(columns.professionals[burst]))),
+            "mean_rate_in_window": float(columns.rates[burst].mean()),
+            "total_ratings": int(end - start)
+        })
+    flags.sort(key=lambda flag: -flag["ratings_in_window"])
+    return flags
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from src.domain.interfaces.rating_repository import RatingRepository
+
+RATE_VALUES = 6  # notas de 0 a 5
+
+@dataclass
+class RatingColumns:
+    """Ratings as parallel arrays; professionals are dictionary-encoded into dense codes."""
+    professional_ids: List[str]
+    codes: np.ndarray
+    rates: np.ndarray
+    created_at: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+@dataclass
+class ProfessionalStats:
+    """Per-professional statistics; row i describes professional_ids[i]."""
+    professional_ids: List[str]
+    count: np.ndarray
+    mean: np.ndarray
+    variance: np.ndarray
+    histogram: np.ndarray
+    percentiles: Dict[float, np.ndarray]
+    wilson_lower: np.ndarray
+    wilson_upper: np.ndarray
+    first_rating_at: np.ndarray
+    last_rating_at: np.ndarray
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Statistics of one professional as plain Python values."""
+        return {
+            "professional_id": self.professional_ids[index],
+            "count": int(self.count[index]),
+            "mean": float(self.mean[index]),
+            "variance": float(self.variance[index]),
+            "histogram": {str(rate): int(n) for rate, n in enumerate(self.histogram[index])},
+            "percentiles": {str(q): int(values[index]) for q, values in self.percentiles.items()},
+            "wilson_lower": float(self.wilson_lower[index]),
+            "wilson_upper": float(self.wilson_upper[index]),
+            "first_rating_at": _isoformat(self.first_rating_at[index]),
+            "last_rating_at": _isoformat(self.last_rating_at[index])
+        }
+
+    def top_by_wilson(self, limit: int = 10, min_count: int = 1) -> List[Dict[str, Any]]:
+        """Best professionals by the lower Wilson bound, which penalizes small samples."""
+        candidates = np.flatnonzero(self.count >= min_count)
+        order = candidates[np.argsort(-self.wilson_lower[candidates], kind="stable")[:limit]]
+        return [self.row(i) for i in order]
+
+def columns_from_batches(batches: Iterable[List[Dict[str, Any]]]) -> RatingColumns:
+    """Build columns from batches of {professional_id, rate, created_at} documents."""
+    professional_codes: Dict[str, int] = {}
+    codes, rates, created_at = [], [], []
+    for batch in batches:
+        if not batch:
+            continue
+        # A codificação por dicionário é o único passo por linha; o resto é vetorizado
+        codes.append(np.fromiter(
+            (professional_codes.setdefault(doc["professional_id"], len(professional_codes)) for doc in batch),
+            dtype=np.int32,
+            count=len(batch)
+        ))
+        rates.append(np.fromiter((doc["rate"] for doc in batch), dtype=np.int8, count=len(batch)))
+        created_at.append(np.array([_naive_utc(doc["created_at"]) for doc in batch], dtype="datetime64[ms]"))
+    return RatingColumns(
+        professional_ids=list(professional_codes),
+        codes=np.concatenate(codes) if codes else np.empty(0, dtype=np.int32),
+        rates=np.concatenate(rates) if rates else np.empty(0, dtype=np.int8),
+        created_at=np.concatenate(created_at) if created_at else np.empty(0, dtype="datetime64[ms]")
+    )
+
+def load_rating_columns(repository: RatingRepository, batch_size: int = 50000, query: Optional[Dict[str, Any]] = None) -> RatingColumns:
+    """Load professional_id, rate and created_at of every (matching) rating into arrays."""
+    return columns_from_batches(
+        repository.iter_field_batches(["professional_id", "rate", "created_at"], batch_size, query)
+    )
+
+def professional_stats(
+    columns: RatingColumns,
+    percentiles: Sequence[float] = (0.5, 0.9),
+    positive_from: int = 4,
+    z: float = 1.96
+) -> ProfessionalStats:
+    """Count, mean, population variance, percentiles and Wilson interval per professional.
+
+    Sums come from bincount over the dense codes. Because rates are integers
+    from 0 to 5, percentiles are exact from each professional's histogram
+    (nearest rank). The Wilson score interval is for the share of ratings
+    >= positive_from. First/last rating times use one sort by
+    professional plus minimum/maximum reduceat over the group boundaries.
+    """
+    groups = len(columns.professional_ids)
+    codes = columns.codes.astype(np.intp, copy=False)
+    rates = columns.rates.astype(np.intp)
+
+    histogram = np.bincount(codes * RATE_VALUES + rates, minlength=groups * RATE_VALUES).reshape(groups, RATE_VALUES)
+    count = histogram.sum(axis=1)
+    values = np.arange(RATE_VALUES)
+    total = histogram @ values
+    squares = histogram @ (values * values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        variance = np.maximum(squares / count - mean * mean, 0.0)
+
+    cumulative = np.cumsum(histogram, axis=1)
+    percentile_values = {}
+    for q in percentiles:
+        rank = np.maximum(np.ceil(q * count), 1)
+        percentile_values[q] = np.argmax(cumulative >= rank[:, None], axis=1)
+
+    positive = histogram[:, positive_from:].sum(axis=1)
+    lower, upper = wilson_interval(positive, count, z)
+
+    first, last = _group_min_max(columns.codes, columns.created_at.astype(np.int64), groups)
+    return ProfessionalStats(
+        professional_ids=columns.professional_ids,
+        count=count,
+        mean=mean,
+        variance=variance,
+        histogram=histogram,
+        percentiles=percentile_values,
+        wilson_lower=lower,
+        wilson_upper=upper,
+        first_rating_at=first.astype("datetime64[ms]"),
+        last_rating_at=last.astype("datetime64[ms]")
+    )
+
+def wilson_interval(successes: np.ndarray, trials: np.ndarray, z: float = 1.96) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized Wilson score interval; (0, 0) where there are no trials."""
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.asarray(trials, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = successes / trials
+        z2 = z * z
+        denominator = 1 + z2 / trials
+        center = (p + z2 / (2 * trials)) / denominator
+        margin = z * np.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / denominator
+    empty = trials == 0
+    return np.where(empty, 0.0, center - margin), np.where(empty, 0.0, center + margin)
+
+def _group_min_max(codes: np.ndarray, values: np.ndarray, groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum and maximum of values per code: one sort, then reduceat over the group starts."""
+    first = np.full(groups, np.iinfo(np.int64).min)
+    last = np.full(groups, np.iinfo(np.int64).min)
+    if not len(codes):
+        return first, last
+    # Min/max não dependem da ordem dentro do grupo: dispensa a ordenação estável
+    order = np.argsort(codes)
+    sorted_codes = codes[order]
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    present = sorted_codes[starts]
+    first[present] = np.minimum.reduceat(sorted_values, starts)
+    last[present] = np.maximum.reduceat(sorted_values, starts)
+    return first, last
+
+def _naive_utc(moment: datetime) -> datetime:
+    # datetime64 não aceita fuso: o MongoDB já devolve UTC sem tzinfo
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+def _isoformat(moment: np.datetime64) -> Optional[str]:
+    if np.isnat(moment):
+        return None
+    return f"{np.datetime_as_string(moment, unit='ms')}+00:00"
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from src.infrastructure.config.settings import Settings, get_settings
+
+class ListPageCache:
+    """Thread-safe LRU cache for listing pages, bounded by entries and approximate bytes.
+
+    Keys embed the generation (write counter) of the professional or consumer,
+    so a write invalidates every cached page of that entity in O(1): the old
+    keys are simply never asked for again and age out through the LRU.
+    """
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """Store a value with its approximate size in bytes."""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate and memory metrics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+_list_page_cache = None
+
+def get_list_page_cache(settings: Optional[Settings] = None) -> Optional[ListPageCache]:
+    """Process-wide listing cache, or None when disabled by settings (by default, from the environment)."""
+    global _list_page_cache
+    settings = settings or get_settings()
+    if not settings.list_cache_enabled:
+        return None
+    if _list_page_cache is None:
+        _list_page_cache = ListPageCache(settings.list_cache_max_entries, settings.list_cache_max_bytes)
+    return _list_page_cache
+
+def set_list_page_cache(cache: Optional[ListPageCache]) -> None:
+    global _list_page_cache
+    _list_page_cache = cache
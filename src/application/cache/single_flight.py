@@ -0,0 +1,140 @@
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from src.infrastructure.config.settings import Settings, get_settings
+
+class _Call:
+    """An in-flight call: its outcome, once done, and the event loops waiting for it."""
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into one execution.
+
+    The first caller of a key runs the function; callers arriving while it is
+    in flight wait and get the same result (or the same exception). Nothing
+    is kept once the call returns, so the next caller runs it again: this
+    only removes duplicate work, it does not cache.
+
+    do() is for synchronous code (threadpool endpoints) and blocks the
+    calling thread; do_async() is for code on an event loop and awaits. Both
+    share the in-flight calls, so a thread and a coroutine asking for the same
+    key also share one execution. do() must not be called from the event
+    loop thread itself.
+
+    Counters are kept per kind, the first element of tuple keys (e.g.
+    "rating", "list"), so coalescing can be followed per read type.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn(), shared with every concurrent do()/do_async() of the same key."""
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            return call.outcome()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, call, None, e)
+            raise
+        self._finish(key, call, result, None)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return await fn(), shared with every concurrent do()/do_async() of the same key."""
+        call, leader = self._join(key)
+        if not leader:
+            future = None
+            with self._lock:
+                if not call.done.is_set():
+                    loop = asyncio.get_running_loop()
+                    future = loop.create_future()
+                    call.waiters.append((loop, future))
+            if future is not None:
+                await future
+            return call.outcome()
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, call, None, e)
+            raise
+        self._finish(key, call, result, None)
+        return result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Executed and coalesced calls, in total and per kind."""
+        with self._lock:
+            kinds = sorted(set(self.executed) | set(self.coalesced))
+            executed = sum(self.executed.values())
+            coalesced = sum(self.coalesced.values())
+            return {
+                "in_flight": len(self._calls),
+                "executed": executed,
+                "coalesced": coalesced,
+                "coalesced_rate": coalesced / (executed + coalesced) if executed + coalesced else 0.0,
+                "by_kind": {
+                    kind: {"executed": self.executed[kind], "coalesced": self.coalesced[kind]}
+                    for kind in kinds
+                }
+            }
+
+    def _join(self, key: Hashable) -> Tuple[_Call, bool]:
+        """The in-flight call of key and whether the caller is the one that must run it."""
+        kind = str(key[0]) if isinstance(key, tuple) and key else "default"
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced[kind] += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.executed[kind] += 1
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call, result: Any, error: Optional[BaseException]) -> None:
+        with self._lock:
+            call.result, call.error = result, error
+            del self._calls[key]
+            waiters, call.waiters = call.waiters, []
+            call.done.set()
+        for loop, future in waiters:
+            # O waiter pode estar em outro loop (ou o líder numa thread do threadpool)
+            loop.call_soon_threadsafe(_wake, future)
+
+_single_flight = None
+
+def get_single_flight(settings: Optional[Settings] = None) -> Optional[SingleFlight]:
+    """Process-wide coalescing of identical reads, or None when disabled by settings (by default, from the environment)."""
+    global _single_flight
+    if not (settings or get_settings()).single_flight_enabled:
+        return None
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+def set_single_flight(single_flight: Optional[SingleFlight]) -> None:
+    global _single_flight
+    _single_flight = single_flight
@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+from src.application.cache.list_page_cache import ListPageCache, get_list_page_cache
+from src.infrastructure.config.settings import Settings, get_settings
+from src.infrastructure.observability.error_log import report_error
+
+logger = logging.getLogger(__name__)
+
+# Endpoints que aceitam a política (nomes usados em STALE_WHILE_REVALIDATE)
+PROFESSIONAL_LISTING = "professional_listing"
+CONSUMER_LISTING = "consumer_listing"
+TREND = "trend"
+ENDPOINTS = (PROFESSIONAL_LISTING, CONSUMER_LISTING, TREND)
+
+# Durações de refresh guardadas para os percentis
+LATENCY_WINDOW = 1000
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """TTLs of an endpoint: served as is for fresh_seconds, then served while refreshing for stale_seconds more."""
+    fresh_seconds: float
+    stale_seconds: float
+
+def parse_policies(value: str) -> Dict[str, CachePolicy]:
+    """Parse "endpoint=fresh:stale,..." (seconds) into policies by endpoint."""
+    policies = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            endpoint, ttls = item.split("=")
+            fresh, stale = (float(ttl) for ttl in ttls.split(":"))
+        except ValueError:
+            raise ValueError(f"Invalid stale-while-revalidate policy {item.strip()!r}, expected endpoint=fresh:stale")
+        endpoint = endpoint.strip()
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown stale-while-revalidate endpoint {endpoint!r}, expected one of {', '.join(ENDPOINTS)}")
+        if fresh < 0 or stale < 0:
+            raise ValueError(f"Stale-while-revalidate TTLs of {endpoint} must not be negative")
+        policies[endpoint] = CachePolicy(fresh, stale)
+    return policies
+
+class StaleWhileRevalidate:
+    """Stale-while-revalidate reads on top of the listing page cache.
+
+    An entry younger than the endpoint's fresh TTL is served as is. Once
+    older, and for the stale TTL after that, it is still served immediately
+    while one background refresh per entry reloads it; later requests keep
+    getting the stale value until the refresh lands. Only an entry past both
+    TTLs (or missing) is loaded in the request. A failed refresh keeps the
+    stale entry, to be retried by the next request.
+
+    Entries are keyed by the request, not by the write counter: a write
+    shows up once the fresh TTL has passed and the refresh has run.
+    """
+    def __init__(
+        self,
+        cache: ListPageCache,
+        policies: Dict[str, CachePolicy],
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.cache = cache
+        self.policies = policies
+        self.executor = executor
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._refreshing: Set[Hashable] = set()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._refresh_ms: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self._refresh_max_ms: Dict[str, float] = defaultdict(float)
+
+    def enabled(self, endpoint: str) -> bool:
+        return endpoint in self.policies
+
+    def get(self, endpoint: str, key: Tuple, load: Callable[[], Tuple[Any, int]]) -> Any:
+        """Value of key for endpoint; load returns a fresh value and its approximate size in bytes."""
+        policy = self.policies[endpoint]
+        cache_key = ("swr", endpoint) + key
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            value, stored_at = cached
+            age = self.clock() - stored_at
+            if age < policy.fresh_seconds:
+                self._count(endpoint, "fresh_hits")
+                return value
+            if age < policy.fresh_seconds + policy.stale_seconds:
+                self._count(endpoint, "stale_serves")
+                self._refresh(endpoint, cache_key, load)
+                return value
+            self._count(endpoint, "expired")
+        else:
+            self._count(endpoint, "misses")
+        started = self.clock()
+        value, size = load()
+        self.cache.put(cache_key, (value, started), size)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Fresh hits, stale serves, synchronous loads and refresh latency per endpoint."""
+        with self._lock:
+            endpoints = {}
+            for endpoint, policy in self.policies.items():
+                counters = self._counters[endpoint]
+                durations = sorted(self._refresh_ms[endpoint])
+                endpoints[endpoint] = {
+                    "fresh_seconds": policy.fresh_seconds,
+                    "stale_seconds": policy.stale_seconds,
+                    "fresh_hits": counters["fresh_hits"],
+                    "stale_serves": counters["stale_serves"],
+                    "misses": counters["misses"],
+                    "expired": counters["expired"],
+                    "refreshes": counters["refreshes"],
+                    "refresh_failures": counters["refresh_failures"],
+                    "refresh_ms": {
+                        "p50": durations[len(durations) // 2] if durations else None,
+                        "p99": durations[int(len(durations) * 0.99)] if durations else None,
+                        "max": self._refresh_max_ms[endpoint] if durations else None
+                    }
+                }
+            return {"refreshing": len(self._refreshing), "endpoints": endpoints}
+
+    def _refresh(self, endpoint: str, cache_key: Hashable, load: Callable[[], Tuple[Any, int]]) -> None:
+        """Start the background refresh of cache_key, unless one is already running."""
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh() -> None:
+            started = self.clock()
+            try:
+                value, size = load()
+            except Exception as e:
+                self._count(endpoint, "refresh_failures")
+                report_error(logger, e, f"Background refresh of {endpoint} failed: {str(e)}")
+            else:
+                self.cache.put(cache_key, (value, started), size)
+                elapsed_ms = (self.clock() - started) * 1000
+                with self._lock:
+                    self._counters[endpoint]["refreshes"] += 1
+                    self._refresh_ms[endpoint].append(elapsed_ms)
+                    self._refresh_max_ms[endpoint] = max(self._refresh_max_ms[endpoint], elapsed_ms)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        if self.executor is None:
+            refresh()
+            return
+        try:
+            self.executor.submit(refresh)
+        except RuntimeError:
+            # Executor encerrado (shutdown): a entrada segue velha até a próxima requisição
+            with self._lock:
+                self._refreshing.discard(cache_key)
+
+    def _count(self, endpoint: str, counter: str) -> None:
+        with self._lock:
+            self._counters[endpoint][counter] += 1
+
+_stale_while_revalidate = None
+_stale_while_revalidate_lock = threading.Lock()
+
+def get_stale_while_revalidate(settings: Optional[Settings] = None) -> Optional[StaleWhileRevalidate]:
+    """Process-wide stale-while-revalidate reads, or None when no endpoint has a policy or the cache is disabled.
+
+    Settings default to the environment's.
+    """
+    global _stale_while_revalidate
+    settings = settings or get_settings()
+    cache = get_list_page_cache(settings)
+    if cache is None or not settings.stale_while_revalidate.strip():
+        return None
+    if _stale_while_revalidate is None:
+        with _stale_while_revalidate_lock:
+            if _stale_while_revalidate is None:
+                _stale_while_revalidate = StaleWhileRevalidate(
+                    cache,
+                    parse_policies(settings.stale_while_revalidate),
+                    executor=ThreadPoolExecutor(max_workers=settings.stale_refresh_workers, thread_name_prefix="cache-refresh")
+                )
+    return _stale_while_revalidate
+
+def set_stale_while_revalidate(stale: Optional[StaleWhileRevalidate]) -> None:
+    global _stale_while_revalidate
+    _stale_while_revalidate = stale
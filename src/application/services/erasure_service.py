@@ -0,0 +1,172 @@
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+from src.domain.interfaces.erasure_job_repository import ErasureJobRepository
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.domain.interfaces.rating_search import RatingSearch
+from src.domain.value_objects.erasure_job import ErasureScope, ErasureStatus
+from src.domain.exceptions.base_exceptions import NotFoundException
+from src.infrastructure.config.settings import get_settings
+from src.infrastructure.observability.error_log import report_error
+from src.infrastructure.repositories.rating_repository import get_rating_repository
+from src.infrastructure.repositories.erasure_job_repository import get_erasure_job_repository
+from src.infrastructure.search.factory import get_rating_search
+
+logger = logging.getLogger(__name__)
+
+class ErasureService:
+    """Erases every rating of a professional or consumer in the background.
+
+    Ratings are walked in _id order and removed in bounded delete_many
+    chunks, with a pause between chunks, so no single write holds locks or
+    floods the replication stream. Each chunk is checkpointed on the job
+    before it is deleted and again once deleted, before counters and trends
+    are decremented; a job resumed after a crash replays the chunk in flight
+    from that point and continues from the last completed _id. _ids are
+    random, so a rating created during the job may sort below the cursor:
+    the job only completes after a sweep from the start finds none left.
+    """
+    def __init__(
+        self,
+        repository: RatingRepository,
+        jobs: ErasureJobRepository,
+        search: Optional[RatingSearch] = None,
+        executor: Optional[Executor] = None,
+        chunk_size: int = 500,
+        chunk_pause: float = 0.05,
+        lease: timedelta = timedelta(seconds=60)
+    ):
+        self.repository = repository
+        self.jobs = jobs
+        self.search = search
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.chunk_pause = chunk_pause
+        self.lease = lease
+        # Identifica este processo como dono dos jobs que executa
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    def start_erasure(self, scope: ErasureScope, subject_id: UUID) -> Dict[str, Any]:
+        """Create (or reuse) the erasure job of a subject and start it in the background."""
+        job = self.jobs.create_job(scope, subject_id)
+        logger.info(f"Erasure job {job['_id']} for {scope.value} {subject_id} is {job['status']}")
+        if job["status"] == ErasureStatus.PENDING.value:
+            self._submit(UUID(job["_id"]))
+        return job
+
+    def get_job(self, job_id: UUID) -> Dict[str, Any]:
+        """Get a job's progress, resuming it if its runner died."""
+        job = self.jobs.get_job(job_id)
+        if not job:
+            raise NotFoundException(
+                message=f"Erasure job {job_id} not found",
+                details={"job_id": str(job_id)}
+            )
+        if self._is_stale(job):
+            self._submit(job_id)
+        return job
+
+    def resume_pending(self) -> int:
+        """Restart pending jobs and jobs abandoned by a crashed process."""
+        job_ids = self.jobs.list_resumable(self._stale_before())
+        for job_id in job_ids:
+            self._submit(job_id)
+        if job_ids:
+            logger.info(f"Resuming {len(job_ids)} erasure jobs")
+        return len(job_ids)
+
+    def run_job(self, job_id: UUID) -> None:
+        """Run a job to completion if this process can claim it."""
+        job = self.jobs.claim_job(job_id, self.owner, self._stale_before())
+        if not job:
+            return
+        scope, subject_id = job["scope"], UUID(job["subject_id"])
+        try:
+            last_id = job["last_id"]
+            if job.get("pending_chunk"):
+                # Retomada após falha: reaplica o lote que estava em andamento
+                logger.info(f"Erasure job {job_id} replaying an interrupted chunk")
+                if not self._erase_chunk(job_id, scope, subject_id, job["pending_chunk"], job.get("pending_deleted")):
+                    return
+                last_id = job["pending_chunk"][-1]["_id"]
+            while True:
+                chunk = self.repository.next_ratings_chunk(scope, subject_id, last_id, self.chunk_size)
+                if not chunk:
+                    # Avaliações criadas durante o job com _id abaixo de last_id ficaram para trás
+                    if last_id and self.repository.next_ratings_chunk(scope, subject_id, "", 1):
+                        logger.info(f"Erasure job {job_id} re-sweeping ratings created while it ran")
+                        last_id = ""
+                        continue
+                    break
+                if not self.jobs.save_pending_chunk(job_id, self.owner, chunk):
+                    logger.warning(f"Erasure job {job_id} was taken over by another process")
+                    return
+                if not self._erase_chunk(job_id, scope, subject_id, chunk):
+                    return
+                last_id = chunk[-1]["_id"]
+                if self.chunk_pause:
+                    time.sleep(self.chunk_pause)
+            self.jobs.finish_job(job_id, self.owner)
+            logger.info(f"Erasure job {job_id} for {scope} {subject_id} completed")
+        except Exception as e:
+            report_error(logger, e, f"Erasure job {job_id} failed: {str(e)}")
+            self.jobs.finish_job(job_id, self.owner, error=str(e))
+
+    def _erase_chunk(self, job_id: UUID, scope: str, subject_id: UUID, chunk, deleted=None) -> bool:
+        if deleted is None:
+            deleted = self.repository.delete_ratings_chunk(scope, subject_id, chunk)
+            if not self.jobs.mark_chunk_deleted(job_id, self.owner, deleted):
+                logger.warning(f"Erasure job {job_id} was taken over by another process")
+                return False
+        self.repository.apply_deleted_ratings(deleted)
+        if self.search is not None:
+            for doc in deleted:
+                self.search.remove_rating(UUID(doc["_id"]))
+        return self.jobs.complete_chunk(job_id, self.owner, chunk[-1]["_id"], len(deleted))
+
+    def _submit(self, job_id: UUID) -> None:
+        if self.executor is None:
+            self.run_job(job_id)
+        else:
+            self.executor.submit(self.run_job, job_id)
+
+    def _stale_before(self) -> datetime:
+        return datetime.now(timezone.utc) - self.lease
+
+    def _is_stale(self, job: Dict[str, Any]) -> bool:
+        if job["status"] != ErasureStatus.RUNNING.value or job.get("heartbeat_at") is None:
+            return False
+        heartbeat = job["heartbeat_at"]
+        if heartbeat.tzinfo is None:
+            heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+        return heartbeat < self._stale_before()
+
+_erasure_service = None
+_erasure_lock = threading.Lock()
+
+def get_erasure_service() -> ErasureService:
+    """Process-wide erasure service, with a single background worker thread."""
+    global _erasure_service
+    with _erasure_lock:
+        if _erasure_service is None:
+            settings = get_settings()
+            _erasure_service = ErasureService(
+                get_rating_repository(),
+                get_erasure_job_repository(),
+                search=get_rating_search(),
+                executor=ThreadPoolExecutor(max_workers=1, thread_name_prefix="rating-erasure"),
+                chunk_size=settings.erasure_chunk_size,
+                chunk_pause=settings.erasure_chunk_pause_ms / 1000,
+                lease=timedelta(seconds=settings.erasure_lease_seconds)
+            )
+    return _erasure_service
+
+def set_erasure_service(service: Optional[ErasureService]) -> None:
+    global _erasure_service
+    _erasure_service = service
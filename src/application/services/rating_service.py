@@ -1,33 +1,83 @@
 import logging
 from src.domain.interfaces.rating_repository import RatingRepository
-from src.api.v1.schemas.rating import RatingCreate, RatingResponse
+from src.api.v1.schemas.rating import RatingCreate, RatingResponse, RatingSearchHit
+from src.domain.interfaces.rating_search import RatingSearch
+from src.domain.interfaces.flagged_consumer_repository import FlaggedConsumerRepository
+from src.api.v1.schemas.trend import TrendPoint, TrendResponse
+from src.domain.value_objects.rating_filters import RatingFilters
+from src.domain.value_objects.trend_period import (
+    TrendGranularity,
+    period_count,
+    period_key,
+    period_start,
+    period_starts,
+    previous_period
+)
 from src.domain.exceptions.base_exceptions import ValidationException, NotFoundException, DatabaseException
 from uuid import UUID, uuid4
 from datetime import datetime, UTC
-from typing import List, Optional
+from typing import Any, Callable, Hashable, List, Optional, Tuple
 from fastapi import Depends
 from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl, get_rating_repository
+from src.application.cache.list_page_cache import ListPageCache, get_list_page_cache
+from src.application.cache.single_flight import SingleFlight, get_single_flight
+from src.application.cache.stale_while_revalidate import TREND, StaleWhileRevalidate, get_stale_while_revalidate
+from src.infrastructure.search.factory import get_rating_search
+from src.infrastructure.repositories.flagged_consumer_repository import get_flagged_consumer_repository
+from src.infrastructure.config.settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Quantidade de buckets retornada quando o início não é informado
+DEFAULT_TREND_BUCKETS = {TrendGranularity.DAY: 30, TrendGranularity.MONTH: 12}
+# Limita o custo de uma consulta de tendência ao número de buckets
+MAX_TREND_BUCKETS = {TrendGranularity.DAY: 366, TrendGranularity.MONTH: 120}
+# IDs por requisição de leitura em lote (uma consulta $in)
+MAX_BATCH_GET_IDS = 100
+
 class RatingService:
     """Service layer for rating operations."""
-    def __init__(self, repository: RatingRepository):
+    def __init__(
+        self,
+        repository: RatingRepository,
+        list_cache: Optional[ListPageCache] = None,
+        search: Optional[RatingSearch] = None,
+        flags: Optional[FlaggedConsumerRepository] = None,
+        flag_policy: str = "log",
+        single_flight: Optional[SingleFlight] = None,
+        stale: Optional[StaleWhileRevalidate] = None
+    ):
         self.repository = repository
+        self.list_cache = list_cache
+        self.search = search
+        self.flags = flags
+        self.flag_policy = flag_policy
+        self.single_flight = single_flight
+        self.stale = stale
 
     def create_rating(self, rating_data: RatingCreate) -> RatingResponse:
         """Create a new rating."""
         logger.info(f"Creating rating for professional {rating_data.professional_id}")
+        if self.flags is not None and self.flags.is_flagged(rating_data.consumer_id):
+            if self.flag_policy == "reject":
+                logger.warning(f"Rejected rating from flagged consumer {rating_data.consumer_id}")
+                raise ValidationException(
+                    message="Consumer is flagged for unusual rating activity",
+                    details={"consumer_id": str(rating_data.consumer_id)}
+                )
+            logger.warning(f"Rating from flagged consumer {rating_data.consumer_id}")
         rating_dict = rating_data.dict()
         # Cria o rating e obtém os dados completos
         created_rating = self.repository.create_rating(rating_dict)
+        if self.search is not None:
+            self.search.index_rating(created_rating)
         logger.info(f"Rating created successfully with ID {created_rating['_id']}")
         return RatingResponse(**created_rating)
 
     def get_rating_by_id(self, rating_id: UUID) -> RatingResponse:
         """Get a rating by its ID."""
         logger.info(f"Fetching rating with ID {rating_id}")
-        rating = self.repository.get_rating_by_id(rating_id)
+        rating = self._shared(("rating", str(rating_id)), lambda: self.repository.get_rating_by_id(rating_id))
         if not rating:
             logger.warning(f"Rating not found with ID {rating_id}")
             raise NotFoundException(
@@ -37,12 +87,88 @@ class RatingService:
         logger.info(f"Rating found with ID {rating_id}")
         return RatingResponse(**rating)
 
-    def list_ratings_by_professional(self, professional_id: UUID, page: int = 1, size: int = 10) -> tuple[List[RatingResponse], int]:
-        """List ratings for a professional."""
+    def get_ratings_by_ids(self, rating_ids: List[UUID]) -> Tuple[List[RatingResponse], List[UUID]]:
+        """Get up to MAX_BATCH_GET_IDS ratings with a single query.
+
+        Returns the ratings found, in the order of rating_ids (repeated IDs
+        once), and the IDs without a rating.
+        """
+        unique = list(dict.fromkeys(rating_ids))
+        if len(unique) > MAX_BATCH_GET_IDS:
+            raise ValidationException(
+                message="Too many rating IDs",
+                details={"error": f"At most {MAX_BATCH_GET_IDS} IDs per request", "count": len(unique)}
+            )
+        logger.info(f"Fetching {len(unique)} ratings by ID")
+        found = {str(r["_id"]): r for r in self.repository.get_ratings_by_ids(unique)} if unique else {}
+        items = [RatingResponse(**found[str(rating_id)]) for rating_id in unique if str(rating_id) in found]
+        missing = [rating_id for rating_id in unique if str(rating_id) not in found]
+        logger.info(f"Found {len(items)} of {len(unique)} ratings")
+        return items, missing
+
+    def rating_exists(self, rating_id: UUID) -> bool:
+        """Check whether a rating exists without loading it."""
+        return self.repository.rating_exists(rating_id)
+
+    def get_professional_version(self, professional_id: UUID) -> int:
+        """Get the write counter of a professional's ratings."""
+        return self._shared(("version", "professional", str(professional_id)), lambda: self.repository.get_version("professional", professional_id))
+
+    def get_consumer_version(self, consumer_id: UUID) -> int:
+        """Get the write counter of a consumer's ratings."""
+        return self._shared(("version", "consumer", str(consumer_id)), lambda: self.repository.get_version("consumer", consumer_id))
+
+    def list_ratings_by_professional(
+        self,
+        professional_id: UUID,
+        page: int = 1,
+        size: int = 10,
+        version: Optional[int] = None,
+        filters: Optional[RatingFilters] = None
+    ) -> tuple[List[RatingResponse], int]:
+        """List ratings for a professional.
+
+        `version` is the professional's write counter when the caller already
+        read it (e.g. to build an ETag); it keys the listing cache.
+        """
         logger.info(f"Listing ratings for professional {professional_id} (page {page}, size {size})")
-        ratings, total = self.repository.list_ratings_by_professional(professional_id, page, size)
+        filters = self._validate_filters(filters)
+        ratings, total = self._cached_listing(
+            "professional", professional_id, page, size, version, filters,
+            lambda: self.repository.list_ratings_by_professional(professional_id, page, size, *_filter_args(filters))
+        )
         logger.info(f"Found {len(ratings)} ratings for professional {professional_id} (total: {total})")
-        return [RatingResponse(**r) for r in ratings], total
+        return ratings, total
+
+    def serves_stale(self, endpoint: str) -> bool:
+        """Whether reads of endpoint (see stale_while_revalidate.ENDPOINTS) are stale-while-revalidate."""
+        return self.stale is not None and self.stale.enabled(endpoint)
+
+    def list_ratings_stale(
+        self,
+        scope: str,
+        entity_id: UUID,
+        page: int = 1,
+        size: int = 10,
+        filters: Optional[RatingFilters] = None
+    ) -> Tuple[List[RatingResponse], int, int]:
+        """Listing page of a professional or consumer read stale-while-revalidate.
+
+        Also returns the write counter the page was read at, so the ETag
+        describes the page actually served.
+        """
+        filters = self._validate_filters(filters)
+        fetch = self.repository.list_ratings_by_professional if scope == "professional" else self.repository.list_ratings_by_consumer
+
+        def load() -> Tuple[Tuple[List[RatingResponse], int, int], int]:
+            # A versão é lida antes da consulta: uma escrita concorrente só gera um ETag mais antigo
+            version = self.repository.get_version(scope, entity_id)
+            ratings, total = fetch(entity_id, page, size, *_filter_args(filters))
+            return ([RatingResponse(**r) for r in ratings], total, version), _estimate_size(ratings)
+
+        key = (str(entity_id), page, size, filters)
+        items, total, version = self.stale.get(f"{scope}_listing", key, lambda: self._shared(("list", scope) + key + ("stale",), load))
+        return list(items), total, version
 
     def delete_rating(self, rating_id: UUID) -> None:
         """Delete a rating by its ID."""
@@ -54,14 +180,208 @@ class RatingService:
                 message="Rating not found",
                 details={"rating_id": str(rating_id)}
             )
+        if self.search is not None:
+            self.search.remove_rating(rating_id)
         logger.info(f"Rating {rating_id} deleted successfully")
 
-    def list_ratings_by_consumer(self, consumer_id: UUID, page: int = 1, size: int = 10) -> tuple[List[RatingResponse], int]:
+    def list_ratings_by_consumer(
+        self,
+        consumer_id: UUID,
+        page: int = 1,
+        size: int = 10,
+        version: Optional[int] = None,
+        filters: Optional[RatingFilters] = None
+    ) -> tuple[List[RatingResponse], int]:
         """List ratings made by a consumer."""
         logger.info(f"Listing ratings made by consumer {consumer_id} (page {page}, size {size})")
-        ratings, total = self.repository.list_ratings_by_consumer(consumer_id, page, size)
+        filters = self._validate_filters(filters)
+        ratings, total = self._cached_listing(
+            "consumer", consumer_id, page, size, version, filters,
+            lambda: self.repository.list_ratings_by_consumer(consumer_id, page, size, *_filter_args(filters))
+        )
         logger.info(f"Found {len(ratings)} ratings made by consumer {consumer_id} (total: {total})")
-        return [RatingResponse(**r) for r in ratings], total
+        return ratings, total
+
+    def search_ratings(self, query: str, professional_id: Optional[UUID] = None, page: int = 1, size: int = 10) -> tuple[List[RatingSearchHit], int]:
+        """Full-text search over rating descriptions, most relevant first."""
+        if self.search is None:
+            raise ValidationException(message="Search is not available")
+        logger.info(f"Searching ratings for '{query}' (professional {professional_id}, page {page}, size {size})")
+        hits, total = self.search.search(query, professional_id, page, size)
+        # Uma única consulta $in carrega a página, na ordem de relevância
+        ratings = {r["_id"]: r for r in self.repository.get_ratings_by_ids([rating_id for rating_id, _ in hits])} if hits else {}
+        items = [
+            RatingSearchHit(**ratings[rating_id], score=score)
+            for rating_id, score in hits
+            if rating_id in ratings
+        ]
+        logger.info(f"Found {total} ratings matching '{query}'")
+        return items, total
+
+    def get_rating_trend(
+        self,
+        professional_id: UUID,
+        granularity: TrendGranularity = TrendGranularity.MONTH,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> TrendResponse:
+        """Rating trend of a professional, read from the pre-aggregated buckets."""
+        if not self.serves_stale(TREND):
+            return self._rating_trend(professional_id, granularity, start, end)
+
+        def load() -> Tuple[TrendResponse, int]:
+            trend = self._rating_trend(professional_id, granularity, start, end)
+            return trend, 512 + 256 * len(trend.points)
+
+        # A chave usa os parâmetros recebidos: sem 'to', o fim é o instante do carregamento
+        return self.stale.get(TREND, (str(professional_id), granularity.value, start, end), load)
+
+    def _rating_trend(
+        self,
+        professional_id: UUID,
+        granularity: TrendGranularity,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> TrendResponse:
+        end = end or datetime.now(UTC)
+        try:
+            if start is None:
+                start = period_start(end, granularity)
+                for _ in range(DEFAULT_TREND_BUCKETS[granularity] - 1):
+                    start = previous_period(start, granularity)
+            count = period_count(start, end, granularity)
+        except (ValueError, OverflowError) as e:
+            raise ValidationException(
+                message="Invalid trend range",
+                details={"error": str(e)}
+            )
+        if count == 0:
+            raise ValidationException(
+                message="Invalid trend range",
+                details={"error": "'from' must not be after 'to'"}
+            )
+        # O tamanho é conferido antes de enumerar os buckets
+        if count > MAX_TREND_BUCKETS[granularity]:
+            raise ValidationException(
+                message="Invalid trend range",
+                details={"error": f"At most {MAX_TREND_BUCKETS[granularity]} {granularity.value} buckets per request"}
+            )
+        starts = period_starts(start, end, granularity)
+        logger.info(f"Fetching {granularity.value} trend for professional {professional_id} ({len(starts)} buckets)")
+        first, last = period_key(starts[0], granularity), period_key(starts[-1], granularity)
+        buckets = {
+            bucket["period"]: bucket
+            for bucket in self._shared(
+                ("trend", str(professional_id), granularity.value, first, last),
+                lambda: self.repository.list_trend_buckets(professional_id, granularity, first, last)
+            )
+        }
+        points = []
+        for bucket_start in starts:
+            bucket = buckets.get(period_key(bucket_start, granularity), {})
+            count = bucket.get("count", 0)
+            total = bucket.get("sum", 0)
+            histogram = bucket.get("histogram", {})
+            points.append(TrendPoint(
+                period_start=bucket_start,
+                count=count,
+                sum=total,
+                average=total / count if count else None,
+                histogram={str(rate): histogram.get(str(rate), 0) for rate in range(6)}
+            ))
+        return TrendResponse(
+            professional_id=professional_id,
+            granularity=granularity,
+            start=starts[0],
+            end=end,
+            points=points
+        )
+
+    def _validate_filters(self, filters: Optional[RatingFilters]) -> Optional[RatingFilters]:
+        """Reject inconsistent filters; empty filters are normalized to None."""
+        if filters is None or filters.is_empty():
+            return None
+        if (
+            filters.created_after is not None
+            and filters.created_before is not None
+            and filters.created_after >= filters.created_before
+        ):
+            raise ValidationException(
+                message="Invalid date range",
+                details={"error": "created_after must be before created_before"}
+            )
+        if filters.min_rate is not None and filters.max_rate is not None and filters.min_rate > filters.max_rate:
+            raise ValidationException(
+                message="Invalid rate range",
+                details={"error": "min_rate must not be greater than max_rate"}
+            )
+        return filters
+
+    def _cached_listing(
+        self,
+        scope: str,
+        entity_id: UUID,
+        page: int,
+        size: int,
+        version: Optional[int],
+        filters: Optional[RatingFilters],
+        fetch: Callable[[], Tuple[List[dict], int]]
+    ) -> Tuple[List[RatingResponse], int]:
+        """Serve a listing page from the cache, keyed by the entity generation.
+
+        Concurrent misses of the same page share one repository call.
+        """
+        if self.list_cache is None:
+            ratings, total = self._shared(("list", scope, str(entity_id), page, size, filters), fetch)
+            return [RatingResponse(**r) for r in ratings], total
+        if version is None:
+            version = self.repository.get_version(scope, entity_id)
+        key = (scope, str(entity_id), page, size, filters, version)
+        cached = self.list_cache.get(key)
+        if cached is not None:
+            return list(cached[0]), cached[1]
+
+        def load() -> Tuple[List[RatingResponse], int]:
+            ratings, total = fetch()
+            items = [RatingResponse(**r) for r in ratings]
+            self.list_cache.put(key, (items, total), _estimate_size(ratings))
+            return items, total
+
+        items, total = self._shared(("list",) + key, load)
+        return list(items), total
+
+    def _shared(self, key: Hashable, read: Callable[[], Any]) -> Any:
+        """Run a repository read, coalesced with identical concurrent ones when single-flight is on.
+
+        Waiters get the very object the read returned, so callers must not
+        mutate it.
+        """
+        if self.single_flight is None:
+            return read()
+        return self.single_flight.do(key, read)
+
+def _filter_args(filters: Optional[RatingFilters]) -> tuple:
+    # Sem filtros a chamada ao repositório mantém a assinatura original
+    return () if filters is None else (filters,)
+
+def _estimate_size(ratings: List[dict]) -> int:
+    """Rough memory footprint of a cached page (models, UUIDs and datetimes)."""
+    return 256 + sum(1024 + len(r.get("description") or "") for r in ratings)
 
-def get_rating_service(repo: RatingRepository = Depends(get_rating_repository)) -> RatingService:
-    return RatingService(repo) 
\ No newline at end of file
+def get_rating_service(
+    repo: RatingRepository = Depends(get_rating_repository),
+    settings: Optional[Settings] = None
+) -> RatingService:
+    settings = settings or get_settings()
+    policy = settings.flagged_consumer_policy
+    # As marcações de rajada ficam no MongoDB: sem ele a consulta é desligada
+    check_flags = policy != "off" and settings.rating_repository_backend == "mongo"
+    return RatingService(
+        repo,
+        list_cache=get_list_page_cache(settings),
+        search=get_rating_search(settings),
+        flags=get_flagged_consumer_repository() if check_flags else None,
+        flag_policy=policy,
+        single_flight=get_single_flight(settings),
+        stale=get_stale_while_revalidate(settings)
+    ) 
\ No newline at end of file
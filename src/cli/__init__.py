@@ -0,0 +1,3 @@
+"""
+Command-line tools package
+"""
\ No newline at end of file
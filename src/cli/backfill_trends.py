@@ -0,0 +1,41 @@
+"""
+Rebuild the per-professional trend buckets from the stored ratings.
+
+Trend buckets are maintained on every write, so ratings stored before the
+buckets existed (or buckets left behind by a failed derived write) are not
+reflected in them. This command recounts day and month buckets from the
+ratings collection and overwrites them; it is idempotent and can be rerun.
+
+A rating written while its professional is being recounted may be counted
+twice or not at all; run it during a quiet period, or rerun it for the
+affected professionals.
+
+Usage: python -m src.cli.backfill_trends [--professional-id UUID ...]
+"""
+import argparse
+import logging
+import sys
+import time
+from typing import List, Optional, TextIO
+from uuid import UUID
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.infrastructure.repositories.rating_repository import get_rating_repository
+
+def backfill_trends(repository: RatingRepository, professional_ids: Optional[List[UUID]] = None, out: TextIO = sys.stdout) -> int:
+    """Rebuild the trend buckets; returns the number of buckets written."""
+    started = time.monotonic()
+    written = repository.rebuild_trend_buckets(professional_ids)
+    print(f"rebuilt {written} trend buckets in {time.monotonic() - started:.1f}s", file=out)
+    return written
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--professional-id", type=UUID, action="append", help="Only this professional (repeatable)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    backfill_trends(get_rating_repository(), args.professional_id)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Flag consumers that post bursts of ratings.
+
+consumer_id, professional_id, rate and created_at are read in large raw
+batches into NumPy arrays; a sliding window per consumer (one sort, one
+searchsorted) finds consumers with at least --threshold ratings inside
+--window seconds. Flagged consumers are written to the flagged_consumers
+collection, which the write path checks with one _id lookup
+(FLAGGED_CONSUMER_POLICY=log|reject|off).
+
+A full run replaces every earlier flag. With --since only recent ratings
+are scanned and flags are added, never removed; start it at least one
+window before the previous run so bursts across the boundary are seen.
+
+Usage: python -m src.cli.detect_bursts [--window 3600] [--threshold 20] [--since 2024-01-01T00:00:00]
+"""
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, TextIO
+from src.application.analytics.burst_detection import detect_bursts, load_consumer_columns
+from src.domain.interfaces.flagged_consumer_repository import FlaggedConsumerRepository
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.infrastructure.repositories.flagged_consumer_repository import get_flagged_consumer_repository
+from src.infrastructure.repositories.rating_repository import get_rating_repository
+
+def run_detection(
+    repository: RatingRepository,
+    flags: FlaggedConsumerRepository,
+    window_seconds: int = 3600,
+    threshold: int = 20,
+    since: Optional[datetime] = None,
+    batch_size: int = 50000,
+    dry_run: bool = False,
+    out: TextIO = sys.stdout
+) -> List[dict]:
+    """Detect bursts, store the flags and report; returns the flags."""
+    started = time.monotonic()
+    columns = load_consumer_columns(repository, batch_size, since)
+    loaded = time.monotonic()
+    found = detect_bursts(columns, window_seconds, threshold)
+    detected = time.monotonic()
+    print(
+        f"{len(columns)} ratings of {len(columns.consumer_ids)} consumers: "
+        f"loaded in {loaded - started:.1f}s, scanned in {detected - loaded:.2f}s, {len(found)} flagged",
+        file=out
+    )
+    for flag in found[:20]:
+        print(
+            f"{flag['consumer_id']}  {flag['ratings_in_window']} ratings from {flag['window_start']} "
+            f"to {flag['window_end']} ({flag['professionals_in_window']} professionals, "
+            f"mean {flag['mean_rate_in_window']:.2f})",
+            file=out
+        )
+    if not dry_run:
+        flags.save_flags(found, replace=since is None)
+    return found
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--window", type=int, default=3600, help="Sliding window, in seconds")
+    parser.add_argument("--threshold", type=int, default=20, help="Ratings inside one window that flag a consumer")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only ratings created at or after this ISO 8601 time")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Documents per raw batch")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing the flags")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    since = args.since
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    run_detection(
+        get_rating_repository(),
+        get_flagged_consumer_repository(),
+        window_seconds=args.window,
+        threshold=args.threshold,
+        since=since,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Parallel bulk export of ratings to compressed NDJSON or CSV part files.
+
+The _id space (UUID strings) is split into contiguous ranges scanned
+concurrently, one part file per range, each streamed through the cursor
+and the compressor so memory stays bounded. Rows are normalized like the
+API (_doc_to_dict): string UUIDs and ISO 8601 timestamps.
+
+Every run writes a manifest with its upper created_at watermark: the time
+the export started minus a safety lag, because created_at is stamped by
+the application before the insert commits and a rating stamped just
+before the start could still be in flight. Passing that manifest to
+--since-manifest exports only ratings created since, for incremental
+warehouse loads; the (created_at, _id) index serves those windows.
+
+Bulk imports keep the created_at of the file, usually far behind any
+watermark: after importing historical ratings, run a full export or pass
+--since with the oldest imported created_at.
+
+Usage: python -m src.cli.export_ratings OUTPUT_DIR [--format ndjson] [--compression gzip] [--parallel 8]
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, TextIO, Tuple
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.infrastructure.repositories.rating_repository import get_rating_repository
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ["_id", "professional_id", "consumer_id", "rate", "description", "created_at"]
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+MANIFEST = "manifest.json"
+# Margem para avaliações com created_at já definido cujo insert ainda não terminou
+DEFAULT_SAFETY_LAG = timedelta(minutes=5)
+
+def id_ranges(parts: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Split the UUID string space into parts contiguous [lower, upper) ranges.
+
+    Bounds are 4-hex-digit prefixes, so the split is even for random UUIDs;
+    the first and last ranges are open-ended.
+    """
+    if not 1 <= parts <= 0x10000:
+        raise ValueError("parts must be between 1 and 65536")
+    bounds = [None] + [format(i * 0x10000 // parts, "04x") for i in range(1, parts)] + [None]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def open_output(path: str, compression: str) -> TextIO:
+    """Text stream writing through the chosen compressor."""
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    raw: BinaryIO = open(path, "wb")
+    if compression == "zstd":
+        if zstandard is None:
+            raw.close()
+            raise ValueError("zstd compression requires the zstandard package")
+        raw = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+def _row(rating: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "_id": str(rating["_id"]),
+        "professional_id": str(rating["professional_id"]),
+        "consumer_id": str(rating["consumer_id"]),
+        "rate": rating["rate"],
+        "description": rating["description"],
+        "created_at": _isoformat(rating["created_at"])
+    }
+
+def _isoformat(moment: datetime) -> str:
+    # O MongoDB devolve datas sem fuso; elas estão em UTC
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.isoformat()
+
+def export_range(
+    repository: RatingRepository,
+    path: str,
+    id_range: Tuple[Optional[str], Optional[str]],
+    fmt: str,
+    compression: str,
+    since: Optional[datetime],
+    until: datetime,
+    batch_size: int
+) -> int:
+    """Write one part file; returns the number of rows."""
+    rows = 0
+    with open_output(path, compression) as stream:
+        if fmt == "csv":
+            writer = csv.DictWriter(stream, fieldnames=FIELDS)
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = lambda row: stream.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+        for rating in repository.iter_ratings(id_range[0], id_range[1], since, until, batch_size):
+            write(_row(rating))
+            rows += 1
+    return rows
+
+def read_watermark(manifest_path: str) -> datetime:
+    with open(manifest_path, "r", encoding="utf-8") as stream:
+        return datetime.fromisoformat(json.load(stream)["watermark"])
+
+def export_ratings(
+    output_dir: str,
+    repository: RatingRepository,
+    fmt: str = "ndjson",
+    compression: str = "gzip",
+    parallel: int = 8,
+    parts: Optional[int] = None,
+    since: Optional[datetime] = None,
+    batch_size: int = 2000,
+    safety_lag: timedelta = DEFAULT_SAFETY_LAG,
+    out: TextIO = sys.stdout
+) -> Dict[str, Any]:
+    """Export ratings created in [since, now - safety_lag) and return the manifest."""
+    os.makedirs(output_dir, exist_ok=True)
+    # O BSON guarda milissegundos: a marca d'água é truncada para valer exatamente como consultada
+    now = datetime.now(timezone.utc) - safety_lag
+    until = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    ranges = id_ranges(parts or parallel)
+    extension = f".{fmt}{EXTENSIONS[compression]}"
+    paths = [os.path.join(output_dir, f"ratings-part-{index:05d}{extension}") for index in range(len(ranges))]
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="rating-export") as executor:
+        counts = list(executor.map(
+            lambda args: export_range(repository, args[0], args[1], fmt, compression, since, until, batch_size),
+            zip(paths, ranges)
+        ))
+    elapsed = time.monotonic() - started
+
+    manifest = {
+        "format": fmt,
+        "compression": compression,
+        "since": since.isoformat() if since else None,
+        "watermark": until.isoformat(),
+        "safety_lag_seconds": safety_lag.total_seconds(),
+        "rows": sum(counts),
+        "parts": [
+            {
+                "file": os.path.basename(path),
+                "id_from": lower,
+                "id_to": upper,
+                "rows": rows,
+                "bytes": os.path.getsize(path)
+            }
+            for path, (lower, upper), rows in zip(paths, ranges, counts)
+        ]
+    }
+    with open(os.path.join(output_dir, MANIFEST), "w", encoding="utf-8") as stream:
+        json.dump(manifest, stream, indent=2)
+    rate = manifest["rows"] / elapsed if elapsed else 0.0
+    print(f"exported {manifest['rows']} rows in {len(paths)} parts in {elapsed:.1f}s ({rate:.0f} rows/s)", file=out)
+    return manifest
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir", help="Directory for the part files and manifest.json")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--compression", choices=list(EXTENSIONS), default="gzip")
+    parser.add_argument("--parallel", type=int, default=8, help="Concurrent range scans")
+    parser.add_argument("--parts", type=int, help="Number of _id ranges / part files (default: --parallel)")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Cursor batch size")
+    parser.add_argument(
+        "--safety-lag", type=float, default=DEFAULT_SAFETY_LAG.total_seconds(),
+        help="Seconds subtracted from the watermark for inserts still in flight"
+    )
+    since = parser.add_mutually_exclusive_group()
+    since.add_argument("--since", type=datetime.fromisoformat, help="Only ratings created at or after this ISO 8601 time")
+    since.add_argument("--since-manifest", help="Only ratings created after the watermark of a previous export")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    since_value = read_watermark(args.since_manifest) if args.since_manifest else args.since
+    if since_value is not None and since_value.tzinfo is None:
+        since_value = since_value.replace(tzinfo=timezone.utc)
+    export_ratings(
+        args.output_dir,
+        get_rating_repository(),
+        fmt=args.format,
+        compression=args.compression,
+        parallel=args.parallel,
+        parts=args.parts,
+        since=since_value,
+        batch_size=args.batch_size,
+        safety_lag=timedelta(seconds=args.safety_lag)
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
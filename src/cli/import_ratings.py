@@ -0,0 +1,294 @@
+"""
+Streaming bulk import of ratings from CSV or NDJSON files (optionally gzipped).
+
+Rows are read one at a time, validated with the same rules as RatingCreate
+and written in unordered insert_many batches by a pool of worker threads,
+with a bounded number of batches in flight so memory stays flat whatever
+the file size. Progress is checkpointed next to the input file; an
+interrupted import resumes after the last contiguous batch written.
+
+Columns/keys: professional_id, consumer_id, rate, description (optional),
+created_at (optional, ISO 8601; defaults to now) and _id or id (optional).
+Rows without an ID get one derived from the file's content hash and the
+row number, so batches replayed after a crash are skipped as duplicates
+while different files (even with the same name) never share IDs.
+
+Usage: python -m src.cli.import_ratings ratings.ndjson [--batch-size 1000] [--workers 4]
+"""
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from uuid import UUID, uuid5
+from pydantic import ValidationError
+from src.api.v1.schemas.rating import RatingCreate
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.infrastructure.repositories.rating_repository import get_rating_repository
+
+logger = logging.getLogger(__name__)
+
+# Namespace fixo: o mesmo conteúdo gera sempre os mesmos _id
+IMPORT_NAMESPACE = UUID("bb57e954-ab1e-4445-b0a2-5c06c0b887e5")
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "ndjson"}
+
+@dataclass
+class ImportStats:
+    """Totals of an import run; written counts include batches from a resumed checkpoint."""
+    read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    rejected: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+def detect_format(path: str) -> str:
+    """Input format from the file extension, ignoring a trailing .gz."""
+    name = path[:-3] if path.endswith(".gz") else path
+    fmt = FORMATS.get(os.path.splitext(name)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Cannot detect the format of {path}; use --format")
+    return fmt
+
+def open_input(path: str) -> TextIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+def file_identity(path: str) -> str:
+    """Content hash of the input file (as stored, compressed or not)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for block in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+def read_records(path: str, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (record number, row, parse error) lazily; records are numbered from 1."""
+    with open_input(path) as stream:
+        if fmt == "csv":
+            for record, row in enumerate(csv.DictReader(stream), start=1):
+                yield record, row, None
+            return
+        record = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            record += 1
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield record, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield record, None, "expected a JSON object"
+                continue
+            yield record, row, None
+
+def to_document(row: Dict[str, Any], record: int, source: str) -> Dict[str, Any]:
+    """Validate a row like POST /ratings/ does and build the document to insert."""
+    # Em CSV os campos vazios chegam como ""
+    values = {key: (value if value != "" else None) for key, value in row.items()}
+    rating = RatingCreate(
+        professional_id=values.get("professional_id"),
+        consumer_id=values.get("consumer_id"),
+        rate=values.get("rate"),
+        description=values.get("description")
+    )
+    rating_id = values.get("_id") or values.get("id")
+    created_at = values.get("created_at")
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    else:
+        created_at = datetime.fromisoformat(str(created_at))
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+    return {
+        "_id": str(UUID(str(rating_id))) if rating_id else str(uuid5(IMPORT_NAMESPACE, f"{source}:{record}")),
+        "professional_id": str(rating.professional_id),
+        "consumer_id": str(rating.consumer_id),
+        "rate": rating.rate,
+        "description": rating.description,
+        "created_at": created_at
+    }
+
+class _Watermark:
+    """Highest record such that every batch up to it has been written.
+
+    Batches finish out of order; the watermark only moves over a contiguous
+    prefix, so a checkpoint never skips an unwritten batch.
+    """
+    def __init__(self, record: int, totals: Dict[str, int]):
+        self.record = record
+        self.totals = Counter(totals)
+        self._done: Dict[int, Tuple[int, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, first: int, last: int, counts: Dict[str, int]) -> None:
+        with self._lock:
+            self._done[first] = (last, counts)
+            while self.record + 1 in self._done:
+                last, counts = self._done.pop(self.record + 1)
+                self.record = last
+                self.totals.update(counts)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"record": self.record, **self.totals}
+
+def load_checkpoint(path: str, source: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as stream:
+        checkpoint = json.load(stream)
+    if checkpoint.get("source") != source:
+        raise ValueError(f"Checkpoint {path} belongs to another file ({checkpoint.get('source')}, not {source}); use --restart")
+    return checkpoint
+
+def save_checkpoint(path: str, source: str, state: Dict[str, Any]) -> None:
+    # Escrita atômica: um checkpoint truncado nunca substitui o anterior
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as stream:
+        json.dump({"source": source, **state}, stream)
+    os.replace(tmp, path)
+
+def import_file(
+    path: str,
+    repository: RatingRepository,
+    fmt: Optional[str] = None,
+    batch_size: int = 1000,
+    workers: int = 4,
+    checkpoint_path: Optional[str] = None,
+    rejects_path: Optional[str] = None,
+    resume: bool = True,
+    report_every: float = 5.0,
+    out: TextIO = sys.stdout
+) -> ImportStats:
+    """Import a rating file; see the module docstring."""
+    fmt = fmt or detect_format(path)
+    # O conteúdo, e não o nome, identifica o arquivo: dois "ratings.ndjson" diferentes não colidem
+    source = file_identity(path)
+    checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path, source) if resume else None
+    start_after = checkpoint["record"] if checkpoint else 0
+    totals = {key: checkpoint.get(key, 0) for key in ("inserted", "duplicates", "invalid", "rejected")} if checkpoint else {}
+    watermark = _Watermark(start_after, totals)
+    if start_after:
+        print(f"resuming after record {start_after}", file=out)
+
+    failures: List[BaseException] = []
+    slots = threading.BoundedSemaphore(workers * 2)
+    rejects = open(rejects_path, "a", encoding="utf-8") if rejects_path else None
+
+    def write(first: int, last: int, docs: List[Dict[str, Any]], invalid: int) -> None:
+        try:
+            inserted, duplicates, rejected = repository.insert_ratings(docs)
+            watermark.complete(first, last, {
+                "inserted": len(inserted),
+                "duplicates": duplicates,
+                "invalid": invalid,
+                "rejected": rejected
+            })
+        except BaseException as e:
+            failures.append(e)
+        finally:
+            slots.release()
+
+    stats = ImportStats()
+    started = last_report = time.monotonic()
+    batch: List[Dict[str, Any]] = []
+    batch_first, batch_invalid = None, 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rating-import") as executor:
+            def submit(last: int) -> None:
+                # Limita os lotes em memória: a leitura espera quando os workers estão ocupados
+                slots.acquire()
+                executor.submit(write, batch_first, last, batch, batch_invalid)
+
+            last_record = start_after
+            for record, row, error in read_records(path, fmt):
+                if record <= start_after:
+                    continue
+                if failures:
+                    break
+                stats.read += 1
+                last_record = record
+                if batch_first is None:
+                    batch_first = record
+                try:
+                    if error is not None:
+                        raise ValueError(error)
+                    batch.append(to_document(row, record, source))
+                except (ValueError, ValidationError) as e:
+                    batch_invalid += 1
+                    if rejects is not None:
+                        rejects.write(json.dumps({"record": record, "error": str(e), "row": row}, default=str) + "\n")
+                if record - batch_first + 1 >= batch_size:
+                    submit(record)
+                    batch, batch_first, batch_invalid = [], None, 0
+                now = time.monotonic()
+                if now - last_report >= report_every:
+                    last_report = now
+                    save_checkpoint(checkpoint_path, source, watermark.snapshot())
+                    print(f"{stats.read} rows read, {stats.read / (now - started):.0f} rows/s", file=out)
+            if batch_first is not None and not failures:
+                submit(last_record)
+    finally:
+        if rejects is not None:
+            rejects.close()
+        save_checkpoint(checkpoint_path, source, watermark.snapshot())
+    if failures:
+        raise failures[0]
+
+    stats.elapsed = time.monotonic() - started
+    totals = watermark.totals
+    stats.inserted, stats.duplicates = totals["inserted"], totals["duplicates"]
+    stats.invalid, stats.rejected = totals["invalid"], totals["rejected"]
+    print(
+        f"done: {stats.read} rows in {stats.elapsed:.1f}s ({stats.rows_per_second:.0f} rows/s), "
+        f"{stats.inserted} inserted, {stats.duplicates} duplicates, {stats.invalid} invalid, {stats.rejected} rejected",
+        file=out
+    )
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or NDJSON file, optionally .gz")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Input format (default: from the extension)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per insert_many")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent insert_many batches")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint)")
+    parser.add_argument("--rejects", help="Append invalid rows, with the reason, to this NDJSON file")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    import_file(
+        args.path,
+        get_rating_repository(),
+        fmt=args.format,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        rejects_path=args.rejects,
+        resume=not args.restart
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
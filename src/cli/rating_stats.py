@@ -0,0 +1,72 @@
+"""
+Per-professional rating statistics computed over the whole collection.
+
+professional_id, rate and created_at are read in large raw batches into
+NumPy arrays and aggregated with vectorized group-bys: count, mean,
+variance, percentiles, Wilson score interval of the share of positive
+ratings and first/last rating time. Prints the best professionals by the
+lower Wilson bound and optionally writes every professional as NDJSON.
+
+Usage: python -m src.cli.rating_stats [--top 20] [--min-count 5] [--output stats.ndjson]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import List, Optional, TextIO
+from src.application.analytics.rating_stats import load_rating_columns, professional_stats
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.infrastructure.repositories.rating_repository import get_rating_repository
+
+def compute_stats(
+    repository: RatingRepository,
+    top: int = 20,
+    min_count: int = 1,
+    output_path: Optional[str] = None,
+    batch_size: int = 50000,
+    out: TextIO = sys.stdout
+):
+    """Load the columns, compute the statistics and report; returns the ProfessionalStats."""
+    started = time.monotonic()
+    columns = load_rating_columns(repository, batch_size)
+    loaded = time.monotonic()
+    stats = professional_stats(columns)
+    computed = time.monotonic()
+    print(
+        f"{len(columns)} ratings of {len(columns.professional_ids)} professionals: "
+        f"loaded in {loaded - started:.1f}s, aggregated in {computed - loaded:.2f}s",
+        file=out
+    )
+    for row in stats.top_by_wilson(top, min_count):
+        print(
+            f"{row['professional_id']}  n={row['count']:<7} mean={row['mean']:.2f} "
+            f"wilson=[{row['wilson_lower']:.3f}, {row['wilson_upper']:.3f}]",
+            file=out
+        )
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as stream:
+            for index in range(len(stats.professional_ids)):
+                stream.write(json.dumps(stats.row(index), separators=(",", ":")) + "\n")
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=20, help="Professionals to print, best lower Wilson bound first")
+    parser.add_argument("--min-count", type=int, default=1, help="Minimum ratings to appear in the ranking")
+    parser.add_argument("--output", help="Write the statistics of every professional to this NDJSON file")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Documents per raw batch")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    compute_stats(
+        get_rating_repository(),
+        top=args.top,
+        min_count=args.min_count,
+        output_path=args.output,
+        batch_size=args.batch_size
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
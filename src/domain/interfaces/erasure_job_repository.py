@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+from typing import Any, Dict, List, Optional
+from src.domain.value_objects.erasure_job import ErasureScope
+
+class ErasureJobRepository(ABC):
+    """Persistent state of bulk erasure jobs, so they survive restarts."""
+
+    @abstractmethod
+    def create_job(self, scope: ErasureScope, subject_id: UUID) -> Dict[str, Any]:
+        """Create a pending job, or return the active job already erasing this subject."""
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a job by its ID."""
+        pass
+
+    @abstractmethod
+    def claim_job(self, job_id: UUID, owner: str, stale_before: datetime) -> Optional[Dict[str, Any]]:
+        """Atomically take a pending job, or a running one whose heartbeat is older than stale_before."""
+        pass
+
+    @abstractmethod
+    def save_pending_chunk(self, job_id: UUID, owner: str, chunk: List[Dict[str, Any]]) -> bool:
+        """Record the chunk about to be deleted; False if the job is no longer owned."""
+        pass
+
+    @abstractmethod
+    def mark_chunk_deleted(self, job_id: UUID, owner: str, deleted: List[Dict[str, Any]]) -> bool:
+        """Record which ratings of the pending chunk were deleted; False if the job is no longer owned."""
+        pass
+
+    @abstractmethod
+    def complete_chunk(self, job_id: UUID, owner: str, last_id: str, deleted: int) -> bool:
+        """Advance the job past a deleted chunk; False if the job is no longer owned."""
+        pass
+
+    @abstractmethod
+    def finish_job(self, job_id: UUID, owner: str, error: Optional[str] = None) -> None:
+        """Mark a job completed, or failed when error is given."""
+        pass
+
+    @abstractmethod
+    def list_resumable(self, stale_before: datetime) -> List[UUID]:
+        """IDs of pending jobs and running jobs with a stale heartbeat."""
+        pass
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+from typing import Any, Dict, List, Optional
+
+class FlaggedConsumerRepository(ABC):
+    """Consumers flagged by the offline rating-burst detection."""
+
+    @abstractmethod
+    def is_flagged(self, consumer_id: UUID) -> bool:
+        """Whether a consumer is currently flagged (one lookup by _id)."""
+        pass
+
+    @abstractmethod
+    def get_flag(self, consumer_id: UUID) -> Optional[Dict[str, Any]]:
+        """The flag of a consumer, with the burst that triggered it, or None."""
+        pass
+
+    @abstractmethod
+    def save_flags(self, flags: List[Dict[str, Any]], replace: bool = False) -> int:
+        """Upsert flags keyed by consumer_id; with replace, drop flags not in the list. Returns flags written."""
+        pass
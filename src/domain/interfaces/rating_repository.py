@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
+from datetime import datetime
+from src.domain.value_objects.trend_period import TrendGranularity
+from src.domain.value_objects.rating_filters import RatingFilters
 
 class RatingRepository(ABC):
     """Repository interface for ratings."""
@@ -10,17 +13,79 @@ class RatingRepository(ABC):
         """Create a new rating in the database."""
         pass
 
+    @abstractmethod
+    def insert_ratings(self, docs: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], int, int]:
+        """Bulk insert prepared documents; returns (inserted documents, duplicate _ids, rejected)."""
+        pass
+
     @abstractmethod
     def get_rating_by_id(self, rating_id: UUID) -> Optional[Dict[str, Any]]:
         """Get a rating by its ID."""
         pass
 
     @abstractmethod
-    def list_ratings_by_professional(self, professional_id: UUID) -> List[Dict[str, Any]]:
+    def get_ratings_by_ids(self, rating_ids: List[UUID]) -> List[Dict[str, Any]]:
+        """Get several ratings at once, in any order; missing IDs are omitted."""
+        pass
+
+    @abstractmethod
+    def rating_exists(self, rating_id: UUID) -> bool:
+        """Check whether a rating exists."""
+        pass
+
+    @abstractmethod
+    def get_version(self, scope: str, entity_id: UUID) -> int:
+        """Get the write counter of a professional or consumer (scope)."""
+        pass
+
+    @abstractmethod
+    def list_ratings_by_professional(self, professional_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
         """List ratings for a professional, ordered by created_at descending."""
         pass
 
     @abstractmethod
-    def list_ratings_by_consumer(self, consumer_id: UUID, page: int = 1, size: int = 10) -> tuple[List[Dict[str, Any]], int]:
+    def list_ratings_by_consumer(self, consumer_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
         """List ratings made by a consumer, ordered by created_at descending."""
-        pass 
\ No newline at end of file
+        pass 
+
+    @abstractmethod
+    def list_trend_buckets(self, professional_id: UUID, granularity: TrendGranularity, first_period: str, last_period: str) -> List[Dict[str, Any]]:
+        """List a professional's trend buckets between two period keys, in period order."""
+        pass
+
+    @abstractmethod
+    def rebuild_trend_buckets(self, professional_ids: Optional[List[UUID]] = None) -> int:
+        """Recompute trend buckets from stored ratings (all or some professionals); returns buckets written."""
+        pass
+
+    @abstractmethod
+    def iter_ratings(
+        self,
+        id_from: Optional[str] = None,
+        id_to: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream ratings in an _id range (and created_at window): in _id order, or (created_at, _id) order with created_from."""
+        pass
+
+    @abstractmethod
+    def iter_field_batches(self, fields: List[str], batch_size: int = 50000, query: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Stream raw documents projected to fields, in batches, for columnar analytics."""
+        pass
+
+    @abstractmethod
+    def next_ratings_chunk(self, scope: str, entity_id: UUID, after_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Next ratings of a professional or consumer (scope) with _id above after_id, in _id order."""
+        pass
+
+    @abstractmethod
+    def delete_ratings_chunk(self, scope: str, entity_id: UUID, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Delete the ratings of a chunk from next_ratings_chunk that still exist; returns them."""
+        pass
+
+    @abstractmethod
+    def apply_deleted_ratings(self, docs: List[Dict[str, Any]]) -> None:
+        """Update derived data (write counters, trends) for ratings removed by delete_ratings_chunk."""
+        pass
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Tuple
+
+class RatingSearch(ABC):
+    """Full-text search over rating descriptions."""
+
+    @abstractmethod
+    def search(self, query: str, professional_id: Optional[UUID] = None, page: int = 1, size: int = 10) -> Tuple[List[Tuple[UUID, float]], int]:
+        """Return (rating_id, score) pairs for a page, most relevant first, and the total number of matches."""
+        pass
+
+    @abstractmethod
+    def index_rating(self, rating: Dict[str, Any]) -> None:
+        """Make a newly created rating searchable."""
+        pass
+
+    @abstractmethod
+    def remove_rating(self, rating_id: UUID) -> None:
+        """Remove a deleted rating from the results."""
+        pass
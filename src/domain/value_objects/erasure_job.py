@@ -0,0 +1,15 @@
+from enum import Enum
+
+class ErasureScope(str, Enum):
+    """Whose ratings a bulk erasure removes."""
+    PROFESSIONAL = "professional"
+    CONSUMER = "consumer"
+
+class ErasureStatus(str, Enum):
+    """Lifecycle of a bulk erasure job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+ACTIVE_ERASURE_STATUSES = (ErasureStatus.PENDING, ErasureStatus.RUNNING)
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+# Valores possíveis de uma avaliação
+RATE_VALUES = range(0, 6)
+
+@dataclass(frozen=True)
+class RatingFilters:
+    """Optional restrictions applied to rating listings.
+
+    `created_after` is inclusive and `created_before` exclusive, so
+    consecutive windows never overlap; both are normalized to aware UTC
+    (naive values are taken as UTC). Instances are hashable and take part
+    in listing cache keys.
+    """
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    min_rate: Optional[int] = None
+    max_rate: Optional[int] = None
+    rate_in: Optional[Tuple[int, ...]] = None
+
+    def __post_init__(self):
+        # Limites sem fuso são UTC: comparar/consultar mistura de naive e aware falharia
+        for field in ("created_after", "created_before"):
+            moment = getattr(self, field)
+            if moment is not None:
+                object.__setattr__(self, field, _as_utc(moment))
+
+    def is_empty(self) -> bool:
+        return (
+            self.created_after is None
+            and self.created_before is None
+            and not self.has_rate_filter()
+        )
+
+    def has_rate_filter(self) -> bool:
+        return self.min_rate is not None or self.max_rate is not None or self.rate_in is not None
+
+    def allowed_rates(self) -> Optional[List[int]]:
+        """Discrete rate values admitted by the rate filters, or None when unrestricted.
+
+        Rates are integers from 0 to 5, so any combination of bounds and sets
+        reduces to a short `$in` list. Equality points on `rate` (instead of a
+        range) let the (<entity>_id, rate, created_at) indexes serve the
+        created_at sort by merging one index scan per value.
+        """
+        if not self.has_rate_filter():
+            return None
+        low = self.min_rate if self.min_rate is not None else RATE_VALUES.start
+        high = self.max_rate if self.max_rate is not None else RATE_VALUES.stop - 1
+        allowed = [rate for rate in RATE_VALUES if low <= rate <= high]
+        if self.rate_in is not None:
+            allowed = [rate for rate in allowed if rate in self.rate_in]
+        return allowed
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
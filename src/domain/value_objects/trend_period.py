@@ -0,0 +1,57 @@
+from datetime import MAXYEAR, MINYEAR, datetime, timedelta, timezone
+from enum import Enum
+from typing import List
+
+class TrendGranularity(str, Enum):
+    """Size of the time buckets used for rating trends."""
+    DAY = "day"
+    MONTH = "month"
+
+def period_start(moment: datetime, granularity: TrendGranularity) -> datetime:
+    """Start (UTC) of the bucket containing moment; naive datetimes are taken as UTC."""
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    if granularity == TrendGranularity.DAY:
+        return datetime(moment.year, moment.month, moment.day, tzinfo=timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+def next_period(start: datetime, granularity: TrendGranularity) -> datetime:
+    """Start of the bucket after start; ValueError past year 9999."""
+    if start.year == MAXYEAR and start.month == 12 and (granularity == TrendGranularity.MONTH or start.day == 31):
+        raise ValueError(f"No {granularity.value} bucket after {start.date()}")
+    if granularity == TrendGranularity.DAY:
+        return start + timedelta(days=1)
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+def previous_period(start: datetime, granularity: TrendGranularity) -> datetime:
+    """Start of the bucket before start; ValueError before year 1."""
+    if start.year == MINYEAR and start.month == 1 and (granularity == TrendGranularity.MONTH or start.day == 1):
+        raise ValueError(f"No {granularity.value} bucket before {start.date()}")
+    if granularity == TrendGranularity.DAY:
+        return start - timedelta(days=1)
+    return datetime(start.year - (start.month == 1), (start.month - 2) % 12 + 1, 1, tzinfo=timezone.utc)
+
+def period_key(moment: datetime, granularity: TrendGranularity) -> str:
+    """Sortable bucket key: YYYY-MM-DD for days, YYYY-MM for months."""
+    start = period_start(moment, granularity)
+    return start.strftime("%Y-%m-%d" if granularity == TrendGranularity.DAY else "%Y-%m")
+
+def period_count(start: datetime, end: datetime, granularity: TrendGranularity) -> int:
+    """Number of buckets overlapping [start, end], computed without enumerating them."""
+    first = period_start(start, granularity)
+    last = period_start(end, granularity)
+    if granularity == TrendGranularity.DAY:
+        return max((last - first).days + 1, 0)
+    return max((last.year - first.year) * 12 + last.month - first.month + 1, 0)
+
+def period_starts(start: datetime, end: datetime, granularity: TrendGranularity) -> List[datetime]:
+    """Starts of every bucket overlapping [start, end]; size request ranges with period_count first."""
+    current = period_start(start, granularity)
+    last = period_start(end, granularity)
+    if current > last:
+        return []
+    starts = [current]
+    # Para no último bucket, sem calcular o seguinte (que pode passar do ano 9999)
+    while current < last:
+        current = next_period(current, granularity)
+        starts.append(current)
+    return starts
@@ -0,0 +1,54 @@
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseSettings, Field
+
+class Settings(BaseSettings):
+    """Application settings, read from environment variables and the .env file."""
+    list_cache_enabled: bool = Field(True, description="Enable the listing page cache")
+    list_cache_max_entries: int = Field(10000, description="Maximum number of cached listing pages")
+    list_cache_max_bytes: int = Field(64 * 1024 * 1024, description="Approximate memory bound of the listing page cache")
+    single_flight_enabled: bool = Field(True, description="Share one repository call among identical concurrent reads")
+    stale_while_revalidate: str = Field("", description="Per-endpoint stale-while-revalidate TTLs: endpoint=fresh:stale seconds, comma separated (professional_listing, consumer_listing, trend)")
+    stale_refresh_workers: int = Field(2, description="Threads running stale-while-revalidate background refreshes")
+    compression_enabled: bool = Field(True, description="Compress listing responses")
+    compression_min_size: int = Field(1024, description="Smallest body, in bytes, worth compressing")
+    compression_encodings: str = Field("zstd,br,gzip", description="Supported encodings in server preference order")
+    compression_gzip_level: int = Field(6, description="gzip compression level (1-9)")
+    compression_brotli_quality: int = Field(5, description="Brotli quality (0-11)")
+    compression_zstd_level: int = Field(3, description="Zstandard compression level")
+    rating_repository_backend: str = Field("mongo", description="Rating storage: mongo, sqlite for single-node installs, or memory for tests and single-process edge nodes")
+    sqlite_path: str = Field("ratings.db", description="Database file of the sqlite rating backend")
+    search_backend: str = Field("auto", description="Full-text search backend: auto, mongo or memory")
+    search_text_language: str = Field("portuguese", description="Language of the MongoDB text index")
+    erasure_chunk_size: int = Field(500, description="Ratings removed per delete_many during a bulk erasure")
+    erasure_chunk_pause_ms: int = Field(50, description="Pause between erasure chunks, to spread lock and replication load")
+    erasure_lease_seconds: int = Field(60, description="Seconds without a heartbeat before another process resumes an erasure job")
+    flagged_consumer_policy: str = Field("log", description="Writes by consumers flagged for rating bursts: off, log or reject")
+    mongodb_max_pool_size: int = Field(50, description="Maximum MongoDB connections per worker process")
+    mongodb_min_pool_size: int = Field(0, description="MongoDB connections kept open per worker process")
+    slow_query_log_enabled: bool = Field(True, description="Record MongoDB commands slower than the threshold")
+    slow_query_threshold_ms: float = Field(100.0, description="Duration, in milliseconds, from which a MongoDB command is logged as slow")
+    slow_query_log_size: int = Field(500, description="Slow commands kept for the admin endpoint")
+    slow_query_max_shapes: int = Field(1000, description="Distinct slow query shapes aggregated")
+    error_log_interval_seconds: float = Field(60.0, description="Seconds between stack traces logged for the same error signature")
+    admission_control_enabled: bool = Field(True, description="Shed requests over the per-route-group limits with 503")
+    admission_limits: str = Field(
+        "writes=16:32:250,reads_by_id=32:64:50,listings=16:32:150,exports=2:2:5000",
+        description="Per route group: group=concurrency:queue:target p90 latency in ms, comma separated"
+    )
+    admission_queue_timeout_ms: float = Field(1000.0, description="Longest wait, in milliseconds, for a slot before a queued request is shed")
+    admission_retry_after_seconds: int = Field(1, description="Retry-After of the 503 sent to shed requests")
+    server_host: str = Field("0.0.0.0", description="Production server bind address")
+    server_port: int = Field(8000, description="Production server port")
+    web_concurrency: Optional[int] = Field(None, description="Number of worker processes (defaults to the CPU count)")
+    server_backlog: int = Field(2048, description="Listen socket backlog")
+    server_keepalive: int = Field(5, description="Seconds to keep idle HTTP connections open")
+    server_timeout: int = Field(30, description="Seconds before a silent worker is restarted")
+    server_graceful_timeout: int = Field(30, description="Seconds given to workers to finish on shutdown")
+
+    class Config:
+        env_file = ".env"
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
@@ -1,6 +1,8 @@
 from pymongo import MongoClient, ASCENDING, DESCENDING
 from pymongo.errors import CollectionInvalid
 from src.infrastructure.database.mongo_config import MongoConfig
+from src.infrastructure.database.slow_query_log import SlowQueryListener, get_slow_query_log
+from src.infrastructure.config.settings import get_settings
 import uuid
 import logging
 
@@ -21,6 +23,19 @@ RATINGS_VALIDATOR = {
     }
 }
 
+RATINGS_INDEXES = [
+    # Lotes da exclusão em massa: igualdade na entidade e faixa de _id já ordenada, sem SORT em memória
+    [("professional_id", ASCENDING), ("_id", ASCENDING)],
+    [("consumer_id", ASCENDING), ("_id", ASCENDING)],
+    [("professional_id", DESCENDING), ("created_at", DESCENDING)],
+    [("consumer_id", DESCENDING), ("created_at", DESCENDING)],
+    # Filtros por nota: igualdade (via $in) em rate antes da ordenação por created_at
+    [("professional_id", DESCENDING), ("rate", ASCENDING), ("created_at", DESCENDING)],
+    [("consumer_id", DESCENDING), ("rate", ASCENDING), ("created_at", DESCENDING)],
+    # Exportações incrementais: janela de created_at, filtrando a faixa de _id na própria chave
+    [("created_at", ASCENDING), ("_id", ASCENDING)],
+]
+
 _mongo_client = None
 
 def get_mongo_client():
@@ -28,7 +43,16 @@ def get_mongo_client():
     if _mongo_client is None:
         uri = MongoConfig.get_uri()
         logger.info(f"Connecting to MongoDB with URI: {uri}")
-        _mongo_client = MongoClient(uri, port=27017)
+        settings = get_settings()
+        slow_query_log = get_slow_query_log()
+        # Cada processo worker cria o seu próprio pool (o MongoClient não sobrevive a um fork)
+        _mongo_client = MongoClient(
+            uri,
+            port=27017,
+            maxPoolSize=settings.mongodb_max_pool_size,
+            minPoolSize=settings.mongodb_min_pool_size,
+            event_listeners=[SlowQueryListener(slow_query_log)] if slow_query_log is not None else []
+        )
     return _mongo_client
 
 def set_mongo_client(client):
@@ -53,7 +77,41 @@ def get_ratings_collection():
             pass
     # Ensure indexes
     coll = db[coll_name]
-    coll.create_index([("professional_id", ASCENDING)])
-    coll.create_index([("consumer_id", ASCENDING)])
-    coll.create_index([("professional_id", DESCENDING), ("created_at", DESCENDING)])
-    return coll 
\ No newline at end of file
+    ensure_ratings_indexes(coll)
+    return coll
+
+def ensure_ratings_indexes(coll):
+    """Create the indexes backing every listing query shape."""
+    for keys in RATINGS_INDEXES:
+        coll.create_index(keys) 
+
+def get_rating_versions_collection():
+    """Per-professional/consumer write counters used to version listings."""
+    client = get_mongo_client()
+    return client["easyprofind"]["rating_versions"]
+
+def get_rating_trends_collection():
+    """Per-professional daily/monthly rating buckets (count, sum, histogram)."""
+    client = get_mongo_client()
+    coll = client["easyprofind"]["rating_trends"]
+    ensure_rating_trends_indexes(coll)
+    return coll
+
+def ensure_rating_trends_indexes(coll):
+    """Create the index backing trend bucket range reads."""
+    coll.create_index([("professional_id", ASCENDING), ("granularity", ASCENDING), ("period", ASCENDING)])
+
+def get_erasure_jobs_collection():
+    """Bulk erasure jobs: status, progress cursor and the chunk in flight."""
+    client = get_mongo_client()
+    coll = client["easyprofind"]["rating_erasure_jobs"]
+    coll.create_index([("scope", ASCENDING), ("subject_id", ASCENDING), ("status", ASCENDING)])
+    coll.create_index([("status", ASCENDING), ("heartbeat_at", ASCENDING)])
+    # Presente só enquanto o job está ativo: no máximo um job ativo por sujeito
+    coll.create_index([("active_subject", ASCENDING)], unique=True, sparse=True)
+    return coll
+
+def get_flagged_consumers_collection():
+    """Consumers flagged for rating bursts, keyed by consumer_id (_id)."""
+    client = get_mongo_client()
+    return client["easyprofind"]["flagged_consumers"]
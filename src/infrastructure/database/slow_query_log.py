@@ -0,0 +1,218 @@
+import json
+import logging
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo import monitoring
+from src.infrastructure.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Rota (método e modelo do caminho) da requisição em andamento; definida pelo RouteContextMiddleware
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+# Campos de cada comando que descrevem a consulta; os demais (sessão, cluster time...) são ignorados
+SHAPE_FIELDS = {
+    "find": ("filter", "sort", "projection", "hint", "skip", "limit"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+    "findAndModify": ("query", "sort", "update"),
+    "insert": (),
+    "getMore": ()
+}
+# Campos mantidos como enviados: descrevem a forma da consulta, não dados
+LITERAL_FIELDS = ("sort", "projection", "hint", "key")
+
+def normalize(value: Any) -> Any:
+    """Replace every literal with "?", keeping field names, operators and nesting.
+
+    Lists collapse to their distinct element shapes, so an $in over 3 or 300
+    IDs has the same shape.
+    """
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes, seen = [], set()
+        for item in value:
+            shape = normalize(item)
+            marker = json.dumps(shape, sort_keys=True)
+            if marker not in seen:
+                seen.add(marker)
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+def _normalize_stage(stage: Dict[str, Any]) -> Dict[str, Any]:
+    """Aggregation stage shape: $match and $skip/$limit carry data, the other stages are code."""
+    return {
+        name: normalize(spec) if name in ("$match", "$skip", "$limit") else spec
+        for name, spec in stage.items()
+    }
+
+def command_shape(command_name: str, command: Dict[str, Any], database: Optional[str] = None) -> str:
+    """Normalized text of a command: name, namespace and the shape of its query fields."""
+    collection = command.get(command_name)
+    parts = {}
+    for field in SHAPE_FIELDS.get(command_name, ()):
+        if field not in command:
+            continue
+        value = command[field]
+        if field in LITERAL_FIELDS:
+            parts[field] = value
+        elif field == "pipeline":
+            parts[field] = [_normalize_stage(stage) for stage in value]
+        else:
+            parts[field] = normalize(value)
+    if command_name == "getMore":
+        collection = command.get("collection")
+    shape = f"{command_name} {database or command.get('$db')}.{collection}"
+    if parts:
+        shape += " " + json.dumps(parts, separators=(",", ":"), default=str)
+    return shape
+
+def documents_returned(reply: Dict[str, Any]) -> Optional[int]:
+    """Documents in the reply: the cursor batch for reads, n for counts and writes."""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        if batch is not None:
+            return len(batch)
+    if "n" in reply:
+        return reply["n"]
+    return None
+
+class SlowQueryLog:
+    """Bounded record of MongoDB commands slower than a threshold.
+
+    The last max_entries slow commands are kept in a ring buffer, and every
+    shape seen is aggregated (count, total and max duration, documents
+    returned, routes), so the top offenders stay visible after their
+    entries rotate out. At most max_shapes shapes are tracked; when full,
+    the one with the least total time makes room.
+    """
+    def __init__(self, threshold_ms: float, max_entries: int = 500, max_shapes: int = 1000):
+        self.threshold_ms = threshold_ms
+        self.max_shapes = max_shapes
+        self._entries: deque = deque(maxlen=max_entries)
+        self._shapes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.recorded += 1
+            self._entries.append(entry)
+            aggregate = self._shapes.get(entry["shape"])
+            if aggregate is None:
+                if len(self._shapes) >= self.max_shapes:
+                    del self._shapes[min(self._shapes, key=lambda shape: self._shapes[shape]["total_ms"])]
+                aggregate = self._shapes[entry["shape"]] = {
+                    "shape": entry["shape"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "docs_returned": 0,
+                    "errors": 0,
+                    "routes": Counter()
+                }
+            aggregate["count"] += 1
+            aggregate["total_ms"] += entry["duration_ms"]
+            aggregate["max_ms"] = max(aggregate["max_ms"], entry["duration_ms"])
+            aggregate["docs_returned"] += entry["docs_returned"] or 0
+            aggregate["errors"] += entry["error"] is not None
+            aggregate["routes"][entry["route"]] += 1
+            aggregate["last_at"] = entry["at"]
+        logger.warning(f"Slow MongoDB command: {json.dumps(entry, default=str)}")
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """The latest slow commands, newest first."""
+        with self._lock:
+            return list(reversed(self._entries))[:limit]
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Shapes with the most total slow time."""
+        with self._lock:
+            ranked = sorted(self._shapes.values(), key=lambda aggregate: aggregate["total_ms"], reverse=True)[:limit]
+            return [
+                {**aggregate, "mean_ms": aggregate["total_ms"] / aggregate["count"], "routes": dict(aggregate["routes"])}
+                for aggregate in ranked
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._shapes.clear()
+            self.recorded = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "recorded": self.recorded,
+                "buffered": len(self._entries),
+                "max_entries": self._entries.maxlen,
+                "shapes": len(self._shapes)
+            }
+
+class SlowQueryListener(monitoring.CommandListener):
+    """PyMongo command listener feeding a SlowQueryLog.
+
+    started() only keeps a reference to the command and the current route;
+    the shape is computed for the commands that turn out to be slow.
+    Callbacks run in the thread issuing the command, so the route context
+    variable is the one of the request that sent it.
+    """
+    def __init__(self, log: SlowQueryLog):
+        self.log = log
+        self._pending: Dict[Tuple[Any, int], Tuple[Dict[str, Any], str, Optional[str]]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._pending[(event.connection_id, event.request_id)] = (event.command, event.database_name, current_route.get())
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is not None and event.duration_micros >= self.log.threshold_ms * 1000:
+            self._record(event, pending, documents_returned(event.reply), None)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is not None and event.duration_micros >= self.log.threshold_ms * 1000:
+            failure = event.failure if isinstance(event.failure, dict) else {}
+            self._record(event, pending, None, failure.get("codeName") or failure.get("errmsg") or "error")
+
+    def _record(self, event: Any, pending: Tuple[Dict[str, Any], str, Optional[str]], docs: Optional[int], error: Optional[str]) -> None:
+        command, database, route = pending
+        self.log.record({
+            "at": datetime.now(timezone.utc).isoformat(),
+            "command": event.command_name,
+            "shape": command_shape(event.command_name, command, database),
+            "duration_ms": event.duration_micros / 1000,
+            "docs_returned": docs,
+            "route": route,
+            "error": error
+        })
+
+_slow_query_log = None
+
+def get_slow_query_log() -> Optional[SlowQueryLog]:
+    """Process-wide slow-query log, or None when disabled by configuration."""
+    global _slow_query_log
+    settings = get_settings()
+    if not settings.slow_query_log_enabled:
+        return None
+    if _slow_query_log is None:
+        _slow_query_log = SlowQueryLog(
+            settings.slow_query_threshold_ms,
+            settings.slow_query_log_size,
+            settings.slow_query_max_shapes
+        )
+    return _slow_query_log
+
+def set_slow_query_log(log: Optional[SlowQueryLog]) -> None:
+    global _slow_query_log
+    _slow_query_log = log
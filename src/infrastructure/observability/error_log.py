@@ -0,0 +1,115 @@
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from src.infrastructure.config.settings import get_settings
+
+class ErrorLog:
+    """Rate-limited, deduplicated error logging.
+
+    Errors are grouped by signature: the exception type and the place that
+    reports it. The first error of a signature in each interval is logged
+    with its stack trace; the others in that interval only bump counters,
+    and the next logged one says how many were suppressed. During an error
+    storm the failing path then costs a dictionary update instead of
+    formatting and writing a traceback per request.
+    """
+    def __init__(self, interval: float = 60.0, max_signatures: int = 1000):
+        self.interval = interval
+        self.max_signatures = max_signatures
+        self._signatures: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.reported = 0
+        self.suppressed = 0
+
+    def report(self, logger: logging.Logger, exc: BaseException, message: str, where: Optional[str] = None, stack: bool = True) -> bool:
+        """Log message (with exc's stack trace) unless its signature was logged within the interval.
+
+        where identifies the reporting site; by default it is the caller's
+        file and line. Returns whether the error was logged.
+        """
+        if where is None:
+            caller = sys._getframe(1)
+            where = f"{caller.f_code.co_filename}:{caller.f_lineno}"
+        signature = (f"{type(exc).__module__}.{type(exc).__qualname__}", where)
+        now = time.monotonic()
+        with self._lock:
+            self.reported += 1
+            entry = self._signatures.get(signature)
+            if entry is None:
+                if len(self._signatures) >= self.max_signatures:
+                    # A assinatura vista há mais tempo dá lugar à nova
+                    del self._signatures[min(self._signatures, key=lambda key: self._signatures[key]["last_seen"])]
+                entry = self._signatures[signature] = {
+                    "count": 0,
+                    "suppressed": 0,
+                    "logged": 0,
+                    "last_logged": None,
+                    "first_seen": datetime.now(timezone.utc).isoformat()
+                }
+            entry["count"] += 1
+            entry["last_seen"] = now
+            entry["last_message"] = message
+            if entry["last_logged"] is not None and now - entry["last_logged"] < self.interval:
+                entry["suppressed"] += 1
+                self.suppressed += 1
+                return False
+            suppressed, entry["suppressed"] = entry["suppressed"], 0
+            entry["last_logged"] = now
+            entry["logged"] += 1
+        if suppressed:
+            message = f"{message} ({suppressed} similar errors suppressed in the last {self.interval:g}s)"
+        logger.error(message, exc_info=exc if stack else None)
+        return True
+
+    def stats(self, limit: int = 20) -> Dict[str, Any]:
+        """Totals and the most frequent signatures."""
+        with self._lock:
+            ranked = sorted(self._signatures.items(), key=lambda item: item[1]["count"], reverse=True)[:limit]
+            signatures: List[Dict[str, Any]] = [
+                {
+                    "exception": exception,
+                    "where": where,
+                    "count": entry["count"],
+                    "logged": entry["logged"],
+                    "suppressed_pending": entry["suppressed"],
+                    "first_seen": entry["first_seen"],
+                    "last_message": entry["last_message"]
+                }
+                for (exception, where), entry in ranked
+            ]
+            return {
+                "interval_seconds": self.interval,
+                "reported": self.reported,
+                "suppressed": self.suppressed,
+                "signatures": signatures
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._signatures.clear()
+            self.reported = 0
+            self.suppressed = 0
+
+_error_log = None
+_error_log_lock = threading.Lock()
+
+def get_error_log() -> ErrorLog:
+    """Process-wide error log, with the interval of the ERROR_LOG_INTERVAL_SECONDS setting."""
+    global _error_log
+    if _error_log is None:
+        with _error_log_lock:
+            if _error_log is None:
+                _error_log = ErrorLog(get_settings().error_log_interval_seconds)
+    return _error_log
+
+def set_error_log(error_log: Optional[ErrorLog]) -> None:
+    global _error_log
+    _error_log = error_log
+
+def report_error(logger: logging.Logger, exc: BaseException, message: str, stack: bool = True) -> bool:
+    """ErrorLog.report on the process-wide log, with the caller as the reporting site."""
+    caller = sys._getframe(1)
+    return get_error_log().report(logger, exc, message, f"{caller.f_code.co_filename}:{caller.f_lineno}", stack)
@@ -0,0 +1,133 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from src.domain.interfaces.erasure_job_repository import ErasureJobRepository
+from src.domain.value_objects.erasure_job import ErasureScope, ErasureStatus
+from src.domain.exceptions.base_exceptions import DatabaseException
+from src.infrastructure.database.mongo_client import get_erasure_jobs_collection
+from src.infrastructure.observability.error_log import report_error
+
+logger = logging.getLogger(__name__)
+
+class ErasureJobRepositoryImpl(ErasureJobRepository):
+    """MongoDB implementation of ErasureJobRepository."""
+    def __init__(self):
+        self.collection = get_erasure_jobs_collection()
+
+    def create_job(self, scope: ErasureScope, subject_id: UUID) -> Dict[str, Any]:
+        """Create a pending job, or return the active job already erasing this subject.
+
+        active_subject is set only while a job is active and carries a unique
+        index, so concurrent requests for the same subject cannot both insert.
+        """
+        active_subject = f"{scope.value}:{subject_id}"
+        try:
+            while True:
+                now = datetime.now(timezone.utc)
+                job = {
+                    "_id": str(uuid4()),
+                    "scope": scope.value,
+                    "subject_id": str(subject_id),
+                    "active_subject": active_subject,
+                    "status": ErasureStatus.PENDING.value,
+                    "deleted": 0,
+                    "last_id": "",
+                    "pending_chunk": None,
+                    "pending_deleted": None,
+                    "owner": None,
+                    "heartbeat_at": None,
+                    "error": None,
+                    "created_at": now,
+                    "updated_at": now,
+                    "finished_at": None
+                }
+                try:
+                    self.collection.insert_one(job)
+                    return job
+                except DuplicateKeyError:
+                    active = self.collection.find_one({"active_subject": active_subject})
+                    # Se o job ativo terminou entre as duas operações, tenta inserir de novo
+                    if active:
+                        return active
+        except Exception as e:
+            report_error(logger, e, f"Error creating erasure job for {scope.value} {subject_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to create erasure job",
+                details={"error": str(e)}
+            )
+
+    def get_job(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a job by its ID."""
+        try:
+            return self.collection.find_one({"_id": str(job_id)})
+        except Exception as e:
+            report_error(logger, e, f"Error fetching erasure job {job_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch erasure job",
+                details={"error": str(e)}
+            )
+
+    def claim_job(self, job_id: UUID, owner: str, stale_before: datetime) -> Optional[Dict[str, Any]]:
+        """Atomically take a pending job, or a running one whose heartbeat is older than stale_before."""
+        now = datetime.now(timezone.utc)
+        # find_one_and_update garante que só um processo assume o job
+        return self.collection.find_one_and_update(
+            {
+                "_id": str(job_id),
+                "$or": [
+                    {"status": ErasureStatus.PENDING.value},
+                    {"status": ErasureStatus.RUNNING.value, "heartbeat_at": {"$lt": stale_before}}
+                ]
+            },
+            {"$set": {"status": ErasureStatus.RUNNING.value, "owner": owner, "heartbeat_at": now, "updated_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def save_pending_chunk(self, job_id: UUID, owner: str, chunk: List[Dict[str, Any]]) -> bool:
+        """Record the chunk about to be deleted; False if the job is no longer owned."""
+        return self._owned_update(job_id, owner, {"$set": {"pending_chunk": chunk, "pending_deleted": None}})
+
+    def mark_chunk_deleted(self, job_id: UUID, owner: str, deleted: List[Dict[str, Any]]) -> bool:
+        """Record which ratings of the pending chunk were deleted; False if the job is no longer owned."""
+        return self._owned_update(job_id, owner, {"$set": {"pending_deleted": deleted}})
+
+    def complete_chunk(self, job_id: UUID, owner: str, last_id: str, deleted: int) -> bool:
+        """Advance the job past a deleted chunk; False if the job is no longer owned."""
+        return self._owned_update(job_id, owner, {
+            "$set": {"last_id": last_id, "pending_chunk": None, "pending_deleted": None},
+            "$inc": {"deleted": deleted}
+        })
+
+    def finish_job(self, job_id: UUID, owner: str, error: Optional[str] = None) -> None:
+        """Mark a job completed, or failed when error is given."""
+        status = ErasureStatus.FAILED if error else ErasureStatus.COMPLETED
+        self._owned_update(job_id, owner, {
+            "$set": {"status": status.value, "error": error, "finished_at": datetime.now(timezone.utc)},
+            "$unset": {"active_subject": ""}
+        })
+
+    def list_resumable(self, stale_before: datetime) -> List[UUID]:
+        """IDs of pending jobs and running jobs with a stale heartbeat."""
+        cursor = self.collection.find(
+            {
+                "$or": [
+                    {"status": ErasureStatus.PENDING.value},
+                    {"status": ErasureStatus.RUNNING.value, "heartbeat_at": {"$lt": stale_before}}
+                ]
+            },
+            {"_id": 1}
+        ).sort("created_at", 1)
+        return [UUID(doc["_id"]) for doc in cursor]
+
+    def _owned_update(self, job_id: UUID, owner: str, update: Dict[str, Any]) -> bool:
+        """Apply update only while owner still holds the job, refreshing its heartbeat."""
+        now = datetime.now(timezone.utc)
+        update.setdefault("$set", {}).update({"heartbeat_at": now, "updated_at": now})
+        result = self.collection.update_one({"_id": str(job_id), "owner": owner}, update)
+        return result.matched_count > 0
+
+def get_erasure_job_repository() -> ErasureJobRepository:
+    return ErasureJobRepositoryImpl()
@@ -0,0 +1,68 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+from pymongo import ReplaceOne
+from src.domain.interfaces.flagged_consumer_repository import FlaggedConsumerRepository
+from src.domain.exceptions.base_exceptions import DatabaseException
+from src.infrastructure.database.mongo_client import get_flagged_consumers_collection
+from src.infrastructure.observability.error_log import report_error
+
+logger = logging.getLogger(__name__)
+
+class FlaggedConsumerRepositoryImpl(FlaggedConsumerRepository):
+    """MongoDB implementation of FlaggedConsumerRepository; the consumer ID is the _id."""
+    def __init__(self):
+        self.collection = get_flagged_consumers_collection()
+
+    def is_flagged(self, consumer_id: UUID) -> bool:
+        """Whether a consumer is currently flagged."""
+        try:
+            # Projeção somente do _id: resolvida pelo índice do _id, sem ler o documento
+            return self.collection.find_one({"_id": str(consumer_id)}, {"_id": 1}) is not None
+        except Exception as e:
+            report_error(logger, e, f"Error checking flag of consumer {consumer_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to check consumer flag",
+                details={"error": str(e)}
+            )
+
+    def get_flag(self, consumer_id: UUID) -> Optional[Dict[str, Any]]:
+        """The flag of a consumer, or None."""
+        try:
+            return self.collection.find_one({"_id": str(consumer_id)})
+        except Exception as e:
+            report_error(logger, e, f"Error fetching flag of consumer {consumer_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch consumer flag",
+                details={"error": str(e)}
+            )
+
+    def save_flags(self, flags: List[Dict[str, Any]], replace: bool = False) -> int:
+        """Upsert flags keyed by consumer_id; with replace, drop flags not in the list."""
+        now = datetime.now(timezone.utc)
+        # Identifica a execução: flagged_at tem precisão de milissegundos e não separa duas execuções próximas
+        run_id = str(uuid4())
+        try:
+            if flags:
+                self.collection.bulk_write([
+                    ReplaceOne(
+                        {"_id": flag["consumer_id"]},
+                        {"_id": flag["consumer_id"], **flag, "flagged_at": now, "run_id": run_id},
+                        upsert=True
+                    )
+                    for flag in flags
+                ], ordered=False)
+            if replace:
+                # Execução sobre o histórico completo: consumidores que não estouraram mais deixam de ser marcados
+                self.collection.delete_many({"run_id": {"$ne": run_id}})
+            return len(flags)
+        except Exception as e:
+            report_error(logger, e, f"Error saving {len(flags)} consumer flags: {str(e)}")
+            raise DatabaseException(
+                message="Failed to save consumer flags",
+                details={"error": str(e)}
+            )
+
+def get_flagged_consumer_repository() -> FlaggedConsumerRepository:
+    return FlaggedConsumerRepositoryImpl()
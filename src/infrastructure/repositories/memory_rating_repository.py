@@ -0,0 +1,361 @@
+import bisect
+import heapq
+import itertools
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.domain.value_objects.trend_period import TrendGranularity, period_key
+from src.domain.value_objects.rating_filters import RatingFilters
+from src.domain.exceptions.base_exceptions import ValidationException
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ("_id", "professional_id", "consumer_id", "rate", "created_at")
+
+class InMemoryRatingRepository(RatingRepository):
+    """In-process implementation of RatingRepository.
+
+    Documents are kept as MongoDB stores them (string IDs, naive UTC
+    created_at) in a dict by _id. Each professional and consumer has a
+    sorted list of (created_at, _id) keys, overall and per rate, mirroring
+    the (<field>, created_at) and (<field>, rate, created_at) indexes, and
+    a list of its _ids in order for the erasure chunks. A listing page is a
+    bisect plus a slice, O(log n + k). Inserts and deletes find their slot
+    by bisect but shift the tail of the entity's lists: O(n) per write in
+    that entity's ratings, a memmove that stays cheap at the sizes one
+    process holds. Trend buckets are kept per (professional, granularity)
+    with their periods sorted, so a range is two bisects. Every method runs
+    under one lock.
+
+    Data lives in a single process: use it for tests and single-worker
+    edge nodes only (see validate_rating_backend).
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        # (campo, id da entidade) -> {None: todas as chaves, nota: chaves daquela nota}
+        self.indexes: Dict[Tuple[str, str], Dict[Optional[int], List[Tuple[datetime, str]]]] = {}
+        # (campo, id da entidade) -> _ids em ordem, para next_ratings_chunk
+        self.ids: Dict[Tuple[str, str], List[str]] = {}
+        self.versions: Dict[str, int] = {}
+        # (profissional, granularidade) -> (períodos ordenados, bucket por período)
+        self.trends: Dict[Tuple[str, str], Tuple[List[str], Dict[str, Dict[str, Any]]]] = {}
+
+    def create_rating(self, rating: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new rating."""
+        doc = rating.copy()
+        doc["_id"] = str(uuid.uuid4())
+        doc["professional_id"] = str(doc["professional_id"])
+        doc["consumer_id"] = str(doc["consumer_id"])
+        doc["created_at"] = datetime.now(timezone.utc)
+        if not _valid_rate(doc.get("rate")):
+            raise ValidationException(
+                message="Invalid rating data",
+                details={"error": f"rate must be an integer from 0 to 5, got {doc.get('rate')!r}"}
+            )
+        with self.lock:
+            self._add(doc)
+            self._apply_derived_many([doc], 1)
+        return doc
+
+    def insert_ratings(self, docs: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], int, int]:
+        """Insert prepared rating documents; returns (inserted, duplicate _ids, rejected)."""
+        inserted, duplicates, rejected = [], 0, 0
+        with self.lock:
+            for doc in docs:
+                if doc.get("_id") in self.docs:
+                    duplicates += 1
+                elif any(field not in doc for field in REQUIRED_FIELDS) or not _valid_rate(doc["rate"]):
+                    logger.warning(f"Rating {doc.get('_id')} rejected: missing fields or invalid rate")
+                    rejected += 1
+                else:
+                    self._add(doc)
+                    inserted.append(doc)
+            self._apply_derived_many(inserted, 1)
+        return inserted, duplicates, rejected
+
+    def rating_exists(self, rating_id: UUID) -> bool:
+        """Check whether a rating exists."""
+        with self.lock:
+            return str(rating_id) in self.docs
+
+    def get_version(self, scope: str, entity_id: UUID) -> int:
+        """Get the write counter of a professional or consumer."""
+        with self.lock:
+            return self.versions.get(f"{scope}:{entity_id}", 0)
+
+    def list_trend_buckets(self, professional_id: UUID, granularity: TrendGranularity, first_period: str, last_period: str) -> List[Dict[str, Any]]:
+        """List a professional's trend buckets between two period keys (inclusive)."""
+        with self.lock:
+            periods, buckets = self.trends.get((str(professional_id), granularity.value), ([], {}))
+            selected = periods[bisect.bisect_left(periods, first_period):bisect.bisect_right(periods, last_period)]
+            return [
+                {"period": period, "count": b["count"], "sum": b["sum"], "histogram": dict(b["histogram"])}
+                for period, b in ((period, buckets[period]) for period in selected)
+            ]
+
+    def rebuild_trend_buckets(self, professional_ids: Optional[List[UUID]] = None) -> int:
+        """Recompute trend buckets from the stored ratings; returns the number of buckets written."""
+        with self.lock:
+            if professional_ids is None:
+                docs = list(self.docs.values())
+            else:
+                docs = [
+                    self.docs[rating_id]
+                    for professional_id in professional_ids
+                    for _, rating_id in self.indexes.get(("professional_id", str(professional_id)), {}).get(None, [])
+                ]
+            counts: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+            for doc in docs:
+                for granularity in TrendGranularity:
+                    period = period_key(doc["created_at"], granularity)
+                    count = counts.setdefault((str(doc["professional_id"]), granularity.value, period), {
+                        "count": 0,
+                        "sum": 0,
+                        "histogram": {}
+                    })
+                    count["count"] += 1
+                    count["sum"] += doc["rate"]
+                    count["histogram"][str(doc["rate"])] = count["histogram"].get(str(doc["rate"]), 0) + 1
+            # Como o $set do MongoDB: sobrescreve os buckets recontados e mantém os demais
+            for (professional_id, granularity, period), count in counts.items():
+                self._trend_bucket(professional_id, granularity, period).update(count)
+            return len(counts)
+
+    def get_rating_by_id(self, rating_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a rating by its ID."""
+        with self.lock:
+            doc = self.docs.get(str(rating_id))
+            return self._doc_to_dict(doc) if doc else None
+
+    def get_ratings_by_ids(self, rating_ids: List[UUID]) -> List[Dict[str, Any]]:
+        """Get several ratings at once; missing IDs are simply absent."""
+        with self.lock:
+            docs = [self.docs.get(str(rating_id)) for rating_id in rating_ids]
+            return [self._doc_to_dict(doc) for doc in docs if doc]
+
+    def list_ratings_by_professional(self, professional_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
+        """List ratings for a professional, newest first."""
+        return self._list("professional_id", professional_id, page, size, filters)
+
+    def list_ratings_by_consumer(self, consumer_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
+        """List ratings made by a consumer, newest first."""
+        return self._list("consumer_id", consumer_id, page, size, filters)
+
+    def _list(self, field: str, entity_id: UUID, page: int, size: int, filters: Optional[RatingFilters]) -> tuple[List[Dict[str, Any]], int]:
+        """A page of an entity's ratings: bisect the created_at range of each index list, then slice from the end."""
+        skip = (page - 1) * size
+        low, high = _created_bounds(filters)
+        rates = filters.allowed_rates() if filters is not None else None
+        with self.lock:
+            index = self.indexes.get((field, str(entity_id)), {})
+            ranges = []
+            for keys in ([index.get(None, [])] if rates is None else [index.get(rate, []) for rate in rates]):
+                start = 0 if low is None else bisect.bisect_left(keys, (low,))
+                end = len(keys) if high is None else bisect.bisect_left(keys, (high,))
+                if start < end:
+                    ranges.append((keys, start, end))
+            total = sum(end - start for _, start, end in ranges)
+            if len(ranges) == 1:
+                keys, start, end = ranges[0]
+                page_keys = keys[max(start, end - skip - size):max(start, end - skip)][::-1]
+            else:
+                # Uma lista por nota: intercala as listas já ordenadas, da mais nova para a mais antiga,
+                # lendo por índice só as skip + size primeiras chaves (sem copiar as faixas)
+                newest_first = heapq.merge(*(_newest_first(keys, start, end) for keys, start, end in ranges), reverse=True)
+                page_keys = list(itertools.islice(newest_first, skip, skip + size))
+            return [self._doc_to_dict(self.docs[rating_id]) for _, rating_id in page_keys], total
+
+    def delete_rating(self, rating_id: UUID) -> bool:
+        """Delete a rating by its ID."""
+        with self.lock:
+            doc = self._remove(str(rating_id))
+            if doc is None:
+                return False
+            self._apply_derived_many([doc], -1)
+            return True
+
+    def iter_ratings(
+        self,
+        id_from: Optional[str] = None,
+        id_to: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream ratings with id_from <= _id < id_to, optionally within [created_from, created_to).
+
+        In _id order, or (created_at, _id) order with created_from, as the MongoDB implementation.
+        """
+        incremental = created_from is not None
+        created_from = _naive_utc(created_from)
+        created_to = _naive_utc(created_to)
+        with self.lock:
+            ids = [
+                rating_id for rating_id in self.docs
+                if (id_from is None or rating_id >= id_from) and (id_to is None or rating_id < id_to)
+            ]
+            if incremental:
+                ids.sort(key=lambda rating_id: (self.docs[rating_id]["created_at"], rating_id))
+            else:
+                ids.sort()
+        # Lotes curtos sob o lock: escritas concorrentes não esperam a exportação inteira
+        for offset in range(0, len(ids), batch_size):
+            with self.lock:
+                docs = [self.docs.get(rating_id) for rating_id in ids[offset:offset + batch_size]]
+            for doc in docs:
+                if doc is None:
+                    continue
+                if created_from is not None and doc["created_at"] < created_from:
+                    continue
+                if created_to is not None and doc["created_at"] >= created_to:
+                    continue
+                yield self._doc_to_dict(doc)
+
+    def iter_field_batches(self, fields: List[str], batch_size: int = 50000, query: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Stream documents with only the given fields, in batches.
+
+        The query supports equality and $gte/$gt/$lte/$lt/$in per field,
+        which is what the analytics jobs send.
+        """
+        with self.lock:
+            docs = [doc for doc in self.docs.values() if _matches(doc, query or {})]
+        for offset in range(0, len(docs), batch_size):
+            yield [{field: doc[field] for field in fields if field in doc} for doc in docs[offset:offset + batch_size]]
+
+    def next_ratings_chunk(self, scope: str, entity_id: UUID, after_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Next ratings of a professional or consumer (scope) with _id above after_id, in _id order."""
+        with self.lock:
+            ids = self.ids.get((f"{scope}_id", str(entity_id)), [])
+            start = bisect.bisect_right(ids, after_id)
+            return [
+                {field: self.docs[rating_id][field] for field in ("_id", "professional_id", "consumer_id", "rate", "created_at")}
+                for rating_id in ids[start:start + limit]
+            ]
+
+    def delete_ratings_chunk(self, scope: str, entity_id: UUID, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Delete the ratings of a chunk that still exist and return them; derived data is not touched."""
+        deleted = []
+        with self.lock:
+            for doc in chunk:
+                stored = self.docs.get(doc["_id"])
+                if stored is not None and stored[f"{scope}_id"] == str(entity_id):
+                    self._remove(doc["_id"])
+                    deleted.append(doc)
+        return deleted
+
+    def apply_deleted_ratings(self, docs: List[Dict[str, Any]]) -> None:
+        """Update write counters and trend buckets for ratings removed by delete_ratings_chunk."""
+        with self.lock:
+            self._apply_derived_many(docs, -1)
+
+    def _add(self, doc: Dict[str, Any]) -> None:
+        stored = {**doc, "created_at": _naive_utc(doc["created_at"])}
+        self.docs[stored["_id"]] = stored
+        key = (stored["created_at"], stored["_id"])
+        for field in ("professional_id", "consumer_id"):
+            index = self.indexes.setdefault((field, stored[field]), {})
+            bisect.insort(index.setdefault(None, []), key)
+            bisect.insort(index.setdefault(stored["rate"], []), key)
+            bisect.insort(self.ids.setdefault((field, stored[field]), []), stored["_id"])
+
+    def _remove(self, rating_id: str) -> Optional[Dict[str, Any]]:
+        doc = self.docs.pop(rating_id, None)
+        if doc is None:
+            return None
+        key = (doc["created_at"], doc["_id"])
+        for field in ("professional_id", "consumer_id"):
+            index = self.indexes[(field, doc[field])]
+            for keys in (index[None], index[doc["rate"]]):
+                del keys[bisect.bisect_left(keys, key)]
+            ids = self.ids[(field, doc[field])]
+            del ids[bisect.bisect_left(ids, doc["_id"])]
+            if not index[None]:
+                del self.indexes[(field, doc[field])]
+                del self.ids[(field, doc[field])]
+        return doc
+
+    def _apply_derived_many(self, docs: List[Dict[str, Any]], sign: int) -> None:
+        """Write counters and trend buckets for created (+1) or deleted (-1) ratings, as the MongoDB implementation keeps them."""
+        if not docs:
+            return
+        scopes = {f"professional:{doc['professional_id']}" for doc in docs}
+        scopes.update(f"consumer:{doc['consumer_id']}" for doc in docs)
+        for scope in scopes:
+            self.versions[scope] = self.versions.get(scope, 0) + 1
+        for doc in docs:
+            rate = doc["rate"]
+            for granularity in TrendGranularity:
+                bucket = self._trend_bucket(str(doc["professional_id"]), granularity.value, period_key(doc["created_at"], granularity))
+                bucket["count"] += sign
+                bucket["sum"] += sign * rate
+                bucket["histogram"][str(rate)] = bucket["histogram"].get(str(rate), 0) + sign
+
+    def _trend_bucket(self, professional_id: str, granularity: str, period: str) -> Dict[str, Any]:
+        """The bucket of a period, created empty (and its period inserted in order) when missing."""
+        periods, buckets = self.trends.setdefault((professional_id, granularity), ([], {}))
+        bucket = buckets.get(period)
+        if bucket is None:
+            bisect.insort(periods, period)
+            bucket = buckets[period] = {"count": 0, "sum": 0, "histogram": {}}
+        return bucket
+
+    @staticmethod
+    def _doc_to_dict(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "_id": UUID(doc["_id"]),
+            "professional_id": UUID(doc["professional_id"]),
+            "consumer_id": UUID(doc["consumer_id"]),
+            "rate": doc["rate"],
+            "description": doc.get("description"),
+            "created_at": doc["created_at"]
+        }
+
+def _valid_rate(rate: Any) -> bool:
+    return isinstance(rate, int) and not isinstance(rate, bool) and 0 <= rate <= 5
+
+def _newest_first(keys: List[Tuple[datetime, str]], start: int, end: int) -> Iterator[Tuple[datetime, str]]:
+    for i in range(end - 1, start - 1, -1):
+        yield keys[i]
+
+def _naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # Como o MongoDB: datas guardadas e comparadas em UTC sem tzinfo
+    if moment is not None and moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+def _created_bounds(filters: Optional[RatingFilters]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    if filters is None:
+        return None, None
+    return _naive_utc(filters.created_after), _naive_utc(filters.created_before)
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for field, condition in query.items():
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for operator, operand in condition.items():
+            if isinstance(operand, datetime):
+                operand = _naive_utc(operand)
+            if operator == "$in":
+                if value not in operand:
+                    return False
+            elif value is None:
+                return False
+            elif operator == "$gte" and not value >= operand:
+                return False
+            elif operator == "$gt" and not value > operand:
+                return False
+            elif operator == "$lte" and not value <= operand:
+                return False
+            elif operator == "$lt" and not value < operand:
+                return False
+            elif operator not in ("$gte", "$gt", "$lte", "$lt"):
+                raise ValueError(f"Unsupported query operator {operator}")
+    return True
@@ -1,12 +1,22 @@
 import logging
 from src.domain.interfaces.rating_repository import RatingRepository
-from src.infrastructure.database.mongo_client import get_ratings_collection
+from src.infrastructure.database.mongo_client import (
+    get_ratings_collection,
+    get_rating_versions_collection,
+    get_rating_trends_collection
+)
+from src.infrastructure.config.settings import Settings, get_settings
+from src.infrastructure.observability.error_log import report_error
+from src.domain.value_objects.trend_period import TrendGranularity, period_key
+from src.domain.value_objects.rating_filters import RatingFilters
 from src.domain.exceptions.base_exceptions import ValidationException, DatabaseException
 from uuid import UUID
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
 from fastapi import Depends
 import bson
-from pymongo.errors import WriteError, OperationFailure
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, WriteError, OperationFailure
 from datetime import datetime, timezone
 import uuid
 
@@ -16,6 +26,8 @@ class RatingRepositoryImpl(RatingRepository):
     """MongoDB implementation of RatingRepository."""
     def __init__(self):
         self.collection = get_ratings_collection()
+        self.versions = get_rating_versions_collection()
+        self.trends = get_rating_trends_collection()
 
     def create_rating(self, rating: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new rating."""
@@ -30,26 +42,221 @@ class RatingRepositoryImpl(RatingRepository):
             doc["created_at"] = datetime.now(timezone.utc)
             logger.info(f"Tentando inserir documento: {doc}")
             self.collection.insert_one(doc)
-            return doc
         except WriteError as e:
-            logger.error(f"MongoDB validation error: {str(e)}")
+            report_error(logger, e, f"MongoDB validation error: {str(e)}")
             raise ValidationException(
                 message="Invalid rating data",
                 details={"error": str(e)}
             )
         except OperationFailure as e:
-            logger.error(f"MongoDB operation error: {str(e)}")
+            report_error(logger, e, f"MongoDB operation error: {str(e)}")
             raise DatabaseException(
                 message="Database operation failed",
                 details={"error": str(e)}
             )
         except Exception as e:
-            logger.error(f"Unexpected error creating rating: {str(e)}")
-            logger.exception("Stack trace:")
+            report_error(logger, e, f"Unexpected error creating rating: {str(e)}")
             raise DatabaseException(
                 message="Failed to create rating",
                 details={"error": str(e)}
             )
+        # A avaliação já foi gravada: uma falha nos dados derivados não pode virar erro (o retry duplicaria)
+        self._apply_derived_safely(doc, 1)
+        return doc
+
+    def insert_ratings(self, docs: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], int, int]:
+        """Insert prepared rating documents with one unordered insert_many.
+
+        Returns the documents actually inserted, the number skipped because
+        their _id already exists and the number rejected by the server.
+        Derived data is updated for the inserted documents only, so a batch
+        can be retried safely.
+        """
+        if not docs:
+            return [], 0, 0
+        try:
+            self.collection.insert_many(docs, ordered=False)
+            inserted, duplicates, rejected = docs, 0, 0
+        except BulkWriteError as e:
+            failed = {error["index"]: error for error in e.details.get("writeErrors", [])}
+            duplicates = sum(1 for error in failed.values() if error.get("code") == 11000)
+            rejected = len(failed) - duplicates
+            for index, error in failed.items():
+                if error.get("code") != 11000:
+                    logger.warning(f"Rating {docs[index]['_id']} rejected: {error.get('errmsg')}")
+            inserted = [doc for index, doc in enumerate(docs) if index not in failed]
+        except Exception as e:
+            report_error(logger, e, f"Error inserting {len(docs)} ratings: {str(e)}")
+            raise DatabaseException(
+                message="Failed to insert ratings",
+                details={"error": str(e)}
+            )
+        self._apply_derived_many(inserted, 1)
+        return inserted, duplicates, rejected
+
+    def rating_exists(self, rating_id: UUID) -> bool:
+        """Check whether a rating exists without fetching the document."""
+        try:
+            # Projeção somente do _id: resolvida pelo índice, sem ler o documento
+            return self.collection.find_one({"_id": str(rating_id)}, {"_id": 1}) is not None
+        except Exception as e:
+            report_error(logger, e, f"Error checking rating {rating_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch rating",
+                details={"error": str(e)}
+            )
+
+    def get_version(self, scope: str, entity_id: UUID) -> int:
+        """Get the write counter of a professional or consumer."""
+        try:
+            doc = self.versions.find_one({"_id": f"{scope}:{entity_id}"})
+            return doc["version"] if doc else 0
+        except Exception as e:
+            report_error(logger, e, f"Error fetching {scope} version for {entity_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch version",
+                details={"error": str(e)}
+            )
+
+    def list_trend_buckets(self, professional_id: UUID, granularity: TrendGranularity, first_period: str, last_period: str) -> List[Dict[str, Any]]:
+        """List a professional's trend buckets between two period keys (inclusive)."""
+        try:
+            cursor = self.trends.find(
+                {
+                    "professional_id": str(professional_id),
+                    "granularity": granularity.value,
+                    "period": {"$gte": first_period, "$lte": last_period}
+                },
+                {"_id": 0, "period": 1, "count": 1, "sum": 1, "histogram": 1}
+            ).sort("period", 1)
+            return list(cursor)
+        except Exception as e:
+            report_error(logger, e, f"Error listing trend for professional {professional_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch rating trend",
+                details={"error": str(e)}
+            )
+
+    def rebuild_trend_buckets(self, professional_ids: Optional[List[UUID]] = None) -> int:
+        """Recompute trend buckets from the stored ratings; returns the number of buckets written.
+
+        One aggregation counts ratings per (professional, day, rate), sorted
+        by professional, and each professional's daily and monthly buckets
+        are overwritten with $set as soon as its groups are complete, so the
+        rebuild is idempotent and memory is bounded by one professional.
+        """
+        match: Dict[str, Any] = {}
+        if professional_ids is not None:
+            match["professional_id"] = {"$in": [str(professional_id) for professional_id in professional_ids]}
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": {
+                    "professional_id": "$professional_id",
+                    "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                    "rate": "$rate"
+                },
+                "count": {"$sum": 1}
+            }},
+            {"$sort": {"_id.professional_id": 1}}
+        ]
+        written = 0
+        try:
+            current, buckets = None, {}
+            for group in self.collection.aggregate(pipeline, allowDiskUse=True):
+                key = group["_id"]
+                if key["professional_id"] != current:
+                    written += self._write_trend_buckets(current, buckets)
+                    current, buckets = key["professional_id"], {}
+                # O bucket mensal é a soma dos diários: YYYY-MM é o prefixo de YYYY-MM-DD
+                for granularity, period in ((TrendGranularity.DAY, key["day"]), (TrendGranularity.MONTH, key["day"][:7])):
+                    bucket = buckets.setdefault((granularity, period), {"count": 0, "sum": 0, "histogram": {}})
+                    bucket["count"] += group["count"]
+                    bucket["sum"] += group["count"] * key["rate"]
+                    histogram = bucket["histogram"]
+                    histogram[str(key["rate"])] = histogram.get(str(key["rate"]), 0) + group["count"]
+            written += self._write_trend_buckets(current, buckets)
+            return written
+        except Exception as e:
+            report_error(logger, e, f"Error rebuilding trend buckets: {str(e)}")
+            raise DatabaseException(
+                message="Failed to rebuild rating trends",
+                details={"error": str(e)}
+            )
+
+    def _write_trend_buckets(self, professional_id: Optional[str], buckets: Dict[tuple, Dict[str, Any]]) -> int:
+        if not buckets:
+            return 0
+        self.trends.bulk_write([
+            UpdateOne(
+                {"_id": f"{professional_id}:{granularity.value}:{period}"},
+                {"$set": {
+                    "professional_id": professional_id,
+                    "granularity": granularity.value,
+                    "period": period,
+                    **bucket
+                }},
+                upsert=True
+            )
+            for (granularity, period), bucket in buckets.items()
+        ], ordered=False)
+        return len(buckets)
+
+    def _apply_derived(self, doc: Dict[str, Any], sign: int) -> None:
+        """Keep write counters and trend buckets in sync with a created (+1) or deleted (-1) rating."""
+        self._apply_derived_many([doc], sign)
+
+    def _apply_derived_safely(self, doc: Dict[str, Any], sign: int) -> None:
+        """_apply_derived after a write that already succeeded: failures are logged, not raised.
+
+        Counters and buckets of that entity stay behind until its next write
+        (or rebuild_trend_buckets); the write itself is never reported as failed.
+        """
+        try:
+            self._apply_derived(doc, sign)
+        except Exception as e:
+            report_error(logger, e, f"Error updating derived data for rating {doc['_id']}: {str(e)}")
+
+    def _apply_derived_many(self, docs: List[Dict[str, Any]], sign: int) -> None:
+        """Same as _apply_derived for a batch: one write per counter and per bucket touched."""
+        if not docs:
+            return
+        self._bump_versions(docs)
+        # Agrega por bucket para que um lote gere uma única atualização por período
+        buckets: Dict[str, Dict[str, Any]] = {}
+        for doc in docs:
+            rate = doc["rate"]
+            for granularity in TrendGranularity:
+                period = period_key(doc["created_at"], granularity)
+                bucket = buckets.setdefault(f"{doc['professional_id']}:{granularity.value}:{period}", {
+                    "inc": {"count": 0, "sum": 0},
+                    "insert": {
+                        "professional_id": str(doc["professional_id"]),
+                        "granularity": granularity.value,
+                        "period": period
+                    }
+                })
+                bucket["inc"]["count"] += sign
+                bucket["inc"]["sum"] += sign * rate
+                histogram = f"histogram.{rate}"
+                bucket["inc"][histogram] = bucket["inc"].get(histogram, 0) + sign
+        self.trends.bulk_write([
+            UpdateOne(
+                {"_id": bucket_id},
+                {"$inc": bucket["inc"], "$setOnInsert": bucket["insert"]},
+                upsert=True
+            )
+            for bucket_id, bucket in buckets.items()
+        ], ordered=False)
+
+    def _bump_versions(self, docs: List[Dict[str, Any]]) -> None:
+        """Increment, once each, the write counters touched by a batch of ratings."""
+        scopes = {f"professional:{doc['professional_id']}" for doc in docs}
+        scopes.update(f"consumer:{doc['consumer_id']}" for doc in docs)
+        self.versions.bulk_write([
+            UpdateOne({"_id": scope}, {"$inc": {"version": 1}}, upsert=True)
+            for scope in sorted(scopes)
+        ], ordered=False)
 
     def get_rating_by_id(self, rating_id: UUID) -> Optional[Dict[str, Any]]:
         """Get a rating by its ID."""
@@ -59,56 +266,90 @@ class RatingRepositoryImpl(RatingRepository):
                 return self._doc_to_dict(doc)
             return None
         except Exception as e:
-            logger.error(f"Error fetching rating {rating_id}: {str(e)}")
+            report_error(logger, e, f"Error fetching rating {rating_id}: {str(e)}")
             raise DatabaseException(
                 message="Failed to fetch rating",
                 details={"error": str(e)}
             )
 
-    def list_ratings_by_professional(self, professional_id: UUID, page: int = 1, size: int = 10) -> tuple[List[Dict[str, Any]], int]:
+    def get_ratings_by_ids(self, rating_ids: List[UUID]) -> List[Dict[str, Any]]:
+        """Get several ratings with a single query; missing IDs are simply absent."""
+        try:
+            cursor = self.collection.find({"_id": {"$in": [str(rating_id) for rating_id in rating_ids]}})
+            return [self._doc_to_dict(doc) for doc in cursor]
+        except Exception as e:
+            report_error(logger, e, f"Error fetching {len(rating_ids)} ratings: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch ratings",
+                details={"error": str(e)}
+            )
+
+    def list_ratings_by_professional(self, professional_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
         """List ratings for a professional."""
         try:
+            query = self._listing_query("professional_id", professional_id, filters)
+
             # Calcula o total de documentos
-            total = self.collection.count_documents({"professional_id": str(professional_id)})
+            total = self.collection.count_documents(query)
             
             # Calcula o skip baseado na página e tamanho
             skip = (page - 1) * size
             
             # Busca os documentos paginados
-            cursor = self.collection.find(
-                {"professional_id": str(professional_id)}
-            ).sort("created_at", -1).skip(skip).limit(size)
+            cursor = self.collection.find(query).sort("created_at", -1).skip(skip).limit(size)
             
             return [self._doc_to_dict(doc) for doc in cursor], total
         except Exception as e:
-            logger.error(f"Error listing ratings for professional {professional_id}: {str(e)}")
+            report_error(logger, e, f"Error listing ratings for professional {professional_id}: {str(e)}")
             raise DatabaseException(
                 message="Failed to list ratings",
                 details={"error": str(e)}
             )
 
-    def list_ratings_by_consumer(self, consumer_id: UUID, page: int = 1, size: int = 10) -> tuple[List[Dict[str, Any]], int]:
+    def list_ratings_by_consumer(self, consumer_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
         """List ratings made by a consumer."""
         try:
+            query = self._listing_query("consumer_id", consumer_id, filters)
+
             # Calcula o total de documentos
-            total = self.collection.count_documents({"consumer_id": str(consumer_id)})
+            total = self.collection.count_documents(query)
             
             # Calcula o skip baseado na página e tamanho
             skip = (page - 1) * size
             
             # Busca os documentos paginados
-            cursor = self.collection.find(
-                {"consumer_id": str(consumer_id)}
-            ).sort("created_at", -1).skip(skip).limit(size)
+            cursor = self.collection.find(query).sort("created_at", -1).skip(skip).limit(size)
             
             return [self._doc_to_dict(doc) for doc in cursor], total
         except Exception as e:
-            logger.error(f"Error listing ratings made by consumer {consumer_id}: {str(e)}")
+            report_error(logger, e, f"Error listing ratings made by consumer {consumer_id}: {str(e)}")
             raise DatabaseException(
                 message="Failed to list ratings",
                 details={"error": str(e)}
             )
 
+    @staticmethod
+    def _listing_query(field: str, entity_id: UUID, filters: Optional[RatingFilters]) -> Dict[str, Any]:
+        """Filter for a listing: equality on the entity, rate points, then a created_at range.
+
+        Matches the (<field>, created_at) and (<field>, rate, created_at)
+        compound indexes, so filtering and the created_at sort are resolved
+        by index scans without an in-memory sort.
+        """
+        query: Dict[str, Any] = {field: str(entity_id)}
+        if filters is not None:
+            rates = filters.allowed_rates()
+            if rates is not None:
+                query["rate"] = {"$in": rates}
+            created_at = {}
+            if filters.created_after is not None:
+                created_at["$gte"] = filters.created_after
+            if filters.created_before is not None:
+                created_at["$lt"] = filters.created_before
+            if created_at:
+                query["created_at"] = created_at
+        return query
+
     def _doc_to_dict(self, doc: Dict[str, Any]) -> Dict[str, Any]:
         """Convert MongoDB document to dictionary."""
         return {
@@ -123,14 +364,184 @@ class RatingRepositoryImpl(RatingRepository):
     def delete_rating(self, rating_id: UUID) -> bool:
         """Delete a rating by its ID."""
         try:
+            # Os campos são necessários para versionar as listagens e atualizar as tendências
+            doc = self.collection.find_one(
+                {"_id": str(rating_id)},
+                {"professional_id": 1, "consumer_id": 1, "rate": 1, "created_at": 1}
+            )
             result = self.collection.delete_one({"_id": str(rating_id)})
-            return result.deleted_count > 0
         except Exception as e:
-            logger.error(f"Error deleting rating {rating_id}: {str(e)}")
+            report_error(logger, e, f"Error deleting rating {rating_id}: {str(e)}")
             raise DatabaseException(
                 message="Failed to delete rating",
                 details={"error": str(e)}
             )
+        if result.deleted_count > 0 and doc:
+            self._apply_derived_safely(doc, -1)
+        return result.deleted_count > 0
+
+    def iter_ratings(
+        self,
+        id_from: Optional[str] = None,
+        id_to: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream ratings with id_from <= _id < id_to, optionally within [created_from, created_to).
+
+        Full scans come in _id order, from the _id index. With created_from
+        (an incremental window) they come in (created_at, _id) order, which
+        the (created_at, _id) index returns without an in-memory sort.
+        """
+        query: Dict[str, Any] = {}
+        id_range = {}
+        if id_from is not None:
+            id_range["$gte"] = id_from
+        if id_to is not None:
+            id_range["$lt"] = id_to
+        if id_range:
+            query["_id"] = id_range
+        created_at = {}
+        if created_from is not None:
+            created_at["$gte"] = created_from
+        if created_to is not None:
+            created_at["$lt"] = created_to
+        if created_at:
+            query["created_at"] = created_at
+        try:
+            # O cursor busca um lote por vez: a memória não depende do tamanho da faixa
+            order = [("created_at", 1), ("_id", 1)] if created_from is not None else [("_id", 1)]
+            for doc in self.collection.find(query).sort(order).batch_size(batch_size):
+                yield self._doc_to_dict(doc)
+        except Exception as e:
+            report_error(logger, e, f"Error streaming ratings in [{id_from}, {id_to}): {str(e)}")
+            raise DatabaseException(
+                message="Failed to read ratings",
+                details={"error": str(e)}
+            )
+
+    def iter_field_batches(self, fields: List[str], batch_size: int = 50000, query: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Stream raw documents with only the given fields, in batches, for columnar analytics.
+
+        On a real server the batches come from find_raw_batches and are
+        decoded in one C call each, skipping per-document cursor overhead.
+        Values are returned as stored (string IDs, naive UTC datetimes).
+        """
+        projection = {field: 1 for field in fields}
+        if "_id" not in fields:
+            projection["_id"] = 0
+        try:
+            if isinstance(self.collection, Collection):
+                for raw in self.collection.find_raw_batches(query or {}, projection, batch_size=batch_size):
+                    yield bson.decode_all(raw)
+                return
+            # mongomock não implementa find_raw_batches
+            batch = []
+            for doc in self.collection.find(query or {}, projection):
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        except Exception as e:
+            report_error(logger, e, f"Error streaming rating fields {fields}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to read ratings",
+                details={"error": str(e)}
+            )
+
+    def next_ratings_chunk(self, scope: str, entity_id: UUID, after_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Next ratings of a professional or consumer (scope) with _id above after_id, in _id order.
+
+        Only the fields needed to keep derived data consistent are returned,
+        as stored (string IDs), so a chunk can be checkpointed as is.
+        """
+        try:
+            cursor = self.collection.find(
+                {f"{scope}_id": str(entity_id), "_id": {"$gt": after_id}},
+                {"professional_id": 1, "consumer_id": 1, "rate": 1, "created_at": 1}
+            ).sort("_id", 1).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            report_error(logger, e, f"Error reading erasure chunk for {scope} {entity_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to read ratings",
+                details={"error": str(e)}
+            )
+
+    def delete_ratings_chunk(self, scope: str, entity_id: UUID, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Delete the ratings of a chunk that still exist and return them.
+
+        Derived data is not touched; call apply_deleted_ratings with the
+        result, so the caller can checkpoint in between.
+        """
+        if not chunk:
+            return []
+        try:
+            ids = [doc["_id"] for doc in chunk]
+            # Avaliações já removidas (ex.: DELETE individual) não são contadas de novo
+            present = {doc["_id"] for doc in self.collection.find({"_id": {"$in": ids}}, {"_id": 1})}
+            deleted = [doc for doc in chunk if doc["_id"] in present]
+            if deleted:
+                self.collection.delete_many({
+                    f"{scope}_id": str(entity_id),
+                    "_id": {"$in": [doc["_id"] for doc in deleted]}
+                })
+            return deleted
+        except Exception as e:
+            report_error(logger, e, f"Error deleting erasure chunk for {scope} {entity_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to delete ratings",
+                details={"error": str(e)}
+            )
+
+    def apply_deleted_ratings(self, docs: List[Dict[str, Any]]) -> None:
+        """Update write counters and trend buckets for ratings removed by delete_ratings_chunk."""
+        try:
+            self._apply_derived_many(docs, -1)
+        except Exception as e:
+            report_error(logger, e, f"Error updating derived data for {len(docs)} deleted ratings: {str(e)}")
+            raise DatabaseException(
+                message="Failed to update rating aggregates",
+                details={"error": str(e)}
+            )
+
+_memory_rating_repository = None
+_sqlite_rating_repository = None
+
+def get_rating_repository(settings: Optional[Settings] = None) -> RatingRepository:
+    """Rating storage chosen by the RATING_REPOSITORY_BACKEND setting (mongo, sqlite or memory).
+
+    Settings default to the environment's.
+    """
+    global _memory_rating_repository, _sqlite_rating_repository
+    settings = settings or get_settings()
+    if settings.rating_repository_backend == "memory":
+        # Os dados vivem no processo: todas as requisições precisam da mesma instância
+        if _memory_rating_repository is None:
+            from src.infrastructure.repositories.memory_rating_repository import InMemoryRatingRepository
+            _memory_rating_repository = InMemoryRatingRepository()
+        return _memory_rating_repository
+    if settings.rating_repository_backend == "sqlite":
+        # Uma instância por processo, com uma conexão reaproveitada por thread
+        if _sqlite_rating_repository is None:
+            from src.infrastructure.repositories.sqlite_rating_repository import SQLiteRatingRepository
+            _sqlite_rating_repository = SQLiteRatingRepository(settings.sqlite_path)
+        return _sqlite_rating_repository
+    return RatingRepositoryImpl()
+
+def validate_rating_backend(settings: Settings, workers: int) -> None:
+    """Reject RATING_REPOSITORY_BACKEND=memory when more than one worker process would serve requests.
 
-def get_rating_repository() -> RatingRepository:
-    return RatingRepositoryImpl() 
\ No newline at end of file
+    Each worker would hold its own, disjoint set of ratings. SQLite in WAL
+    mode is shared by the workers of one node.
+    """
+    if settings.rating_repository_backend not in ("mongo", "sqlite", "memory"):
+        raise ValueError(f"Unknown RATING_REPOSITORY_BACKEND {settings.rating_repository_backend!r}; use mongo, sqlite or memory")
+    if settings.rating_repository_backend == "memory" and workers > 1:
+        raise ValueError(
+            f"RATING_REPOSITORY_BACKEND=memory is single-process only ({workers} workers configured); "
+            "use RATING_REPOSITORY_BACKEND=mongo or sqlite"
+        )
@@ -0,0 +1,588 @@
+import logging
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from src.domain.interfaces.rating_repository import RatingRepository
+from src.domain.value_objects.trend_period import TrendGranularity, period_key
+from src.domain.value_objects.rating_filters import RatingFilters
+from src.domain.exceptions.base_exceptions import ValidationException, DatabaseException
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+COLUMNS = ("_id", "professional_id", "consumer_id", "rate", "description", "created_at")
+# Limite de parâmetros por instrução em versões antigas do SQLite
+MAX_PARAMETERS = 900
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS ratings (
+        _id TEXT PRIMARY KEY,
+        professional_id TEXT NOT NULL,
+        consumer_id TEXT NOT NULL,
+        rate INTEGER NOT NULL CHECK (rate BETWEEN 0 AND 5),
+        description TEXT,
+        created_at INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+    # Tabela WITHOUT ROWID: todo índice termina com o _id, então cobre contagens, páginas de chaves e
+    # os lotes de exclusão em ordem de _id sem voltar à tabela. Espelham RATINGS_INDEXES do MongoDB.
+    "CREATE INDEX IF NOT EXISTS ix_ratings_professional ON ratings (professional_id)",
+    "CREATE INDEX IF NOT EXISTS ix_ratings_consumer ON ratings (consumer_id)",
+    # rate no fim da chave: a página filtrada por nota também é lida só do índice
+    "CREATE INDEX IF NOT EXISTS ix_ratings_professional_created ON ratings (professional_id, created_at, rate)",
+    "CREATE INDEX IF NOT EXISTS ix_ratings_consumer_created ON ratings (consumer_id, created_at, rate)",
+    "CREATE INDEX IF NOT EXISTS ix_ratings_professional_rate_created ON ratings (professional_id, rate, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_ratings_consumer_rate_created ON ratings (consumer_id, rate, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_ratings_created ON ratings (created_at)",
+    """CREATE TABLE IF NOT EXISTS rating_versions (
+        scope TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS rating_trends (
+        professional_id TEXT NOT NULL,
+        granularity TEXT NOT NULL,
+        period TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        sum INTEGER NOT NULL,
+        h0 INTEGER NOT NULL, h1 INTEGER NOT NULL, h2 INTEGER NOT NULL,
+        h3 INTEGER NOT NULL, h4 INTEGER NOT NULL, h5 INTEGER NOT NULL,
+        PRIMARY KEY (professional_id, granularity, period)
+    ) WITHOUT ROWID"""
+]
+
+# Texto fixo por instrução: o cache de instruções preparadas da conexão reaproveita a compilação
+INSERT_RATING = "INSERT INTO ratings (_id, professional_id, consumer_id, rate, description, created_at) VALUES (?, ?, ?, ?, ?, ?)"
+SELECT_RATING = "SELECT _id, professional_id, consumer_id, rate, description, created_at FROM ratings WHERE _id = ?"
+RATING_EXISTS = "SELECT 1 FROM ratings WHERE _id = ?"
+DELETE_RATING = "DELETE FROM ratings WHERE _id = ? RETURNING professional_id, consumer_id, rate, created_at"
+SELECT_VERSION = "SELECT version FROM rating_versions WHERE scope = ?"
+BUMP_VERSION = "INSERT INTO rating_versions (scope, version) VALUES (?, 1) ON CONFLICT (scope) DO UPDATE SET version = version + 1"
+HISTOGRAM = ("h0", "h1", "h2", "h3", "h4", "h5")
+INSERT_BUCKET = f"""INSERT INTO rating_trends (professional_id, granularity, period, count, sum, {', '.join(HISTOGRAM)})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+# $inc do MongoDB: soma ao bucket existente
+UPSERT_BUCKET = f"""{INSERT_BUCKET} ON CONFLICT (professional_id, granularity, period) DO UPDATE SET
+    count = count + excluded.count, sum = sum + excluded.sum, {', '.join(f'{h} = {h} + excluded.{h}' for h in HISTOGRAM)}"""
+# $set do MongoDB: sobrescreve o bucket recontado
+SET_BUCKET = f"""{INSERT_BUCKET} ON CONFLICT (professional_id, granularity, period) DO UPDATE SET
+    count = excluded.count, sum = excluded.sum, {', '.join(f'{h} = excluded.{h}' for h in HISTOGRAM)}"""
+SELECT_BUCKETS = f"""SELECT period, count, sum, {', '.join(HISTOGRAM)} FROM rating_trends
+    WHERE professional_id = ? AND granularity = ? AND period BETWEEN ? AND ? ORDER BY period"""
+
+class SQLiteRatingRepository(RatingRepository):
+    """SQLite implementation of RatingRepository, for single-node installs without MongoDB.
+
+    The database runs in WAL mode, so readers never block the writer.
+    Each thread reuses its own connection, whose prepared-statement cache
+    serves the fixed SQL texts above. created_at is stored as milliseconds
+    since the epoch (UTC), the precision MongoDB keeps. Write counters and
+    trend buckets are updated in the same transaction as the rating.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        connection = self._connection()
+        with connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, cached_statements=256, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Com WAL, NORMAL só sincroniza nos checkpoints: um commit não espera o fsync
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        """Close the connections of every thread."""
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def create_rating(self, rating: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new rating."""
+        doc = rating.copy()
+        doc["_id"] = str(uuid.uuid4())
+        doc["professional_id"] = str(doc["professional_id"])
+        doc["consumer_id"] = str(doc["consumer_id"])
+        doc["created_at"] = datetime.now(timezone.utc)
+        connection = self._connection()
+        try:
+            with _transaction(connection):
+                connection.execute(INSERT_RATING, _row(doc))
+                self._apply_derived_many(connection, [doc], 1)
+        except sqlite3.IntegrityError as e:
+            logger.error(f"SQLite constraint error: {str(e)}")
+            raise ValidationException(
+                message="Invalid rating data",
+                details={"error": str(e)}
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Unexpected error creating rating: {str(e)}")
+            raise DatabaseException(
+                message="Failed to create rating",
+                details={"error": str(e)}
+            )
+        return doc
+
+    def insert_ratings(self, docs: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], int, int]:
+        """Insert prepared rating documents with one executemany; returns (inserted, duplicate _ids, rejected)."""
+        if not docs:
+            return [], 0, 0
+        connection = self._connection()
+        try:
+            with _transaction(connection):
+                existing = set()
+                ids = [doc.get("_id") for doc in docs]
+                for offset in range(0, len(ids), MAX_PARAMETERS):
+                    chunk = ids[offset:offset + MAX_PARAMETERS]
+                    placeholders = ",".join("?" * len(chunk))
+                    existing.update(row[0] for row in connection.execute(f"SELECT _id FROM ratings WHERE _id IN ({placeholders})", chunk))
+                inserted, duplicates, rejected = [], 0, 0
+                for doc in docs:
+                    if doc.get("_id") in existing:
+                        duplicates += 1
+                    elif not _valid(doc):
+                        logger.warning(f"Rating {doc.get('_id')} rejected: missing fields or invalid rate")
+                        rejected += 1
+                    else:
+                        existing.add(doc["_id"])
+                        inserted.append(doc)
+                connection.executemany(INSERT_RATING, [_row(doc) for doc in inserted])
+                self._apply_derived_many(connection, inserted, 1)
+            return inserted, duplicates, rejected
+        except sqlite3.Error as e:
+            logger.error(f"Error inserting {len(docs)} ratings: {str(e)}")
+            raise DatabaseException(
+                message="Failed to insert ratings",
+                details={"error": str(e)}
+            )
+
+    def rating_exists(self, rating_id: UUID) -> bool:
+        """Check whether a rating exists; answered from the primary key alone."""
+        try:
+            return self._connection().execute(RATING_EXISTS, (str(rating_id),)).fetchone() is not None
+        except sqlite3.Error as e:
+            logger.error(f"Error checking rating {rating_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch rating",
+                details={"error": str(e)}
+            )
+
+    def get_version(self, scope: str, entity_id: UUID) -> int:
+        """Get the write counter of a professional or consumer."""
+        try:
+            row = self._connection().execute(SELECT_VERSION, (f"{scope}:{entity_id}",)).fetchone()
+            return row[0] if row else 0
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching {scope} version for {entity_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch version",
+                details={"error": str(e)}
+            )
+
+    def list_trend_buckets(self, professional_id: UUID, granularity: TrendGranularity, first_period: str, last_period: str) -> List[Dict[str, Any]]:
+        """List a professional's trend buckets between two period keys (inclusive): one primary key range scan."""
+        try:
+            rows = self._connection().execute(SELECT_BUCKETS, (str(professional_id), granularity.value, first_period, last_period))
+            return [
+                {"period": period, "count": count, "sum": total, "histogram": _histogram_dict(histogram)}
+                for period, count, total, *histogram in rows
+            ]
+        except sqlite3.Error as e:
+            logger.error(f"Error listing trend for professional {professional_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch rating trend",
+                details={"error": str(e)}
+            )
+
+    def rebuild_trend_buckets(self, professional_ids: Optional[List[UUID]] = None) -> int:
+        """Recompute trend buckets from the stored ratings with one GROUP BY; returns the number of buckets written."""
+        query = """SELECT professional_id, strftime('%Y-%m-%d', created_at / 1000, 'unixepoch') AS day, rate, COUNT(*)
+            FROM ratings {where} GROUP BY professional_id, day, rate"""
+        parameters: List[str] = []
+        where = ""
+        if professional_ids is not None:
+            parameters = [str(professional_id) for professional_id in professional_ids]
+            where = f"WHERE professional_id IN ({','.join('?' * len(parameters))})"
+        connection = self._connection()
+        try:
+            buckets: Dict[tuple, List[int]] = {}
+            for professional_id, day, rate, count in connection.execute(query.format(where=where), parameters):
+                for granularity, period in ((TrendGranularity.DAY, day), (TrendGranularity.MONTH, day[:7])):
+                    _add_to_bucket(buckets, (professional_id, granularity.value, period), rate, count)
+            with _transaction(connection):
+                connection.executemany(SET_BUCKET, [(*key, *bucket) for key, bucket in buckets.items()])
+            return len(buckets)
+        except sqlite3.Error as e:
+            logger.error(f"Error rebuilding trend buckets: {str(e)}")
+            raise DatabaseException(
+                message="Failed to rebuild rating trends",
+                details={"error": str(e)}
+            )
+
+    def _apply_derived_many(self, connection: sqlite3.Connection, docs: List[Dict[str, Any]], sign: int) -> None:
+        """Write counters and trend buckets for created (+1) or deleted (-1) ratings, inside the caller's transaction."""
+        if not docs:
+            return
+        scopes = {f"professional:{doc['professional_id']}" for doc in docs}
+        scopes.update(f"consumer:{doc['consumer_id']}" for doc in docs)
+        connection.executemany(BUMP_VERSION, [(scope,) for scope in sorted(scopes)])
+        # Agrega por bucket para que um lote gere uma única linha por período
+        buckets: Dict[tuple, List[int]] = {}
+        for doc in docs:
+            created_at = _as_datetime(doc["created_at"])
+            for granularity in TrendGranularity:
+                key = (str(doc["professional_id"]), granularity.value, period_key(created_at, granularity))
+                _add_to_bucket(buckets, key, doc["rate"], sign)
+        connection.executemany(UPSERT_BUCKET, [(*key, *bucket) for key, bucket in buckets.items()])
+
+    def get_rating_by_id(self, rating_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a rating by its ID."""
+        try:
+            row = self._connection().execute(SELECT_RATING, (str(rating_id),)).fetchone()
+            return _row_to_dict(row) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching rating {rating_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch rating",
+                details={"error": str(e)}
+            )
+
+    def get_ratings_by_ids(self, rating_ids: List[UUID]) -> List[Dict[str, Any]]:
+        """Get several ratings with one IN query per chunk of IDs; missing IDs are simply absent."""
+        ids = [str(rating_id) for rating_id in rating_ids]
+        connection = self._connection()
+        try:
+            ratings = []
+            for offset in range(0, len(ids), MAX_PARAMETERS):
+                chunk = ids[offset:offset + MAX_PARAMETERS]
+                rows = connection.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM ratings WHERE _id IN ({','.join('?' * len(chunk))})", chunk
+                )
+                ratings.extend(_row_to_dict(row) for row in rows)
+            return ratings
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching {len(ids)} ratings: {str(e)}")
+            raise DatabaseException(
+                message="Failed to fetch ratings",
+                details={"error": str(e)}
+            )
+
+    def list_ratings_by_professional(self, professional_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
+        """List ratings for a professional."""
+        return self._list("professional_id", professional_id, page, size, filters)
+
+    def list_ratings_by_consumer(self, consumer_id: UUID, page: int = 1, size: int = 10, filters: Optional[RatingFilters] = None) -> tuple[List[Dict[str, Any]], int]:
+        """List ratings made by a consumer."""
+        return self._list("consumer_id", consumer_id, page, size, filters)
+
+    def _list(self, field: str, entity_id: UUID, page: int, size: int, filters: Optional[RatingFilters]) -> tuple[List[Dict[str, Any]], int]:
+        """Count and page with the (<field>, [rate,] created_at) indexes.
+
+        The count and the page of _ids (OFFSET included) are read from the
+        index alone; only the size rows of the page are then fetched by
+        primary key.
+        """
+        where, parameters = _listing_where(field, entity_id, filters)
+        connection = self._connection()
+        try:
+            total = connection.execute(f"SELECT COUNT(*) FROM ratings WHERE {where}", parameters).fetchone()[0]
+            rows = connection.execute(
+                f"""SELECT r._id, r.professional_id, r.consumer_id, r.rate, r.description, r.created_at
+                FROM (SELECT _id FROM ratings WHERE {where} ORDER BY created_at DESC LIMIT ? OFFSET ?) AS page
+                JOIN ratings AS r ON r._id = page._id
+                ORDER BY r.created_at DESC""",
+                [*parameters, size, (page - 1) * size]
+            )
+            return [_row_to_dict(row) for row in rows], total
+        except sqlite3.Error as e:
+            logger.error(f"Error listing ratings for {field} {entity_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to list ratings",
+                details={"error": str(e)}
+            )
+
+    def delete_rating(self, rating_id: UUID) -> bool:
+        """Delete a rating by its ID."""
+        connection = self._connection()
+        try:
+            with _transaction(connection):
+                row = connection.execute(DELETE_RATING, (str(rating_id),)).fetchone()
+                if row is None:
+                    return False
+                professional_id, consumer_id, rate, created_at = row
+                self._apply_derived_many(connection, [{
+                    "professional_id": professional_id,
+                    "consumer_id": consumer_id,
+                    "rate": rate,
+                    "created_at": _from_ms(created_at)
+                }], -1)
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error deleting rating {rating_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to delete rating",
+                details={"error": str(e)}
+            )
+
+    def iter_ratings(
+        self,
+        id_from: Optional[str] = None,
+        id_to: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream ratings with id_from <= _id < id_to, optionally within [created_from, created_to).
+
+        In _id order, or (created_at, _id) order with created_from, which
+        the (created_at) index returns without a temporary sort.
+        """
+        conditions, parameters = [], []
+        for column, operator, value in (
+            ("_id", ">=", id_from),
+            ("_id", "<", id_to),
+            ("created_at", ">=", _to_ms(created_from) if created_from is not None else None),
+            ("created_at", "<", _to_ms(created_to) if created_to is not None else None)
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        try:
+            # Conexão própria: o cursor fica aberto entre os lotes sem prender a conexão da thread
+            connection = sqlite3.connect(self.path)
+            try:
+                order = "created_at, _id" if created_from is not None else "_id"
+                cursor = connection.execute(f"SELECT {', '.join(COLUMNS)} FROM ratings {where} ORDER BY {order}", parameters)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield _row_to_dict(row)
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error streaming ratings in [{id_from}, {id_to}): {str(e)}")
+            raise DatabaseException(
+                message="Failed to read ratings",
+                details={"error": str(e)}
+            )
+
+    def iter_field_batches(self, fields: List[str], batch_size: int = 50000, query: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Stream documents with only the given fields, in batches, as MongoDB stores them (string IDs, naive UTC datetimes).
+
+        The query supports equality and $gte/$gt/$lte/$lt/$in per column,
+        which is what the analytics jobs send.
+        """
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown rating fields: {', '.join(sorted(unknown))}")
+        where, parameters = _query_where(query or {})
+        dates = [index for index, field in enumerate(fields) if field == "created_at"]
+        try:
+            connection = sqlite3.connect(self.path)
+            try:
+                cursor = connection.execute(f"SELECT {', '.join(fields)} FROM ratings {where}", parameters)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    batch = [dict(zip(fields, row)) for row in rows]
+                    if dates:
+                        for doc in batch:
+                            doc["created_at"] = _from_ms(doc["created_at"])
+                    yield batch
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error streaming rating fields {fields}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to read ratings",
+                details={"error": str(e)}
+            )
+
+    def next_ratings_chunk(self, scope: str, entity_id: UUID, after_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Next ratings of a professional or consumer (scope) with _id above after_id, in _id order.
+
+        The (<scope>_id) index of a WITHOUT ROWID table is ordered by
+        (<scope>_id, _id), so the chunk is an index range scan.
+        """
+        column = _scope_column(scope)
+        try:
+            rows = self._connection().execute(
+                f"SELECT _id, professional_id, consumer_id, rate, created_at FROM ratings "
+                f"WHERE {column} = ? AND _id > ? ORDER BY _id LIMIT ?",
+                (str(entity_id), after_id, limit)
+            )
+            return [
+                {"_id": _id, "professional_id": professional_id, "consumer_id": consumer_id, "rate": rate, "created_at": _from_ms(created_at)}
+                for _id, professional_id, consumer_id, rate, created_at in rows
+            ]
+        except sqlite3.Error as e:
+            logger.error(f"Error reading erasure chunk for {scope} {entity_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to read ratings",
+                details={"error": str(e)}
+            )
+
+    def delete_ratings_chunk(self, scope: str, entity_id: UUID, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Delete the ratings of a chunk that still exist and return them; derived data is not touched."""
+        if not chunk:
+            return []
+        column = _scope_column(scope)
+        connection = self._connection()
+        try:
+            deleted_ids = set()
+            with _transaction(connection):
+                for offset in range(0, len(chunk), MAX_PARAMETERS):
+                    ids = [doc["_id"] for doc in chunk[offset:offset + MAX_PARAMETERS]]
+                    rows = connection.execute(
+                        f"DELETE FROM ratings WHERE {column} = ? AND _id IN ({','.join('?' * len(ids))}) RETURNING _id",
+                        [str(entity_id), *ids]
+                    )
+                    deleted_ids.update(row[0] for row in rows)
+            return [doc for doc in chunk if doc["_id"] in deleted_ids]
+        except sqlite3.Error as e:
+            logger.error(f"Error deleting erasure chunk for {scope} {entity_id}: {str(e)}")
+            raise DatabaseException(
+                message="Failed to delete ratings",
+                details={"error": str(e)}
+            )
+
+    def apply_deleted_ratings(self, docs: List[Dict[str, Any]]) -> None:
+        """Update write counters and trend buckets for ratings removed by delete_ratings_chunk."""
+        connection = self._connection()
+        try:
+            with _transaction(connection):
+                self._apply_derived_many(connection, docs, -1)
+        except sqlite3.Error as e:
+            logger.error(f"Error updating derived data for {len(docs)} deleted ratings: {str(e)}")
+            raise DatabaseException(
+                message="Failed to update rating aggregates",
+                details={"error": str(e)}
+            )
+
+@contextmanager
+def _transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK on an autocommit connection.
+
+    IMMEDIATE takes the write lock up front, so a transaction that reads
+    before writing does not fail with SQLITE_BUSY halfway through.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+def _add_to_bucket(buckets: Dict[tuple, List[int]], key: tuple, rate: int, count: int) -> None:
+    # [count, sum, h0..h5]: a ordem das colunas de rating_trends
+    bucket = buckets.setdefault(key, [0] * (2 + len(HISTOGRAM)))
+    bucket[0] += count
+    bucket[1] += count * rate
+    bucket[2 + rate] += count
+
+def _histogram_dict(counts: List[int]) -> Dict[str, int]:
+    return {str(rate): count for rate, count in enumerate(counts) if count}
+
+def _row(doc: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        str(doc["_id"]),
+        str(doc["professional_id"]),
+        str(doc["consumer_id"]),
+        doc["rate"],
+        doc.get("description"),
+        _to_ms(doc["created_at"])
+    )
+
+def _row_to_dict(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    _id, professional_id, consumer_id, rate, description, created_at = row
+    return {
+        "_id": UUID(_id),
+        "professional_id": UUID(professional_id),
+        "consumer_id": UUID(consumer_id),
+        "rate": rate,
+        "description": description,
+        "created_at": _from_ms(created_at)
+    }
+
+def _valid(doc: Dict[str, Any]) -> bool:
+    required = ("_id", "professional_id", "consumer_id", "rate", "created_at")
+    rate = doc.get("rate")
+    return all(field in doc for field in required) and isinstance(rate, int) and not isinstance(rate, bool) and 0 <= rate <= 5
+
+def _as_datetime(value: Any) -> datetime:
+    return _from_ms(value) if isinstance(value, int) else value
+
+def _to_ms(moment: datetime) -> int:
+    # Datas sem fuso são UTC, como no MongoDB
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - EPOCH) // timedelta(milliseconds=1)
+
+def _from_ms(value: int) -> datetime:
+    return EPOCH + timedelta(milliseconds=value)
+
+def _scope_column(scope: str) -> str:
+    if scope not in ("professional", "consumer"):
+        raise ValueError(f"Unknown scope {scope!r}")
+    return f"{scope}_id"
+
+def _listing_where(field: str, entity_id: UUID, filters: Optional[RatingFilters]) -> Tuple[str, List[Any]]:
+    """Equality on the entity, rate points, then a created_at range: the order of the composite indexes."""
+    conditions, parameters = [f"{field} = ?"], [str(entity_id)]
+    if filters is not None:
+        rates = filters.allowed_rates()
+        if rates is not None:
+            conditions.append(f"rate IN ({','.join('?' * len(rates))})" if rates else "0")
+            parameters.extend(rates)
+        if filters.created_after is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(_to_ms(filters.created_after))
+        if filters.created_before is not None:
+            conditions.append("created_at < ?")
+            parameters.append(_to_ms(filters.created_before))
+    return " AND ".join(conditions), parameters
+
+def _query_where(query: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """Translate the MongoDB-style filters the analytics jobs use into a WHERE clause."""
+    operators = {"$gte": ">=", "$gt": ">", "$lte": "<=", "$lt": "<"}
+    conditions, parameters = [], []
+    for field, condition in query.items():
+        if field not in COLUMNS:
+            raise ValueError(f"Unknown rating field {field!r}")
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for operator, operand in condition.items():
+            if operator == "$in":
+                values = [_to_ms(v) if isinstance(v, datetime) else v for v in operand]
+                conditions.append(f"{field} IN ({','.join('?' * len(values))})" if values else "0")
+                parameters.extend(values)
+                continue
+            if operator == "$eq":
+                sql = "="
+            elif operator in operators:
+                sql = operators[operator]
+            else:
+                raise ValueError(f"Unsupported query operator {operator}")
+            conditions.append(f"{field} {sql} ?")
+            parameters.append(_to_ms(operand) if isinstance(operand, datetime) else operand)
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), parameters
@@ -0,0 +1,74 @@
+import logging
+from typing import Optional
+from pymongo import MongoClient
+from src.domain.interfaces.rating_search import RatingSearch
+from src.infrastructure.config.settings import Settings, get_settings
+from src.infrastructure.database.mongo_client import get_mongo_client, get_ratings_collection
+
+logger = logging.getLogger(__name__)
+
+_rating_search = None
+
+def get_rating_search(settings: Optional[Settings] = None) -> RatingSearch:
+    """Process-wide search backend chosen by the SEARCH_BACKEND setting.
+
+    `auto` uses the MongoDB text index on a real server and the in-process
+    inverted index otherwise (mongomock does not implement $text, and the
+    sqlite and memory rating backends have no MongoDB at all). Settings
+    default to the environment's.
+    """
+    global _rating_search
+    if _rating_search is None:
+        settings = settings or get_settings()
+        validate_search_backend(settings, settings.web_concurrency or 1)
+        backend = _effective_backend(settings)
+        # Só o backend escolhido é importado
+        if backend == "mongo":
+            from src.infrastructure.search.mongo_text_search import MongoTextSearch
+            _rating_search = MongoTextSearch(get_ratings_collection(), settings.search_text_language)
+        else:
+            from src.infrastructure.search.inverted_index_search import InvertedIndexSearch
+            index = InvertedIndexSearch()
+            if settings.rating_repository_backend == "mongo":
+                index.index_ratings(get_ratings_collection().find({}, {"professional_id": 1, "description": 1, "created_at": 1}))
+            else:
+                from src.infrastructure.repositories.rating_repository import get_rating_repository
+                index.index_ratings(get_rating_repository(settings).iter_ratings())
+            logger.info(f"Built in-memory search index with {len(index)} ratings")
+            _rating_search = index
+    return _rating_search
+
+def _effective_backend(settings: Settings) -> str:
+    if settings.search_backend != "auto":
+        return settings.search_backend
+    if settings.rating_repository_backend != "mongo":
+        return "memory"
+    return "mongo" if isinstance(get_mongo_client(), MongoClient) else "memory"
+
+def validate_search_backend(settings: Settings, workers: int) -> None:
+    """Reject the in-memory index when more than one worker process would serve requests.
+
+    That is SEARCH_BACKEND=memory, or auto without MongoDB storage; mongo
+    needs MongoDB storage. The inverted index lives in one process and only sees that process's
+    creates and deletes; bulk imports and erasures run elsewhere never
+    reach it. With several workers each one would answer from a different,
+    diverging index.
+    """
+    if settings.search_backend == "mongo" and settings.rating_repository_backend != "mongo":
+        raise ValueError(
+            f"SEARCH_BACKEND=mongo needs RATING_REPOSITORY_BACKEND=mongo "
+            f"(got {settings.rating_repository_backend}); use SEARCH_BACKEND=memory or auto"
+        )
+    # Sem MongoDB, auto também resolve para o índice em memória
+    memory = settings.search_backend == "memory" or (
+        settings.search_backend == "auto" and settings.rating_repository_backend != "mongo"
+    )
+    if memory and workers > 1:
+        raise ValueError(
+            f"SEARCH_BACKEND={settings.search_backend} uses the in-memory index, which is single-process only "
+            f"({workers} workers configured); use SEARCH_BACKEND=mongo with RATING_REPOSITORY_BACKEND=mongo"
+        )
+
+def set_rating_search(search: Optional[RatingSearch]) -> None:
+    global _rating_search
+    _rating_search = search
@@ -0,0 +1,146 @@
+import heapq
+import math
+import threading
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from src.domain.interfaces.rating_search import RatingSearch
+from src.infrastructure.search.tokenizer import tokenize
+
+# Parâmetros usuais do BM25
+K1 = 1.2
+B = 0.75
+
+# Compacta quando as lápides passam desta fração dos slots (e deste mínimo)
+COMPACT_RATIO = 0.25
+COMPACT_MIN_DELETED = 1024
+
+class InvertedIndexSearch(RatingSearch):
+    """In-process BM25 inverted index over rating descriptions.
+
+    Used where MongoDB text indexes are unavailable (mongomock, tests) and
+    as a single-node alternative. Each rating gets an integer slot; postings
+    are compact arrays of (slot, term frequency) and deletions are
+    tombstones, so inserts and deletes are O(terms of the rating). Document
+    frequencies are kept per term and decremented on delete, so idf only
+    counts live ratings. Once tombstones pass COMPACT_RATIO of the slots the
+    index is rebuilt without them, O(postings) amortized over the deletes.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._document_frequency: Dict[str, int] = {}
+        # Termos de cada slot, para descontar a frequência de documento na exclusão
+        self._terms: List[Tuple[str, ...]] = []
+        self._slots: Dict[str, int] = {}
+        self._rating_ids: List[str] = []
+        self._professionals = array("I")
+        self._professional_codes: Dict[str, int] = {}
+        self._lengths = array("I")
+        self._created_at = array("d")
+        self._deleted = set()
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def index_rating(self, rating: Dict[str, Any]) -> None:
+        terms = Counter(tokenize(rating.get("description") or ""))
+        rating_id = str(rating["_id"])
+        with self._lock:
+            if rating_id in self._slots:
+                return
+            slot = len(self._rating_ids)
+            self._slots[rating_id] = slot
+            self._rating_ids.append(rating_id)
+            professional = str(rating["professional_id"])
+            code = self._professional_codes.setdefault(professional, len(self._professional_codes))
+            self._professionals.append(code)
+            length = sum(terms.values())
+            self._lengths.append(length)
+            self._total_length += length
+            self._created_at.append(_timestamp(rating.get("created_at")))
+            self._terms.append(tuple(terms))
+            for term, frequency in terms.items():
+                self._document_frequency[term] = self._document_frequency.get(term, 0) + 1
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("H"))
+                postings[0].append(slot)
+                postings[1].append(min(frequency, 65535))
+
+    def index_ratings(self, ratings: Iterable[Dict[str, Any]]) -> None:
+        for rating in ratings:
+            self.index_rating(rating)
+
+    def remove_rating(self, rating_id: UUID) -> None:
+        with self._lock:
+            slot = self._slots.pop(str(rating_id), None)
+            if slot is None:
+                return
+            self._deleted.add(slot)
+            self._total_length -= self._lengths[slot]
+            for term in self._terms[slot]:
+                self._document_frequency[term] -= 1
+            self._terms[slot] = ()
+            if len(self._deleted) >= max(COMPACT_MIN_DELETED, COMPACT_RATIO * len(self._rating_ids)):
+                self._compact()
+
+    def _compact(self) -> None:
+        """Renumber the live slots and rebuild the postings without the tombstones."""
+        live = [slot for slot in range(len(self._rating_ids)) if slot not in self._deleted]
+        renumbered = {slot: new for new, slot in enumerate(live)}
+        postings: Dict[str, Tuple[array, array]] = {}
+        for term, (slots, frequencies) in self._postings.items():
+            kept = [(renumbered[slot], frequency) for slot, frequency in zip(slots, frequencies) if slot in renumbered]
+            if kept:
+                postings[term] = (array("I", (slot for slot, _ in kept)), array("H", (frequency for _, frequency in kept)))
+        self._postings = postings
+        self._document_frequency = {term: count for term, count in self._document_frequency.items() if count}
+        self._rating_ids = [self._rating_ids[slot] for slot in live]
+        self._slots = {rating_id: slot for slot, rating_id in enumerate(self._rating_ids)}
+        self._professionals = array("I", (self._professionals[slot] for slot in live))
+        self._lengths = array("I", (self._lengths[slot] for slot in live))
+        self._created_at = array("d", (self._created_at[slot] for slot in live))
+        self._terms = [self._terms[slot] for slot in live]
+        self._deleted = set()
+
+    def search(self, query: str, professional_id: Optional[UUID] = None, page: int = 1, size: int = 10) -> Tuple[List[Tuple[UUID, float]], int]:
+        terms = set(tokenize(query))
+        with self._lock:
+            if professional_id is not None:
+                code = self._professional_codes.get(str(professional_id))
+                if code is None:
+                    return [], 0
+            documents = len(self._slots)
+            if not terms or not documents:
+                return [], 0
+            average_length = self._total_length / documents or 1.0
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                slots, frequencies = postings
+                document_frequency = self._document_frequency[term]
+                idf = math.log(1 + (documents - document_frequency + 0.5) / (document_frequency + 0.5))
+                for slot, frequency in zip(slots, frequencies):
+                    if slot in self._deleted:
+                        continue
+                    if professional_id is not None and self._professionals[slot] != code:
+                        continue
+                    norm = K1 * (1 - B + B * self._lengths[slot] / average_length)
+                    scores[slot] = scores.get(slot, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+            # Empate na relevância: a avaliação mais recente primeiro
+            top = heapq.nlargest(page * size, scores.items(), key=lambda item: (item[1], self._created_at[item[0]]))
+            hits = [(UUID(self._rating_ids[slot]), score) for slot, score in top[(page - 1) * size:]]
+            return hits, len(scores)
+
+def _timestamp(moment: Optional[datetime]) -> float:
+    if moment is None:
+        return 0.0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
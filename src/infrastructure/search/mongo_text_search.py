@@ -0,0 +1,40 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from pymongo import TEXT
+from src.domain.interfaces.rating_search import RatingSearch
+from src.domain.exceptions.base_exceptions import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+class MongoTextSearch(RatingSearch):
+    """MongoDB text-index implementation of RatingSearch."""
+    def __init__(self, collection, language: str = "portuguese"):
+        self.collection = collection
+        # Só pode existir um índice de texto por coleção
+        self.collection.create_index([("description", TEXT)], default_language=language)
+
+    def search(self, query: str, professional_id: Optional[UUID] = None, page: int = 1, size: int = 10) -> Tuple[List[Tuple[UUID, float]], int]:
+        try:
+            criteria: Dict[str, Any] = {"$text": {"$search": query}}
+            if professional_id is not None:
+                criteria["professional_id"] = str(professional_id)
+            total = self.collection.count_documents(criteria)
+            cursor = self.collection.find(
+                criteria,
+                {"_id": 1, "score": {"$meta": "textScore"}}
+            ).sort([("score", {"$meta": "textScore"}), ("created_at", -1)]).skip((page - 1) * size).limit(size)
+            return [(UUID(doc["_id"]), doc["score"]) for doc in cursor], total
+        except Exception as e:
+            logger.error(f"Error searching ratings for '{query}': {str(e)}")
+            raise DatabaseException(
+                message="Failed to search ratings",
+                details={"error": str(e)}
+            )
+
+    def index_rating(self, rating: Dict[str, Any]) -> None:
+        # O índice de texto do MongoDB é atualizado pela própria escrita
+        pass
+
+    def remove_rating(self, rating_id: UUID) -> None:
+        pass
@@ -0,0 +1,13 @@
+import re
+import unicodedata
+from typing import List
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-insensitive word tokens with at least two characters."""
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text.casefold())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return [token for token in _WORD.findall(normalized) if len(token) > 1]
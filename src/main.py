@@ -1,38 +1,101 @@
+"""
+Application factory.
+
+Importing this module is cheap: routers, schemas, services and the database
+driver are imported by create_app(), and `app` is only built on first access
+(`from src.main import app`, or "src.main:app" in uvicorn/gunicorn). Startup
+and shutdown work runs in the lifespan handler.
+"""
 import logging
-from fastapi import FastAPI
-from src.api.v1.endpoints import ratings, health
-from src.api.middleware.exception_handler import global_exception_handler
-from src.domain.exceptions.base_exceptions import BaseAPIException
-from pymongo.errors import PyMongoError
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+from src.infrastructure.config.settings import Settings, get_settings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi import FastAPI
+
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="ms_rate - EasyProFind",
-    description="Microserviço de avaliações de profissionais",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Add exception handlers
-app.add_exception_handler(PyMongoError, global_exception_handler)
-app.add_exception_handler(BaseAPIException, global_exception_handler)
-app.add_exception_handler(Exception, global_exception_handler)
-
-# Include routers
-app.include_router(health.router, prefix="/health", tags=["Health"])
-app.include_router(ratings.router, tags=["Ratings"])
-
-@app.on_event("startup")
-async def startup_event():
+def configure_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+def resume_erasure_jobs() -> None:
+    """Continue erasure jobs interrupted by a crash, from where they stopped."""
+    from src.application.services.erasure_service import get_erasure_service
+    try:
+        get_erasure_service().resume_pending()
+    except Exception as e:
+        logger.warning(f"Could not resume erasure jobs: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: "FastAPI") -> AsyncIterator[None]:
+    from src.api.dependencies import ServiceContainer
     logger.info("Starting up ms_rate service...")
+    # Repositório e serviço compartilhados por todas as requisições desta aplicação
+    app.state.services = ServiceContainer(app.state.settings)
+    if app.state.settings.rating_repository_backend == "mongo":
+        # Em segundo plano: nem o startup (e o /health/) nem o shutdown esperam pelo MongoDB
+        threading.Thread(target=resume_erasure_jobs, name="erasure-resume", daemon=True).start()
+    yield
+    app.state.services = None
+    logger.info("Shutting down ms_rate service...")
+
+def create_app(settings: Optional[Settings] = None) -> "FastAPI":
+    """Build the FastAPI application for the given settings (by default, from the environment).
+
+    The erasure endpoints are only mounted with MongoDB storage, where the
+    erasure jobs live.
+    """
+    from fastapi import FastAPI
+    from pymongo.errors import PyMongoError
+    from src.api.v1.endpoints import ratings, health, admin
+    from src.api.middleware.exception_handler import global_exception_handler
+    from src.api.middleware.admission_control import AdmissionControlMiddleware
+    from src.api.middleware.route_context import RouteContextMiddleware
+    from src.domain.exceptions.base_exceptions import BaseAPIException
+
+    settings = settings or get_settings()
+    configure_logging()
+    app = FastAPI(
+        title="ms_rate - EasyProFind",
+        description="Microserviço de avaliações de profissionais",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+    app.state.settings = settings
+
+    # Limites por grupo de rotas; adicionado antes para rodar dentro do RouteContextMiddleware
+    app.add_middleware(AdmissionControlMiddleware, settings=settings)
+    # Rota da requisição para o log de consultas lentas e o controle de admissão
+    app.add_middleware(RouteContextMiddleware)
+
+    # Add exception handlers
+    app.add_exception_handler(PyMongoError, global_exception_handler)
+    app.add_exception_handler(BaseAPIException, global_exception_handler)
+    app.add_exception_handler(Exception, global_exception_handler)
+
+    # Include routers
+    app.include_router(health.router, prefix="/health", tags=["Health"])
+    app.include_router(ratings.router, tags=["Ratings"])
+    app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+    if settings.rating_repository_backend == "mongo":
+        from src.api.v1.endpoints import erasure
+        app.include_router(erasure.router, prefix="/erasure-jobs", tags=["Erasure"])
+    return app
+
+_app_lock = threading.Lock()
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Shutting down ms_rate service...") 
\ No newline at end of file
+def __getattr__(name: str):
+    # `app` é montado no primeiro acesso, uma única vez, e fica como atributo do módulo
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _app_lock:
+        if "app" not in globals():
+            globals()["app"] = create_app()
+    return globals()["app"]
@@ -0,0 +1,119 @@
+"""
+Production server entry point.
+
+Runs the app under gunicorn with uvicorn workers: the app is imported once in
+the master (preload) and the heap is frozen with gc.freeze() before forking,
+so workers share those pages copy-on-write. Each worker then opens its own
+MongoDB pool. Without gunicorn installed it falls back to uvicorn's own
+multi-process mode, which imports the app in every worker.
+"""
+import gc
+import importlib.util
+import logging
+import os
+from typing import Any, Dict
+from src.infrastructure.config.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+APP = "src.main:app"
+
+def worker_count(settings: Settings) -> int:
+    """Configured worker count, or one per CPU available to this process."""
+    if settings.web_concurrency:
+        return settings.web_concurrency
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover
+        cpus = os.cpu_count() or 1
+    return max(cpus, 1)
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+def gunicorn_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "bind": f"{settings.server_host}:{settings.server_port}",
+        "workers": worker_count(settings),
+        "worker_class": "src.server.UvicornWorker",
+        "preload_app": True,
+        "backlog": settings.server_backlog,
+        "keepalive": settings.server_keepalive,
+        "timeout": settings.server_timeout,
+        "graceful_timeout": settings.server_graceful_timeout,
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+    }
+
+def when_ready(server) -> None:
+    """Master hook, after the preloaded app is imported and before workers fork."""
+    gc.collect()
+    # Move os objetos do import para a geração permanente: o GC dos workers não
+    # toca nessas páginas e elas continuam compartilhadas após o fork
+    gc.freeze()
+    server.log.info(f"Froze {gc.get_freeze_count()} objects before forking workers")
+
+def post_fork(server, worker) -> None:
+    """Worker hook: drop any client inherited from the master so the worker opens its own pool."""
+    from src.infrastructure.database.mongo_client import set_mongo_client
+    set_mongo_client(None)
+
+try:
+    from uvicorn.workers import UvicornWorker as _BaseUvicornWorker
+
+    class UvicornWorker(_BaseUvicornWorker):
+        """Uvicorn worker pinned to uvloop/httptools when they are installed."""
+        CONFIG_KWARGS = {"loop": event_loop(), "http": http_protocol()}
+except ImportError:  # pragma: no cover
+    UvicornWorker = None
+
+def run_gunicorn(settings: Settings) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from src.main import app
+            return app
+
+    Application(gunicorn_options(settings)).run()
+
+def run_uvicorn(settings: Settings) -> None:
+    import uvicorn
+    uvicorn.run(
+        APP,
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=worker_count(settings),
+        loop=event_loop(),
+        http=http_protocol(),
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+    )
+
+def main() -> None:
+    settings = get_settings()
+    from src.infrastructure.search.factory import validate_search_backend
+    from src.infrastructure.repositories.rating_repository import validate_rating_backend
+    # Falha antes do fork, e não na primeira busca de cada worker
+    validate_search_backend(settings, worker_count(settings))
+    validate_rating_backend(settings, worker_count(settings))
+    if importlib.util.find_spec("gunicorn") is not None:
+        run_gunicorn(settings)
+    else:
+        logger.warning("gunicorn is not installed: falling back to uvicorn workers without preload")
+        run_uvicorn(settings)
+
+if __name__ == "__main__":
+    main()
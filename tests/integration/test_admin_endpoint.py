@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+from src.main import app
+
+client = TestClient(app)
+
+def test_cache_stats():
+    """Testa o endpoint de métricas do cache de listagens."""
+    response = client.get("/admin/cache")
+    assert response.status_code == 200
+    stats = response.json()["list_pages"]
+    assert {"entries", "bytes", "hits", "misses", "evictions", "hit_rate"} <= set(stats)
+    assert {"in_flight", "executed", "coalesced", "by_kind"} <= set(response.json()["single_flight"])
+
+def test_slow_queries():
+    """Testa o endpoint do log de consultas lentas."""
+    from src.infrastructure.database.slow_query_log import SlowQueryLog, set_slow_query_log
+    log = SlowQueryLog(threshold_ms=0)
+    log.record({"at": "2024-01-01T00:00:00+00:00", "command": "find", "shape": "find easyprofind.ratings {}", "duration_ms": 150.0, "docs_returned": 10, "route": "GET /ratings/{rating_id}", "error": None})
+    set_slow_query_log(log)
+    try:
+        response = client.get("/admin/slow-queries", params={"limit": 5, "top": 3})
+    finally:
+        set_slow_query_log(None)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["stats"]["recorded"] == 1
+    assert body["top"][0]["shape"] == "find easyprofind.ratings {}"
+    assert body["recent"][0]["route"] == "GET /ratings/{rating_id}"
+
+def test_errors():
+    """Testa o endpoint de contadores de erros."""
+    import logging
+    from src.infrastructure.observability.error_log import ErrorLog, set_error_log
+    log = ErrorLog(interval=60)
+    for _ in range(3):
+        log.report(logging.getLogger("test"), RuntimeError("boom"), "Erro", where="site")
+    set_error_log(log)
+    try:
+        response = client.get("/admin/errors", params={"limit": 5})
+    finally:
+        set_error_log(None)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reported"] == 3
+    assert body["suppressed"] == 2
+    assert body["signatures"][0]["exception"] == "builtins.RuntimeError"
+    assert body["signatures"][0]["where"] == "site"
+
+def test_admission():
+    """Testa o endpoint de métricas do controle de admissão."""
+    response = client.get("/admin/admission")
+    assert response.status_code == 200
+    groups = response.json()["groups"]
+    assert {"writes", "reads_by_id", "listings", "exports"} <= set(groups)
+    assert {"limit", "max_limit", "in_flight", "queued", "admitted", "rejected", "timed_out"} <= set(groups["writes"])
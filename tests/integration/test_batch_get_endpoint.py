@@ -0,0 +1,85 @@
+import pytest
+import pytest_asyncio
+import mongomock
+from uuid import uuid4
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.application.services.rating_service import MAX_BATCH_GET_IDS
+from src.infrastructure.database import mongo_client
+
+@pytest_asyncio.fixture
+async def test_client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+async def _create(client, rate):
+    response = await client.post("/ratings/", json={
+        "professional_id": str(uuid4()),
+        "consumer_id": str(uuid4()),
+        "rate": rate,
+        "description": None
+    })
+    assert response.status_code == 201
+    return response.json()["_id"]
+
+@pytest.mark.asyncio
+async def test_get_ratings_by_ids_query(test_client):
+    """Testa GET /ratings?ids=, com IDs separados por vírgula e repetidos."""
+    first, second = await _create(test_client, 1), await _create(test_client, 2)
+    missing = str(uuid4())
+    response = await test_client.get(f"/ratings?ids={second},{missing}&ids={first}")
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["_id"] for item in body["items"]] == [second, first]
+    assert [item["rate"] for item in body["items"]] == [2, 1]
+    assert body["missing"] == [missing]
+
+@pytest.mark.asyncio
+async def test_batch_get(test_client):
+    """Testa POST /ratings:batchGet, na ordem pedida e com os IDs inexistentes."""
+    first, second = await _create(test_client, 4), await _create(test_client, 5)
+    missing = str(uuid4())
+    response = await test_client.post("/ratings:batchGet", json={"ids": [missing, first, second, first]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["_id"] for item in body["items"]] == [first, second]
+    assert body["missing"] == [missing]
+
+@pytest.mark.asyncio
+async def test_batch_get_validation(test_client):
+    """Testa os limites e IDs inválidos."""
+    too_many = [str(uuid4()) for _ in range(MAX_BATCH_GET_IDS + 1)]
+    response = await test_client.post("/ratings:batchGet", json={"ids": too_many})
+    assert response.status_code == 400
+    assert response.json()["message"] == "Too many rating IDs"
+
+    response = await test_client.get("/ratings", params={"ids": ",".join(too_many)})
+    assert response.status_code == 400
+
+    response = await test_client.get("/ratings", params={"ids": "not-a-uuid"})
+    assert response.status_code == 400
+    assert response.json()["details"] == {"id": "not-a-uuid"}
+
+    response = await test_client.post("/ratings:batchGet", json={"ids": ["not-a-uuid"]})
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_create_without_trailing_slash_still_works(test_client):
+    """Testa que o GET /ratings não tira o POST /ratings (sem barra) do ar."""
+    response = await test_client.post("/ratings", json={
+        "professional_id": str(uuid4()),
+        "consumer_id": str(uuid4()),
+        "rate": 4,
+        "description": "Sem barra"
+    })
+    assert response.status_code == 201
+    rating_id = response.json()["_id"]
+    response = await test_client.get(f"/ratings?ids={rating_id}")
+    assert [item["_id"] for item in response.json()["items"]] == [rating_id]
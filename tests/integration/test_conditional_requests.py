@@ -0,0 +1,229 @@
+import pytest
+import pytest_asyncio
+import mongomock
+from uuid import uuid4
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.infrastructure.database import mongo_client
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+
+@pytest_asyncio.fixture
+async def test_client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+async def _create_rating(test_client, professional_id, consumer_id=None):
+    response = await test_client.post("/ratings/", json={
+        "professional_id": professional_id,
+        "consumer_id": consumer_id or str(uuid4()),
+        "rate": 5,
+        "description": "Test rating"
+    })
+    assert response.status_code == 201
+    return response.json()
+
+@pytest.mark.asyncio
+async def test_get_rating_not_modified(test_client, monkeypatch):
+    rating = await _create_rating(test_client, str(uuid4()))
+
+    response = await test_client.get(f"/ratings/{rating['_id']}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    # O 304 não carrega nem serializa o documento
+    def fail(*args, **kwargs):
+        raise AssertionError("rating should not be loaded")
+    monkeypatch.setattr(RatingRepositoryImpl, "get_rating_by_id", fail)
+    response = await test_client.get(f"/ratings/{rating['_id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+@pytest.mark.asyncio
+async def test_get_deleted_rating_with_etag_returns_404(test_client):
+    rating = await _create_rating(test_client, str(uuid4()))
+    response = await test_client.get(f"/ratings/{rating['_id']}")
+    etag = response.headers["ETag"]
+
+    response = await test_client.delete(f"/ratings/{rating['_id']}")
+    assert response.status_code == 204
+
+    response = await test_client.get(f"/ratings/{rating['_id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_list_by_professional_not_modified_until_write(test_client, monkeypatch):
+    professional_id = str(uuid4())
+    await _create_rating(test_client, professional_id)
+
+    response = await test_client.get(f"/ratings/professional/{professional_id}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith("W/")
+
+    original = RatingRepositoryImpl.list_ratings_by_professional
+    def fail(*args, **kwargs):
+        raise AssertionError("listing should not be queried")
+    monkeypatch.setattr(RatingRepositoryImpl, "list_ratings_by_professional", fail)
+    response = await test_client.get(
+        f"/ratings/professional/{professional_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    monkeypatch.setattr(RatingRepositoryImpl, "list_ratings_by_professional", original)
+
+    # Uma nova escrita invalida o ETag
+    await _create_rating(test_client, professional_id)
+    response = await test_client.get(
+        f"/ratings/professional/{professional_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["total"] == 2
+
+@pytest.mark.asyncio
+async def test_list_by_consumer_not_modified(test_client):
+    consumer_id = str(uuid4())
+    await _create_rating(test_client, str(uuid4()), consumer_id)
+
+    response = await test_client.get(f"/ratings/consumer/{consumer_id}")
+    etag = response.headers["ETag"]
+
+    response = await test_client.get(f"/ratings/consumer/{consumer_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    # O 304 repete o Vary do 200
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+    # Outra página tem outro ETag
+    response = await test_client.get(
+        f"/ratings/consumer/{consumer_id}?page=2", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_large_listing_is_compressed(test_client):
+    professional_id = str(uuid4())
+    for _ in range(20):
+        response = await test_client.post("/ratings/", json={
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": 5,
+            "description": "Excellent service! " * 20
+        })
+        assert response.status_code == 201
+
+    response = await test_client.get(
+        f"/ratings/professional/{professional_id}?size=20", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert "ETag" in response.headers
+    # O httpx descomprime o corpo de forma transparente
+    assert len(response.json()["items"]) == 20
+    assert int(response.headers["Content-Length"]) < len(response.content)
+
+    response = await test_client.get(
+        f"/ratings/professional/{professional_id}?size=20", headers={"Accept-Encoding": "identity"}
+    )
+    assert "Content-Encoding" not in response.headers
+    assert response.json()["total"] == 20
+
+@pytest.mark.asyncio
+async def test_list_with_date_filters(test_client):
+    from datetime import datetime, timedelta, timezone
+    consumer_id = str(uuid4())
+    await _create_rating(test_client, str(uuid4()), consumer_id)
+    now = datetime.now(timezone.utc)
+
+    response = await test_client.get(
+        f"/ratings/consumer/{consumer_id}",
+        params={"created_after": (now - timedelta(hours=1)).isoformat()}
+    )
+    assert response.json()["total"] == 1
+
+    response = await test_client.get(
+        f"/ratings/consumer/{consumer_id}",
+        params={"created_before": (now - timedelta(hours=1)).isoformat()}
+    )
+    assert response.json()["total"] == 0
+
+    response = await test_client.get(
+        f"/ratings/consumer/{consumer_id}",
+        params={"created_after": now.isoformat(), "created_before": (now - timedelta(days=1)).isoformat()}
+    )
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_with_naive_and_aware_bounds(test_client):
+    # Um limite sem fuso (UTC) e outro com fuso não podem gerar erro 500
+    response = await test_client.get(
+        f"/ratings/professional/{uuid4()}",
+        params={"created_after": "2024-01-01T00:00:00", "created_before": "2024-02-01T00:00:00Z"}
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+    response = await test_client.get(
+        f"/ratings/consumer/{uuid4()}",
+        params={"created_after": "2024-02-01T00:00:00", "created_before": "2024-01-01T00:00:00Z"}
+    )
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_with_rate_filters(test_client):
+    professional_id = str(uuid4())
+    for rate in (1, 2, 5):
+        response = await test_client.post("/ratings/", json={
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": rate
+        })
+        assert response.status_code == 201
+
+    response = await test_client.get(f"/ratings/professional/{professional_id}?rate_in=1&rate_in=2")
+    assert sorted(r["rate"] for r in response.json()["items"]) == [1, 2]
+
+    response = await test_client.get(f"/ratings/professional/{professional_id}?min_rate=2")
+    assert response.json()["total"] == 2
+
+    response = await test_client.get(f"/ratings/professional/{professional_id}?rate_in=6")
+    assert response.status_code == 422
+
+    response = await test_client.get(f"/ratings/professional/{professional_id}?min_rate=5&max_rate=1")
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_filtered_listing_does_not_match_unfiltered_etag(test_client):
+    professional_id = str(uuid4())
+    for rate in (1, 5):
+        response = await test_client.post("/ratings/", json={
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": rate
+        })
+        assert response.status_code == 201
+
+    response = await test_client.get(f"/ratings/professional/{professional_id}")
+    etag = response.headers["ETag"]
+
+    # Mesma versão, outra consulta: o ETag da listagem sem filtro não vale aqui
+    response = await test_client.get(
+        f"/ratings/professional/{professional_id}?min_rate=4", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    filtered_etag = response.headers["ETag"]
+    assert filtered_etag != etag
+
+    response = await test_client.get(
+        f"/ratings/professional/{professional_id}?min_rate=4", headers={"If-None-Match": filtered_etag}
+    )
+    assert response.status_code == 304
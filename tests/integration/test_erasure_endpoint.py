@@ -0,0 +1,61 @@
+import pytest
+import pytest_asyncio
+import mongomock
+from uuid import uuid4
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.infrastructure.database import mongo_client
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.infrastructure.repositories.erasure_job_repository import ErasureJobRepositoryImpl
+from src.application.services.erasure_service import ErasureService, set_erasure_service
+
+@pytest_asyncio.fixture
+async def test_client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    # Sem executor o job roda dentro da requisição, o que torna o teste determinístico
+    set_erasure_service(ErasureService(RatingRepositoryImpl(), ErasureJobRepositoryImpl(), chunk_size=2, chunk_pause=0))
+    yield
+    set_erasure_service(None)
+    mongo_client.set_mongo_client(original)
+
+@pytest.mark.asyncio
+async def test_erase_consumer_ratings(test_client):
+    consumer_id = str(uuid4())
+    for _ in range(5):
+        response = await test_client.post("/ratings/", json={
+            "professional_id": str(uuid4()),
+            "consumer_id": consumer_id,
+            "rate": 4,
+            "description": "Test"
+        })
+        assert response.status_code == 201
+
+    response = await test_client.post("/erasure-jobs/", json={"scope": "consumer", "subject_id": consumer_id})
+    assert response.status_code == 202
+    job_id = response.json()["_id"]
+
+    response = await test_client.get(f"/erasure-jobs/{job_id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "completed"
+    assert data["deleted"] == 5
+    assert data["subject_id"] == consumer_id
+
+    response = await test_client.get(f"/ratings/consumer/{consumer_id}")
+    assert response.json()["total"] == 0
+
+@pytest.mark.asyncio
+async def test_erasure_job_not_found(test_client):
+    response = await test_client.get(f"/erasure-jobs/{uuid4()}")
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_erasure_invalid_scope(test_client):
+    response = await test_client.post("/erasure-jobs/", json={"scope": "admin", "subject_id": str(uuid4())})
+    assert response.status_code == 422
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from uuid import uuid4
+import httpx
+import pytest
+from src.main import create_app
+from src.infrastructure.config.settings import get_settings
+from src.api.dependencies import provide_rating_service
+from src.api.middleware.admission_control import (
+    AdaptiveLimiter, AdmissionControl, READS_BY_ID, set_admission_control
+)
+
+# Cada leitura "no MongoDB" demora isto; o threadpool do AnyIO roda 40 por vez
+SERVICE_SECONDS = 0.05
+REQUESTS = 400
+QUEUE_TIMEOUT = 0.3
+
+class SlowService:
+    def get_rating_by_id(self, rating_id):
+        time.sleep(SERVICE_SECONDS)
+        return {
+            "_id": str(rating_id),
+            "professional_id": str(uuid4()),
+            "consumer_id": str(uuid4()),
+            "rate": 4,
+            "description": None,
+            "created_at": "2024-01-01T00:00:00Z"
+        }
+
+def _slow_service():
+    return SlowService()
+
+async def _storm(app):
+    """Every request at once; (status, seconds, Retry-After) per request."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        async def one():
+            started = time.perf_counter()
+            response = await client.get(f"/ratings/{uuid4()}")
+            return response.status_code, time.perf_counter() - started, response.headers.get("Retry-After")
+        return await asyncio.gather(*(one() for _ in range(REQUESTS)))
+
+def _p99(latencies):
+    latencies = sorted(latencies)
+    return latencies[int(len(latencies) * 0.99)]
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.dependency_overrides[provide_rating_service] = _slow_service
+    yield app
+    set_admission_control(None)
+
+def test_tail_latency_stays_bounded_under_overload(app, monkeypatch):
+    """Testa que, sob sobrecarga, o excesso recebe 503 rápido e a cauda das respostas aceitas fica limitada."""
+    set_admission_control(AdmissionControl({READS_BY_ID: AdaptiveLimiter(READS_BY_ID, 8, 16, target_ms=1000, queue_timeout=QUEUE_TIMEOUT)}, retry_after=2))
+    results = asyncio.run(_storm(app))
+    served = [seconds for status, seconds, _ in results if status == 200]
+    shed = [(seconds, retry_after) for status, seconds, retry_after in results if status == 503]
+    assert {status for status, _, _ in results} == {200, 503}
+    assert served and shed
+    assert all(retry_after == "2" for _, retry_after in shed)
+    # Aceita: no máximo a espera na fila mais algumas leituras; rejeitada: sem esperar pelo banco além do timeout da fila
+    assert _p99(served) < QUEUE_TIMEOUT + 6 * SERVICE_SECONDS
+    assert max(seconds for seconds, _ in shed) < QUEUE_TIMEOUT + 4 * SERVICE_SECONDS
+
+    # Sem controle de admissão todas entram na fila do threadpool e a cauda cresce com a carga
+    set_admission_control(None)
+    monkeypatch.setattr(get_settings(), "admission_control_enabled", False)
+    unlimited = asyncio.run(_storm(app))
+    assert {status for status, _, _ in unlimited} == {200}
+    assert _p99([seconds for _, seconds, _ in unlimited]) > 2 * _p99(served)
@@ -1,5 +1,8 @@
+import threading
+import time
 import pytest
 from fastapi.testclient import TestClient
+from src.application.services import erasure_service
 from src.main import app
 
 client = TestClient(app)
@@ -15,4 +18,38 @@ def test_shutdown_event():
     # O evento de shutdown é chamado automaticamente ao fechar o TestClient
     with TestClient(app) as client:
         response = client.get("/health/")
-        assert response.status_code == 200 
\ No newline at end of file
+        assert response.status_code == 200
+
+def test_startup_does_not_wait_for_erasure_resume(monkeypatch):
+    """Testa que a retomada dos jobs de exclusão não bloqueia o startup."""
+    release = threading.Event()
+
+    class SlowErasureService:
+        def resume_pending(self):
+            # Simula um MongoDB inacessível (timeout de seleção de servidor)
+            release.wait(10)
+            return 0
+
+    monkeypatch.setattr(erasure_service, "get_erasure_service", lambda: SlowErasureService())
+    started = time.monotonic()
+    try:
+        with TestClient(app) as client:
+            assert client.get("/health/").status_code == 200
+            assert time.monotonic() - started < 5
+    finally:
+        release.set()
+
+
+def test_create_app_with_settings():
+    """Testa a fábrica da aplicação com configurações explícitas."""
+    from src.infrastructure.config.settings import Settings
+    from src.main import create_app
+
+    memory_app = create_app(Settings(rating_repository_backend="memory"))
+    assert memory_app.state.settings.rating_repository_backend == "memory"
+    # Os jobs de exclusão vivem no MongoDB: sem ele, as rotas não são montadas
+    assert not any(route.path.startswith("/erasure-jobs") for route in memory_app.routes)
+    assert any(route.path.startswith("/erasure-jobs") for route in create_app(Settings()).routes)
+
+    with TestClient(memory_app) as client:
+        assert client.get("/health/").status_code == 200
@@ -0,0 +1,283 @@
+import json
+import os
+import pytest
+import bson
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from pymongo import MongoClient, monitoring
+from pymongo.errors import PyMongoError
+from src.infrastructure.database.mongo_client import ensure_ratings_indexes, ensure_rating_trends_indexes
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.domain.value_objects.rating_filters import RatingFilters
+from src.domain.value_objects.trend_period import TrendGranularity
+from src.cli.export_ratings import id_ranges
+
+# Estes testes precisam de um mongod real: o mongomock não implementa explain()
+PROFESSIONAL_ID = str(uuid4())
+CONSUMER_ID = str(uuid4())
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# Chaves de índice lidas por documento devolvido acima das quais a consulta falha
+MAX_KEYS_PER_DOC = float(os.getenv("QUERY_PLAN_MAX_KEYS_PER_DOC", "3"))
+EXPORT_PARTS = 4
+EXPLAINABLE = ("find", "aggregate", "count", "update", "delete")
+# Campos do protocolo que o comando explain não aceita
+PROTOCOL_FIELDS = ("lsid", "txnNumber", "writeConcern", "readConcern", "apiVersion", "apiStrict", "apiDeprecationErrors")
+
+class CommandRecorder(monitoring.CommandListener):
+    """Keeps a copy of every explainable command sent while recording is on."""
+    def __init__(self):
+        self.recording = False
+        self.commands = []
+
+    def started(self, event):
+        if self.recording and event.command_name in EXPLAINABLE:
+            self.commands.append(bson.decode(bson.encode(event.command)))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+@pytest.fixture(scope="module")
+def database():
+    uri = os.getenv("MONGODB_URI")
+    if not uri:
+        pytest.skip("MONGODB_URI is not set")
+    recorder = CommandRecorder()
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000, event_listeners=[recorder])
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("MongoDB is not reachable")
+    client.drop_database("easyprofind_query_plans_test")
+    db = client["easyprofind_query_plans_test"]
+    ensure_ratings_indexes(db["ratings"])
+    ensure_rating_trends_indexes(db["rating_trends"])
+    yield db, recorder
+    client.drop_database("easyprofind_query_plans_test")
+    client.close()
+
+@pytest.fixture(scope="module")
+def seeded(database):
+    """Repository on the test database, seeded with 3000 ratings (and their derived data)."""
+    db, _ = database
+    # Sem o __init__: ele abriria as coleções do banco da aplicação
+    repository = RatingRepositoryImpl.__new__(RatingRepositoryImpl)
+    repository.collection = db["ratings"]
+    repository.versions = db["rating_versions"]
+    repository.trends = db["rating_trends"]
+    docs = []
+    for i in range(3000):
+        docs.append({
+            "_id": str(uuid4()),
+            "professional_id": PROFESSIONAL_ID if i % 3 == 0 else str(uuid4()),
+            "consumer_id": CONSUMER_ID if i % 3 == 1 else str(uuid4()),
+            # Cada profissional e consumidor recebe todas as notas
+            "rate": (i // 3) % 6,
+            "description": None,
+            "created_at": BASE + timedelta(minutes=i)
+        })
+    repository.insert_ratings([dict(doc) for doc in docs])
+    return repository, {doc["_id"]: doc for doc in docs}
+
+@pytest.fixture(scope="module")
+def collection(seeded):
+    return seeded[0].collection
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory):
+    """Winning plan of every explained command, written as JSON when the module ends."""
+    entries = []
+    yield entries
+    path = os.getenv("QUERY_PLAN_REPORT") or str(tmp_path_factory.getbasetemp() / "query-plans.json")
+    with open(path, "w", encoding="utf-8") as stream:
+        json.dump(entries, stream, indent=2, default=str)
+
+def _stages(plan):
+    """All stage names of a winning plan (classic or slot-based engine)."""
+    if "queryPlan" in plan:
+        plan = plan["queryPlan"]
+    stages = [plan.get("stage")]
+    for child in plan.get("inputStages", []) + [plan[k] for k in ("inputStage",) if k in plan]:
+        stages.extend(_stages(child))
+    return stages
+
+def _index_names(plan):
+    if "queryPlan" in plan:
+        plan = plan["queryPlan"]
+    names = [plan["indexName"]] if "indexName" in plan else []
+    for child in plan.get("inputStages", []) + [plan[k] for k in ("inputStage",) if k in plan]:
+        names.extend(_index_names(child))
+    return names
+
+def _find_stat(stage, key):
+    """First value of key in an execution stage tree."""
+    if key in stage:
+        return stage[key]
+    for child in stage.get("inputStages", []) + [stage[k] for k in ("inputStage",) if k in stage]:
+        value = _find_stat(child, key)
+        if value is not None:
+            return value
+    return None
+
+def _explainable(command):
+    """The recorded command as one or more explain targets.
+
+    Protocol fields are dropped, multi-statement writes are split (explain
+    takes one statement) and count_documents pipelines become count
+    commands, so their ratio is measured against the documents counted.
+    """
+    command = {k: v for k, v in command.items() if not k.startswith("$") and k not in PROTOCOL_FIELDS}
+    name = next(iter(command))
+    if name in ("update", "delete"):
+        statements = command.pop(f"{name}s")
+        for statement in statements:
+            yield {**command, f"{name}s": [statement]}
+        return
+    pipeline = command.get("pipeline", [])
+    if name == "aggregate" and pipeline and "$group" in pipeline[-1] and pipeline[-1]["$group"].get("_id") == 1:
+        count = {"count": command["aggregate"], "query": pipeline[0]["$match"]}
+        for stage in pipeline[1:-1]:
+            count.update({key[1:]: value for key, value in stage.items()})
+        yield count
+        return
+    yield command
+
+def _analyze(explain, command):
+    if "stages" in explain:
+        # Pipeline que não foi inteiramente empurrado ao motor de consultas
+        explain = explain["stages"][0]["$cursor"]
+    planner, stats = explain["queryPlanner"], explain["executionStats"]
+    name = next(iter(command))
+    if name == "count":
+        returned = _find_stat(stats["executionStages"], "nCounted")
+    elif name == "delete":
+        returned = _find_stat(stats["executionStages"], "nWouldDelete")
+    elif name == "update":
+        returned = _find_stat(stats["executionStages"], "nMatched")
+    else:
+        # Chaves puladas pelo skip também são lidas
+        returned = stats["nReturned"] + command.get("skip", 0)
+    returned = returned or 0
+    return {
+        "command": name,
+        "collection": command[name],
+        "filter": command.get("filter", command.get("query", command.get("pipeline", command.get(f"{name}s")))),
+        "stages": _stages(planner["winningPlan"]),
+        "indexes": _index_names(planner["winningPlan"]),
+        "keys_examined": stats["totalKeysExamined"],
+        "docs_examined": stats["totalDocsExamined"],
+        "returned": returned,
+        "keys_per_doc": stats["totalKeysExamined"] / max(returned, 1),
+        "millis": stats["executionTimeMillis"]
+    }
+
+def _restore(repository, docs):
+    """Put back ratings a destructive case removed, so later cases (and the explain) see the same data."""
+    repository.collection.insert_many([dict(doc) for doc in docs])
+
+def _delete_chunk(repository, docs, scope, entity_id):
+    chunk = repository.next_ratings_chunk(scope, entity_id, "", 50)
+    deleted = repository.delete_ratings_chunk(scope, entity_id, chunk)
+    repository.apply_deleted_ratings(deleted)
+    _restore(repository, [docs[doc["_id"]] for doc in deleted])
+
+def _delete_one(repository, docs):
+    rating_id = next(doc["_id"] for doc in docs.values() if doc["professional_id"] == PROFESSIONAL_ID)
+    repository.delete_rating(rating_id)
+    _restore(repository, [docs[rating_id]])
+
+def _first(docs, field, entity_id, count):
+    return [doc["_id"] for doc in docs.values() if doc[field] == entity_id][:count]
+
+def _at(minutes):
+    return BASE + timedelta(minutes=minutes)
+
+# (caso, chamada ao repositório, máximo de chaves por documento, varredura completa permitida)
+CASES = [
+    ("get_by_id", lambda r, d: r.get_rating_by_id(next(iter(d))), None, False),
+    ("get_by_id_missing", lambda r, d: r.get_rating_by_id(uuid4()), None, False),
+    ("exists", lambda r, d: r.rating_exists(next(iter(d))), None, False),
+    ("get_by_ids", lambda r, d: r.get_ratings_by_ids(list(d)[:20] + [str(uuid4())]), None, False),
+    ("list_professional", lambda r, d: r.list_ratings_by_professional(PROFESSIONAL_ID, 1, 10), None, False),
+    ("list_professional_deep_page", lambda r, d: r.list_ratings_by_professional(PROFESSIONAL_ID, 40, 20), None, False),
+    ("list_professional_rate_in", lambda r, d: r.list_ratings_by_professional(PROFESSIONAL_ID, 1, 10, RatingFilters(rate_in=(1, 2))), None, False),
+    ("list_professional_min_rate", lambda r, d: r.list_ratings_by_professional(PROFESSIONAL_ID, 1, 10, RatingFilters(min_rate=4)), None, False),
+    # Um ramo de índice por nota: cada ramo pode ler uma chave além da página
+    ("list_professional_rate_range", lambda r, d: r.list_ratings_by_professional(PROFESSIONAL_ID, 1, 10, RatingFilters(min_rate=1, max_rate=3)), MAX_KEYS_PER_DOC + 3, False),
+    ("list_professional_window", lambda r, d: r.list_ratings_by_professional(
+        PROFESSIONAL_ID, 1, 10, RatingFilters(created_after=_at(600), created_before=_at(1200))
+    ), None, False),
+    ("list_professional_rate_window", lambda r, d: r.list_ratings_by_professional(
+        PROFESSIONAL_ID, 1, 10, RatingFilters(rate_in=(0, 5), created_after=_at(600))
+    ), MAX_KEYS_PER_DOC + 2, False),
+    ("list_consumer", lambda r, d: r.list_ratings_by_consumer(CONSUMER_ID, 1, 10), None, False),
+    ("list_consumer_rate_in", lambda r, d: r.list_ratings_by_consumer(CONSUMER_ID, 2, 10, RatingFilters(rate_in=(1, 4))), None, False),
+    ("version", lambda r, d: r.get_version("professional", PROFESSIONAL_ID), None, False),
+    ("trend_days", lambda r, d: r.list_trend_buckets(PROFESSIONAL_ID, TrendGranularity.DAY, "2024-01-01", "2024-01-31"), None, False),
+    ("trend_months", lambda r, d: r.list_trend_buckets(PROFESSIONAL_ID, TrendGranularity.MONTH, "2023-01", "2024-12"), None, False),
+    # Lê todas as avaliações do profissional para regrupar: só o uso de índice é verificado
+    ("rebuild_trends", lambda r, d: r.rebuild_trend_buckets([PROFESSIONAL_ID]), float("inf"), False),
+    ("create", lambda r, d: r.create_rating({"professional_id": PROFESSIONAL_ID, "consumer_id": CONSUMER_ID, "rate": 4, "description": None}), None, False),
+    ("erasure_chunk_professional", lambda r, d: r.next_ratings_chunk("professional", PROFESSIONAL_ID, "", 100), None, False),
+    ("erasure_chunk_consumer", lambda r, d: r.next_ratings_chunk("consumer", CONSUMER_ID, _first(d, "consumer_id", CONSUMER_ID, 1)[0], 100), None, False),
+    ("erasure_delete_chunk", lambda r, d: _delete_chunk(r, d, "professional", PROFESSIONAL_ID), None, False),
+    ("delete", lambda r, d: _delete_one(r, d), None, False),
+    ("export_full_range", lambda r, d: list(r.iter_ratings(*id_ranges(EXPORT_PARTS)[1], None, datetime.now(timezone.utc), 500)), None, False),
+    ("export_incremental", lambda r, d: list(r.iter_ratings(None, None, _at(1000), _at(1500), 500)), None, False),
+    # Cada parte de uma exportação incremental paralela percorre a janela inteira e fica com a sua faixa de _id
+    ("export_incremental_range", lambda r, d: list(r.iter_ratings(*id_ranges(EXPORT_PARTS)[2], _at(1000), _at(1500), 500)), EXPORT_PARTS + MAX_KEYS_PER_DOC, False),
+    ("analytics_window", lambda r, d: list(r.iter_field_batches(["professional_id", "rate", "created_at"], 500, {"created_at": {"$gte": _at(2500)}})), None, False),
+    # Análises sem janela leem a coleção inteira de propósito
+    ("analytics_full_scan", lambda r, d: list(r.iter_field_batches(["professional_id", "rate", "created_at"], 1000)), float("inf"), True),
+]
+
+@pytest.mark.parametrize("name,call,max_keys_per_doc,full_scan", CASES, ids=[case[0] for case in CASES])
+def test_repository_query_plans(database, seeded, report, name, call, max_keys_per_doc, full_scan):
+    db, recorder = database
+    repository, docs = seeded
+    recorder.commands = []
+    recorder.recording = True
+    try:
+        call(repository, docs)
+    finally:
+        recorder.recording = False
+    assert recorder.commands, f"{name} sent no explainable command"
+
+    failures = []
+    limit = max_keys_per_doc if max_keys_per_doc is not None else MAX_KEYS_PER_DOC
+    for recorded in recorder.commands:
+        for command in _explainable(recorded):
+            entry = _analyze(db.command({"explain": command, "verbosity": "executionStats"}), command)
+            entry["case"] = name
+            report.append(entry)
+            if "COLLSCAN" in entry["stages"] and not full_scan:
+                failures.append(f"COLLSCAN on {entry['collection']}: {entry['filter']}")
+            if "SORT" in entry["stages"] and entry["command"] == "find":
+                failures.append(f"in-memory SORT on {entry['collection']}: {entry['filter']}")
+            if entry["keys_per_doc"] > limit:
+                failures.append(
+                    f"{entry['keys_examined']} keys for {entry['returned']} documents on "
+                    f"{entry['collection']} ({entry['indexes']}): {entry['filter']}"
+                )
+    assert not failures, f"{name}: " + "; ".join(failures)
+
+def _explain(collection, field, entity_id, filters):
+    query = RatingRepositoryImpl._listing_query(field, entity_id, filters)
+    return collection.find(query).sort("created_at", -1).limit(10).explain()
+
+@pytest.mark.parametrize("field,entity_id", [("professional_id", PROFESSIONAL_ID), ("consumer_id", CONSUMER_ID)])
+@pytest.mark.parametrize("filters", [
+    None,
+    RatingFilters(rate_in=(1, 2)),
+    RatingFilters(min_rate=4),
+    RatingFilters(min_rate=1, max_rate=3),
+    RatingFilters(rate_in=(0, 5), created_after=datetime(2024, 1, 2, tzinfo=timezone.utc)),
+])
+def test_rate_filtered_listing_uses_index_without_sort(collection, field, entity_id, filters):
+    explain = _explain(collection, field, entity_id, filters)
+    stages = _stages(explain["queryPlanner"]["winningPlan"])
+    assert "COLLSCAN" not in stages
+    assert "SORT" not in stages
+    assert "IXSCAN" in stages
@@ -0,0 +1,67 @@
+import pytest
+import pytest_asyncio
+import mongomock
+from uuid import uuid4
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.infrastructure.database import mongo_client
+from src.infrastructure.search.factory import set_rating_search
+
+@pytest_asyncio.fixture
+async def test_client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    set_rating_search(None)
+    yield
+    set_rating_search(None)
+    mongo_client.set_mongo_client(original)
+
+async def _create(client, professional_id, description):
+    response = await client.post("/ratings/", json={
+        "professional_id": professional_id,
+        "consumer_id": str(uuid4()),
+        "rate": 3,
+        "description": description
+    })
+    assert response.status_code == 201
+    return response.json()["_id"]
+
+@pytest.mark.asyncio
+async def test_search_ratings(test_client):
+    professional_id = str(uuid4())
+    late = await _create(test_client, professional_id, "Chegou com atraso")
+    await _create(test_client, professional_id, "Serviço impecável")
+    other = await _create(test_client, str(uuid4()), "Atraso e mais atraso")
+
+    response = await test_client.get("/ratings/search", params={"q": "atraso"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert [item["_id"] for item in data["items"]] == [other, late]
+    assert data["items"][0]["score"] >= data["items"][1]["score"]
+
+    response = await test_client.get("/ratings/search", params={"q": "ATRASO", "professional_id": professional_id})
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["_id"] == late
+
+    response = await test_client.get("/ratings/search", params={"q": "servico"})
+    assert response.json()["total"] == 1
+
+@pytest.mark.asyncio
+async def test_search_skips_deleted_ratings(test_client):
+    rating_id = await _create(test_client, str(uuid4()), "Pontualidade exemplar")
+    response = await test_client.delete(f"/ratings/{rating_id}")
+    assert response.status_code == 204
+    response = await test_client.get("/ratings/search", params={"q": "pontualidade"})
+    assert response.json()["total"] == 0
+
+@pytest.mark.asyncio
+async def test_search_requires_query(test_client):
+    response = await test_client.get("/ratings/search")
+    assert response.status_code == 422
@@ -0,0 +1,99 @@
+import mongomock
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from src.main import app
+from src.api import dependencies
+from src.api.dependencies import ServiceContainer, provide_rating_service
+from src.infrastructure.database import mongo_client
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+def _count_builds(monkeypatch):
+    builds = []
+    build = dependencies.get_rating_service
+
+    def counting(repository, settings=None):
+        builds.append(repository)
+        return build(repository, settings)
+
+    monkeypatch.setattr(dependencies, "get_rating_service", counting)
+    return builds
+
+def test_service_is_built_once_per_application(monkeypatch):
+    """Testa que, com o lifespan, serviço e repositório são criados uma vez e reaproveitados."""
+    builds = _count_builds(monkeypatch)
+    with TestClient(app) as client:
+        assert isinstance(app.state.services, ServiceContainer)
+        for _ in range(3):
+            assert client.get(f"/ratings/{uuid4()}").status_code == 404
+        assert len(builds) == 1
+    # Encerrada a aplicação, a próxima começa com instâncias novas
+    assert app.state.services is None
+
+def test_service_is_built_per_request_without_lifespan(monkeypatch):
+    """Testa o caminho sem lifespan: uma instância por requisição, como antes."""
+    builds = _count_builds(monkeypatch)
+    client = TestClient(app)
+    for _ in range(2):
+        assert client.get(f"/ratings/{uuid4()}").status_code == 404
+    assert len(builds) == 2
+
+def test_service_can_be_overridden():
+    """Testa a substituição do serviço compartilhado nos testes."""
+    class FakeService:
+        def get_rating_by_id(self, rating_id):
+            return {
+                "_id": str(rating_id),
+                "professional_id": str(uuid4()),
+                "consumer_id": str(uuid4()),
+                "rate": 3,
+                "description": None,
+                "created_at": "2024-01-01T00:00:00Z"
+            }
+
+    app.dependency_overrides[provide_rating_service] = FakeService
+    try:
+        with TestClient(app) as client:
+            response = client.get(f"/ratings/{uuid4()}")
+    finally:
+        app.dependency_overrides.pop(provide_rating_service)
+    assert response.status_code == 200
+    assert response.json()["rate"] == 3
+
+def test_create_app_settings_drive_the_wiring(monkeypatch):
+    """Testa que as configurações passadas ao create_app (e não as do ambiente) montam o serviço."""
+    from src.main import create_app
+    from src.infrastructure.config.settings import Settings
+    from src.infrastructure.repositories import rating_repository
+    from src.infrastructure.repositories.memory_rating_repository import InMemoryRatingRepository
+    from src.infrastructure.search import factory
+    monkeypatch.setattr(rating_repository, "_memory_rating_repository", None)
+    monkeypatch.setattr(factory, "_rating_search", None)
+    settings = Settings(
+        rating_repository_backend="memory",
+        list_cache_enabled=False,
+        single_flight_enabled=False,
+        admission_control_enabled=False
+    )
+    custom = create_app(settings)
+    with TestClient(custom) as client:
+        response = client.post("/ratings/", json={
+            "professional_id": str(uuid4()),
+            "consumer_id": str(uuid4()),
+            "rate": 4,
+            "description": "Na memória"
+        })
+        assert response.status_code == 201
+        service = custom.state.services.rating_service()
+        assert isinstance(service.repository, InMemoryRatingRepository)
+        assert service.repository.get_rating_by_id(response.json()["_id"]) is not None
+        assert service.list_cache is None
+        assert service.single_flight is None
+        assert client.get("/admin/cache").json()["list_pages"] is None
+        assert client.get("/admin/admission").json()["groups"] is None
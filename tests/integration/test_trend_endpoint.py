@@ -0,0 +1,95 @@
+import pytest
+import pytest_asyncio
+import mongomock
+from uuid import uuid4
+from datetime import datetime, timezone
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.infrastructure.database import mongo_client
+
+@pytest_asyncio.fixture
+async def test_client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+@pytest.mark.asyncio
+async def test_trend_by_month(test_client):
+    professional_id = str(uuid4())
+    for rate in (5, 4, 3):
+        response = await test_client.post("/ratings/", json={
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": rate,
+            "description": "Test"
+        })
+        assert response.status_code == 201
+
+    response = await test_client.get(f"/ratings/professional/{professional_id}/trend")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["granularity"] == "month"
+    assert len(data["points"]) == 12
+    current = data["points"][-1]
+    assert current["count"] == 3
+    assert current["sum"] == 12
+    assert current["average"] == 4.0
+    assert current["histogram"]["5"] == 1
+    assert all(p["count"] == 0 for p in data["points"][:-1])
+
+@pytest.mark.asyncio
+async def test_trend_by_day_with_range(test_client):
+    professional_id = str(uuid4())
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    response = await test_client.post("/ratings/", json={
+        "professional_id": professional_id,
+        "consumer_id": str(uuid4()),
+        "rate": 2
+    })
+    assert response.status_code == 201
+
+    response = await test_client.get(
+        f"/ratings/professional/{professional_id}/trend",
+        params={"granularity": "day", "from": f"{today}T00:00:00Z", "to": f"{today}T23:59:59Z"}
+    )
+    assert response.status_code == 200
+    points = response.json()["points"]
+    assert len(points) == 1
+    assert points[0]["count"] == 1
+
+@pytest.mark.asyncio
+async def test_trend_invalid_range(test_client):
+    response = await test_client.get(
+        f"/ratings/professional/{uuid4()}/trend",
+        params={"granularity": "day", "from": "2020-01-01T00:00:00Z", "to": "2024-01-01T00:00:00Z"}
+    )
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid trend range"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {"granularity": "day", "from": "0001-01-01T00:00:00Z", "to": "9999-12-31T00:00:00Z"},
+    {"granularity": "month", "from": "9999-11-01T00:00:00Z", "to": "9999-12-15T00:00:00Z"},
+    {"granularity": "month", "to": "0001-03-01T00:00:00Z"},
+    {"granularity": "day", "from": "9999-12-31T23:00:00-03:00", "to": "9999-12-31T23:30:00-03:00"}
+])
+async def test_trend_range_at_calendar_bounds(test_client, params):
+    # Intervalos nos limites do calendário viram 400 (ou 200), nunca 500
+    response = await test_client.get(f"/ratings/professional/{uuid4()}/trend", params=params)
+    if params.get("from", "").startswith("9999-11"):
+        assert response.status_code == 200
+        assert len(response.json()["points"]) == 2
+    else:
+        assert response.status_code == 400
+        assert response.json()["message"] == "Invalid trend range"
+
+@pytest.mark.asyncio
+async def test_trend_invalid_granularity(test_client):
+    response = await test_client.get(f"/ratings/professional/{uuid4()}/trend?granularity=year")
+    assert response.status_code == 422
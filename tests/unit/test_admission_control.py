@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from src.api.middleware.admission_control import (
+    AdaptiveLimiter, parse_limits, route_group, WRITES, READS_BY_ID, LISTINGS, EXPORTS
+)
+
+def test_route_group():
+    assert route_group("POST /ratings/") == WRITES
+    assert route_group("DELETE /ratings/{id}") == WRITES
+    assert route_group("POST /erasure-jobs/") == WRITES
+    assert route_group("GET /ratings/{id}") == READS_BY_ID
+    assert route_group("GET /erasure-jobs/{job_id}") == READS_BY_ID
+    assert route_group("GET /ratings") == READS_BY_ID
+    assert route_group("POST /ratings:batchGet") == READS_BY_ID
+    assert route_group("GET /ratings/professional/{professional_id}") == LISTINGS
+    assert route_group("GET /ratings/search") == LISTINGS
+    assert route_group("GET /ratings/export") == EXPORTS
+    assert route_group("GET /health/") is None
+    assert route_group("GET /admin/admission") is None
+
+def test_parse_limits():
+    assert parse_limits("writes=4:8:250, listings=2:0:100") == {WRITES: (4, 8, 250.0), LISTINGS: (2, 0, 100.0)}
+    assert parse_limits("") == {}
+    for invalid in ("writes=4:8", "writes=a:b:c", "other=1:1:1", "writes=0:1:10", "writes=1:1:0"):
+        with pytest.raises(ValueError):
+            parse_limits(invalid)
+
+def test_queue_is_fifo_and_full_queue_is_rejected():
+    async def main():
+        limiter = AdaptiveLimiter("reads", max_limit=1, queue_size=2, target_ms=100, queue_timeout=5)
+        assert await limiter.acquire() is True
+        order = []
+
+        async def waiter(name):
+            assert await limiter.acquire() is True
+            order.append(name)
+
+        first = asyncio.ensure_future(waiter("first"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(waiter("second"))
+        await asyncio.sleep(0)
+        # Fila cheia: rejeitada na hora
+        assert await limiter.acquire() is False
+        assert limiter.stats()["queued"] == 2
+        limiter.release()
+        await first
+        limiter.release()
+        await second
+        limiter.release()
+        return limiter.stats(), order
+
+    stats, order = asyncio.run(main())
+    assert order == ["first", "second"]
+    assert stats["in_flight"] == 0
+    assert stats["admitted"] == 3
+    assert stats["rejected"] == 1
+
+def test_queued_request_times_out_and_slot_is_not_lost():
+    async def main():
+        limiter = AdaptiveLimiter("reads", max_limit=1, queue_size=1, target_ms=100, queue_timeout=0.01)
+        assert await limiter.acquire() is True
+        assert await limiter.acquire() is False
+        limiter.release()
+        assert await limiter.acquire() is True
+        return limiter.stats()
+
+    stats = asyncio.run(main())
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 1
+    assert stats["queued"] == 0
+
+def test_limit_adapts_to_latency():
+    async def main():
+        limiter = AdaptiveLimiter("listings", max_limit=10, queue_size=0, target_ms=100, window=10)
+        for _ in range(10):
+            assert await limiter.acquire() is True
+        for _ in range(10):
+            limiter.release(500)
+        slow = limiter.stats()["limit"]
+        # Rápido e no limite: volta a crescer, um por janela
+        for _ in range(10):
+            for _ in range(slow):
+                await limiter.acquire()
+            for _ in range(slow):
+                limiter.release(10)
+        return slow, limiter.stats()
+
+    slow, stats = asyncio.run(main())
+    assert slow == 9
+    assert stats["limit"] == 10
+    assert stats["last_p90_ms"] == 10
@@ -0,0 +1,109 @@
+import io
+import pytest
+import mongomock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from uuid import uuid4
+from src.infrastructure.database import mongo_client
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.infrastructure.repositories.flagged_consumer_repository import FlaggedConsumerRepositoryImpl
+from src.application.analytics.burst_detection import consumer_columns_from_batches, detect_bursts
+from src.application.services.rating_service import RatingService
+from src.api.v1.schemas.rating import RatingCreate
+from src.domain.exceptions.base_exceptions import ValidationException
+from src.cli.detect_bursts import run_detection
+
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+def _docs(consumer_id, minutes, professional_id="p", rate=5):
+    return [
+        {"consumer_id": consumer_id, "professional_id": f"{professional_id}{i}", "rate": rate, "created_at": START + timedelta(minutes=m)}
+        for i, m in enumerate(minutes)
+    ]
+
+def _brute_force_peak(minutes, window_minutes):
+    return max(sum(1 for other in minutes if start <= other < start + window_minutes) for start in minutes)
+
+def test_detect_bursts_matches_brute_force():
+    """Testa o pico por janela deslizante contra a contagem ingênua."""
+    activity = {
+        "burst": [0, 1000, 1001, 1002, 1003, 1059, 5000],
+        "spread": [0, 61, 122, 183, 244, 305],
+        "edge": [10, 20, 70, 75, 80],
+        "single": [30]
+    }
+    docs = [doc for consumer, minutes in activity.items() for doc in _docs(consumer, minutes)]
+    # Lotes fora de ordem e consumidores intercalados
+    docs.reverse()
+    columns = consumer_columns_from_batches([docs[:5], [], docs[5:]])
+
+    flags = detect_bursts(columns, window_seconds=3600, threshold=3)
+
+    expected = {c: _brute_force_peak(m, 60) for c, m in activity.items()}
+    assert {f["consumer_id"]: f["ratings_in_window"] for f in flags} == {c: p for c, p in expected.items() if p >= 3}
+    burst = flags[0]
+    assert burst["consumer_id"] == "burst"
+    assert burst["window_start"] == "2024-03-01T16:40:00.000+00:00"
+    assert burst["window_end"] == "2024-03-01T17:39:00.000+00:00"
+    assert burst["professionals_in_window"] == 5
+    assert burst["total_ratings"] == 7
+
+def test_detect_bursts_empty():
+    """Testa a detecção sem nenhuma avaliação."""
+    assert detect_bursts(consumer_columns_from_batches([])) == []
+
+def test_flagged_consumer_repository_replace():
+    """Testa a gravação das marcações e a substituição numa execução completa."""
+    repository = FlaggedConsumerRepositoryImpl()
+    first, second = str(uuid4()), str(uuid4())
+    repository.save_flags([{"consumer_id": first, "ratings_in_window": 30}])
+    repository.save_flags([{"consumer_id": second, "ratings_in_window": 25}], replace=True)
+
+    assert not repository.is_flagged(first)
+    assert repository.is_flagged(second)
+    assert repository.get_flag(second)["ratings_in_window"] == 25
+
+def test_run_detection_flags_consumers():
+    """Testa o comando lendo do repositório e gravando as marcações."""
+    ratings = RatingRepositoryImpl()
+    flags = FlaggedConsumerRepositoryImpl()
+    bursty, calm = str(uuid4()), str(uuid4())
+    for _ in range(4):
+        ratings.create_rating({"professional_id": str(uuid4()), "consumer_id": bursty, "rate": 5})
+    ratings.create_rating({"professional_id": str(uuid4()), "consumer_id": calm, "rate": 4})
+    out = io.StringIO()
+
+    found = run_detection(ratings, flags, window_seconds=600, threshold=4, batch_size=2, out=out)
+
+    assert [f["consumer_id"] for f in found] == [bursty]
+    assert flags.is_flagged(bursty) and not flags.is_flagged(calm)
+    assert "1 flagged" in out.getvalue()
+
+@pytest.mark.parametrize("policy", ["log", "reject"])
+def test_create_rating_from_flagged_consumer(policy):
+    """Testa a política de escrita para consumidores marcados."""
+    repository = Mock()
+    repository.create_rating.return_value = {
+        "_id": uuid4(), "professional_id": uuid4(), "consumer_id": uuid4(), "rate": 5,
+        "description": None, "created_at": START
+    }
+    flags = Mock()
+    flags.is_flagged.return_value = True
+    service = RatingService(repository, flags=flags, flag_policy=policy)
+    data = RatingCreate(professional_id=uuid4(), consumer_id=uuid4(), rate=5)
+
+    if policy == "reject":
+        with pytest.raises(ValidationException):
+            service.create_rating(data)
+        repository.create_rating.assert_not_called()
+    else:
+        service.create_rating(data)
+        repository.create_rating.assert_called_once()
+    flags.is_flagged.assert_called_once_with(data.consumer_id)
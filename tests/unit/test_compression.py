@@ -0,0 +1,61 @@
+import gzip
+import pytest
+from src.api.utils import compression
+from src.api.utils.compression import negotiate_encoding, compress_body, available_codecs
+from src.infrastructure.config.settings import get_settings
+
+BODY = b'{"items":[' + b'{"description":"Excellent service!"},' * 200 + b'{}]}'
+
+def test_negotiate_encoding_prefers_server_order():
+    assert negotiate_encoding("gzip, br, zstd", ["zstd", "br", "gzip"]) == "zstd"
+    assert negotiate_encoding("gzip, br", ["zstd", "br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip", ["zstd", "br", "gzip"]) == "gzip"
+
+def test_negotiate_encoding_q_values():
+    assert negotiate_encoding("gzip;q=1.0, zstd;q=0.5", ["zstd", "gzip"]) == "gzip"
+    assert negotiate_encoding("zstd;q=0, gzip;q=0", ["zstd", "gzip"]) is None
+    assert negotiate_encoding("*", ["zstd", "gzip"]) == "zstd"
+    assert negotiate_encoding("*;q=0.5, zstd;q=0", ["zstd", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip;q=invalid", ["gzip"]) is None
+
+def test_negotiate_encoding_identity():
+    assert negotiate_encoding(None, ["gzip"]) is None
+    assert negotiate_encoding("", ["gzip"]) is None
+    assert negotiate_encoding("identity", ["gzip"]) is None
+    assert negotiate_encoding("deflate", ["gzip"]) is None
+
+def test_compress_body_gzip():
+    body, encoding = compress_body(BODY, "gzip")
+    assert encoding == "gzip"
+    assert len(body) < len(BODY)
+    assert gzip.decompress(body) == BODY
+
+def test_compress_body_below_threshold():
+    body, encoding = compress_body(b'{"items":[]}', "gzip")
+    assert encoding is None
+    assert body == b'{"items":[]}'
+
+def test_compress_body_disabled(monkeypatch):
+    monkeypatch.setattr(get_settings(), "compression_enabled", False)
+    body, encoding = compress_body(BODY, "gzip")
+    assert encoding is None
+    assert body == BODY
+
+def test_compress_body_skips_unavailable_codecs(monkeypatch):
+    monkeypatch.setattr(compression, "zstandard", None)
+    monkeypatch.setattr(compression, "brotli", None)
+    assert set(available_codecs()) == {"gzip"}
+    body, encoding = compress_body(BODY, "zstd, br")
+    assert encoding is None
+
+@pytest.mark.skipif(compression.zstandard is None, reason="zstandard not installed")
+def test_compress_body_zstd():
+    body, encoding = compress_body(BODY, "zstd, gzip")
+    assert encoding == "zstd"
+    assert compression.zstandard.ZstdDecompressor().decompress(body) == BODY
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+def test_compress_body_brotli():
+    body, encoding = compress_body(BODY, "br, gzip")
+    assert encoding == "br"
+    assert compression.brotli.decompress(body) == BODY
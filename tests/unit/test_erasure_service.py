@@ -0,0 +1,170 @@
+import pytest
+import mongomock
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+from src.infrastructure.database import mongo_client
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.infrastructure.repositories.erasure_job_repository import ErasureJobRepositoryImpl
+from src.infrastructure.search.inverted_index_search import InvertedIndexSearch
+from src.application.services.erasure_service import ErasureService
+from src.domain.value_objects.erasure_job import ErasureScope, ErasureStatus
+from src.domain.value_objects.trend_period import TrendGranularity
+from src.domain.exceptions.base_exceptions import NotFoundException
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+@pytest.fixture
+def repository():
+    return RatingRepositoryImpl()
+
+@pytest.fixture
+def jobs():
+    return ErasureJobRepositoryImpl()
+
+def _create(repository, professional_id, consumer_id=None, rate=4):
+    return repository.create_rating({
+        "professional_id": professional_id,
+        "consumer_id": consumer_id or str(uuid4()),
+        "rate": rate,
+        "description": "Pontual"
+    })
+
+def _month_count(repository, professional_id):
+    buckets = repository.list_trend_buckets(UUID(professional_id), TrendGranularity.MONTH, "0000-00", "9999-99")
+    return sum(bucket["count"] for bucket in buckets)
+
+def test_erasure_deletes_in_chunks_and_keeps_derived_data(repository, jobs):
+    """Testa a exclusão em lotes mantendo contadores, tendências e busca consistentes."""
+    professional_id, other_id = str(uuid4()), str(uuid4())
+    search = InvertedIndexSearch()
+    for _ in range(7):
+        search.index_rating(_create(repository, professional_id))
+    kept = _create(repository, other_id)
+    version = repository.get_version("professional", professional_id)
+
+    service = ErasureService(repository, jobs, search=search, chunk_size=3, chunk_pause=0)
+    job = service.start_erasure(ErasureScope.PROFESSIONAL, UUID(professional_id))
+
+    job = service.get_job(UUID(job["_id"]))
+    assert job["status"] == ErasureStatus.COMPLETED.value
+    assert job["deleted"] == 7
+    assert repository.list_ratings_by_professional(professional_id)[1] == 0
+    assert repository.get_rating_by_id(kept["_id"]) is not None
+    assert _month_count(repository, professional_id) == 0
+    assert _month_count(repository, other_id) == 1
+    assert repository.get_version("professional", professional_id) > version
+    assert search.search("pontual") == ([], 0)
+
+def test_erasure_by_consumer(repository, jobs):
+    """Testa a exclusão de todas as avaliações feitas por um consumidor."""
+    consumer_id = str(uuid4())
+    professionals = [str(uuid4()) for _ in range(3)]
+    for professional_id in professionals:
+        _create(repository, professional_id, consumer_id)
+    _create(repository, professionals[0])
+
+    service = ErasureService(repository, jobs, chunk_size=2, chunk_pause=0)
+    job = service.start_erasure(ErasureScope.CONSUMER, UUID(consumer_id))
+
+    assert jobs.get_job(job["_id"])["deleted"] == 3
+    assert repository.list_ratings_by_consumer(consumer_id)[1] == 0
+    assert [_month_count(repository, p) for p in professionals] == [1, 0, 0]
+
+def test_erasure_resumes_interrupted_chunk(repository, jobs):
+    """Testa a retomada de um job interrompido entre a exclusão e a atualização das tendências."""
+    professional_id = str(uuid4())
+    for _ in range(5):
+        _create(repository, professional_id)
+    job = jobs.create_job(ErasureScope.PROFESSIONAL, UUID(professional_id))
+
+    # Simula um processo que caiu logo após excluir o primeiro lote
+    long_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    jobs.claim_job(job["_id"], "crashed", long_ago + timedelta(minutes=1))
+    chunk = repository.next_ratings_chunk("professional", professional_id, "", 2)
+    jobs.save_pending_chunk(job["_id"], "crashed", chunk)
+    jobs.mark_chunk_deleted(job["_id"], "crashed", repository.delete_ratings_chunk("professional", professional_id, chunk))
+    jobs.collection.update_one({"_id": job["_id"]}, {"$set": {"heartbeat_at": long_ago}})
+    assert _month_count(repository, professional_id) == 5
+
+    service = ErasureService(repository, jobs, chunk_size=2, chunk_pause=0)
+    assert service.resume_pending() == 1
+
+    job = jobs.get_job(job["_id"])
+    assert job["status"] == ErasureStatus.COMPLETED.value
+    assert job["deleted"] == 5
+    assert _month_count(repository, professional_id) == 0
+
+def test_running_job_is_not_taken_over(repository, jobs):
+    """Testa que um job com heartbeat recente não é assumido por outro processo."""
+    professional_id = str(uuid4())
+    _create(repository, professional_id)
+    job = jobs.create_job(ErasureScope.PROFESSIONAL, UUID(professional_id))
+    jobs.claim_job(job["_id"], "alive", datetime.now(timezone.utc))
+
+    service = ErasureService(repository, jobs, chunk_pause=0)
+    assert service.resume_pending() == 0
+    service.run_job(UUID(job["_id"]))
+    assert jobs.get_job(job["_id"])["status"] == ErasureStatus.RUNNING.value
+    assert repository.list_ratings_by_professional(professional_id)[1] == 1
+
+def test_active_job_is_reused(repository, jobs):
+    """Testa que um segundo pedido para o mesmo sujeito reutiliza o job ativo."""
+    subject_id = uuid4()
+    first = jobs.create_job(ErasureScope.CONSUMER, subject_id)
+    assert jobs.create_job(ErasureScope.CONSUMER, subject_id)["_id"] == first["_id"]
+    assert jobs.create_job(ErasureScope.PROFESSIONAL, subject_id)["_id"] != first["_id"]
+
+def test_erasure_re_sweeps_ratings_created_below_the_cursor(repository, jobs):
+    """Testa que avaliações criadas durante o job com _id menor que o cursor também são excluídas."""
+    professional_id = str(uuid4())
+    for _ in range(4):
+        _create(repository, professional_id)
+    late_id = "00000000-0000-4000-8000-000000000000"
+    original_complete = jobs.complete_chunk
+    inserted = []
+
+    def complete_and_rate(job_id, owner, last_id, deleted):
+        # Uma avaliação nova chega depois que o cursor já passou do início
+        if not inserted:
+            inserted.append(late_id)
+            repository.insert_ratings([{
+                "_id": late_id,
+                "professional_id": professional_id,
+                "consumer_id": str(uuid4()),
+                "rate": 1,
+                "description": None,
+                "created_at": datetime.now(timezone.utc)
+            }])
+        return original_complete(job_id, owner, last_id, deleted)
+
+    jobs.complete_chunk = complete_and_rate
+    service = ErasureService(repository, jobs, chunk_size=2, chunk_pause=0)
+    job = service.start_erasure(ErasureScope.PROFESSIONAL, UUID(professional_id))
+
+    job = jobs.get_job(job["_id"])
+    assert job["status"] == ErasureStatus.COMPLETED.value
+    assert job["deleted"] == 5
+    assert repository.list_ratings_by_professional(professional_id)[1] == 0
+    assert _month_count(repository, professional_id) == 0
+
+def test_new_job_after_previous_finished(repository, jobs):
+    """Testa que um sujeito volta a aceitar jobs quando o anterior termina."""
+    subject_id = uuid4()
+    first = jobs.create_job(ErasureScope.CONSUMER, subject_id)
+    jobs.claim_job(first["_id"], "worker", datetime.now(timezone.utc))
+    jobs.finish_job(first["_id"], "worker")
+    assert "active_subject" not in jobs.get_job(first["_id"])
+
+    second = jobs.create_job(ErasureScope.CONSUMER, subject_id)
+    assert second["_id"] != first["_id"]
+    assert second["status"] == ErasureStatus.PENDING.value
+
+def test_get_job_not_found(repository, jobs):
+    """Testa a consulta de um job inexistente."""
+    with pytest.raises(NotFoundException):
+        ErasureService(repository, jobs).get_job(uuid4())
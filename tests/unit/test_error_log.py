@@ -0,0 +1,94 @@
+import json
+import logging
+from fastapi.responses import JSONResponse
+from src.api.utils.error_bodies import error_response, DATABASE_ERROR, UNEXPECTED_ERROR
+from src.infrastructure.observability import error_log as error_log_module
+from src.infrastructure.observability.error_log import ErrorLog
+
+logger = logging.getLogger("test_error_log")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def _fail(log, exc=None, where="site"):
+    try:
+        raise exc or RuntimeError("boom")
+    except Exception as e:
+        return log.report(logger, e, f"Falhou: {e}", where=where)
+
+def test_one_stack_trace_per_signature_per_interval(caplog, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(error_log_module.time, "monotonic", clock)
+    log = ErrorLog(interval=60)
+    with caplog.at_level(logging.ERROR, logger="test_error_log"):
+        assert _fail(log) is True
+        assert [_fail(log) for _ in range(4)] == [False] * 4
+        clock.now += 61
+        assert _fail(log) is True
+    records = [record for record in caplog.records if record.name == "test_error_log"]
+    assert len(records) == 2
+    assert records[0].exc_info is not None
+    assert "suppressed" not in records[0].getMessage()
+    assert "(4 similar errors suppressed in the last 60s)" in records[1].getMessage()
+
+    stats = log.stats()
+    assert stats["reported"] == 6
+    assert stats["suppressed"] == 4
+    assert stats["signatures"][0]["count"] == 6
+    assert stats["signatures"][0]["logged"] == 2
+    assert stats["signatures"][0]["suppressed_pending"] == 0
+
+def test_signatures_are_type_and_site():
+    log = ErrorLog(interval=60)
+    assert _fail(log) is True
+    assert _fail(log, ValueError("x")) is True
+    assert _fail(log, where="other") is True
+    assert _fail(log) is False
+    assert {(s["exception"], s["where"]) for s in log.stats()["signatures"]} == {
+        ("builtins.RuntimeError", "site"), ("builtins.ValueError", "site"), ("builtins.RuntimeError", "other")
+    }
+
+def test_default_site_is_the_caller():
+    log = ErrorLog(interval=60)
+    for _ in range(2):
+        log.report(logger, RuntimeError("a"), "a")
+    log.report(logger, RuntimeError("b"), "b")
+    counts = sorted(s["count"] for s in log.stats()["signatures"])
+    assert counts == [1, 2]
+    assert all(s["where"].startswith(__file__) for s in log.stats()["signatures"])
+
+def test_least_recently_seen_signature_is_evicted(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(error_log_module.time, "monotonic", clock)
+    log = ErrorLog(interval=60, max_signatures=2)
+    _fail(log, where="a")
+    clock.now += 1
+    _fail(log, where="b")
+    clock.now += 1
+    _fail(log, where="a")
+    clock.now += 1
+    _fail(log, where="c")
+    assert {s["where"] for s in log.stats()["signatures"]} == {"a", "c"}
+    log.clear()
+    assert log.stats() == {"interval_seconds": 60, "reported": 0, "suppressed": 0, "signatures": []}
+
+def test_zero_interval_logs_every_error(caplog):
+    log = ErrorLog(interval=0)
+    with caplog.at_level(logging.ERROR, logger="test_error_log"):
+        assert all(_fail(log) for _ in range(3))
+    assert len([record for record in caplog.records if record.name == "test_error_log"]) == 3
+
+def test_prebuilt_bodies_match_json_response():
+    for message, error in ((DATABASE_ERROR, 'timeout "x" ção'), (UNEXPECTED_ERROR, None)):
+        expected = JSONResponse(status_code=500, content={"message": message, "details": {"error": error} if error is not None else None})
+        response = error_response(500, message, error)
+        assert response.status_code == 500
+        assert response.body == expected.body
+        assert response.headers["content-type"] == "application/json"
+
+    wrapped = error_response(500, DATABASE_ERROR, "falha", wrap_detail=True)
+    assert json.loads(wrapped.body) == {"detail": {"message": DATABASE_ERROR, "details": {"error": "falha"}}}
@@ -0,0 +1,54 @@
+from datetime import datetime
+from uuid import uuid4
+from src.api.utils.etag import rating_etag, listing_etag, etag_matches, not_modified
+from src.domain.value_objects.rating_filters import RatingFilters
+
+def test_rating_etag_is_strong_and_stable():
+    rating_id = uuid4()
+    etag = rating_etag(rating_id)
+    assert not etag.startswith("W/")
+    assert etag == rating_etag(str(rating_id))
+    assert etag != rating_etag(uuid4())
+
+def test_listing_etag_changes_with_version():
+    professional_id = uuid4()
+    etag = listing_etag("professional", professional_id, 3, 1, 10)
+    assert etag.startswith('W/"')
+    assert etag != listing_etag("professional", professional_id, 4, 1, 10)
+    assert etag != listing_etag("consumer", professional_id, 3, 1, 10)
+    assert etag != listing_etag("professional", professional_id, 3, 2, 10)
+
+def test_listing_etag_changes_with_filters():
+    professional_id = uuid4()
+    etag = listing_etag("professional", professional_id, 3, 1, 10)
+    assert etag == listing_etag("professional", professional_id, 3, 1, 10, RatingFilters())
+    by_rate = listing_etag("professional", professional_id, 3, 1, 10, RatingFilters(min_rate=4))
+    assert by_rate != etag
+    # Filtros equivalentes compartilham o ETag
+    assert by_rate == listing_etag("professional", professional_id, 3, 1, 10, RatingFilters(rate_in=(4, 5)))
+    assert by_rate != listing_etag("professional", professional_id, 3, 1, 10, RatingFilters(min_rate=3))
+    since = listing_etag("professional", professional_id, 3, 1, 10, RatingFilters(created_after=datetime(2024, 1, 1)))
+    assert since not in (etag, by_rate)
+
+def test_etag_matches():
+    etag = listing_etag("professional", uuid4(), 1, 1, 10)
+    assert etag_matches(etag, etag)
+    # Comparação fraca: o prefixo W/ é ignorado
+    assert etag_matches(etag[2:], etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+
+def test_not_modified():
+    response = not_modified('"abc"')
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"abc"'
+    assert response.body == b""
+    assert "Vary" not in response.headers
+
+def test_not_modified_repeats_vary():
+    response = not_modified('W/"abc"', vary="Accept-Encoding")
+    assert response.status_code == 304
+    assert response.headers["Vary"] == "Accept-Encoding"
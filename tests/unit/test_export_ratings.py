@@ -0,0 +1,114 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+import pytest
+import mongomock
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from src.infrastructure.database import mongo_client
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.cli.export_ratings import export_ratings, id_ranges, read_watermark
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+@pytest.fixture
+def repository():
+    return RatingRepositoryImpl()
+
+def _create(repository, count):
+    created = [
+        repository.create_rating({
+            "professional_id": str(uuid4()),
+            "consumer_id": str(uuid4()),
+            "rate": i % 6,
+            "description": f"Avaliação {i}"
+        })
+        for i in range(count)
+    ]
+    # A marca d'água tem precisão de milissegundos
+    time.sleep(0.002)
+    return created
+
+def _read_ndjson(output_dir, manifest):
+    rows = []
+    for part in manifest["parts"]:
+        with gzip.open(os.path.join(output_dir, part["file"]), "rt", encoding="utf-8") as stream:
+            rows.extend(json.loads(line) for line in stream)
+    return rows
+
+def test_id_ranges_cover_the_uuid_space():
+    """Testa que as faixas de _id são contíguas e cobrem todo o espaço."""
+    ranges = id_ranges(4)
+    assert ranges == [(None, "4000"), ("4000", "8000"), ("8000", "c000"), ("c000", None)]
+    assert id_ranges(1) == [(None, None)]
+    with pytest.raises(ValueError):
+        id_ranges(0)
+
+def test_export_ndjson_parts(tmp_path, repository):
+    """Testa a exportação paralela em partes NDJSON compactadas."""
+    created = _create(repository, 30)
+    manifest = export_ratings(str(tmp_path), repository, parallel=3, parts=8, safety_lag=timedelta(0), out=io.StringIO())
+
+    assert manifest["rows"] == 30
+    assert len(manifest["parts"]) == 8
+    rows = _read_ndjson(str(tmp_path), manifest)
+    assert sorted(row["_id"] for row in rows) == sorted(doc["_id"] for doc in created)
+    for part in manifest["parts"]:
+        ids = [row["_id"] for row in _read_ndjson(str(tmp_path), {"parts": [part]})]
+        assert ids == sorted(ids)
+        assert all((part["id_from"] or "") <= i and (part["id_to"] is None or i < part["id_to"]) for i in ids)
+    row = rows[0]
+    assert set(row) == {"_id", "professional_id", "consumer_id", "rate", "description", "created_at"}
+    assert datetime.fromisoformat(row["created_at"]).tzinfo is not None
+    assert json.loads((tmp_path / "manifest.json").read_text())["rows"] == 30
+
+def test_export_csv_uncompressed(tmp_path, repository):
+    """Testa a exportação em CSV sem compressão."""
+    _create(repository, 5)
+    manifest = export_ratings(str(tmp_path), repository, fmt="csv", compression="none", parallel=2, safety_lag=timedelta(0), out=io.StringIO())
+    rows = []
+    for part in manifest["parts"]:
+        assert part["file"].endswith(".csv")
+        with open(tmp_path / part["file"], newline="", encoding="utf-8") as stream:
+            rows.extend(csv.DictReader(stream))
+    assert len(rows) == 5
+    assert {row["rate"] for row in rows} <= {"0", "1", "2", "3", "4", "5"}
+
+def test_incremental_export_since_watermark(tmp_path, repository):
+    """Testa a exportação incremental a partir da marca d'água da exportação anterior."""
+    _create(repository, 4)
+    first = export_ratings(str(tmp_path / "full"), repository, parallel=2, safety_lag=timedelta(0), out=io.StringIO())
+    assert first["rows"] == 4
+
+    watermark = read_watermark(str(tmp_path / "full" / "manifest.json"))
+    later = _create(repository, 2)
+    incremental = export_ratings(str(tmp_path / "delta"), repository, parallel=2, since=watermark, safety_lag=timedelta(0), out=io.StringIO())
+    assert incremental["rows"] == 2
+    assert incremental["since"] == watermark.isoformat()
+    rows = _read_ndjson(str(tmp_path / "delta"), incremental)
+    assert sorted(row["_id"] for row in rows) == sorted(doc["_id"] for doc in later)
+
+def test_watermark_lags_behind_inserts_in_flight(tmp_path, repository):
+    """Testa que avaliações recentes (possivelmente ainda sendo gravadas) ficam para a próxima exportação."""
+    created = _create(repository, 3)
+    # Uma avaliação carimbada antes do início da exportação, mas gravada depois
+    in_flight = {**created[0], "_id": str(uuid4()), "created_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+
+    first = export_ratings(str(tmp_path / "full"), repository, parallel=2, safety_lag=timedelta(minutes=5), out=io.StringIO())
+    assert first["rows"] == 0
+    assert first["safety_lag_seconds"] == 300
+    repository.collection.insert_one(in_flight)
+
+    watermark = read_watermark(str(tmp_path / "full" / "manifest.json"))
+    delta = export_ratings(str(tmp_path / "delta"), repository, parallel=2, since=watermark, safety_lag=timedelta(0), out=io.StringIO())
+    rows = _read_ndjson(str(tmp_path / "delta"), delta)
+    assert sorted(row["_id"] for row in rows) == sorted([doc["_id"] for doc in created] + [in_flight["_id"]])
+
@@ -0,0 +1,140 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+import mongomock
+from uuid import UUID, uuid4
+from src.infrastructure.database import mongo_client
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.cli.import_ratings import detect_format, import_file, read_records, to_document
+from src.domain.value_objects.trend_period import TrendGranularity
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+@pytest.fixture
+def repository():
+    return RatingRepositoryImpl()
+
+def _rows(count, professional_id):
+    return [
+        {
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": i % 6,
+            "description": f"Avaliação {i}",
+            "created_at": f"2024-03-{i % 28 + 1:02d}T10:00:00Z"
+        }
+        for i in range(count)
+    ]
+
+def _write_ndjson(path, rows):
+    with open(path, "w", encoding="utf-8") as stream:
+        for row in rows:
+            stream.write((row if isinstance(row, str) else json.dumps(row)) + "\n")
+
+def test_detect_format():
+    """Testa a detecção do formato pela extensão."""
+    assert detect_format("ratings.csv") == "csv"
+    assert detect_format("ratings.ndjson.gz") == "ndjson"
+    assert detect_format("ratings.jsonl") == "ndjson"
+    with pytest.raises(ValueError):
+        detect_format("ratings.txt")
+
+def test_to_document_validates_like_rating_create():
+    """Testa a validação das linhas com as regras do RatingCreate."""
+    row = {"professional_id": str(uuid4()), "consumer_id": str(uuid4()), "rate": "5", "description": ""}
+    doc = to_document(row, 7, "file.csv")
+    assert doc["rate"] == 5
+    assert doc["description"] is None
+    assert doc["_id"] == to_document(row, 7, "file.csv")["_id"]
+    assert doc["_id"] != to_document(row, 8, "file.csv")["_id"]
+    with pytest.raises(ValueError):
+        to_document({**row, "rate": "6"}, 1, "file.csv")
+    with pytest.raises(ValueError):
+        to_document({**row, "consumer_id": "not-a-uuid"}, 1, "file.csv")
+
+def test_read_records_csv_and_gzip(tmp_path):
+    """Testa a leitura em streaming de CSV compactado."""
+    path = tmp_path / "ratings.csv.gz"
+    rows = _rows(3, str(uuid4()))
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as stream:
+        writer = csv.DictWriter(stream, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    records = list(read_records(str(path), "csv"))
+    assert [record for record, _, _ in records] == [1, 2, 3]
+    assert records[0][1]["professional_id"] == rows[0]["professional_id"]
+
+def test_import_ndjson(tmp_path, repository):
+    """Testa a importação em lotes paralelos, com linhas inválidas e contadores derivados."""
+    professional_id = str(uuid4())
+    rows = _rows(23, professional_id) + ["{not json", json.dumps({"professional_id": professional_id, "rate": 3})]
+    path = tmp_path / "ratings.ndjson"
+    _write_ndjson(path, rows)
+    rejects = tmp_path / "rejects.ndjson"
+
+    stats = import_file(str(path), repository, batch_size=5, workers=3, rejects_path=str(rejects), out=io.StringIO())
+
+    assert stats.read == 25
+    assert stats.inserted == 23
+    assert stats.invalid == 2
+    assert repository.list_ratings_by_professional(UUID(professional_id))[1] == 23
+    buckets = repository.list_trend_buckets(UUID(professional_id), TrendGranularity.MONTH, "2024-03", "2024-03")
+    assert buckets[0]["count"] == 23
+    assert repository.get_version("professional", professional_id) > 0
+    assert [json.loads(line)["record"] for line in rejects.read_text().splitlines()] == [24, 25]
+    assert json.loads((tmp_path / "ratings.ndjson.checkpoint").read_text())["record"] == 25
+
+def test_import_resumes_from_checkpoint(tmp_path, repository):
+    """Testa a retomada a partir do checkpoint sem duplicar avaliações."""
+    professional_id = str(uuid4())
+    path = tmp_path / "ratings.ndjson"
+    _write_ndjson(path, _rows(10, professional_id))
+    import_file(str(path), repository, batch_size=4, workers=2, out=io.StringIO())
+
+    # Um checkpoint atrasado (queda antes de gravá-lo) só reprocessa o final do arquivo
+    checkpoint = tmp_path / "ratings.ndjson.checkpoint"
+    source = json.loads(checkpoint.read_text())["source"]
+    checkpoint.write_text(json.dumps({"source": source, "record": 6, "inserted": 6}))
+    stats = import_file(str(path), repository, batch_size=4, workers=2, out=io.StringIO())
+    assert stats.read == 4
+    assert stats.duplicates == 4
+    assert stats.inserted == 6
+    assert repository.list_ratings_by_professional(UUID(professional_id))[1] == 10
+    buckets = repository.list_trend_buckets(UUID(professional_id), TrendGranularity.MONTH, "2024-03", "2024-03")
+    assert buckets[0]["count"] == 10
+
+    stats = import_file(str(path), repository, resume=False, out=io.StringIO())
+    assert stats.duplicates == 10
+
+def test_same_file_name_in_different_directories(tmp_path, repository):
+    """Testa que arquivos diferentes com o mesmo nome não geram _ids iguais."""
+    professional_id = str(uuid4())
+    paths = []
+    for month in ("2024-01", "2024-02"):
+        (tmp_path / month).mkdir()
+        path = tmp_path / month / "ratings.ndjson"
+        _write_ndjson(path, _rows(5, professional_id))
+        paths.append(path)
+
+    first = import_file(str(paths[0]), repository, out=io.StringIO())
+    second = import_file(str(paths[1]), repository, out=io.StringIO())
+
+    assert (first.inserted, second.inserted, second.duplicates) == (5, 5, 0)
+    assert repository.list_ratings_by_professional(UUID(professional_id))[1] == 10
+
+def test_checkpoint_of_another_file_is_rejected(tmp_path, repository):
+    """Testa que um checkpoint gravado para outro conteúdo não é reaproveitado."""
+    path = tmp_path / "ratings.ndjson"
+    _write_ndjson(path, _rows(3, str(uuid4())))
+    import_file(str(path), repository, out=io.StringIO())
+    _write_ndjson(path, _rows(4, str(uuid4())))
+    with pytest.raises(ValueError, match="another file"):
+        import_file(str(path), repository, out=io.StringIO())
+
@@ -0,0 +1,63 @@
+from src.application.cache.list_page_cache import ListPageCache, get_list_page_cache, set_list_page_cache
+from src.infrastructure.config.settings import get_settings
+
+def test_get_and_put():
+    cache = ListPageCache(max_entries=10, max_bytes=1000)
+    assert cache.get("a") is None
+    cache.put("a", 1, 10)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 10
+
+def test_evicts_least_recently_used_by_entries():
+    cache = ListPageCache(max_entries=2, max_bytes=1000)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.get("a")
+    cache.put("c", 3, 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_evicts_by_bytes():
+    cache = ListPageCache(max_entries=100, max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.put("b", 2, 60)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 60
+
+    # Valores maiores que o limite não são armazenados
+    cache.put("c", 3, 1000)
+    assert cache.get("c") is None
+    assert cache.get("b") == 2
+
+def test_replace_updates_size():
+    cache = ListPageCache(max_entries=10, max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.put("a", 2, 30)
+    assert cache.get("a") == 2
+    assert cache.stats()["bytes"] == 30
+
+def test_clear():
+    cache = ListPageCache(max_entries=10, max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+def test_get_list_page_cache_disabled(monkeypatch):
+    monkeypatch.setattr(get_settings(), "list_cache_enabled", False)
+    assert get_list_page_cache() is None
+
+def test_get_list_page_cache_singleton():
+    set_list_page_cache(None)
+    cache = get_list_page_cache()
+    assert cache is get_list_page_cache()
+    assert cache.max_entries == get_settings().list_cache_max_entries
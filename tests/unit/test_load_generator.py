@@ -0,0 +1,112 @@
+import asyncio
+import random
+from collections import Counter
+import httpx
+import pytest
+from benchmarks.load_generator import (
+    DEFAULT_MIX, RouteStats, Workload, ZipfSampler, parse_mix, percentile, run_load, summarize
+)
+
+SEED = 1234
+SAMPLES = 20000
+
+class SlowClient:
+    """Answers every request with a 404 after a fixed delay, keeping the send times."""
+    def __init__(self, delay):
+        self.delay = delay
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, method, path, json=None):
+        self.sent.append(asyncio.get_running_loop().time())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return httpx.Response(404)
+
+def _workload(mix=None):
+    return Workload(mix or {"create": 0.2, "list_professional": 0.5, "list_consumer": 0.3}, 50, 50, seed=SEED)
+
+def _arrivals(rate, duration):
+    """Replay the schedule of run_load with a twin workload: arrivals before the deadline."""
+    twin = _workload()
+    scheduled, count = 0.0, 0
+    while True:
+        scheduled += twin.rng.expovariate(rate)
+        if scheduled >= duration:
+            return count
+        twin.next_request()
+        count += 1
+
+def test_zipf_sampler_follows_the_power_law():
+    sampler = ZipfSampler(5, 1.0, random.Random(SEED))
+    counts = Counter(sampler.sample() for _ in range(SAMPLES))
+    assert set(counts) <= set(range(5))
+    harmonic = sum(1 / (rank + 1) for rank in range(5))
+    for rank in range(5):
+        assert counts[rank] / SAMPLES == pytest.approx(1 / (rank + 1) / harmonic, abs=0.015)
+    # Mais popular primeiro
+    assert [rank for rank, _ in counts.most_common()] == list(range(5))
+
+def test_zipf_sampler_is_reproducible_with_a_seed():
+    first = ZipfSampler(100, 1.1, random.Random(SEED))
+    second = ZipfSampler(100, 1.1, random.Random(SEED))
+    assert [first.sample() for _ in range(100)] == [second.sample() for _ in range(100)]
+
+def test_traffic_mix_follows_the_weights():
+    workload = _workload()
+    routes = Counter(workload.next_request()[0] for _ in range(SAMPLES))
+    assert set(routes) == {"create", "list_professional", "list_consumer"}
+    assert routes["create"] / SAMPLES == pytest.approx(0.2, abs=0.015)
+    assert routes["list_professional"] / SAMPLES == pytest.approx(0.5, abs=0.015)
+    assert routes["list_consumer"] / SAMPLES == pytest.approx(0.3, abs=0.015)
+    # A mesma semente gera a mesma sequência de rotas
+    assert [_workload().next_request()[0] for _ in range(50)] == [_workload().next_request()[0] for _ in range(50)]
+
+def test_get_without_known_ids_becomes_a_create():
+    workload = _workload({"get": 1.0})
+    assert workload.next_request()[:3] == ("create", "POST", "/ratings/")
+    workload.record("create", httpx.Response(201, json={"_id": "abc"}))
+    assert workload.next_request()[:3] == ("get", "GET", "/ratings/abc")
+
+def test_unknown_route_and_mix_parsing():
+    with pytest.raises(ValueError):
+        Workload({"update": 1.0})
+    assert parse_mix(",".join(f"{route}={weight}" for route, weight in DEFAULT_MIX.items())) == DEFAULT_MIX
+
+def test_open_loop_schedule_does_not_wait_for_responses():
+    rate, duration = 200.0, 0.5
+    client = SlowClient(delay=0.2)
+    stats, elapsed = asyncio.run(run_load(client, _workload(), rate, duration))
+
+    # As chegadas seguem só o agendamento: respostas lentas não atrasam as seguintes
+    assert sum(len(entry.latencies) for entry in stats.values()) == len(client.sent) == _arrivals(rate, duration)
+    assert max(client.sent) - min(client.sent) < duration
+    assert client.max_in_flight > 10
+    # A latência é contada desde o instante agendado e inclui a espera da resposta
+    assert min(latency for entry in stats.values() for latency in entry.latencies) >= 0.2
+    assert elapsed >= duration
+
+def test_arrivals_over_the_in_flight_limit_are_dropped():
+    stats, _ = asyncio.run(run_load(SlowClient(delay=0.5), _workload(), 200.0, 0.3, max_in_flight=5))
+    completed = sum(len(entry.latencies) for entry in stats.values())
+    dropped = sum(entry.dropped for entry in stats.values())
+    assert completed == 5
+    assert completed + dropped == _arrivals(200.0, 0.3)
+
+def test_summary_percentiles_and_error_rate():
+    assert percentile([], 0.5) == 0.0
+    ordered = [i / 1000 for i in range(1, 101)]
+    assert percentile(ordered, 0.5) == 0.05
+    assert percentile(ordered, 0.99) == 0.099
+    entry = RouteStats()
+    entry.latencies = [0.01, 0.02, 0.03]
+    entry.statuses.update({200: 2, 503: 1})
+    entry.dropped = 1
+    report = summarize({"get": entry}, 2.0, 10.0)
+    assert report["requests"] == 4
+    assert report["throughput"] == 1.5
+    assert report["routes"]["get"]["error_rate"] == 0.5
+    assert report["routes"]["get"]["latency_ms"]["max"] == pytest.approx(30.0)
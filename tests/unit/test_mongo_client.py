@@ -19,8 +19,8 @@ def test_get_ratings_collection():
     # Verifica se os índices foram criados
     indexes = collection.list_indexes()
     index_names = [index["name"] for index in indexes]
-    assert "professional_id_1" in index_names
-    assert "consumer_id_1" in index_names
+    assert "professional_id_1__id_1" in index_names
+    assert "consumer_id_1__id_1" in index_names
     assert "professional_id_-1_created_at_-1" in index_names
 
 def test_collection_validation():
@@ -150,10 +150,10 @@ def test_create_collection_with_validation_and_indexes():
     
     # Verifica se os índices foram criados
     indexes = list(collection.list_indexes())
-    assert len(indexes) >= 4  # _id (padrão), professional_id, consumer_id e (professional_id, created_at)
+    assert len(indexes) >= 4  # _id (padrão), (professional_id, _id), (consumer_id, _id) e (professional_id, created_at)
     
-    # Verifica o índice de professional_id
-    professional_index = next(idx for idx in indexes if "professional_id" in idx["key"] and len(idx["key"]) == 1)
+    # Verifica o índice (professional_id, _id) dos lotes da exclusão em massa
+    professional_index = next(idx for idx in indexes if list(idx["key"]) == ["professional_id", "_id"])
     assert professional_index["key"]["professional_id"] == 1
     
     # Verifica o índice de consumer_id
@@ -163,4 +163,14 @@ def test_create_collection_with_validation_and_indexes():
     # Verifica o índice composto (professional_id, created_at)
     compound_index = next(idx for idx in indexes if "professional_id" in idx["key"] and "created_at" in idx["key"])
     assert compound_index["key"]["professional_id"] == -1
-    assert compound_index["key"]["created_at"] == -1 
\ No newline at end of file
+    assert compound_index["key"]["created_at"] == -1
+
+def test_consumer_created_at_index():
+    """Testa o índice composto (consumer_id, created_at) usado nas listagens por consumidor."""
+    import mongomock
+    set_mongo_client(mongomock.MongoClient())
+
+    collection = get_ratings_collection()
+    indexes = list(collection.list_indexes())
+    compound_index = next(idx for idx in indexes if "consumer_id" in idx["key"] and "created_at" in idx["key"])
+    assert list(compound_index["key"].items()) == [("consumer_id", -1), ("created_at", -1)]
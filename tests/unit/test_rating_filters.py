@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+from src.domain.value_objects.rating_filters import RatingFilters
+
+def test_is_empty():
+    assert RatingFilters().is_empty()
+    assert not RatingFilters(created_after=datetime(2024, 1, 1, tzinfo=timezone.utc)).is_empty()
+    assert not RatingFilters(min_rate=0).is_empty()
+    assert not RatingFilters(rate_in=()).is_empty()
+
+def test_allowed_rates():
+    assert RatingFilters().allowed_rates() is None
+    assert RatingFilters(min_rate=3).allowed_rates() == [3, 4, 5]
+    assert RatingFilters(max_rate=1).allowed_rates() == [0, 1]
+    assert RatingFilters(min_rate=1, max_rate=2).allowed_rates() == [1, 2]
+    assert RatingFilters(rate_in=(5, 1)).allowed_rates() == [1, 5]
+    assert RatingFilters(min_rate=2, rate_in=(1, 2, 3)).allowed_rates() == [2, 3]
+    assert RatingFilters(min_rate=4, rate_in=(1,)).allowed_rates() == []
+
+def test_hashable():
+    assert hash(RatingFilters(rate_in=(1, 2))) == hash(RatingFilters(rate_in=(1, 2)))
+    assert RatingFilters(min_rate=1) != RatingFilters(max_rate=1)
+
+def test_bounds_normalized_to_utc():
+    filters = RatingFilters(
+        created_after=datetime(2024, 1, 1),
+        created_before=datetime(2024, 1, 31, 21, 0, tzinfo=timezone(timedelta(hours=-3)))
+    )
+    assert filters.created_after == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert filters.created_before.tzinfo == timezone.utc
+    assert filters.created_before == datetime(2024, 2, 1, tzinfo=timezone.utc)
+
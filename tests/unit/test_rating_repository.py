@@ -1,13 +1,26 @@
 import pytest
 from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.infrastructure.repositories.memory_rating_repository import InMemoryRatingRepository
+from src.infrastructure.repositories.sqlite_rating_repository import SQLiteRatingRepository
 from src.domain.exceptions.base_exceptions import ValidationException, DatabaseException
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime, timezone
 from pymongo.errors import WriteError, OperationFailure
 
-@pytest.fixture
-def repository():
-    return RatingRepositoryImpl()
+@pytest.fixture(params=["mongo", "memory", "sqlite"])
+def repository(request, tmp_path):
+    # A mesma suíte roda contra todas as implementações
+    if request.param == "memory":
+        yield InMemoryRatingRepository()
+    elif request.param == "sqlite":
+        sqlite = SQLiteRatingRepository(str(tmp_path / "ratings.db"))
+        yield sqlite
+        sqlite.close()
+    else:
+        yield RatingRepositoryImpl()
+
+# Testes que substituem métodos da coleção do MongoDB
+mongo_only = pytest.mark.parametrize("repository", ["mongo"], indirect=True)
 
 def test_create_rating(repository):
     """Testa a criação de uma avaliação."""
@@ -26,6 +39,7 @@ def test_create_rating(repository):
     assert created_rating["description"] == rating_data["description"]
     assert isinstance(created_rating["created_at"], datetime)
 
+@mongo_only
 def test_create_rating_validation_error(repository, monkeypatch):
     """Testa erro de validação ao criar avaliação."""
     def mock_insert_one(*args, **kwargs):
@@ -43,6 +57,7 @@ def test_create_rating_validation_error(repository, monkeypatch):
     with pytest.raises(ValidationException):
         repository.create_rating(rating_data)
 
+@mongo_only
 def test_create_rating_operation_error(repository, monkeypatch):
     """Testa erro de operação ao criar avaliação."""
     def mock_insert_one(*args, **kwargs):
@@ -229,6 +244,7 @@ def test_delete_rating_error_handling(repository):
     deleted = repository.delete_rating(rating_id)
     assert deleted is False
 
+@mongo_only
 def test_create_rating_operation_failure(repository):
     """Testa o tratamento de erro de operação ao criar uma avaliação."""
     from pymongo.errors import OperationFailure
@@ -257,6 +273,7 @@ def test_create_rating_operation_failure(repository):
         # Restaura o método original
         repository.collection.insert_one = original_insert_one
 
+@mongo_only
 def test_create_rating_unexpected_error(repository):
     """Testa o tratamento de erro inesperado ao criar uma avaliação."""
     def mock_insert_one(*args, **kwargs):
@@ -283,6 +300,7 @@ def test_create_rating_unexpected_error(repository):
         # Restaura o método original
         repository.collection.insert_one = original_insert_one
 
+@mongo_only
 def test_get_rating_by_id_error(repository):
     """Testa o tratamento de erro ao buscar uma avaliação por ID."""
     def mock_find_one(*args, **kwargs):
@@ -302,6 +320,7 @@ def test_get_rating_by_id_error(repository):
         # Restaura o método original
         repository.collection.find_one = original_find_one
 
+@mongo_only
 def test_list_ratings_by_professional_error(repository):
     """Testa o tratamento de erro ao listar avaliações por profissional."""
     def mock_count_documents(*args, **kwargs):
@@ -321,6 +340,7 @@ def test_list_ratings_by_professional_error(repository):
         # Restaura o método original
         repository.collection.count_documents = original_count_documents
 
+@mongo_only
 def test_list_ratings_by_consumer_error(repository):
     """Testa o tratamento de erro ao listar avaliações por consumidor."""
     def mock_count_documents(*args, **kwargs):
@@ -340,6 +360,7 @@ def test_list_ratings_by_consumer_error(repository):
         # Restaura o método original
         repository.collection.count_documents = original_count_documents
 
+@mongo_only
 def test_delete_rating_error(repository):
     """Testa o tratamento de erro ao excluir uma avaliação."""
     def mock_delete_one(*args, **kwargs):
@@ -357,4 +378,299 @@ def test_delete_rating_error(repository):
         assert "Failed to delete rating" in str(exc_info.value)
     finally:
         # Restaura o método original
-        repository.collection.delete_one = original_delete_one 
\ No newline at end of file
+        repository.collection.delete_one = original_delete_one
+
+def test_rating_exists(repository):
+    """Testa a verificação de existência de uma avaliação."""
+    rating_data = {
+        "professional_id": str(uuid4()),
+        "consumer_id": str(uuid4()),
+        "rate": 5,
+        "description": "Test rating"
+    }
+
+    created_rating = repository.create_rating(rating_data)
+    assert repository.rating_exists(created_rating["_id"]) is True
+    assert repository.rating_exists(uuid4()) is False
+
+def test_versions_bumped_on_write(repository):
+    """Testa o incremento das versões de profissional e consumidor a cada escrita."""
+    professional_id = str(uuid4())
+    consumer_id = str(uuid4())
+    assert repository.get_version("professional", professional_id) == 0
+
+    rating_data = {
+        "professional_id": professional_id,
+        "consumer_id": consumer_id,
+        "rate": 4,
+        "description": "Test rating"
+    }
+    created_rating = repository.create_rating(rating_data)
+    assert repository.get_version("professional", professional_id) == 1
+    assert repository.get_version("consumer", consumer_id) == 1
+
+    repository.delete_rating(created_rating["_id"])
+    assert repository.get_version("professional", professional_id) == 2
+    assert repository.get_version("consumer", consumer_id) == 2
+
+    # Excluir uma avaliação inexistente não altera as versões
+    repository.delete_rating(uuid4())
+    assert repository.get_version("professional", professional_id) == 2
+
+def test_trend_buckets_follow_writes(repository):
+    """Testa a manutenção dos buckets de tendência a cada escrita."""
+    from src.domain.value_objects.trend_period import TrendGranularity, period_key
+    professional_id = str(uuid4())
+    created = [
+        repository.create_rating({
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": rate,
+            "description": None
+        })
+        for rate in (5, 4, 5)
+    ]
+    month = period_key(created[0]["created_at"], TrendGranularity.MONTH)
+    day = period_key(created[0]["created_at"], TrendGranularity.DAY)
+
+    buckets = repository.list_trend_buckets(professional_id, TrendGranularity.MONTH, month, month)
+    assert len(buckets) == 1
+    assert buckets[0]["count"] == 3
+    assert buckets[0]["sum"] == 14
+    assert buckets[0]["histogram"] == {"5": 2, "4": 1}
+
+    repository.delete_rating(created[0]["_id"])
+    buckets = repository.list_trend_buckets(professional_id, TrendGranularity.DAY, day, day)
+    assert buckets[0]["count"] == 2
+    assert buckets[0]["sum"] == 9
+    assert buckets[0]["histogram"] == {"5": 1, "4": 1}
+
+    # Buckets fora do intervalo não são retornados
+    assert repository.list_trend_buckets(professional_id, TrendGranularity.MONTH, "1999-01", "1999-12") == []
+
+def _insert_at(repository, field, entity_id, created_at):
+    doc = {
+        "_id": str(uuid4()),
+        "professional_id": str(uuid4()),
+        "consumer_id": str(uuid4()),
+        "rate": 5,
+        "description": None,
+        "created_at": created_at
+    }
+    doc[field] = entity_id
+    repository.insert_ratings([doc])
+    return doc
+
+def test_list_ratings_created_range(repository):
+    """Testa os filtros created_after (inclusivo) e created_before (exclusivo)."""
+    from datetime import timedelta
+    from src.domain.value_objects.rating_filters import RatingFilters
+    base = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    for field, list_ratings in (
+        ("professional_id", repository.list_ratings_by_professional),
+        ("consumer_id", repository.list_ratings_by_consumer)
+    ):
+        entity_id = str(uuid4())
+        for day in range(10):
+            _insert_at(repository, field, entity_id, base + timedelta(days=day))
+
+        filters = RatingFilters(created_after=base + timedelta(days=2), created_before=base + timedelta(days=5))
+        ratings, total = list_ratings(entity_id, 1, 10, filters)
+        assert total == 3
+        assert [r["created_at"].day for r in ratings] == [5, 4, 3]
+
+        ratings, total = list_ratings(entity_id, 1, 2, RatingFilters(created_after=base + timedelta(days=7)))
+        assert total == 3
+        assert len(ratings) == 2
+
+        ratings, total = list_ratings(entity_id, 1, 10, RatingFilters(created_before=base + timedelta(days=1)))
+        assert total == 1
+
+def test_list_ratings_rate_filters(repository):
+    """Testa os filtros min_rate, max_rate e rate_in."""
+    from src.domain.value_objects.rating_filters import RatingFilters
+    professional_id = str(uuid4())
+    for rate in (0, 1, 1, 2, 3, 4, 5, 5):
+        repository.create_rating({
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": rate,
+            "description": None
+        })
+
+    ratings, total = repository.list_ratings_by_professional(professional_id, 1, 10, RatingFilters(rate_in=(1, 2)))
+    assert total == 3
+    assert sorted(r["rate"] for r in ratings) == [1, 1, 2]
+
+    _, total = repository.list_ratings_by_professional(professional_id, 1, 10, RatingFilters(min_rate=4))
+    assert total == 3
+
+    _, total = repository.list_ratings_by_professional(professional_id, 1, 10, RatingFilters(min_rate=1, max_rate=3, rate_in=(3, 5)))
+    assert total == 1
+
+    _, total = repository.list_ratings_by_professional(professional_id, 1, 10, RatingFilters(min_rate=4, rate_in=(1,)))
+    assert total == 0
+
+def test_get_ratings_by_ids(repository):
+    """Testa a busca de várias avaliações em uma única consulta."""
+    created = [
+        repository.create_rating({
+            "professional_id": str(uuid4()),
+            "consumer_id": str(uuid4()),
+            "rate": rate,
+            "description": None
+        })
+        for rate in (1, 2)
+    ]
+    ids = [UUID(str(r["_id"])) for r in created]
+    ratings = repository.get_ratings_by_ids(ids + [uuid4()])
+    assert sorted(r["rate"] for r in ratings) == [1, 2]
+    assert {r["_id"] for r in ratings} == set(ids)
+    assert repository.get_ratings_by_ids([]) == []
+
+def test_rebuild_trend_buckets_counts_existing_ratings(repository):
+    """Testa a reconstrução dos buckets para avaliações gravadas antes deles existirem."""
+    from src.domain.value_objects.trend_period import TrendGranularity
+    professional_id = str(uuid4())
+    repository.insert_ratings([
+        {
+            "_id": str(uuid4()),
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": rate,
+            "description": None,
+            "created_at": datetime(2023, 5, day, 12, 0)
+        }
+        for day, rate in ((3, 5), (3, 4), (20, 1))
+    ])
+    # Remove os buckets: simula avaliações gravadas antes deles existirem
+    if isinstance(repository, InMemoryRatingRepository):
+        repository.trends.clear()
+    elif isinstance(repository, SQLiteRatingRepository):
+        repository._connection().execute("DELETE FROM rating_trends")
+    else:
+        repository.trends.delete_many({"professional_id": professional_id})
+    assert repository.list_trend_buckets(professional_id, TrendGranularity.MONTH, "2023-05", "2023-05") == []
+
+    assert repository.rebuild_trend_buckets([UUID(professional_id)]) == 3
+    # Idempotente: rodar de novo não soma em dobro
+    repository.rebuild_trend_buckets([UUID(professional_id)])
+
+    month = repository.list_trend_buckets(professional_id, TrendGranularity.MONTH, "2023-05", "2023-05")
+    assert month == [{"period": "2023-05", "count": 3, "sum": 10, "histogram": {"5": 1, "4": 1, "1": 1}}]
+    days = repository.list_trend_buckets(professional_id, TrendGranularity.DAY, "2023-05-01", "2023-05-31")
+    assert [(b["period"], b["count"]) for b in days] == [("2023-05-03", 2), ("2023-05-20", 1)]
+
+@mongo_only
+def test_create_and_delete_survive_derived_data_failure(repository, monkeypatch):
+    """Testa que uma falha nos contadores/tendências não transforma uma escrita gravada em erro."""
+    def failing_bulk_write(*args, **kwargs):
+        raise OperationFailure("trends unavailable")
+
+    monkeypatch.setattr(repository.trends, "bulk_write", failing_bulk_write)
+    created = repository.create_rating({
+        "professional_id": str(uuid4()),
+        "consumer_id": str(uuid4()),
+        "rate": 3,
+        "description": None
+    })
+    assert repository.rating_exists(created["_id"]) is True
+    assert repository.delete_rating(created["_id"]) is True
+    assert repository.rating_exists(created["_id"]) is False
+
+def test_memory_backend_selection(monkeypatch):
+    """Testa a escolha do backend em memória pela configuração e a recusa com vários workers."""
+    from src.infrastructure.config.settings import Settings
+    from src.infrastructure.repositories import rating_repository
+    monkeypatch.setattr(rating_repository, "get_settings", lambda: Settings(rating_repository_backend="memory"))
+    monkeypatch.setattr(rating_repository, "_memory_rating_repository", None)
+    first = rating_repository.get_rating_repository()
+    assert isinstance(first, InMemoryRatingRepository)
+    # Uma única instância por processo
+    assert rating_repository.get_rating_repository() is first
+
+    rating_repository.validate_rating_backend(Settings(rating_repository_backend="memory"), 1)
+    rating_repository.validate_rating_backend(Settings(rating_repository_backend="mongo"), 8)
+    with pytest.raises(ValueError):
+        rating_repository.validate_rating_backend(Settings(rating_repository_backend="memory"), 2)
+    rating_repository.validate_rating_backend(Settings(rating_repository_backend="sqlite"), 8)
+    with pytest.raises(ValueError):
+        rating_repository.validate_rating_backend(Settings(rating_repository_backend="postgres"), 1)
+
+def test_bulk_and_streaming_operations(repository):
+    """Testa inserção em lote, leitura em faixas e exclusão em lotes em todas as implementações."""
+    from datetime import timedelta
+    professional_id = str(uuid4())
+    # _ids crescentes e únicos por execução
+    prefix = uuid4().hex[:8]
+    base = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    docs = [
+        {
+            "_id": f"{prefix}-0000-4000-8000-{i:012d}",
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": i % 6,
+            "description": None,
+            "created_at": base + timedelta(days=i)
+        }
+        for i in range(6)
+    ]
+    inserted, duplicates, rejected = repository.insert_ratings(docs[:4])
+    assert (len(inserted), duplicates, rejected) == (4, 0, 0)
+    inserted, duplicates, rejected = repository.insert_ratings(docs[2:])
+    assert (len(inserted), duplicates, rejected) == (2, 2, 0)
+
+    ids = [str(r["_id"]) for r in repository.iter_ratings(docs[1]["_id"], docs[4]["_id"], batch_size=2)]
+    assert ids == [doc["_id"] for doc in docs[1:4]]
+    ids = [str(r["_id"]) for r in repository.iter_ratings(docs[0]["_id"], docs[5]["_id"], created_from=base + timedelta(days=3))]
+    assert ids == [docs[3]["_id"], docs[4]["_id"]]
+
+    query = {"professional_id": professional_id, "created_at": {"$gte": base + timedelta(days=4)}}
+    batches = list(repository.iter_field_batches(["rate", "created_at"], 1, query))
+    assert [batch[0]["rate"] for batch in batches] == [4, 5]
+    assert set(batches[0][0]) == {"rate", "created_at"}
+
+    chunk = repository.next_ratings_chunk("professional", professional_id, "", 4)
+    assert [doc["_id"] for doc in chunk] == [doc["_id"] for doc in docs[:4]]
+    repository.delete_rating(UUID(docs[1]["_id"]))
+    deleted = repository.delete_ratings_chunk("professional", professional_id, chunk)
+    assert [doc["_id"] for doc in deleted] == [docs[0]["_id"], docs[2]["_id"], docs[3]["_id"]]
+    repository.apply_deleted_ratings(deleted)
+    assert repository.next_ratings_chunk("professional", professional_id, chunk[-1]["_id"], 4)[0]["_id"] == docs[4]["_id"]
+    _, total = repository.list_ratings_by_professional(professional_id)
+    assert total == 2
+
+def test_chunks_follow_id_order_and_trends_period_order(repository):
+    """Testa lotes em ordem de _id (não de created_at) e buckets de tendência em ordem de período."""
+    from src.domain.value_objects.trend_period import TrendGranularity
+    from src.domain.value_objects.rating_filters import RatingFilters
+    professional_id = str(uuid4())
+    prefix = uuid4().hex[:8]
+    # _ids crescentes com created_at decrescente e meses fora de ordem
+    months = (5, 1, 9, 3)
+    docs = [
+        {
+            "_id": f"{prefix}-0000-4000-8000-{i:012d}",
+            "professional_id": professional_id,
+            "consumer_id": str(uuid4()),
+            "rate": 3,
+            "description": None,
+            "created_at": datetime(2023, month, 10, tzinfo=timezone.utc)
+        }
+        for i, month in enumerate(months)
+    ]
+    for doc in docs:
+        repository.insert_ratings([doc])
+
+    chunk = repository.next_ratings_chunk("professional", professional_id, docs[0]["_id"], 2)
+    assert [doc["_id"] for doc in chunk] == [docs[1]["_id"], docs[2]["_id"]]
+    assert repository.next_ratings_chunk("professional", professional_id, docs[3]["_id"], 2) == []
+
+    buckets = repository.list_trend_buckets(professional_id, TrendGranularity.MONTH, "2023-02", "2023-09")
+    assert [bucket["period"] for bucket in buckets] == ["2023-03", "2023-05", "2023-09"]
+
+    # Filtro por nota com mais de uma lista: intercala pela data mais recente
+    repository.insert_ratings([{**docs[0], "_id": f"{prefix}-0000-4000-8000-{9:012d}", "rate": 1}])
+    items, total = repository.list_ratings_by_professional(professional_id, 1, 2, RatingFilters(rate_in=(1, 3)))
+    assert total == 5
+    assert [item["created_at"].month for item in items] == [9, 5]
@@ -26,6 +26,10 @@ class MockRatingRepository:
             raise DatabaseException(message="Database error", details={"error": "Connection failed"})
         return self.ratings.get(str(rating_id))
 
+    def get_ratings_by_ids(self, rating_ids):
+        self.batch_queries = getattr(self, "batch_queries", 0) + 1
+        return [self.ratings[str(rating_id)] for rating_id in rating_ids if str(rating_id) in self.ratings]
+
     def list_ratings_by_professional(self, professional_id, page, size):
         if self.should_raise_error:
             raise DatabaseException(message="Database error", details={"error": "Connection failed"})
@@ -262,4 +266,198 @@ def test_list_ratings_by_consumer_error(service, mock_repository):
     with pytest.raises(DatabaseException) as exc_info:
         service.list_ratings_by_consumer(consumer_id)
     assert "Failed to list ratings" in str(exc_info.value)
-    mock_repository.list_ratings_by_consumer.assert_called_once_with(consumer_id, 1, 10) 
\ No newline at end of file
+    mock_repository.list_ratings_by_consumer.assert_called_once_with(consumer_id, 1, 10)
+
+def _rating_dicts(professional_id, count):
+    return [
+        {
+            "_id": uuid4(),
+            "professional_id": professional_id,
+            "consumer_id": uuid4(),
+            "rate": 5,
+            "description": f"Test rating {i}",
+            "created_at": datetime.now(UTC)
+        }
+        for i in range(count)
+    ]
+
+def test_list_ratings_cached_by_generation(mock_repository):
+    """Testa o cache de páginas de listagem chaveado pela geração do profissional."""
+    from src.application.cache.list_page_cache import ListPageCache
+    cache = ListPageCache(max_entries=100, max_bytes=1024 * 1024)
+    service = RatingService(mock_repository, list_cache=cache)
+    professional_id = uuid4()
+    mock_repository.list_ratings_by_professional.return_value = (_rating_dicts(professional_id, 2), 2)
+
+    first, total = service.list_ratings_by_professional(professional_id, 1, 10, version=1)
+    second, _ = service.list_ratings_by_professional(professional_id, 1, 10, version=1)
+    assert total == 2
+    assert [r.id for r in first] == [r.id for r in second]
+    assert mock_repository.list_ratings_by_professional.call_count == 1
+    assert cache.stats()["hits"] == 1
+
+    # Uma escrita incrementa a geração e a página é recalculada
+    service.list_ratings_by_professional(professional_id, 1, 10, version=2)
+    assert mock_repository.list_ratings_by_professional.call_count == 2
+
+    # Outra página não compartilha a entrada
+    service.list_ratings_by_professional(professional_id, 2, 10, version=2)
+    assert mock_repository.list_ratings_by_professional.call_count == 3
+
+def test_list_ratings_cache_reads_generation(mock_repository):
+    """Testa a leitura da geração no repositório quando não informada."""
+    from src.application.cache.list_page_cache import ListPageCache
+    service = RatingService(mock_repository, list_cache=ListPageCache(100, 1024 * 1024))
+    consumer_id = uuid4()
+    mock_repository.get_version.return_value = 7
+    mock_repository.list_ratings_by_consumer.return_value = ([], 0)
+
+    service.list_ratings_by_consumer(consumer_id, 1, 10)
+    service.list_ratings_by_consumer(consumer_id, 1, 10)
+    mock_repository.get_version.assert_called_with("consumer", consumer_id)
+    mock_repository.list_ratings_by_consumer.assert_called_once_with(consumer_id, 1, 10)
+
+def test_get_rating_trend_fills_empty_buckets(service, mock_repository):
+    """Testa a tendência mensal com buckets vazios preenchidos."""
+    from src.domain.value_objects.trend_period import TrendGranularity
+    professional_id = uuid4()
+    mock_repository.list_trend_buckets.return_value = [
+        {"period": "2024-01", "count": 2, "sum": 9, "histogram": {"5": 1, "4": 1}},
+        {"period": "2024-03", "count": 1, "sum": 3, "histogram": {"3": 1}}
+    ]
+
+    trend = service.get_rating_trend(
+        professional_id,
+        TrendGranularity.MONTH,
+        datetime(2024, 1, 10, tzinfo=UTC),
+        datetime(2024, 3, 5, tzinfo=UTC)
+    )
+    mock_repository.list_trend_buckets.assert_called_once_with(
+        professional_id, TrendGranularity.MONTH, "2024-01", "2024-03"
+    )
+    assert [p.count for p in trend.points] == [2, 0, 1]
+    assert trend.points[0].average == 4.5
+    assert trend.points[1].average is None
+    assert trend.points[0].histogram == {"0": 0, "1": 0, "2": 0, "3": 0, "4": 1, "5": 1}
+    assert trend.start == datetime(2024, 1, 1, tzinfo=UTC)
+
+def test_get_rating_trend_defaults_to_last_12_months(service, mock_repository):
+    """Testa o intervalo padrão de 12 meses."""
+    from src.domain.value_objects.trend_period import TrendGranularity
+    mock_repository.list_trend_buckets.return_value = []
+    trend = service.get_rating_trend(uuid4(), TrendGranularity.MONTH, end=datetime(2024, 3, 5, tzinfo=UTC))
+    assert len(trend.points) == 12
+    assert trend.points[0].period_start == datetime(2023, 4, 1, tzinfo=UTC)
+
+def test_get_rating_trend_invalid_range(service, mock_repository):
+    """Testa a validação do intervalo da tendência."""
+    from src.domain.value_objects.trend_period import TrendGranularity
+    with pytest.raises(ValidationException):
+        service.get_rating_trend(
+            uuid4(), TrendGranularity.MONTH, datetime(2024, 5, 1, tzinfo=UTC), datetime(2024, 3, 1, tzinfo=UTC)
+        )
+    with pytest.raises(ValidationException):
+        service.get_rating_trend(
+            uuid4(), TrendGranularity.DAY, datetime(2020, 1, 1, tzinfo=UTC), datetime(2024, 3, 1, tzinfo=UTC)
+        )
+    mock_repository.list_trend_buckets.assert_not_called()
+
+def test_list_ratings_with_filters(mock_repository):
+    """Testa o repasse dos filtros de data e a separação das entradas de cache."""
+    from src.application.cache.list_page_cache import ListPageCache
+    from src.domain.value_objects.rating_filters import RatingFilters
+    service = RatingService(mock_repository, list_cache=ListPageCache(100, 1024 * 1024))
+    professional_id = uuid4()
+    mock_repository.list_ratings_by_professional.return_value = ([], 0)
+    filters = RatingFilters(created_after=datetime(2024, 3, 1, tzinfo=UTC))
+
+    service.list_ratings_by_professional(professional_id, 1, 10, version=1, filters=filters)
+    mock_repository.list_ratings_by_professional.assert_called_with(professional_id, 1, 10, filters)
+
+    # Filtros vazios equivalem a nenhum filtro
+    service.list_ratings_by_professional(professional_id, 1, 10, version=1, filters=RatingFilters())
+    mock_repository.list_ratings_by_professional.assert_called_with(professional_id, 1, 10)
+    assert mock_repository.list_ratings_by_professional.call_count == 2
+
+    service.list_ratings_by_professional(professional_id, 1, 10, version=1, filters=filters)
+    assert mock_repository.list_ratings_by_professional.call_count == 2
+
+def test_list_ratings_invalid_date_range(service, mock_repository):
+    """Testa a rejeição de intervalos de data invertidos."""
+    from src.domain.value_objects.rating_filters import RatingFilters
+    filters = RatingFilters(
+        created_after=datetime(2024, 3, 2, tzinfo=UTC),
+        created_before=datetime(2024, 3, 1, tzinfo=UTC)
+    )
+    with pytest.raises(ValidationException):
+        service.list_ratings_by_consumer(uuid4(), 1, 10, filters=filters)
+    mock_repository.list_ratings_by_consumer.assert_not_called()
+
+def test_list_ratings_invalid_rate_range(service, mock_repository):
+    """Testa a rejeição de min_rate maior que max_rate."""
+    from src.domain.value_objects.rating_filters import RatingFilters
+    with pytest.raises(ValidationException):
+        service.list_ratings_by_professional(uuid4(), 1, 10, filters=RatingFilters(min_rate=4, max_rate=2))
+    mock_repository.list_ratings_by_professional.assert_not_called()
+
+def test_search_ratings_keeps_relevance_order(mock_repository):
+    """Testa que a busca textual mantém a ordem de relevância ao hidratar as avaliações."""
+    search = Mock()
+    service = RatingService(mock_repository, search=search)
+    professional_id = uuid4()
+    ratings = _rating_dicts(professional_id, 3)
+    search.search.return_value = ([(ratings[2]["_id"], 2.5), (ratings[0]["_id"], 1.0), (uuid4(), 0.5)], 3)
+    mock_repository.get_ratings_by_ids.return_value = ratings
+
+    items, total = service.search_ratings("atraso", professional_id, 1, 10)
+    assert total == 3
+    assert [r.id for r in items] == [ratings[2]["_id"], ratings[0]["_id"]]
+    assert [r.score for r in items] == [2.5, 1.0]
+    search.search.assert_called_once_with("atraso", professional_id, 1, 10)
+    mock_repository.get_ratings_by_ids.assert_called_once()
+
+def test_search_ratings_without_backend(service):
+    """Testa a busca sem backend configurado."""
+    with pytest.raises(ValidationException):
+        service.search_ratings("atraso")
+
+def test_create_and_delete_update_search_index(mock_repository):
+    """Testa que criação e remoção mantêm o índice de busca atualizado."""
+    search = Mock()
+    service = RatingService(mock_repository, search=search)
+    rating = _rating_dicts(uuid4(), 1)[0]
+    mock_repository.create_rating.return_value = rating
+    mock_repository.delete_rating.return_value = True
+
+    service.create_rating(RatingCreate(
+        professional_id=rating["professional_id"],
+        consumer_id=rating["consumer_id"],
+        rate=rating["rate"],
+        description="Pontual"
+    ))
+    search.index_rating.assert_called_once_with(rating)
+    service.delete_rating(rating["_id"])
+    search.remove_rating.assert_called_once_with(rating["_id"])
+
+def test_get_ratings_by_ids_keeps_order_and_reports_missing():
+    repo = MockRatingRepository()
+    service = RatingService(repo)
+    created = [
+        service.create_rating(RatingCreate(professional_id=uuid4(), consumer_id=uuid4(), rate=i, description=None))
+        for i in range(3)
+    ]
+    missing = uuid4()
+    ids = [created[2].id, missing, created[0].id, created[2].id]
+
+    items, not_found = service.get_ratings_by_ids(ids)
+
+    assert [item.id for item in items] == [created[2].id, created[0].id]
+    assert not_found == [missing]
+    assert repo.batch_queries == 1
+
+def test_get_ratings_by_ids_limit():
+    from src.application.services.rating_service import MAX_BATCH_GET_IDS
+    service = RatingService(MockRatingRepository())
+    with pytest.raises(ValidationException):
+        service.get_ratings_by_ids([uuid4() for _ in range(MAX_BATCH_GET_IDS + 1)])
+    assert service.get_ratings_by_ids([]) == ([], [])
@@ -0,0 +1,110 @@
+import io
+import json
+import math
+import statistics
+import pytest
+import mongomock
+import numpy as np
+from datetime import datetime, timezone
+from uuid import uuid4
+from src.infrastructure.database import mongo_client
+from src.infrastructure.repositories.rating_repository import RatingRepositoryImpl
+from src.application.analytics.rating_stats import (
+    columns_from_batches,
+    load_rating_columns,
+    professional_stats,
+    wilson_interval
+)
+from src.cli.rating_stats import compute_stats
+
+@pytest.fixture(autouse=True)
+def mock_mongo():
+    original = mongo_client._mongo_client
+    mongo_client.set_mongo_client(mongomock.MongoClient())
+    yield
+    mongo_client.set_mongo_client(original)
+
+@pytest.fixture
+def repository():
+    return RatingRepositoryImpl()
+
+def _docs(professional_id, rates, day=1):
+    return [
+        {"professional_id": professional_id, "rate": rate, "created_at": datetime(2024, 3, day + i, tzinfo=timezone.utc)}
+        for i, rate in enumerate(rates)
+    ]
+
+def test_professional_stats_match_python_reference():
+    """Testa que as estatísticas vetorizadas batem com o cálculo em Python puro."""
+    rates = {"a": [5, 4, 4, 1, 0, 3, 5], "b": [2], "c": [3, 3, 5, 5]}
+    # Lotes pequenos e profissionais intercalados entre os lotes
+    docs = _docs("a", rates["a"][:3]) + _docs("b", rates["b"]) + _docs("c", rates["c"]) + _docs("a", rates["a"][3:], day=10)
+    columns = columns_from_batches([docs[:4], [], docs[4:9], docs[9:]])
+    stats = professional_stats(columns, percentiles=(0.5, 0.9))
+
+    assert len(columns) == sum(len(r) for r in rates.values())
+    for index, professional_id in enumerate(stats.professional_ids):
+        expected = rates[professional_id]
+        assert stats.count[index] == len(expected)
+        assert math.isclose(stats.mean[index], statistics.fmean(expected))
+        assert math.isclose(stats.variance[index], statistics.pvariance(expected), abs_tol=1e-12)
+        ordered = sorted(expected)
+        for q in (0.5, 0.9):
+            assert stats.percentiles[q][index] == ordered[max(math.ceil(q * len(ordered)), 1) - 1]
+        assert list(stats.histogram[index]) == [expected.count(rate) for rate in range(6)]
+
+    a = stats.row(stats.professional_ids.index("a"))
+    assert a["first_rating_at"] == "2024-03-01T00:00:00.000+00:00"
+    assert a["last_rating_at"] == "2024-03-13T00:00:00.000+00:00"
+
+def test_wilson_interval():
+    """Testa o intervalo de Wilson contra valores conhecidos e amostras vazias."""
+    lower, upper = wilson_interval(np.array([8, 0]), np.array([10, 0]))
+    assert math.isclose(lower[0], 0.4902, abs_tol=1e-4)
+    assert math.isclose(upper[0], 0.9433, abs_tol=1e-4)
+    assert lower[1] == 0 and upper[1] == 0
+
+def test_top_by_wilson_penalizes_small_samples():
+    """Testa que poucas avaliações perfeitas não superam muitas avaliações boas."""
+    docs = _docs("few", [5]) + [
+        {"professional_id": "many", "rate": 5 if i % 10 else 3, "created_at": datetime(2024, 1, 1)}
+        for i in range(200)
+    ]
+    stats = professional_stats(columns_from_batches([docs]))
+    assert [row["professional_id"] for row in stats.top_by_wilson(2)] == ["many", "few"]
+    assert [row["professional_id"] for row in stats.top_by_wilson(2, min_count=2)] == ["many"]
+
+def test_empty_columns():
+    """Testa as estatísticas sem nenhuma avaliação."""
+    stats = professional_stats(columns_from_batches([]))
+    assert stats.professional_ids == []
+    assert stats.top_by_wilson() == []
+
+def test_load_rating_columns_from_repository(repository):
+    """Testa a leitura das colunas em lotes a partir do repositório."""
+    professional_id = str(uuid4())
+    for rate in (5, 4, 1):
+        repository.create_rating({"professional_id": professional_id, "consumer_id": str(uuid4()), "rate": rate})
+    repository.create_rating({"professional_id": str(uuid4()), "consumer_id": str(uuid4()), "rate": 2})
+
+    columns = load_rating_columns(repository, batch_size=2)
+    stats = professional_stats(columns)
+
+    index = stats.professional_ids.index(professional_id)
+    assert len(columns) == 4
+    assert stats.count[index] == 3
+    assert math.isclose(stats.mean[index], 10 / 3)
+
+def test_compute_stats_writes_every_professional(repository, tmp_path):
+    """Testa o comando de estatísticas gravando um NDJSON por profissional."""
+    for _ in range(3):
+        repository.create_rating({"professional_id": str(uuid4()), "consumer_id": str(uuid4()), "rate": 4})
+    output = tmp_path / "stats.ndjson"
+    out = io.StringIO()
+
+    compute_stats(repository, top=2, output_path=str(output), out=out)
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(rows) == 3
+    assert all(row["count"] == 1 and row["mean"] == 4.0 for row in rows)
+    assert "3 ratings of 3 professionals" in out.getvalue()
@@ -0,0 +1,125 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from src.infrastructure.search.tokenizer import tokenize
+from src.infrastructure.search.inverted_index_search import InvertedIndexSearch
+from src.infrastructure.search.factory import validate_search_backend
+from src.infrastructure.config.settings import Settings
+
+def _rating(description, professional_id=None, created_at=None):
+    return {
+        "_id": uuid4(),
+        "professional_id": professional_id or uuid4(),
+        "description": description,
+        "created_at": created_at or datetime.now(timezone.utc)
+    }
+
+def test_tokenize_is_case_and_accent_insensitive():
+    assert tokenize("Ótimo ATENDIMENTO, serviço rápido!") == ["otimo", "atendimento", "servico", "rapido"]
+
+def test_tokenize_drops_single_characters_and_empty_text():
+    assert tokenize("a b ok") == ["ok"]
+    assert tokenize("") == []
+    assert tokenize(None) == []
+
+def test_search_ranks_more_relevant_first():
+    index = InvertedIndexSearch()
+    weak = _rating("atraso na entrega mas bom trabalho de pintura no geral")
+    strong = _rating("atraso atraso")
+    index.index_ratings([weak, strong, _rating("excelente")])
+    hits, total = index.search("atraso")
+    assert total == 2
+    assert [rating_id for rating_id, _ in hits] == [strong["_id"], weak["_id"]]
+    assert hits[0][1] > hits[1][1] > 0
+
+def test_search_breaks_ties_by_newest():
+    index = InvertedIndexSearch()
+    now = datetime.now(timezone.utc)
+    old = _rating("pontual", created_at=now - timedelta(days=1))
+    new = _rating("pontual", created_at=now)
+    index.index_ratings([old, new])
+    hits, _ = index.search("Pontual")
+    assert [rating_id for rating_id, _ in hits] == [new["_id"], old["_id"]]
+
+def test_search_filters_by_professional():
+    index = InvertedIndexSearch()
+    professional_id = uuid4()
+    mine = _rating("muito educado", professional_id)
+    index.index_ratings([mine, _rating("muito educado")])
+    hits, total = index.search("educado", professional_id)
+    assert total == 1
+    assert hits[0][0] == mine["_id"]
+    assert index.search("educado", uuid4()) == ([], 0)
+
+def test_search_paginates():
+    index = InvertedIndexSearch()
+    now = datetime.now(timezone.utc)
+    ratings = [_rating("limpeza", created_at=now - timedelta(minutes=i)) for i in range(5)]
+    index.index_ratings(ratings)
+    hits, total = index.search("limpeza", page=2, size=2)
+    assert total == 5
+    assert [rating_id for rating_id, _ in hits] == [ratings[2]["_id"], ratings[3]["_id"]]
+
+def test_removed_ratings_are_not_returned():
+    index = InvertedIndexSearch()
+    rating = _rating("demorou")
+    index.index_rating(rating)
+    index.remove_rating(rating["_id"])
+    assert index.search("demorou") == ([], 0)
+    assert len(index) == 0
+
+def test_removed_ratings_leave_idf_as_a_fresh_index():
+    kept = [_rating("atraso na entrega"), _rating("entrega rápida")]
+    removed = [_rating("atraso atraso") for _ in range(5)]
+    index = InvertedIndexSearch()
+    index.index_ratings(kept + removed)
+    for rating in removed:
+        index.remove_rating(rating["_id"])
+    fresh = InvertedIndexSearch()
+    fresh.index_ratings(kept)
+    assert index.search("atraso entrega") == fresh.search("atraso entrega")
+
+def test_tombstones_are_compacted(monkeypatch):
+    from src.infrastructure.search import inverted_index_search
+    monkeypatch.setattr(inverted_index_search, "COMPACT_MIN_DELETED", 4)
+    index = InvertedIndexSearch()
+    now = datetime.now(timezone.utc)
+    ratings = [_rating(f"limpeza item{i}", created_at=now - timedelta(minutes=i)) for i in range(12)]
+    index.index_ratings(ratings)
+    for rating in ratings[::3]:
+        index.remove_rating(rating["_id"])
+    # 4 de 12 removidas: passou do limite e as lápides foram descartadas
+    assert not index._deleted
+    assert len(index._rating_ids) == len(index) == 8
+    live = [rating for i, rating in enumerate(ratings) if i % 3]
+    hits, total = index.search("limpeza", size=20)
+    assert total == 8
+    assert [rating_id for rating_id, _ in hits] == [rating["_id"] for rating in live]
+    assert index.search("item0") == ([], 0)
+    assert index.search("item4")[0][0][0] == ratings[4]["_id"]
+    # Índice compactado segue aceitando inserções e exclusões
+    index.index_rating(ratings[0])
+    index.remove_rating(ratings[1]["_id"])
+    assert index.search("limpeza", size=20)[1] == 8
+
+def test_index_rating_is_idempotent():
+    index = InvertedIndexSearch()
+    rating = _rating("caprichoso")
+    index.index_rating(rating)
+    index.index_rating(rating)
+    assert index.search("caprichoso")[1] == 1
+
+def test_memory_backend_is_single_process_only():
+    validate_search_backend(Settings(search_backend="memory"), 1)
+    validate_search_backend(Settings(search_backend="mongo"), 8)
+    validate_search_backend(Settings(search_backend="auto"), 8)
+    with pytest.raises(ValueError):
+        validate_search_backend(Settings(search_backend="memory"), 2)
+
+def test_search_backend_without_mongodb():
+    """Testa que sem MongoDB a busca usa o índice em memória e continua restrita a um processo."""
+    validate_search_backend(Settings(search_backend="auto", rating_repository_backend="sqlite"), 1)
+    with pytest.raises(ValueError):
+        validate_search_backend(Settings(search_backend="auto", rating_repository_backend="sqlite"), 4)
+    with pytest.raises(ValueError):
+        validate_search_backend(Settings(search_backend="mongo", rating_repository_backend="memory"), 1)
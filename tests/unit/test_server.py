@@ -0,0 +1,51 @@
+import gc
+import pytest
+from unittest.mock import Mock
+from src import server
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.database import mongo_client
+
+def test_worker_count_from_settings():
+    assert server.worker_count(Settings(web_concurrency=3)) == 3
+
+def test_worker_count_defaults_to_cpus(monkeypatch):
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: {0, 1, 2, 3}, raising=False)
+    assert server.worker_count(Settings(web_concurrency=None)) == 4
+
+def test_gunicorn_options():
+    settings = Settings(web_concurrency=2, server_port=9000, server_backlog=4096, server_keepalive=10)
+    options = server.gunicorn_options(settings)
+    assert options["bind"] == "0.0.0.0:9000"
+    assert options["workers"] == 2
+    assert options["preload_app"] is True
+    assert options["backlog"] == 4096
+    assert options["keepalive"] == 10
+    assert options["worker_class"] == "src.server.UvicornWorker"
+
+def test_when_ready_freezes_heap():
+    try:
+        server.when_ready(Mock())
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+def test_post_fork_resets_mongo_client():
+    original = mongo_client._mongo_client
+    try:
+        mongo_client.set_mongo_client(object())
+        server.post_fork(Mock(), Mock())
+        assert mongo_client._mongo_client is None
+    finally:
+        mongo_client.set_mongo_client(original)
+
+def test_main_rejects_memory_search_with_several_workers(monkeypatch):
+    monkeypatch.setattr(server, "get_settings", lambda: Settings(search_backend="memory", web_concurrency=4))
+    run = Mock()
+    monkeypatch.setattr(server, "run_gunicorn", run)
+    with pytest.raises(ValueError, match="single-process"):
+        server.main()
+    run.assert_not_called()
+
+@pytest.mark.skipif(server.UvicornWorker is None, reason="gunicorn not installed")
+def test_uvicorn_worker_event_loop():
+    assert server.UvicornWorker.CONFIG_KWARGS == {"loop": server.event_loop(), "http": server.http_protocol()}
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+import pytest
+from src.application.cache.list_page_cache import ListPageCache
+from src.application.cache.single_flight import SingleFlight
+from src.application.services.rating_service import RatingService
+
+WAITERS = 20
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def read():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(WAITERS) as pool:
+        futures = [pool.submit(flight.do, ("rating", "a"), read) for _ in range(WAITERS)]
+        _wait_for(lambda: flight.stats()["coalesced"] == WAITERS - 1)
+        release.set()
+        results = [future.result(5) for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = flight.stats()
+    assert stats["executed"] == 1
+    assert stats["by_kind"]["rating"] == {"executed": 1, "coalesced": WAITERS - 1}
+    assert stats["in_flight"] == 0
+
+def test_exception_reaches_every_waiter_and_next_call_runs_again():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "k", failing) for _ in range(4)]
+        _wait_for(lambda: flight.stats()["coalesced"] == 3)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result(5)
+
+    # Nada fica guardado depois da chamada: a próxima executa de novo
+    assert flight.do("k", lambda: "ok") == "ok"
+    assert flight.stats()["by_kind"]["default"] == {"executed": 2, "coalesced": 3}
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do(("list", 1), lambda: 1) == 1
+    assert flight.do(("list", 2), lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
+
+def test_concurrent_coroutines_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def read():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "page"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async(("list", "p", 1), read) for _ in range(WAITERS)))
+
+    assert asyncio.run(main()) == ["page"] * WAITERS
+    assert len(calls) == 1
+    assert flight.stats()["by_kind"]["list"] == {"executed": 1, "coalesced": WAITERS - 1}
+
+def test_coroutine_waits_for_call_running_in_a_thread():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("k", lambda: release.wait(5) and "from thread"))
+    leader.start()
+    _wait_for(lambda: flight.in_flight() == 1)
+
+    async def main():
+        waiter = asyncio.ensure_future(flight.do_async("k", _never_called))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await waiter
+
+    assert asyncio.run(main()) == "from thread"
+    leader.join(5)
+
+async def _never_called():
+    raise AssertionError("follower must not run the call")
+
+class SlowRepository:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = {"get_rating_by_id": 0, "list_ratings_by_professional": 0}
+        self.rating = {
+            "_id": str(uuid4()),
+            "professional_id": str(uuid4()),
+            "consumer_id": str(uuid4()),
+            "rate": 5,
+            "description": "Ótimo",
+            "created_at": "2024-01-01T00:00:00+00:00"
+        }
+
+    def get_rating_by_id(self, rating_id):
+        self.calls["get_rating_by_id"] += 1
+        self.release.wait(5)
+        return self.rating
+
+    def list_ratings_by_professional(self, professional_id, page, size):
+        self.calls["list_ratings_by_professional"] += 1
+        self.release.wait(5)
+        return [self.rating], 1
+
+    def get_version(self, scope, entity_id):
+        return 0
+
+@pytest.mark.parametrize("list_cache", [None, ListPageCache(100, 1024 * 1024)])
+def test_service_coalesces_by_id_and_listing_reads(list_cache):
+    repository = SlowRepository()
+    flight = SingleFlight()
+    service = RatingService(repository, list_cache=list_cache, single_flight=flight)
+    professional_id = repository.rating["professional_id"]
+
+    with ThreadPoolExecutor(2 * WAITERS) as pool:
+        by_id = [pool.submit(service.get_rating_by_id, repository.rating["_id"]) for _ in range(WAITERS)]
+        pages = [pool.submit(service.list_ratings_by_professional, professional_id, 1, 10, 0) for _ in range(WAITERS)]
+        _wait_for(lambda: flight.stats()["coalesced"] == 2 * (WAITERS - 1))
+        repository.release.set()
+        assert {str(future.result(5).id) for future in by_id} == {repository.rating["_id"]}
+        assert all(future.result(5)[1] == 1 for future in pages)
+
+    assert repository.calls == {"get_rating_by_id": 1, "list_ratings_by_professional": 1}
@@ -0,0 +1,99 @@
+import logging
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api.middleware.route_context import RouteContextMiddleware
+from src.infrastructure.database.slow_query_log import (
+    SlowQueryLog, SlowQueryListener, command_shape, current_route, normalize
+)
+
+def _events(request_id, command, duration_ms, reply=None, failure=None):
+    name = next(iter(command))
+    started = SimpleNamespace(connection_id=("localhost", 27017), request_id=request_id, command_name=name, command=command, database_name="easyprofind")
+    finished = SimpleNamespace(
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        command_name=name,
+        duration_micros=int(duration_ms * 1000),
+        reply=reply or {},
+        failure=failure
+    )
+    return started, finished
+
+def test_normalize_strips_literals_and_collapses_lists():
+    assert normalize({"professional_id": "a", "rate": {"$in": [1, 2, 3]}}) == {"professional_id": "?", "rate": {"$in": ["?"]}}
+    assert normalize({"$or": [{"a": 1}, {"b": 2}, {"a": 3}]}) == {"$or": [{"a": "?"}, {"b": "?"}]}
+
+def test_command_shape_ignores_values_but_keeps_sort():
+    first = command_shape("find", {"find": "ratings", "filter": {"_id": {"$in": ["x", "y"]}}, "sort": {"created_at": -1}, "limit": 10, "lsid": {}}, "easyprofind")
+    second = command_shape("find", {"find": "ratings", "filter": {"_id": {"$in": ["z"]}}, "sort": {"created_at": -1}, "limit": 20}, "easyprofind")
+    assert first == second
+    assert first.startswith("find easyprofind.ratings ")
+    assert '"sort":{"created_at":-1}' in first
+    assert first != command_shape("find", {"find": "ratings", "filter": {"_id": {"$in": ["x"]}}, "sort": {"created_at": 1}}, "easyprofind")
+
+    pipeline = command_shape("aggregate", {"aggregate": "ratings", "pipeline": [{"$match": {"professional_id": "p"}}, {"$group": {"_id": 1, "n": {"$sum": 1}}}]}, "easyprofind")
+    assert '{"$match":{"professional_id":"?"}}' in pipeline
+    assert '"$group":{"_id":1,"n":{"$sum":1}}' in pipeline
+
+def test_listener_records_only_slow_commands(caplog):
+    log = SlowQueryLog(threshold_ms=50)
+    listener = SlowQueryListener(log)
+    token = current_route.set("GET /ratings/professional/{professional_id}")
+    try:
+        fast_start, fast_end = _events(1, {"find": "ratings", "filter": {"_id": "a"}}, 5)
+        slow_start, slow_end = _events(2, {"find": "ratings", "filter": {"professional_id": "p"}}, 120, {"cursor": {"firstBatch": [{}, {}, {}]}})
+        listener.started(fast_start)
+        listener.started(slow_start)
+    finally:
+        current_route.reset(token)
+    with caplog.at_level(logging.WARNING):
+        listener.succeeded(fast_end)
+        listener.succeeded(slow_end)
+
+    [entry] = log.recent()
+    assert entry["duration_ms"] == 120
+    assert entry["docs_returned"] == 3
+    assert entry["route"] == "GET /ratings/professional/{professional_id}"
+    assert entry["shape"] == 'find easyprofind.ratings {"filter":{"professional_id":"?"}}'
+    assert "Slow MongoDB command" in caplog.text
+    assert not listener._pending
+
+    failed_start, failed_end = _events(3, {"delete": "ratings", "deletes": [{"q": {"_id": "a"}, "limit": 1}]}, 80, failure={"codeName": "NotWritablePrimary"})
+    listener.started(failed_start)
+    listener.failed(failed_end)
+    assert log.recent()[0]["error"] == "NotWritablePrimary"
+
+def test_ring_buffer_and_top_shapes():
+    log = SlowQueryLog(threshold_ms=0, max_entries=3, max_shapes=2)
+    for i, (shape, duration) in enumerate([("a", 10), ("b", 50), ("a", 30), ("b", 5), ("a", 1)]):
+        log.record({"at": str(i), "command": "find", "shape": shape, "duration_ms": duration, "docs_returned": 1, "route": "GET /x", "error": None})
+
+    assert [entry["at"] for entry in log.recent()] == ["4", "3", "2"]
+    top = log.top()
+    assert [aggregate["shape"] for aggregate in top] == ["b", "a"]
+    assert top[0]["count"] == 2 and top[0]["total_ms"] == 55 and top[0]["max_ms"] == 50
+    assert top[1]["mean_ms"] == 41 / 3
+    assert top[1]["routes"] == {"GET /x": 3}
+
+    # Sem espaço, a forma com menos tempo acumulado sai
+    log.record({"at": "5", "command": "find", "shape": "c", "duration_ms": 100, "docs_returned": None, "route": None, "error": None})
+    assert [aggregate["shape"] for aggregate in log.top()] == ["c", "b"]
+    assert log.stats()["recorded"] == 6
+
+def test_route_context_middleware_sets_route_template():
+    app = FastAPI()
+    app.add_middleware(RouteContextMiddleware)
+
+    @app.get("/items/{item_id}")
+    def sync_route(item_id: str):
+        return {"route": current_route.get()}
+
+    @app.get("/async/{item_id}")
+    async def async_route(item_id: str):
+        return {"route": current_route.get()}
+
+    client = TestClient(app)
+    assert client.get("/items/42").json() == {"route": "GET /items/{item_id}"}
+    assert client.get("/async/42").json() == {"route": "GET /async/{item_id}"}
+    assert current_route.get() is None
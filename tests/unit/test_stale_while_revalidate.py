@@ -0,0 +1,188 @@
+import logging
+from uuid import uuid4
+import pytest
+from fastapi.testclient import TestClient
+from src.application.cache.list_page_cache import ListPageCache
+from src.application.cache.stale_while_revalidate import (
+    CachePolicy, StaleWhileRevalidate, parse_policies, PROFESSIONAL_LISTING, TREND
+)
+from src.application.services.rating_service import RatingService
+from src.api.dependencies import provide_rating_service
+from src.infrastructure.repositories.memory_rating_repository import InMemoryRatingRepository
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class ManualExecutor:
+    """Keeps submitted refreshes until the test runs them."""
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, fn):
+        self.pending.append(fn)
+
+    def run(self):
+        pending, self.pending = self.pending, []
+        for fn in pending:
+            fn()
+
+def _stale(clock, executor, **policies):
+    return StaleWhileRevalidate(ListPageCache(100, 1024 * 1024), policies or {TREND: CachePolicy(10, 50)}, executor, clock)
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("database down")
+        return f"v{self.calls}", 10
+
+def test_parse_policies():
+    assert parse_policies("") == {}
+    assert parse_policies("professional_listing=5:30, trend=60:600") == {
+        PROFESSIONAL_LISTING: CachePolicy(5, 30),
+        TREND: CachePolicy(60, 600)
+    }
+    for invalid in ("trend=5", "trend=a:b", "unknown=1:2", "trend=-1:5"):
+        with pytest.raises(ValueError):
+            parse_policies(invalid)
+
+def test_fresh_then_stale_with_a_single_background_refresh():
+    clock, executor, load = FakeClock(), ManualExecutor(), Loader()
+    stale = _stale(clock, executor)
+    assert stale.get(TREND, ("p",), load) == "v1"
+    clock.now += 5
+    assert stale.get(TREND, ("p",), load) == "v1"
+    assert executor.pending == []
+
+    # Vencido o TTL fresco: servido na hora, com um único refresh em segundo plano
+    clock.now += 10
+    assert [stale.get(TREND, ("p",), load) for _ in range(5)] == ["v1"] * 5
+    assert len(executor.pending) == 1
+    assert stale.stats()["refreshing"] == 1
+    executor.run()
+    assert load.calls == 2
+    assert stale.get(TREND, ("p",), load) == "v2"
+
+    stats = stale.stats()
+    assert stats["refreshing"] == 0
+    trend = stats["endpoints"][TREND]
+    assert trend["fresh_hits"] == 2
+    assert trend["stale_serves"] == 5
+    assert trend["misses"] == 1
+    assert trend["refreshes"] == 1
+    assert trend["refresh_ms"]["p50"] is not None
+
+def test_past_both_ttls_loads_in_the_request():
+    clock, executor, load = FakeClock(), ManualExecutor(), Loader()
+    stale = _stale(clock, executor)
+    stale.get(TREND, ("p",), load)
+    clock.now += 61
+    assert stale.get(TREND, ("p",), load) == "v2"
+    assert executor.pending == []
+    assert stale.stats()["endpoints"][TREND]["expired"] == 1
+
+def test_failed_refresh_keeps_serving_the_stale_value(caplog):
+    clock, executor, load = FakeClock(), ManualExecutor(), Loader()
+    stale = _stale(clock, executor)
+    stale.get(TREND, ("p",), load)
+    clock.now += 20
+    load.fail = True
+    stale.get(TREND, ("p",), load)
+    with caplog.at_level(logging.ERROR):
+        executor.run()
+    assert "Background refresh of trend failed" in caplog.text
+    assert stale.get(TREND, ("p",), load) == "v1"
+    # O refresh seguinte pode ser disparado de novo
+    assert len(executor.pending) == 1
+    assert stale.stats()["endpoints"][TREND]["refresh_failures"] == 1
+
+def _service(clock, executor):
+    repository = InMemoryRatingRepository()
+    stale = _stale(clock, executor, professional_listing=CachePolicy(10, 50), trend=CachePolicy(10, 50))
+    return RatingService(repository, list_cache=ListPageCache(100, 1024 * 1024), stale=stale), repository
+
+def _rating(professional_id):
+    return {"professional_id": professional_id, "consumer_id": uuid4(), "rate": 4, "description": "Bom"}
+
+def test_service_listing_returns_the_version_it_was_read_at():
+    clock, executor = FakeClock(), ManualExecutor()
+    service, repository = _service(clock, executor)
+    professional_id = uuid4()
+    repository.create_rating(_rating(professional_id))
+    assert service.serves_stale(PROFESSIONAL_LISTING)
+
+    items, total, version = service.list_ratings_stale("professional", professional_id, 1, 10)
+    assert (len(items), total) == (1, 1)
+    repository.create_rating(_rating(professional_id))
+    clock.now += 20
+    # Servida a página velha, com a versão em que foi lida; o refresh traz a nova
+    assert service.list_ratings_stale("professional", professional_id, 1, 10)[1:] == (1, version)
+    executor.run()
+    items, total, new_version = service.list_ratings_stale("professional", professional_id, 1, 10)
+    assert total == 2
+    assert new_version > version
+
+def test_listing_endpoint_etag_follows_the_served_page():
+    from src.main import app
+    clock, executor = FakeClock(), ManualExecutor()
+    service, repository = _service(clock, executor)
+    professional_id = uuid4()
+    repository.create_rating(_rating(professional_id))
+    app.dependency_overrides[provide_rating_service] = lambda: service
+    try:
+        client = TestClient(app)
+        first = client.get(f"/ratings/professional/{professional_id}")
+        repository.create_rating(_rating(professional_id))
+        cached = client.get(f"/ratings/professional/{professional_id}", headers={"If-None-Match": first.headers["ETag"]})
+        clock.now += 20
+        executor.run()
+        stale = client.get(f"/ratings/professional/{professional_id}", headers={"If-None-Match": first.headers["ETag"]})
+        executor.run()
+        refreshed = client.get(f"/ratings/professional/{professional_id}", headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        app.dependency_overrides.pop(provide_rating_service)
+    assert first.status_code == 200 and first.json()["total"] == 1
+    assert cached.status_code == 304
+    assert stale.status_code == 304
+    assert refreshed.status_code == 200
+    assert refreshed.json()["total"] == 2
+    assert refreshed.headers["ETag"] != first.headers["ETag"]
+
+def test_stale_listing_etag_includes_filters():
+    from src.main import app
+    clock, executor = FakeClock(), ManualExecutor()
+    service, repository = _service(clock, executor)
+    professional_id = uuid4()
+    repository.create_rating(_rating(professional_id))
+    app.dependency_overrides[provide_rating_service] = lambda: service
+    try:
+        client = TestClient(app)
+        unfiltered = client.get(f"/ratings/professional/{professional_id}")
+        filtered = client.get(
+            f"/ratings/professional/{professional_id}?min_rate=5", headers={"If-None-Match": unfiltered.headers["ETag"]}
+        )
+    finally:
+        app.dependency_overrides.pop(provide_rating_service)
+    assert filtered.status_code == 200
+    assert filtered.json()["total"] == 0
+    assert filtered.headers["ETag"] != unfiltered.headers["ETag"]
+
+def test_service_trend_is_served_stale():
+    clock, executor = FakeClock(), ManualExecutor()
+    service, repository = _service(clock, executor)
+    professional_id = uuid4()
+    first = service.get_rating_trend(professional_id)
+    repository.create_rating(_rating(professional_id))
+    assert service.get_rating_trend(professional_id) is first
+    clock.now += 20
+    assert service.get_rating_trend(professional_id) is first
+    executor.run()
+    assert sum(point.count for point in service.get_rating_trend(professional_id).points) == 1
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone, timedelta
+from src.domain.value_objects.trend_period import (
+    TrendGranularity,
+    period_start,
+    next_period,
+    previous_period,
+    period_key,
+    period_count,
+    period_starts
+)
+import pytest
+
+DAY = TrendGranularity.DAY
+MONTH = TrendGranularity.MONTH
+
+def test_period_start():
+    moment = datetime(2024, 3, 20, 15, 30, tzinfo=timezone.utc)
+    assert period_start(moment, DAY) == datetime(2024, 3, 20, tzinfo=timezone.utc)
+    assert period_start(moment, MONTH) == datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+def test_period_start_naive_and_other_timezones():
+    # Datas sem fuso são tratadas como UTC
+    assert period_start(datetime(2024, 3, 20, 23, 0), DAY) == datetime(2024, 3, 20, tzinfo=timezone.utc)
+    moment = datetime(2024, 3, 20, 23, 0, tzinfo=timezone(timedelta(hours=-3)))
+    assert period_start(moment, DAY) == datetime(2024, 3, 21, tzinfo=timezone.utc)
+
+def test_next_and_previous_period():
+    assert next_period(datetime(2024, 12, 1, tzinfo=timezone.utc), MONTH) == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert previous_period(datetime(2025, 1, 1, tzinfo=timezone.utc), MONTH) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+    assert previous_period(datetime(2024, 3, 1, tzinfo=timezone.utc), MONTH) == datetime(2024, 2, 1, tzinfo=timezone.utc)
+    assert next_period(datetime(2024, 2, 29, tzinfo=timezone.utc), DAY) == datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert previous_period(datetime(2024, 3, 1, tzinfo=timezone.utc), DAY) == datetime(2024, 2, 29, tzinfo=timezone.utc)
+
+def test_period_key():
+    moment = datetime(2024, 3, 5, 10, tzinfo=timezone.utc)
+    assert period_key(moment, DAY) == "2024-03-05"
+    assert period_key(moment, MONTH) == "2024-03"
+
+def test_period_starts():
+    starts = period_starts(
+        datetime(2023, 11, 15, tzinfo=timezone.utc),
+        datetime(2024, 2, 2, tzinfo=timezone.utc),
+        MONTH
+    )
+    assert [period_key(s, MONTH) for s in starts] == ["2023-11", "2023-12", "2024-01", "2024-02"]
+    assert len(period_starts(datetime(2024, 1, 1), datetime(2024, 1, 31, 23), DAY)) == 31
+
+def test_period_count():
+    start = datetime(2023, 11, 15, tzinfo=timezone.utc)
+    end = datetime(2024, 2, 2, tzinfo=timezone.utc)
+    assert period_count(start, end, MONTH) == 4
+    assert period_count(start, end, DAY) == len(period_starts(start, end, DAY))
+    assert period_count(end, start, MONTH) == 0
+    # Calculado sem enumerar os buckets
+    assert period_count(datetime(1, 1, 1), datetime(9999, 12, 31), DAY) == 3652059
+
+def test_periods_at_calendar_bounds():
+    last_month = datetime(9999, 12, 1, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        next_period(last_month, MONTH)
+    with pytest.raises(ValueError):
+        next_period(datetime(9999, 12, 31, tzinfo=timezone.utc), DAY)
+    with pytest.raises(ValueError):
+        previous_period(datetime(1, 1, 1, tzinfo=timezone.utc), MONTH)
+    with pytest.raises(ValueError):
+        previous_period(datetime(1, 1, 1, tzinfo=timezone.utc), DAY)
+    assert next_period(datetime(9999, 11, 1, tzinfo=timezone.utc), MONTH) == last_month
+    assert period_starts(datetime(9999, 11, 5), datetime(9999, 12, 31), MONTH)[-1] == last_month